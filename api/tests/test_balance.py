@@ -0,0 +1,122 @@
+from datetime import date
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from treasury.models import AccountingPeriod, CategoryModel, TransactionModel
+from treasury.services import PeriodService
+from users.models import CustomUser
+
+
+class LegacyBalanceTests(APITestCase):
+    """Endpoints da tesouraria antiga ainda consultados pelo dashboard legado."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            username="treasurer", email="treasurer@test.com", password="password123",
+            type=CustomUser.Types.REGULAR,
+        )
+        self.category = CategoryModel.objects.create(name="Dizimos")
+        self.today = timezone.now().date()
+        self.first_day = self.today.replace(day=1)
+        self.period = AccountingPeriod.objects.create(
+            month=self.first_day, opening_balance=Decimal("100.00"), status="open",
+        )
+        self.previous_period = AccountingPeriod.objects.create(
+            month=self.first_day - relativedelta(months=1),
+            opening_balance=Decimal("0.00"), status="open",
+        )
+        self.client.force_login(self.user)
+
+    def create_tx(self, amount, is_positive, day=None, period=None, **kwargs):
+        period = period or self.period
+        return TransactionModel.objects.create(
+            user=self.user,
+            category=self.category,
+            description="Lançamento",
+            amount=Decimal(amount),
+            is_positive=is_positive,
+            date=day or self.first_day,
+            accounting_period=period,
+            **kwargs,
+        )
+
+    def create_sample(self):
+        self.create_tx("200.00", True)
+        # Padrão de sinal duplo: negativas com e sem sinal
+        self.create_tx("-30.00", False)
+        self.create_tx("20.00", False, day=self.today)
+        # Fora do mês e estornos não entram no saldo
+        self.create_tx("999.00", True, day=self.first_day - relativedelta(days=1),
+                       period=self.previous_period)
+        self.create_tx("50.00", False, transaction_type="reversal")
+
+    def test_month_balance_single_aggregate(self):
+        self.create_sample()
+
+        with CaptureQueriesContext(connection) as ctx:
+            month = PeriodService().get_month_balance(self.today)
+
+        self.assertEqual(month, {
+            "opening_balance": Decimal("100.00"),
+            "positive": Decimal("200.00"),
+            "negative": Decimal("-50.00"),
+            "net": Decimal("150.00"),
+            "balance": Decimal("250.00"),
+        })
+        aggregates = [q["sql"] for q in ctx.captured_queries if "SUM" in q["sql"].upper()]
+        self.assertEqual(len(aggregates), 1)
+        self.assertIn('"date" >=', aggregates[0])
+        self.assertIn('"date" <', aggregates[0])
+
+    def test_get_current_balance_endpoint(self):
+        self.create_sample()
+
+        response = self.client.get(reverse("get-current-balance"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            "current_balance": "250.00",
+            "last_month_balance": "100.00",
+            "unaware_month_balance": "150.00",
+            "sum_negative_transactions": "-50.00",
+            "sum_positive_transactions": "200.00",
+        })
+
+    def test_cached_until_ledger_changes(self):
+        self.create_sample()
+        url = reverse("get-current-balance")
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        self.assertFalse(any("SUM" in q["sql"].upper() for q in ctx.captured_queries))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_tx("10.00", True)
+        self.assertEqual(self.client.get(url).data["sum_positive_transactions"], "210.00")
+
+    def test_current_balance_uses_dual_sign_totals(self):
+        self.create_sample()
+
+        # Sem período fechado: só o resultado do período aberto mais recente
+        self.assertEqual(PeriodService().get_current_balance(), Decimal("150.00"))
+
+    def test_transactions_of_current_month(self):
+        self.create_sample()
+
+        response = self.client.get(reverse("get-transactions"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = response.data["results"] if isinstance(response.data, dict) else response.data
+        self.assertEqual(len(rows), 4)
+        self.assertTrue(all(date.fromisoformat(row["date"]) >= self.first_day for row in rows))
+        self.assertEqual(rows[0]["category"]["name"], "Dizimos")
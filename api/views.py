@@ -5,7 +5,7 @@ from dateutil.relativedelta import relativedelta
 from django.utils import timezone
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
-from treasury.models import AccountingPeriod
+from treasury.services import PeriodService
 from rest_framework.parsers import MultiPartParser, FormParser
 
 from .serializers import (
@@ -19,6 +19,7 @@ from .serializers import (
     BalanceSerializer,
 )
 from users.models import CustomUser
+from users.services import MembershipService
 from secretarial.models import MinuteExcerptsModel
 from secretarial.models import MeetingMinuteModel, MinuteTemplateModel, MinuteProjectModel
 
@@ -52,48 +53,17 @@ def getMentionUsers(request):
 
 @api_view(["GET"])
 def getCurrentBalance(request):
-    from datetime import datetime
-
-    # Get current month period
-    today = timezone.now().date()
-    current_month_date = today.replace(day=1)
-
-    # Try to get current period's opening balance
-    try:
-        current_period = AccountingPeriod.objects.get(month=current_month_date)
-        last_month_balance = current_period.opening_balance
-    except AccountingPeriod.DoesNotExist:
-        last_month_balance = 0
-
-    # Get transactions for current month
-    current_month = timezone.now().month
-    current_year = timezone.now().year
-
-    transactions_queryset = TransactionModel.objects.filter(
-        date__month=current_month, date__year=current_year,
-        transaction_type='original'
-    ).order_by("-date")
-
-    positive_transactions_queryset = transactions_queryset.filter(
-        is_positive=True)
-    negative_transactions_queryset = transactions_queryset.filter(
-        is_positive=False)
-
-    unaware_month_balance = sum(t.amount for t in transactions_queryset)
-    positive_transactions = sum(
-        pt.amount for pt in positive_transactions_queryset)
-    negative_transactions = sum(
-        nt.amount for nt in negative_transactions_queryset)
-
-    aware_month_balance = last_month_balance + unaware_month_balance
+    # Totais do mês corrente em uma agregação (em cache curto), os mesmos
+    # usados pelo PeriodService
+    month = PeriodService().get_month_balance(timezone.now().date())
 
     serializer = BalanceSerializer(
         {
-            "current_balance": aware_month_balance,
-            "last_month_balance": last_month_balance,
-            "unaware_month_balance": unaware_month_balance,
-            "sum_negative_transactions": negative_transactions,
-            "sum_positive_transactions": positive_transactions,
+            "current_balance": month["balance"],
+            "last_month_balance": month["opening_balance"],
+            "unaware_month_balance": month["net"],
+            "sum_negative_transactions": month["negative"],
+            "sum_positive_transactions": month["positive"],
         }
     )
 
@@ -120,12 +90,12 @@ class TransactionCatListAPIView(generics.ListAPIView):
     serializer_class = TransactionCatModelSerializer
 
     def get_queryset(self):
-        current_month = timezone.now().month
-        current_year = timezone.now().year
+        # Intervalo de datas em vez de date__month/date__year, que não usam o índice
+        first_day = timezone.now().date().replace(day=1)
 
         queryset = TransactionModel.objects.filter(
-            date__month=current_month, date__year=current_year
-        ).order_by("-date")
+            date__gte=first_day, date__lt=first_day + relativedelta(months=1)
+        ).select_related("category").order_by("-date")
         return queryset
 
 
@@ -158,12 +128,15 @@ def unifiedSearch(request):
 
 
     if search_category == "users":
-        queryset = CustomUser.objects.filter(
-            Q(type=CustomUser.Types.SIMPLE_USER)
-            | Q(type=CustomUser.Types.ONLY_WORKER)
-            | Q(type=CustomUser.Types.CONGREGATED),
-            Q(first_name__icontains=search_criterion)
-            | Q(last_name__icontains=search_criterion),
+        queryset = MembershipService().search(
+            CustomUser.objects.filter(
+                type__in=[
+                    CustomUser.Types.SIMPLE_USER,
+                    CustomUser.Types.ONLY_WORKER,
+                    CustomUser.Types.CONGREGATED,
+                ]
+            ),
+            search_criterion,
         )
         serialized_data = CustomUserSerializer(queryset, many=True)
         return Response(serialized_data.data)
@@ -218,11 +191,8 @@ def unifiedSearch(request):
         return Response(serialized_data.data)
 
     elif search_category == "members":
-        queryset = CustomUser.objects.filter(
-            Q(type=CustomUser.Types.REGULAR) | Q(type=CustomUser.Types.STAFF),
-            Q(first_name__icontains=search_criterion)
-            | Q(last_name__icontains=search_criterion),
-        )
+        membership = MembershipService()
+        queryset = membership.search(membership.members(), search_criterion)
         serialized_data = CustomUserSerializer(queryset, many=True)
         return Response(serialized_data.data)
 
@@ -1 +1 @@
-from .comment_serializers import CommentSerializer
\ No newline at end of file
+from .comment_serializers import CommentSerializer, ThreadedCommentSerializer
\ No newline at end of file
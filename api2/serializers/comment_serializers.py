@@ -9,12 +9,14 @@ class CommentSerializer(serializers.ModelSerializer):
         source='author.profile_image', read_only=True)
     author_id = serializers.IntegerField(
         source='author.id', read_only=True)
+    likes_count = serializers.IntegerField(
+        source='like_count', read_only=True)
 
     class Meta:
         model = Comment
         fields = ['id', 'post', 'author', 'author_id', 'content', 'parent',
-                  'likes', 'created', 'user_photo', 'author_name']
-        read_only_fields = ['id', 'post', 'author', 'author_id', 'created', 'likes', 'user_photo', 'author_name']
+                  'likes_count', 'created', 'user_photo', 'author_name']
+        read_only_fields = ['id', 'post', 'author', 'author_id', 'created', 'likes_count', 'user_photo', 'author_name']
 
     def update(self, instance, validated_data):
         # Verificar se o usuário atual é o autor do comentário
@@ -26,3 +28,21 @@ class CommentSerializer(serializers.ModelSerializer):
         instance.content = validated_data.get('content', instance.content)
         instance.save()
         return instance
+
+
+class ThreadedCommentSerializer(serializers.ModelSerializer):
+    """Leitura da árvore de comentários; espera ``Comment.objects.for_thread()``."""
+    author_name = serializers.CharField(
+        source='author.get_full_name', read_only=True)
+    user_photo = serializers.ImageField(
+        source='author.profile_image', read_only=True)
+    author_id = serializers.IntegerField(read_only=True)
+    likes_count = serializers.IntegerField(
+        source='like_count', read_only=True)
+    liked_by_user = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = ['id', 'post', 'author_id', 'content', 'parent', 'likes_count',
+                  'liked_by_user', 'created', 'user_photo', 'author_name']
+        read_only_fields = fields
@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from blog.models import Comment, Post
+from api2.views.comments_view import CommentThreadPagination
+
+User = get_user_model()
+
+
+class CommentListAPITestCase(APITestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username='author', email='author@test.com', password='testpass123')
+        self.reader = User.objects.create_user(
+            username='reader', email='reader@test.com', password='testpass123')
+        self.post = Post.objects.create(
+            title='Test Post', content='Test content', author=self.author)
+        self.url = reverse('comment-filter', kwargs={'post_id': self.post.pk})
+        self.client.login(username='reader', password='testpass123')
+
+    def comment(self, parent=None, **kwargs):
+        return Comment.objects.create(
+            post=self.post, author=self.author, content='Comentário', parent=parent, **kwargs)
+
+    def test_replies_are_nested_under_their_root(self):
+        root = self.comment()
+        reply = self.comment(parent=root)
+        nested = self.comment(parent=reply)
+        other_root = self.comment()
+
+        self.assertEqual(nested.thread_id, root.pk)
+
+        results = self.client.get(self.url).json()['results']
+
+        self.assertEqual([c['id'] for c in results], [root.pk, other_root.pk])
+        self.assertEqual(results[0]['replies'][0]['id'], reply.pk)
+        self.assertEqual(results[0]['replies'][0]['replies'][0]['id'], nested.pk)
+        self.assertEqual(results[1]['replies'], [])
+
+    def test_likes_are_annotated_for_current_user(self):
+        liked = self.comment()
+        self.comment()
+        self.client.post(reverse('blog:toggle-comment-like', kwargs={'comment_id': liked.pk}))
+
+        results = self.client.get(self.url).json()['results']
+
+        self.assertEqual(results[0]['likes_count'], 1)
+        self.assertTrue(results[0]['liked_by_user'])
+        self.assertEqual(results[1]['likes_count'], 0)
+        self.assertFalse(results[1]['liked_by_user'])
+
+    def test_cursor_pagination_splits_roots(self):
+        page_size = CommentThreadPagination.page_size
+        roots = [self.comment() for _ in range(page_size + 1)]
+        self.comment(parent=roots[-1])
+
+        first = self.client.get(self.url).json()
+        self.assertEqual(len(first['results']), page_size)
+        self.assertIsNotNone(first['next'])
+
+        second = self.client.get(first['next']).json()
+        self.assertEqual([c['id'] for c in second['results']], [roots[-1].pk])
+        self.assertEqual(len(second['results'][0]['replies']), 1)
+        self.assertIsNone(second['next'])
+
+    def test_query_count_does_not_depend_on_thread_size(self):
+        root = self.comment()
+        self.comment(parent=root)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url)
+
+        for _ in range(5):
+            reply = self.comment(parent=self.comment())
+            self.comment(parent=self.comment(parent=reply))
+        with CaptureQueriesContext(connection) as large:
+            self.client.get(self.url)
+
+        self.assertEqual(len(small), len(large))
@@ -1,17 +1,53 @@
-from api2.serializers import CommentSerializer
+from api2.serializers import ThreadedCommentSerializer
 from rest_framework import generics
+from rest_framework.pagination import CursorPagination
 from blog.models import Comment
 
 
+class CommentThreadPagination(CursorPagination):
+    page_size = 20
+    ordering = "id"
+
+
 class CommentListAPIView(generics.ListAPIView):
-    serializer_class = CommentSerializer
+    """
+    Página de comentários raiz de um post, cada um com suas respostas já
+    aninhadas em ``replies``. Usa duas consultas: uma para a página de raízes
+    e outra para todas as respostas dessas conversas.
+    """
+    serializer_class = ThreadedCommentSerializer
+    pagination_class = CommentThreadPagination
     lookup_field = 'post_id'
 
     def get_queryset(self):
         post_id = self.kwargs['post_id']
         if post_id:
-            queryset = Comment.objects.filter(
-                post=post_id).order_by("created")
+            queryset = Comment.objects.for_thread(self.request.user).filter(
+                post=post_id, parent__isnull=True)
         else:
             queryset = Comment.objects.none()
         return queryset
+
+    def list(self, request, *args, **kwargs):
+        roots = self.paginate_queryset(self.get_queryset())
+        replies = Comment.objects.for_thread(request.user).filter(
+            thread__in=[root.pk for root in roots]).order_by("id")
+        return self.get_paginated_response(self.build_tree(roots, replies))
+
+    def build_tree(self, roots, replies):
+        """
+        Monta a árvore em uma única passada. As respostas vêm ordenadas por id,
+        então o pai de cada uma já está no mapa quando ela é encaixada.
+        """
+        serializer = self.get_serializer
+        tree = []
+        nodes = {}
+        for data in serializer(roots, many=True).data + serializer(replies, many=True).data:
+            data['replies'] = []
+            nodes[data['id']] = data
+            parent = nodes.get(data['parent'])
+            if parent is not None:
+                parent['replies'].append(data)
+            elif data['parent'] is None:
+                tree.append(data)
+        return tree
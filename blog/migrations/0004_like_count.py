@@ -0,0 +1,40 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_like_counts(apps, schema_editor):
+    for model_name in ("Post", "Comment"):
+        model = apps.get_model("blog", model_name)
+        through = model.likes.through
+        fk_name = model._meta.model_name
+        likes = (
+            through.objects.filter(**{fk_name: OuterRef("pk")})
+            .values(fk_name)
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        model.objects.update(like_count=Coalesce(Subquery(likes), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_alter_post_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_like_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_threads(apps, schema_editor):
+    Comment = apps.get_model("blog", "Comment")
+    parents = dict(Comment.objects.exclude(parent=None).values_list("id", "parent_id"))
+
+    replies = []
+    for comment_id in parents:
+        root_id = parents[comment_id]
+        while root_id in parents:
+            root_id = parents[root_id]
+        replies.append(Comment(id=comment_id, thread_id=root_id))
+
+    Comment.objects.bulk_update(replies, ["thread"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_like_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='thread',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='thread_replies', to='blog.comment'),
+        ),
+        migrations.RunPython(backfill_threads, migrations.RunPython.noop),
+    ]
@@ -1,15 +1,38 @@
 from users.models import CustomUser
 from core.models import BaseModel
 from blog.models import Post
+from blog.models.counter_mixin import DenormalizedCountersMixin
 from django.db import models
+from django.db.models import Exists, OuterRef, Value
 
 
-class Comment(BaseModel):
+class CommentQuerySet(models.QuerySet):
+    def for_thread(self, user=None):
+        """
+        Comentários prontos para a árvore: autor via join e se o usuário
+        atual curtiu cada comentário, sem consultas por linha.
+        """
+        if user is not None and user.is_authenticated:
+            liked_by_user = Exists(Comment.likes.through.objects.filter(
+                comment_id=OuterRef("pk"), customuser_id=user.pk))
+        else:
+            liked_by_user = Value(False)
+
+        return self.select_related("author").annotate(liked_by_user=liked_by_user)
+
+
+class Comment(DenormalizedCountersMixin, BaseModel):
     post = models.ForeignKey(Post, on_delete=models.CASCADE)
     author = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     content = models.TextField()
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
+    # Comentário raiz da conversa, para buscar todas as respostas de uma página de uma vez
+    thread = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True,
+                               editable=False, related_name='thread_replies')
     likes = models.ManyToManyField(CustomUser, related_name='liked_comments', blank=True)
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = CommentQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Comentário"
@@ -17,3 +40,8 @@ class Comment(BaseModel):
 
     def __str__(self):
         return f"{self.author}"
+
+    def save(self, *args, **kwargs):
+        if self.parent_id and self.thread_id is None:
+            self.thread_id = self.parent.thread_id or self.parent_id
+        super().save(*args, **kwargs)
@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class DenormalizedCountersMixin(models.Model):
+    """
+    Impede que ``save()`` sobrescreva contadores mantidos via F() com o
+    valor (possivelmente desatualizado) que está em memória.
+    """
+
+    denormalized_counters = ("like_count",)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.denormalized_counters
+            ]
+        super().save(*args, **kwargs)
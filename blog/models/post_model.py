@@ -1,13 +1,39 @@
 from django.db import models
+from django.db.models import Count, Exists, OuterRef, Prefetch, Value
 from users.models import CustomUser
 from core.models import BaseModel
 from blog.models import Category
-from django.db.models.signals import pre_save
-from django.dispatch import receiver
+from blog.models.counter_mixin import DenormalizedCountersMixin
 from django.utils import timezone
 
+TOP_LIKERS_LIMIT = 5
 
-class Post(BaseModel):
+
+class PostQuerySet(models.QuerySet):
+    def for_feed(self, user=None):
+        """
+        Posts prontos para o feed: autor via join, categorias e os primeiros
+        curtidores pré-carregados, contagem de comentários e se o usuário
+        atual curtiu cada post.
+        """
+        top_likers = CustomUser.objects.order_by("id")[:TOP_LIKERS_LIMIT]
+
+        if user is not None and user.is_authenticated:
+            liked_by_user = Exists(Post.likes.through.objects.filter(
+                post_id=OuterRef("pk"), customuser_id=user.pk))
+        else:
+            liked_by_user = Value(False)
+
+        return self.select_related("author").prefetch_related(
+            "categories",
+            Prefetch("likes", queryset=top_likers, to_attr="top_likers"),
+        ).annotate(
+            comment_count=Count("comment"),
+            liked_by_user=liked_by_user,
+        )
+
+
+class Post(DenormalizedCountersMixin, BaseModel):
     title = models.CharField(max_length=200, null=False, blank=False)
     content = models.TextField(null=False, blank=False)
     author = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
@@ -17,20 +43,22 @@ class Post(BaseModel):
         CustomUser, related_name='liked_posts', blank=True)
     categories = models.ManyToManyField(
         Category, related_name='posts', blank=True)
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Post"
         verbose_name_plural = "Posts"
 
+    def save(self, *args, **kwargs):
+        # Atualiza a data de modificação no mesmo UPDATE da edição
+        if self.pk:
+            self.modified = timezone.now().date()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "modified"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.title
-
-
-@receiver(pre_save, sender=Post)
-def update_post_modified_date(sender, instance, **kwargs):
-    current_date = timezone.now().date()
-    if instance.pk:
-        pre_save.disconnect(update_post_modified_date, sender=Post)
-        instance.modified = current_date
-        instance.save()
-        pre_save.connect(update_post_modified_date, sender=Post)
@@ -0,0 +1,87 @@
+"""
+Signals do blog.
+
+- Invalidação do cache dos cards de post
+- Sincronização de ``like_count`` quando curtidas mudam via ``likes.add()``,
+  ``remove()`` ou ``clear()`` (admin, shell); as views de curtida ajustam o
+  contador diretamente e não disparam ``m2m_changed``.
+"""
+
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from blog.models import Post, Comment, Category
+
+# Fragmentos de {% cache %} em blog/home.html, todos variando apenas pelo id do post
+POST_CARD_FRAGMENTS = ("blog_post_header", "blog_post_content", "blog_post_categories")
+
+
+def invalidate_post_cards(post_ids):
+    cache.delete_many([
+        make_template_fragment_key(fragment, [post_id])
+        for post_id in post_ids
+        for fragment in POST_CARD_FRAGMENTS
+    ])
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_edited_post(sender, instance, **kwargs):
+    invalidate_post_cards([instance.pk])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_commented_post(sender, instance, **kwargs):
+    invalidate_post_cards([instance.post_id])
+
+
+@receiver(m2m_changed, sender=Post.categories.through)
+def invalidate_recategorized_post(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear", "pre_clear"):
+        return
+    if not reverse:
+        invalidate_post_cards([instance.pk])
+    elif action == "pre_clear":
+        invalidate_post_cards(instance.posts.values_list("pk", flat=True))
+    elif pk_set:
+        invalidate_post_cards(pk_set)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def invalidate_category_posts(sender, instance, **kwargs):
+    if not kwargs.get("created"):
+        invalidate_post_cards(instance.posts.values_list("pk", flat=True))
+
+
+def recount_likes(model, pks):
+    fk_name = model._meta.model_name
+    likes = (
+        model.likes.through.objects.filter(**{fk_name: OuterRef("pk")})
+        .values(fk_name)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    model.objects.filter(pk__in=pks).update(like_count=Coalesce(Subquery(likes), 0))
+
+
+@receiver(m2m_changed, sender=Post.likes.through)
+@receiver(m2m_changed, sender=Comment.likes.through)
+def sync_like_count(sender, instance, action, reverse, pk_set, **kwargs):
+    liked_model = Post if sender is Post.likes.through else Comment
+
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            recount_likes(liked_model, [instance.pk])
+    elif action == "pre_clear":
+        instance._cleared_like_pks = list(
+            liked_model.objects.filter(likes=instance).values_list("pk", flat=True))
+    elif action == "post_clear":
+        recount_likes(liked_model, getattr(instance, "_cleared_like_pks", []))
+    elif action in ("post_add", "post_remove") and pk_set:
+        recount_likes(liked_model, pk_set)
@@ -44,10 +44,10 @@ function loadComments(postId) {
 	// is used even if the server injected HTML is present.
 	fetch(`/api2/comments/${postId}/`)
 		.then((response) => response.json())
-		.then((comments) => {
-			if (comments.length > 0) {
-				const commentTree = buildCommentTree(comments);
-				const commentElements = renderCommentTree(commentTree);
+		.then((page) => {
+			if (page.results && page.results.length > 0) {
+				// A API já devolve a árvore montada (respostas em comment.replies)
+				const commentElements = renderCommentTree(page.results);
 				// Insert inside a reliable wrapper to avoid stray text nodes or margin-collapsing issues
 				commentsContainer.innerHTML = '';
 				const wrapper = document.createElement('div');
@@ -55,8 +55,7 @@ function loadComments(postId) {
 				wrapper.innerHTML = commentElements;
 				commentsContainer.appendChild(wrapper);
 				commentsContainer.classList.remove('hidden');
-
-				const authorIds = Array.from(document.querySelectorAll('.comment-item')).map(e => e.getAttribute('data-author-id'));
+				renderLoadMoreButton(commentsContainer, wrapper, page.next);
 			} else {
 				commentsContainer.innerHTML = '';
 				const noCommentsMsg = document.createElement("p");
@@ -73,26 +72,28 @@ function loadComments(postId) {
 		});
 }
 
-function buildCommentTree(comments) {
-	const commentMap = {};
-	const roots = [];
-
-	comments.forEach(comment => {
-		comment.replies = [];
-		commentMap[comment.id] = comment;
-	});
+function renderLoadMoreButton(commentsContainer, wrapper, nextUrl) {
+	const previous = commentsContainer.querySelector('.blog-load-more-comments');
+	if (previous) previous.remove();
+	if (!nextUrl) return;
 
-	comments.forEach(comment => {
-		if (comment.parent) {
-			if (commentMap[comment.parent]) {
-				commentMap[comment.parent].replies.push(comment);
-			}
-		} else {
-			roots.push(comment);
-		}
+	const button = document.createElement('button');
+	button.className = 'blog-load-more-comments text-sm text-primary-600 hover:underline';
+	button.textContent = 'Carregar mais comentários';
+	button.addEventListener('click', () => {
+		button.disabled = true;
+		fetch(nextUrl)
+			.then((response) => response.json())
+			.then((page) => {
+				wrapper.insertAdjacentHTML('beforeend', renderCommentTree(page.results || []));
+				renderLoadMoreButton(commentsContainer, wrapper, page.next);
+			})
+			.catch((error) => {
+				button.disabled = false;
+				console.error('[comment_fetch] Erro ao carregar mais comentários:', error);
+			});
 	});
-
-	return roots;
+	commentsContainer.appendChild(button);
 }
 
 function renderCommentTree(comments, depth = 0) {
@@ -0,0 +1,91 @@
+"""
+Testes do feed do blog: consultas, contagens e cache dos cards
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Post, Comment, Category
+
+User = get_user_model()
+
+
+class BlogFeedTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='feed_author', email='feed_author@test.com', password='testpass123')
+        self.category = Category.objects.create(name='Devocional')
+        self.users = [
+            User.objects.create_user(
+                username=f'leitor{i}', email=f'leitor{i}@test.com', password='testpass123')
+            for i in range(7)
+        ]
+        self.posts = []
+        for i in range(5):
+            post = Post.objects.create(
+                title=f'Post {i}', content=f'Conteúdo {i}', author=self.author)
+            post.categories.add(self.category)
+            post.likes.add(*self.users)
+            Comment.objects.create(post=post, author=self.users[0], content='Amém')
+            self.posts.append(post)
+
+    def test_feed_queryset_annotations(self):
+        post = Post.objects.for_feed(self.users[0]).get(pk=self.posts[0].pk)
+
+        self.assertEqual(post.like_count, 7)
+        self.assertEqual(post.comment_count, 1)
+        self.assertTrue(post.liked_by_user)
+        self.assertEqual(len(post.top_likers), 5)
+
+    def test_feed_queryset_anonymous(self):
+        post = Post.objects.for_feed().get(pk=self.posts[0].pk)
+
+        self.assertFalse(post.liked_by_user)
+
+    def test_query_count_does_not_grow_with_posts(self):
+        self.client.login(username='leitor0', password='testpass123')
+        with CaptureQueriesContext(connection) as few_posts:
+            self.client.get(reverse('blog:home'))
+
+        for i in range(5):
+            post = Post.objects.create(title=f'Extra {i}', content='...', author=self.author)
+            post.likes.add(*self.users)
+        cache.clear()
+        with CaptureQueriesContext(connection) as more_posts:
+            response = self.client.get(reverse('blog:home'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(few_posts), len(more_posts))
+
+    def test_edit_updates_modified_in_a_single_query(self):
+        post = self.posts[0]
+        Post.objects.filter(pk=post.pk).update(modified=timezone.now().date().replace(year=2000))
+        post.refresh_from_db()
+
+        with self.assertNumQueries(1):
+            post.title = 'Novo título'
+            post.save()
+
+        post.refresh_from_db()
+        self.assertEqual(post.modified, timezone.now().date())
+
+    def test_card_fragment_is_invalidated_on_edit_and_comment(self):
+        url = reverse('blog:home')
+        self.client.get(url)
+
+        post = self.posts[-1]
+        post.title = 'Título Editado'
+        post.save()
+        self.assertContains(self.client.get(url), 'Título Editado')
+
+        Comment.objects.create(post=post, author=self.users[1], content='Glória')
+        self.assertContains(self.client.get(url), '2 comentários')
+
+        self.category.name = 'Estudos'
+        self.category.save()
+        self.assertContains(self.client.get(url), 'Estudos')
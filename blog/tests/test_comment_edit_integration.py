@@ -97,7 +97,7 @@ class CommentEditIntegrationTest(TestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, 200)
-        comments = response.json()
+        comments = response.json()['results']
 
         # Verificar se o comentário inclui author_id
         self.assertTrue(len(comments) > 0)
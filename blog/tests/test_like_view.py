@@ -0,0 +1,91 @@
+"""
+Testes das curtidas de posts e comentários com contadores desnormalizados
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.models import Post, Comment
+
+User = get_user_model()
+
+
+class ToggleLikeTest(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username='like_author', email='like_author@test.com', password='testpass123')
+        self.reader = User.objects.create_user(
+            username='like_reader', email='like_reader@test.com', password='testpass123')
+        self.post = Post.objects.create(title='Post', content='Conteúdo', author=self.author)
+        self.comment = Comment.objects.create(post=self.post, author=self.author, content='Amém')
+        self.client.login(username='like_reader', password='testpass123')
+
+    def test_toggle_like_adds_and_removes(self):
+        url = reverse('blog:toggle-like', kwargs={'post_id': self.post.pk})
+
+        data = self.client.post(url).json()
+        self.assertTrue(data['liked'])
+        self.assertEqual(data['like_count'], 1)
+        self.assertEqual(data['likers'][0]['id'], self.reader.pk)
+        self.assertFalse(data['has_more_likers'])
+
+        data = self.client.post(url).json()
+        self.assertFalse(data['liked'])
+        self.assertEqual(data['like_count'], 0)
+        self.assertEqual(data['likers'], [])
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 0)
+        self.assertFalse(self.post.likes.exists())
+
+    def test_query_count_does_not_depend_on_popularity(self):
+        url = reverse('blog:toggle-like', kwargs={'post_id': self.post.pk})
+        with CaptureQueriesContext(connection) as unpopular:
+            self.client.post(url)
+        self.client.post(url)
+
+        fans = [
+            User.objects.create_user(username=f'fan{i}', email=f'fan{i}@test.com')
+            for i in range(20)
+        ]
+        self.post.likes.add(*fans)
+        with CaptureQueriesContext(connection) as popular:
+            data = self.client.post(url).json()
+
+        self.assertEqual(len(unpopular), len(popular))
+        self.assertEqual(data['like_count'], 21)
+        self.assertEqual(len(data['likers']), 5)
+        self.assertTrue(data['has_more_likers'])
+
+    def test_toggle_comment_like(self):
+        url = reverse('blog:toggle-comment-like', kwargs={'comment_id': self.comment.pk})
+
+        self.assertEqual(self.client.post(url).json(), {'liked': True, 'like_count': 1})
+        self.assertEqual(self.client.post(url).json(), {'liked': False, 'like_count': 0})
+
+    def test_missing_post(self):
+        url = reverse('blog:toggle-like', kwargs={'post_id': 9999})
+
+        self.assertEqual(self.client.post(url).status_code, 404)
+
+    def test_edit_does_not_overwrite_like_count(self):
+        stale = Post.objects.get(pk=self.post.pk)
+        self.client.post(reverse('blog:toggle-like', kwargs={'post_id': self.post.pk}))
+
+        stale.title = 'Título novo'
+        stale.save()
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
+        self.assertEqual(self.post.title, 'Título novo')
+
+    def test_m2m_changes_keep_counter_in_sync(self):
+        self.reader.liked_comments.add(self.comment)
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.like_count, 1)
+
+        self.reader.liked_comments.clear()
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.like_count, 0)
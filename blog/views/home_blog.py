@@ -8,3 +8,6 @@ class BlogHomeView(ListView):
     context_object_name = 'posts'
     paginate_by = 5
     ordering = ['-created', '-id']
+
+    def get_queryset(self):
+        return Post.objects.for_feed(self.request.user).order_by(*self.ordering)
@@ -1,63 +1,78 @@
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from blog.models import Post, Comment
-from django.core.exceptions import ObjectDoesNotExist
+from blog.models.post_model import TOP_LIKERS_LIMIT
+from users.models import CustomUser
+
+
+def _toggle_like(model, object_id, user):
+    """
+    Alterna a curtida do usuário com uma exclusão ou inserção direta na
+    tabela intermediária, ajustando ``like_count`` com F(), sem carregar os
+    curtidores. Retorna (liked, like_count), ou None se o objeto não existir.
+    """
+    through = model.likes.through
+    link = {f"{model._meta.model_name}_id": object_id, "customuser_id": user.pk}
+    target = model.objects.filter(pk=object_id)
+
+    try:
+        with transaction.atomic():
+            if through.objects.filter(**link).delete()[0]:
+                target.update(like_count=Greatest(F("like_count") - 1, 0))
+                liked = False
+            else:
+                if not target.update(like_count=F("like_count") + 1):
+                    return None
+                through.objects.create(**link)
+                liked = True
+    except IntegrityError:
+        # Requisição concorrente do mesmo usuário já registrou a curtida
+        liked = True
+
+    return liked, target.values_list("like_count", flat=True).first()
 
 
 @login_required
 @require_POST
 def toggle_like(request, post_id):
-    try:
-        post = Post.objects.get(id=post_id)
-    except ObjectDoesNotExist:
+    result = _toggle_like(Post, post_id, request.user)
+    if result is None:
         return JsonResponse({'error': 'Post not found'}, status=404)
-
-    user = request.user
-
-    if user in post.likes.all():
-        post.likes.remove(user)
-        liked = False
-    else:
-        post.likes.add(user)
-        liked = True
+    liked, like_count = result
 
     # Get likers data for responsive UI
-    likers = []
-    for liker in post.likes.all()[:5]:  # Limit to 5 for performance
-        likers.append({
+    likers = [
+        {
             'id': liker.id,
             'first_name': liker.first_name,
             'last_name': liker.last_name,
             'profile_image': liker.profile_image.url if liker.profile_image else None
-        })
+        }
+        for liker in CustomUser.objects.filter(
+            liked_posts=post_id).order_by('id')[:TOP_LIKERS_LIMIT]
+    ]
 
     return JsonResponse({
         'liked': liked,
-        'like_count': post.likes.count(),
+        'like_count': like_count,
         'likers': likers,
-        'has_more_likers': post.likes.count() > 5
+        'has_more_likers': like_count > TOP_LIKERS_LIMIT
     })
 
 
 @login_required
 @require_POST
 def toggle_comment_like(request, comment_id):
-    try:
-        comment = Comment.objects.get(id=comment_id)
-    except ObjectDoesNotExist:
+    result = _toggle_like(Comment, comment_id, request.user)
+    if result is None:
         return JsonResponse({'error': 'Comment not found'}, status=404)
-
-    user = request.user
-
-    if user in comment.likes.all():
-        comment.likes.remove(user)
-        liked = False
-    else:
-        comment.likes.add(user)
-        liked = True
+    liked, like_count = result
 
     return JsonResponse({
         'liked': liked,
-        'like_count': comment.likes.count()
-    })
\ No newline at end of file
+        'like_count': like_count
+    })
@@ -0,0 +1,278 @@
+"""
+Backup e restauração dos bancos SQLite.
+
+O backup base usa a API de backup online do SQLite (``Connection.backup``)
+em passos de ``pages`` páginas, com uma pausa entre eles para não bloquear
+quem está escrevendo. O resultado é comprimido com gzip em
+``<BACKUP_ROOT>/<alias>/<carimbo>.sqlite3.gz``.
+
+Com o banco em WAL, também é possível enviar segmentos: cópias do arquivo
+``-wal`` feitas depois de um backup base. Enquanto não houver checkpoint que
+reinicie o WAL (o "salt" do cabeçalho continua o mesmo do momento do backup
+base), o WAL contém a imagem de todas as páginas alteradas desde então, e
+base + segmento reproduzem o banco no instante da cópia do segmento. Se o WAL
+foi reiniciado, o segmento não serve e um novo backup base é feito.
+
+Na restauração o arquivo é montado ao lado do banco, passa por
+``PRAGMA integrity_check`` e só então substitui o original.
+"""
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+STAMP_FORMAT = '%Y%m%dT%H%M%S%fZ'
+BASE_SUFFIX = '.sqlite3.gz'
+WAL_MAGIC = (b'\x37\x7f\x06\x82', b'\x37\x7f\x06\x83')
+WAL_HEADER_SIZE = 32
+
+
+class BackupError(Exception):
+    pass
+
+
+def sqlite_aliases():
+    """Aliases de DATABASES que usam SQLite em arquivo."""
+    return [
+        alias for alias, config in settings.DATABASES.items()
+        if config['ENGINE'] == 'django.db.backends.sqlite3' and str(config['NAME']) != ':memory:'
+    ]
+
+
+def db_path(alias):
+    return Path(connections[alias].settings_dict['NAME'])
+
+
+def backup_root():
+    return Path(getattr(settings, 'BACKUP_ROOT', Path(settings.BASE_DIR) / 'backups'))
+
+
+def now_stamp():
+    return datetime.now(dt_timezone.utc).strftime(STAMP_FORMAT)
+
+
+def parse_stamp(stamp):
+    return datetime.strptime(stamp, STAMP_FORMAT).replace(tzinfo=dt_timezone.utc)
+
+
+def wal_salt(path):
+    """Salt do cabeçalho do WAL (muda a cada reinício do WAL), ou None."""
+    try:
+        with open(f'{path}-wal', 'rb') as f:
+            header = f.read(WAL_HEADER_SIZE)
+    except FileNotFoundError:
+        return None
+    if len(header) < WAL_HEADER_SIZE or header[:4] not in WAL_MAGIC:
+        return None
+    return header[16:24].hex()
+
+
+def _compress(source, target):
+    """Comprime ``source`` em ``target`` (gzip) em blocos, via arquivo temporário."""
+    partial = target.with_name(target.name + '.partial')
+    with open(source, 'rb') as src, gzip.open(partial, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.replace(partial, target)
+
+
+def _decompress(source, target):
+    with gzip.open(source, 'rb') as src, open(target, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+
+
+def list_backups(alias, root=None):
+    """
+    Backups base de um alias, do mais antigo para o mais novo.
+
+    Returns:
+        Lista de dicts com stamp, path, meta e segments (lista de
+        (stamp, path) dos segmentos de WAL, em ordem)
+    """
+    directory = (root or backup_root()) / alias
+    if not directory.is_dir():
+        return []
+
+    backups = []
+    for path in sorted(directory.glob(f'*{BASE_SUFFIX}')):
+        stamp = path.name[:-len(BASE_SUFFIX)]
+        meta_path = directory / f'{stamp}.json'
+        meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+        segments = [
+            (segment.name[len(stamp) + len('.wal-'):-len('.gz')], segment)
+            for segment in sorted(directory.glob(f'{stamp}.wal-*.gz'))
+        ]
+        backups.append({'stamp': stamp, 'path': path, 'meta': meta, 'segments': segments})
+    return backups
+
+
+def backup_database(path, alias, root=None, pages=1024, sleep=0.005):
+    """
+    Faz o backup base de um banco com a API de backup online.
+
+    Returns:
+        Caminho do arquivo comprimido
+    """
+    directory = (root or backup_root()) / alias
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = now_stamp()
+
+    salt_before = wal_salt(path)
+    source = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    fd, raw = tempfile.mkstemp(suffix='.sqlite3', dir=directory)
+    os.close(fd)
+    try:
+        target = sqlite3.connect(raw)
+        try:
+            source.backup(target, pages=pages, sleep=sleep)
+        finally:
+            target.close()
+        salt_after = wal_salt(path)
+
+        base = directory / f'{stamp}{BASE_SUFFIX}'
+        _compress(raw, base)
+    finally:
+        source.close()
+        os.remove(raw)
+
+    meta = {
+        'alias': alias,
+        'created_at': stamp,
+        # Sem salt estável não dá para aplicar segmentos de WAL a este backup
+        'wal_salt': salt_after if salt_before == salt_after else None,
+    }
+    (directory / f'{stamp}.json').write_text(json.dumps(meta))
+    return base
+
+
+def ship_wal(path, alias, root=None):
+    """
+    Copia o WAL atual como segmento do último backup base.
+
+    Returns:
+        Caminho do segmento, ou None se não houver backup base compatível
+        (sem WAL, WAL reiniciado desde o backup) — nesse caso faça um novo
+        backup base.
+    """
+    backups = list_backups(alias, root)
+    if not backups:
+        return None
+    latest = backups[-1]
+    salt = latest['meta'].get('wal_salt')
+    if salt is None or wal_salt(path) != salt:
+        return None
+
+    stamp = now_stamp()
+    segment = latest['path'].with_name(f"{latest['stamp']}.wal-{stamp}.gz")
+    fd, raw = tempfile.mkstemp(suffix='.wal', dir=segment.parent)
+    os.close(fd)
+    try:
+        shutil.copyfile(f'{path}-wal', raw)
+        # Se o WAL foi reiniciado durante a cópia, ela não vale
+        if wal_salt(path) != salt:
+            return None
+        _compress(raw, segment)
+    finally:
+        os.remove(raw)
+    return segment
+
+
+def rotate(alias, keep, root=None):
+    """
+    Mantém apenas os ``keep`` backups base mais novos (com seus segmentos).
+
+    Returns:
+        Quantidade de backups base removidos
+    """
+    backups = list_backups(alias, root)
+    removed = backups[:-keep] if keep > 0 else []
+    for backup in removed:
+        for _, segment in backup['segments']:
+            segment.unlink()
+        backup['path'].with_name(f"{backup['stamp']}.json").unlink(missing_ok=True)
+        backup['path'].unlink()
+    return len(removed)
+
+
+def select_restore_point(alias, root=None, until=None):
+    """
+    Escolhe o backup base e o segmento mais recentes até ``until``.
+
+    Returns:
+        Tupla (backup, segment_path ou None)
+    """
+    candidates = [
+        backup for backup in list_backups(alias, root)
+        if until is None or parse_stamp(backup['stamp']) <= until
+    ]
+    if not candidates:
+        raise BackupError(f'Nenhum backup de "{alias}" disponível para o instante pedido.')
+    backup = candidates[-1]
+    segments = [
+        segment for stamp, segment in backup['segments']
+        if until is None or parse_stamp(stamp) <= until
+    ]
+    return backup, (segments[-1] if segments else None)
+
+
+def integrity_check(path):
+    connection = sqlite3.connect(path)
+    try:
+        rows = connection.execute('PRAGMA integrity_check').fetchall()
+    finally:
+        connection.close()
+    return [row[0] for row in rows]
+
+
+def prepare_restore(path, base, segment=None):
+    """
+    Monta o banco restaurado ao lado do original e verifica a integridade.
+
+    O segmento de WAL, se houver, é aplicado pelo próprio SQLite ao abrir o
+    arquivo e incorporado com um checkpoint.
+
+    Returns:
+        Caminho do arquivo pronto para substituir o banco
+    """
+    restored = Path(f'{path}.restore')
+    for leftover in (restored, Path(f'{restored}-wal'), Path(f'{restored}-shm')):
+        leftover.unlink(missing_ok=True)
+
+    _decompress(base, restored)
+    try:
+        if segment is not None:
+            _decompress(segment, f'{restored}-wal')
+            connection = sqlite3.connect(restored)
+            try:
+                connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                connection.execute('PRAGMA journal_mode=DELETE')
+            finally:
+                connection.close()
+        result = integrity_check(restored)
+    except sqlite3.DatabaseError as e:
+        result = [str(e)]
+
+    if result != ['ok']:
+        for leftover in (restored, Path(f'{restored}-wal'), Path(f'{restored}-shm')):
+            leftover.unlink(missing_ok=True)
+        raise BackupError(f'integrity_check falhou: {"; ".join(result[:5])}')
+    return restored
+
+
+def swap_in(path, restored):
+    """
+    Substitui o banco pelo arquivo restaurado.
+
+    O WAL e o SHM do banco antigo são removidos antes: se ficassem, o SQLite
+    os aplicaria ao arquivo novo.
+    """
+    connections.close_all()
+    for suffix in ('-wal', '-shm'):
+        Path(f'{path}{suffix}').unlink(missing_ok=True)
+    os.replace(restored, path)
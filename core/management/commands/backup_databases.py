@@ -0,0 +1,80 @@
+"""
+Management Command para backup online dos bancos SQLite.
+
+Usa a API de backup do SQLite em passos, sem bloquear quem está escrevendo,
+comprime o resultado e mantém apenas os BACKUP_KEEP backups mais novos.
+Com --wal, envia apenas o WAL atual como segmento do último backup base
+(restauração em um ponto no tempo); se o WAL foi reiniciado desde então,
+faz um novo backup base.
+
+Uso:
+    python manage.py backup_databases
+    python manage.py backup_databases --database default --keep 14
+    python manage.py backup_databases --wal
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import backup
+
+
+class Command(BaseCommand):
+    help = 'Faz backup online (e comprimido) dos bancos SQLite'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            action='append',
+            dest='databases',
+            help='Alias do banco (pode repetir). Padrão: todos os bancos SQLite',
+        )
+        parser.add_argument(
+            '--keep',
+            type=int,
+            default=getattr(settings, 'BACKUP_KEEP', 7),
+            help='Quantos backups base manter por banco (padrão: BACKUP_KEEP)',
+        )
+        parser.add_argument(
+            '--pages',
+            type=int,
+            default=1024,
+            help='Páginas copiadas por passo do backup online (padrão: 1024)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.005,
+            help='Pausa em segundos entre os passos (padrão: 0.005)',
+        )
+        parser.add_argument(
+            '--wal',
+            action='store_true',
+            help='Envia só o WAL atual como segmento do último backup base',
+        )
+
+    def handle(self, *args, **options):
+        aliases = options['databases'] or backup.sqlite_aliases()
+        unknown = set(aliases) - set(backup.sqlite_aliases())
+        if unknown:
+            raise CommandError(f'Banco(s) SQLite desconhecido(s): {", ".join(sorted(unknown))}')
+
+        for alias in aliases:
+            path = backup.db_path(alias)
+            if not path.exists():
+                self.stdout.write(self.style.WARNING(f'[{alias}] {path} não existe, ignorado.'))
+                continue
+
+            if options['wal']:
+                segment = backup.ship_wal(path, alias)
+                if segment:
+                    self.stdout.write(self.style.SUCCESS(f'[{alias}] Segmento de WAL: {segment}'))
+                    continue
+                self.stdout.write(f'[{alias}] WAL reiniciado ou sem backup base; fazendo backup completo.')
+
+            base = backup.backup_database(path, alias, pages=options['pages'], sleep=options['sleep'])
+            self.stdout.write(self.style.SUCCESS(f'[{alias}] Backup: {base}'))
+
+            removed = backup.rotate(alias, options['keep'])
+            if removed:
+                self.stdout.write(f'[{alias}] {removed} backup(s) antigo(s) removido(s).')
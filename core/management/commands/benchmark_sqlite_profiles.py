@@ -0,0 +1,115 @@
+"""
+Management Command para comparar os perfis de PRAGMA do SQLite.
+
+Para cada perfil, reabre as conexões com os PRAGMAs dele e mede as
+respostas dos endpoints de listagem e resumo de transações (a view é
+chamada diretamente, sem servidor HTTP). Mostra mediana e p95 em ms.
+
+Uso:
+    python manage.py benchmark_sqlite_profiles
+    python manage.py benchmark_sqlite_profiles --iterations 50 --profile read_heavy
+    python manage.py benchmark_sqlite_profiles --username tesoureiro
+"""
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.urls import resolve, reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core import sqlite
+
+ENDPOINTS = (
+    ('transaction-list', {}),
+    ('transaction-summary', {}),
+)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, round(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = 'Mede os endpoints de transações sob cada perfil de PRAGMA do SQLite'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Requisições medidas por endpoint e perfil (padrão: 20)',
+        )
+        parser.add_argument(
+            '--profile',
+            action='append',
+            dest='profiles',
+            help='Perfil a medir (pode repetir). Padrão: todos',
+        )
+        parser.add_argument(
+            '--username',
+            help='Usuário autenticado nas requisições (padrão: primeiro superusuário)',
+        )
+
+    def handle(self, *args, **options):
+        profiles = options['profiles'] or list(sqlite.get_profiles())
+        unknown = set(profiles) - set(sqlite.get_profiles())
+        if unknown:
+            raise CommandError(f'Perfil(is) desconhecido(s): {", ".join(sorted(unknown))}')
+
+        user = self._get_user(options['username'])
+        aliases = [alias for alias in connections if connections[alias].vendor == 'sqlite']
+        factory = APIRequestFactory()
+
+        self.stdout.write(f'{"perfil":<14}{"endpoint":<34}{"mediana":>10}{"p95":>10}')
+        try:
+            for name in profiles:
+                for alias in aliases:
+                    sqlite.profile_overrides[alias] = name
+                # Conexões novas recebem o perfil no connection_created
+                connections.close_all()
+
+                for url_name, params in ENDPOINTS:
+                    timings = self._measure(factory, user, url_name, params, options['iterations'])
+                    label = url_name + (f' {params}' if params else '')
+                    self.stdout.write(
+                        f'{name:<14}{label:<34}'
+                        f'{statistics.median(timings):>8.2f}ms{percentile(timings, 95):>8.2f}ms'
+                    )
+        finally:
+            for alias in aliases:
+                sqlite.profile_overrides.pop(alias, None)
+            connections.close_all()
+
+    def _get_user(self, username):
+        User = get_user_model()
+        if username:
+            user = User.objects.filter(username=username).first()
+        else:
+            user = User.objects.filter(is_superuser=True).order_by('pk').first()
+        if user is None:
+            raise CommandError('Usuário não encontrado. Informe --username.')
+        return user
+
+    def _measure(self, factory, user, url_name, params, iterations):
+        path = reverse(f'treasury-api:{url_name}')
+        match = resolve(path)
+
+        def call():
+            request = factory.get(path, params)
+            force_authenticate(request, user=user)
+            response = match.func(request, *match.args, **match.kwargs)
+            response.render()
+            return response
+
+        # Primeira chamada aquece o cache de páginas do SQLite
+        call()
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            call()
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
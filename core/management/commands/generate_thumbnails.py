@@ -0,0 +1,76 @@
+"""
+Management Command para gerar as miniaturas que faltam.
+
+Percorre os arquivos de comprovantes e partituras e gera, de forma
+síncrona, as miniaturas WebP ausentes. Serve de backfill para arquivos
+enviados antes das miniaturas e de nova tentativa para gerações perdidas
+(restart do processo, erro no worker). Arquivos que já têm todas as
+larguras são pulados sem abrir o original.
+
+Uso:
+    python manage.py generate_thumbnails
+    python manage.py generate_thumbnails --dry-run
+    python manage.py generate_thumbnails --source treasury.TransactionModel.acquittance_doc
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from core import thumbnails
+
+SOURCES = (
+    'treasury.TransactionModel.acquittance_doc',
+    'worship.SongFile.file',
+)
+
+
+class Command(BaseCommand):
+    help = 'Gera as miniaturas WebP que faltam de comprovantes e partituras'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source', action='append', choices=SOURCES,
+            help='Campo a processar (pode repetir; padrão: todos)',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Apenas conta os arquivos sem miniaturas',
+        )
+
+    def handle(self, *args, **options):
+        totals = {'generated': 0, 'skipped': 0, 'failed': 0}
+        for source in options['source'] or SOURCES:
+            app_label, model_name, field_name = source.split('.')
+            try:
+                model = apps.get_model(app_label, model_name)
+            except LookupError:
+                raise CommandError(f'Modelo não encontrado: {app_label}.{model_name}')
+            storage = model._meta.get_field(field_name).storage
+
+            names = (
+                model.objects.exclude(**{field_name: ''})
+                .exclude(**{f'{field_name}__isnull': True})
+                .order_by().values_list(field_name, flat=True).distinct()
+            )
+            for name in names.iterator():
+                if not thumbnails.supports(name) or self._complete(name, storage):
+                    totals['skipped'] += 1
+                    continue
+                if options['dry_run']:
+                    self.stdout.write(f'  sem miniaturas: {name}')
+                    totals['generated'] += 1
+                    continue
+                try:
+                    thumbnails.generate_derivatives(name, storage)
+                    totals['generated'] += 1
+                except Exception as exc:
+                    totals['failed'] += 1
+                    self.stderr.write(f'  erro em {name}: {exc}')
+
+        label = 'A gerar' if options['dry_run'] else 'Geradas'
+        self.stdout.write(self.style.SUCCESS(
+            f"{label}: {totals['generated']} | já prontas/ignoradas: {totals['skipped']} "
+            f"| falhas: {totals['failed']}"
+        ))
+
+    def _complete(self, name, storage):
+        return len(thumbnails.available_widths(name, storage)) == len(thumbnails.get_widths())
@@ -0,0 +1,84 @@
+"""
+Management Command para restaurar um banco SQLite a partir dos backups.
+
+Escolhe o backup base mais recente (ou o mais recente até --until) e o
+último segmento de WAL dele, monta o banco ao lado do original, roda
+PRAGMA integrity_check e só então troca os arquivos. Antes da troca é feito
+um backup do estado atual.
+
+Pare a aplicação antes de restaurar: a troca remove o WAL do banco antigo.
+
+Uso:
+    python manage.py restore_databases --database default
+    python manage.py restore_databases --database default --until 2025-03-10T18:30
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core import backup
+
+
+class Command(BaseCommand):
+    help = 'Restaura um banco SQLite a partir dos backups (com integrity_check)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Alias do banco a restaurar (padrão: default)',
+        )
+        parser.add_argument(
+            '--until',
+            help='Restaura o estado mais recente até este instante (AAAA-MM-DDTHH:MM, horário local)',
+        )
+        parser.add_argument(
+            '--noinput',
+            '--no-input',
+            action='store_false',
+            dest='interactive',
+            help='Não pede confirmação',
+        )
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        if alias not in backup.sqlite_aliases():
+            raise CommandError(f'Banco SQLite desconhecido: {alias}')
+
+        until = None
+        if options['until']:
+            until = parse_datetime(options['until'])
+            if until is None:
+                raise CommandError(f'Data inválida: {options["until"]}. Use AAAA-MM-DDTHH:MM')
+            if timezone.is_naive(until):
+                until = timezone.make_aware(until)
+
+        try:
+            base, segment = backup.select_restore_point(alias, until=until)
+        except backup.BackupError as e:
+            raise CommandError(str(e))
+
+        path = backup.db_path(alias)
+        self.stdout.write(f'Backup base: {base["path"]}')
+        if segment:
+            self.stdout.write(f'Segmento de WAL: {segment}')
+
+        if options['interactive']:
+            answer = input(f'Substituir {path}? A aplicação deve estar parada. [s/N] ')
+            if answer.strip().lower() not in ('s', 'sim', 'y', 'yes'):
+                self.stdout.write('Cancelado.')
+                return
+
+        try:
+            restored = backup.prepare_restore(path, base['path'], segment)
+        except backup.BackupError as e:
+            raise CommandError(f'Restauração abortada, banco atual mantido: {e}')
+        self.stdout.write(self.style.SUCCESS('integrity_check: ok'))
+
+        if path.exists():
+            safety = backup.backup_database(path, alias)
+            self.stdout.write(f'Estado atual salvo em: {safety}')
+
+        backup.swap_in(path, restored)
+        self.stdout.write(self.style.SUCCESS(f'{path} restaurado.'))
@@ -0,0 +1,187 @@
+"""
+Entrega de arquivos protegidos com GET condicional e intervalos de bytes.
+
+``serve_file`` responde a partir de qualquer storage do Django:
+
+- ETag forte (o hash já guardado do arquivo quando existe, senão derivado de
+  nome, tamanho e data) e Last-Modified, com 304/412 para requisições
+  condicionais;
+- ``Range: bytes=...`` (um intervalo) com 206/416, respeitando ``If-Range``;
+  no S3 só o intervalo pedido é baixado do bucket;
+- com ``PROTECTED_MEDIA_SENDFILE`` = ``'x-accel-redirect'`` (nginx) ou
+  ``'x-sendfile'`` (Apache) e storage local, o servidor web entrega o
+  arquivo (e trata os intervalos) depois da verificação de permissão.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+
+CHUNK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# Só o original ("<hash>.pdf"); miniaturas ("<hash>.pdf.w320.webp") têm outro conteúdo
+_SHA256_NAME_RE = re.compile(r'(?:^|/)([0-9a-f]{64})(?:\.[^./]*)?$')
+
+
+def parse_range(header, size):
+    """
+    Intervalo pedido em ``Range`` como (início, fim) inclusivos.
+
+    Returns:
+        Tupla (início, fim); None para servir o arquivo inteiro (sem Range,
+        formato desconhecido ou vários intervalos); ``False`` se o intervalo
+        não puder ser atendido (416)
+    """
+    match = _RANGE_RE.match((header or '').strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Sufixo: os últimos N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def file_etag(name, size, modified=None, stored_hash=None):
+    """ETag forte: o hash do conteúdo quando conhecido."""
+    if not stored_hash:
+        match = _SHA256_NAME_RE.search(name)
+        stored_hash = match.group(1) if match else None
+    if not stored_hash:
+        stamp = modified.timestamp() if modified else ''
+        stored_hash = hashlib.sha256(f'{name}:{size}:{stamp}'.encode()).hexdigest()[:32]
+    return f'"{stored_hash}"'
+
+
+def _modified_time(storage, name):
+    try:
+        return storage.get_modified_time(name)
+    except (NotImplementedError, AttributeError):
+        return None
+
+
+def _local_path(storage, name):
+    try:
+        return storage.path(name)
+    except NotImplementedError:
+        return None
+
+
+def _if_range_matches(request, etag, modified):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and modified is not None and int(modified.timestamp()) <= since
+
+
+def _iter_range(storage, name, start, end):
+    """Lê só o intervalo pedido, em blocos."""
+    bucket = getattr(storage, 'bucket', None)
+    if bucket is not None:
+        # S3: GET com Range, sem baixar o objeto inteiro
+        key = storage._normalize_name(name)
+        body = bucket.Object(key).get(Range=f'bytes={start}-{end}')['Body']
+        yield from body.iter_chunks(CHUNK_SIZE)
+        return
+
+    with storage.open(name, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def serve_file(request, field_file, stored_hash=None, as_attachment=False):
+    """
+    Resposta para um FieldFile já autorizado.
+
+    Args:
+        request: Requisição (GET ou HEAD)
+        field_file: Arquivo a entregar
+        stored_hash: Hash do conteúdo já conhecido (ex.: FrozenReport.pdf_hash)
+        as_attachment: Content-Disposition attachment em vez de inline
+    """
+    storage, name = field_file.storage, field_file.name
+    size = storage.size(name)
+    modified = _modified_time(storage, name)
+    etag = file_etag(name, size, modified, stored_hash)
+    last_modified = int(modified.timestamp()) if modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _file_response(request, storage, name, size, etag, modified)
+
+    response['ETag'] = etag
+    if modified:
+        response['Last-Modified'] = http_date(last_modified)
+    if response.status_code < 300:
+        filename = os.path.basename(name)
+        disposition = 'attachment' if as_attachment else 'inline'
+        response['Content-Disposition'] = f"{disposition}; filename*=UTF-8''{quote(filename)}"
+    patch_cache_control(
+        response, private=True, max_age=getattr(settings, 'PROTECTED_MEDIA_MAX_AGE', 60 * 60),
+    )
+    return response
+
+
+def _file_response(request, storage, name, size, etag, modified):
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+    sendfile = getattr(settings, 'PROTECTED_MEDIA_SENDFILE', '')
+    path = _local_path(storage, name) if sendfile else None
+    if path:
+        # O servidor web entrega o arquivo (inclusive intervalos)
+        response = HttpResponse(content_type=content_type)
+        if sendfile == 'x-accel-redirect':
+            prefix = getattr(settings, 'PROTECTED_MEDIA_ACCEL_PREFIX', '/protected-media/')
+            response['X-Accel-Redirect'] = quote(prefix.rstrip('/') + '/' + name)
+        else:
+            response['X-Sendfile'] = path
+        return response
+
+    byte_range = None
+    if _if_range_matches(request, etag, modified):
+        byte_range = parse_range(request.headers.get('Range'), size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        if request.method == 'HEAD':
+            response = HttpResponse(content_type=content_type)
+        else:
+            response = FileResponse(storage.open(name, 'rb'), content_type=content_type)
+        response['Content-Length'] = size
+    else:
+        start, end = byte_range
+        body = () if request.method == 'HEAD' else _iter_range(storage, name, start, end)
+        response = StreamingHttpResponse(body, status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+    response['Accept-Ranges'] = 'bytes'
+    return response
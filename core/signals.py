@@ -0,0 +1,16 @@
+from django.core.signals import request_finished
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from core import sqlite
+
+
+@receiver(connection_created)
+def apply_sqlite_profile(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        sqlite.apply_profile(connection)
+
+
+@receiver(request_finished)
+def optimize_sqlite(sender, **kwargs):
+    sqlite.optimize_if_due()
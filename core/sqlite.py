@@ -0,0 +1,120 @@
+"""
+Ajuste das conexões SQLite.
+
+Cada conexão nova recebe os PRAGMAs do perfil configurado para o seu alias
+(``SQLITE_PROFILE_BY_ALIAS``), aplicados pelo sinal ``connection_created``
+(ver ``core.signals``). Os perfis padrão podem ser sobrescritos em
+``SQLITE_PROFILES``. ``PRAGMA optimize`` roda no fim de uma requisição no
+máximo uma vez a cada ``SQLITE_OPTIMIZE_INTERVAL`` segundos por alias.
+"""
+import time
+
+from django.conf import settings
+from django.db import connections
+
+DEFAULT_PROFILES = {
+    # Muitas leituras (páginas, relatórios): cache e mmap maiores
+    'read_heavy': {
+        'journal_mode': 'wal',
+        'synchronous': 'normal',
+        'busy_timeout': 5000,
+        'foreign_keys': 'on',
+        'temp_store': 'memory',
+        'cache_size': -65536,  # KiB (64 MiB)
+        'mmap_size': 268435456,  # 256 MiB
+    },
+    # Muitas escritas (importações, auditoria): checkpoints menos frequentes
+    'write_heavy': {
+        'journal_mode': 'wal',
+        'synchronous': 'normal',
+        'busy_timeout': 10000,
+        'foreign_keys': 'on',
+        'temp_store': 'memory',
+        'cache_size': -16384,  # KiB (16 MiB)
+        'mmap_size': 0,
+        'wal_autocheckpoint': 4000,
+    },
+}
+DEFAULT_PROFILE = 'read_heavy'
+
+# Perfil forçado por alias (usado pelo benchmark_sqlite_profiles)
+profile_overrides = {}
+
+_last_optimize = {}
+
+
+def get_profiles():
+    return {**DEFAULT_PROFILES, **getattr(settings, 'SQLITE_PROFILES', {})}
+
+
+def profile_name(alias):
+    if alias in profile_overrides:
+        return profile_overrides[alias]
+    return getattr(settings, 'SQLITE_PROFILE_BY_ALIAS', {}).get(alias, DEFAULT_PROFILE)
+
+
+def apply_profile(connection):
+    """Aplica os PRAGMAs do perfil do alias a uma conexão SQLite recém-aberta."""
+    pragmas = get_profiles()[profile_name(connection.alias)]
+    in_memory = connection.is_in_memory_db()
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            # Bancos em memória não têm WAL nem arquivo para mapear
+            if in_memory and name in ('journal_mode', 'mmap_size'):
+                continue
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def optimize_if_due(now=None):
+    """
+    Roda ``PRAGMA optimize`` nas conexões SQLite abertas cujo último
+    optimize passou de ``SQLITE_OPTIMIZE_INTERVAL``.
+
+    Returns:
+        Aliases otimizados
+    """
+    interval = getattr(settings, 'SQLITE_OPTIMIZE_INTERVAL', 60 * 60)
+    now = now or time.monotonic()
+    optimized = []
+    for connection in connections.all(initialized_only=True):
+        if connection.vendor != 'sqlite' or connection.connection is None:
+            continue
+        last = _last_optimize.setdefault(connection.alias, now)
+        if now - last < interval:
+            continue
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA optimize')
+        _last_optimize[connection.alias] = now
+        optimized.append(connection.alias)
+    return optimized
+
+
+def effective_settings(aliases=None):
+    """
+    Valores efetivos dos PRAGMAs nos bancos SQLite (todos, ou ``aliases``).
+
+    Returns:
+        Lista de dicts com alias, profile, conn_max_age, sqlite_version e pragmas
+    """
+    result = []
+    for alias in aliases or settings.DATABASES:
+        connection = connections[alias]
+        if connection.vendor != 'sqlite':
+            continue
+        name = profile_name(alias)
+        with connection.cursor() as cursor:
+            pragmas = {}
+            for pragma in get_profiles()[name]:
+                cursor.execute(f'PRAGMA {pragma}')
+                row = cursor.fetchone()
+                pragmas[pragma] = row[0] if row else None
+            cursor.execute('SELECT sqlite_version()')
+            version = cursor.fetchone()[0]
+        result.append({
+            'alias': alias,
+            'profile': name,
+            'conn_max_age': connection.settings_dict.get('CONN_MAX_AGE'),
+            'sqlite_version': version,
+            'pragmas': pragmas,
+        })
+    return result
@@ -0,0 +1,24 @@
+from django import template
+
+from core.thumbnails import thumbnail_url as _thumbnail_url
+from core.views.protected_media_view import protected_thumbnail_url as _protected_thumbnail_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def thumbnail_url(field_file, width=320):
+    """
+    URL da menor miniatura WebP adequada para exibir o arquivo com ``width`` px.
+    Ex: {% thumbnail_url transaction.acquittance_doc 320 %}
+    """
+    return _thumbnail_url(field_file, int(width))
+
+
+@register.simple_tag
+def protected_thumbnail_url(kind, obj, width=320):
+    """
+    URL protegida (core:protected-media) da miniatura de um arquivo privado.
+    Ex: {% protected_thumbnail_url 'receipt' transaction 320 %}
+    """
+    return _protected_thumbnail_url(kind, obj, int(width))
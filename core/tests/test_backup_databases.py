@@ -0,0 +1,131 @@
+import gzip
+import shutil
+import sqlite3
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+from core import backup
+
+
+class SQLiteBackupTests(SimpleTestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.root = self.tmp / 'backups'
+        self.path = self.tmp / 'db.sqlite3'
+
+        # Escritor em WAL sem checkpoint automático, como um processo da aplicação
+        self.writer = sqlite3.connect(self.path, isolation_level=None)
+        self.addCleanup(self.writer.close)
+        self.writer.execute('PRAGMA journal_mode=WAL')
+        self.writer.execute('PRAGMA wal_autocheckpoint=0')
+        self.writer.execute('CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT)')
+        self.insert('primeiro')
+
+    def insert(self, name):
+        self.writer.execute('INSERT INTO item (name) VALUES (?)', (name,))
+
+    def names(self, path):
+        connection = sqlite3.connect(path)
+        try:
+            return [row[0] for row in connection.execute('SELECT name FROM item ORDER BY id')]
+        finally:
+            connection.close()
+
+    def restore(self, base, segment=None):
+        target = self.tmp / 'restored.sqlite3'
+        restored = backup.prepare_restore(target, base, segment)
+        backup.swap_in(target, restored)
+        return target
+
+    def test_backup_is_compressed_and_consistent(self):
+        base = backup.backup_database(self.path, 'default', root=self.root, pages=1)
+
+        with gzip.open(base, 'rb') as f:
+            self.assertTrue(f.read(16).startswith(b'SQLite format 3'))
+        self.assertEqual(self.names(self.restore(base)), ['primeiro'])
+
+    def test_wal_segment_restores_later_writes(self):
+        base = backup.backup_database(self.path, 'default', root=self.root)
+        self.insert('segundo')
+        segment = backup.ship_wal(self.path, 'default', root=self.root)
+
+        self.assertIsNotNone(segment)
+        self.assertEqual(self.names(self.restore(base, segment)), ['primeiro', 'segundo'])
+
+    def test_wal_restart_requires_new_base(self):
+        backup.backup_database(self.path, 'default', root=self.root)
+        self.writer.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        self.insert('segundo')
+
+        self.assertIsNone(backup.ship_wal(self.path, 'default', root=self.root))
+
+    def test_select_restore_point_until(self):
+        backup.backup_database(self.path, 'default', root=self.root)
+        time.sleep(0.01)
+        middle = timezone.now()
+        time.sleep(0.01)
+        self.insert('segundo')
+        backup.ship_wal(self.path, 'default', root=self.root)
+
+        base, segment = backup.select_restore_point('default', root=self.root, until=middle)
+        self.assertIsNone(segment)
+        self.assertEqual(self.names(self.restore(base['path'])), ['primeiro'])
+
+        with self.assertRaises(backup.BackupError):
+            backup.select_restore_point('default', root=self.root, until=middle.replace(year=2000))
+
+    def test_rotation_keeps_newest(self):
+        stamps = []
+        for _ in range(3):
+            stamps.append(backup.backup_database(self.path, 'default', root=self.root))
+            time.sleep(0.001)
+        backup.ship_wal(self.path, 'default', root=self.root)
+
+        self.assertEqual(backup.rotate('default', 2, root=self.root), 1)
+        self.assertEqual([b['path'] for b in backup.list_backups('default', self.root)], stamps[1:])
+
+    def test_corrupted_backup_is_not_swapped_in(self):
+        base = self.root / 'default' / f'{backup.now_stamp()}{backup.BASE_SUFFIX}'
+        base.parent.mkdir(parents=True)
+        raw = self.path.read_bytes()
+        with gzip.open(base, 'wb') as f:
+            f.write(raw[:100] + b'\xff' * (len(raw) - 100))
+
+        with self.assertRaises(backup.BackupError):
+            backup.prepare_restore(self.tmp / 'restored.sqlite3', base)
+        self.assertFalse((self.tmp / 'restored.sqlite3').exists())
+
+    def test_commands(self):
+        with override_settings(BACKUP_ROOT=self.root), \
+                mock.patch.object(backup, 'db_path', return_value=self.path):
+            call_command('backup_databases', '--database', 'default', stdout=StringIO())
+            self.insert('segundo')
+            call_command('backup_databases', '--database', 'default', '--wal', stdout=StringIO())
+
+            backups = backup.list_backups('default')
+            self.assertEqual(len(backups), 1)
+            self.assertEqual(len(backups[0]['segments']), 1)
+
+            self.insert('terceiro')
+            out = StringIO()
+            call_command('restore_databases', '--database', 'default', '--noinput', stdout=out)
+            self.assertIn('integrity_check: ok', out.getvalue())
+
+        self.writer.close()
+        self.assertEqual(self.names(self.path), ['primeiro', 'segundo'])
+        # O estado anterior à restauração também foi salvo
+        self.assertEqual(len(backup.list_backups('default', self.root)), 2)
+
+    def test_unknown_database(self):
+        with self.assertRaises(CommandError):
+            call_command('backup_databases', '--database', 'nope', stdout=StringIO())
@@ -0,0 +1,172 @@
+import hashlib
+import shutil
+import tempfile
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core import thumbnails
+from core.media import file_etag, parse_range
+from core.tests.test_thumbnails import image_bytes
+from core.views.protected_media_view import protected_thumbnail_url
+from treasury.models import AccountingPeriod, TransactionModel
+from users.models import CustomUser
+
+CONTENT = b'0123456789abcdef'
+
+
+class RangeParsingTests(SimpleTestCase):
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range('bytes=2-5', 16), (2, 5))
+        self.assertEqual(parse_range('bytes=10-', 16), (10, 15))
+        self.assertEqual(parse_range('bytes=-4', 16), (12, 15))
+        self.assertEqual(parse_range('bytes=5-100', 16), (5, 15))
+        self.assertIsNone(parse_range(None, 16))
+        self.assertIsNone(parse_range('bytes=0-1,4-5', 16))
+        self.assertFalse(parse_range('bytes=16-', 16))
+        self.assertFalse(parse_range('bytes=6-2', 16))
+
+    def test_etag_prefers_stored_hash(self):
+        digest = 'a' * 64
+        self.assertEqual(file_etag('frozen_reports/2024/01/x.pdf', 10, stored_hash='abc'), '"abc"')
+        self.assertEqual(file_etag(f'treasury/receipts/sha256/aa/{digest}.pdf', 10), f'"{digest}"')
+
+
+class ProtectedMediaViewTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = CustomUser.objects.create_user(
+            username='member',
+            email='member@test.com',
+            password='testpass123',
+            type=CustomUser.Types.REGULAR,
+        )
+        period = AccountingPeriod.objects.create(
+            month=date(2024, 1, 1), opening_balance=Decimal('0.00'), status='open',
+        )
+        self.transaction = TransactionModel.objects.create(
+            user=self.user,
+            description='Energia',
+            amount=Decimal('10.00'),
+            is_positive=False,
+            date=date(2024, 1, 5),
+            accounting_period=period,
+            acquittance_doc=ContentFile(CONTENT, name='boleto.pdf'),
+        )
+        self.url = reverse('core:protected-media', args=['receipt', self.transaction.pk])
+        self.etag = f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+        self.client.force_login(self.user)
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_full_response_with_validators(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), CONTENT)
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('Last-Modified', response)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_if_none_match_returns_304(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], self.etag)
+
+    def test_byte_range(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=2-5')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self.body(response), b'2345')
+        self.assertEqual(response['Content-Range'], f'bytes 2-5/{len(CONTENT)}')
+        self.assertEqual(response['Content-Length'], '4')
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=100-')
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(CONTENT)}')
+
+    def test_stale_if_range_sends_whole_file(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE='"outro"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), CONTENT)
+
+    def test_download_disposition(self):
+        response = self.client.get(self.url, {'download': '1'})
+        self.assertTrue(response['Content-Disposition'].startswith('attachment;'))
+
+    @override_settings(PROTECTED_MEDIA_SENDFILE='x-accel-redirect', PROTECTED_MEDIA_ACCEL_PREFIX='/internal/')
+    def test_x_accel_redirect(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], f'/internal/{self.transaction.acquittance_doc.name}')
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], self.etag)
+
+    def test_permissions(self):
+        outsider = CustomUser.objects.create_user(
+            username='outsider',
+            email='outsider@test.com',
+            password='testpass123',
+            type=CustomUser.Types.SIMPLE_USER,
+        )
+        self.client.force_login(outsider)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    def test_unknown_kind(self):
+        url = reverse('core:protected-media', args=['nope', self.transaction.pk])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_thumbnail_is_served_through_the_view(self):
+        cache.clear()
+        self.transaction.acquittance_doc.save('boleto.jpg', ContentFile(image_bytes()))
+        doc = self.transaction.acquittance_doc
+        self.assertEqual(protected_thumbnail_url('receipt', self.transaction, 320), self.url)
+
+        thumbnails.generate_derivatives(doc.name, doc.storage)
+        url = protected_thumbnail_url('receipt', self.transaction, 1000)
+        self.assertEqual(url, f'{self.url}?w=1024')
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertIn('private', response['Cache-Control'])
+        self.assertNotEqual(response['ETag'], self.client.get(self.url)['ETag'])
+
+        self.assertEqual(self.client.get(self.url, {'w': '500'}).status_code, 404)
+        self.assertEqual(self.client.get(self.url, {'w': 'x'}).status_code, 404)
+
+        outsider = CustomUser.objects.create_user(
+            username='outsider',
+            email='outsider@test.com',
+            password='testpass123',
+            type=CustomUser.Types.SIMPLE_USER,
+        )
+        self.client.force_login(outsider)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_thumbnails_only_for_enabled_kinds(self):
+        url = reverse('core:protected-media', args=['frozen-report', uuid.uuid4()])
+        self.assertEqual(self.client.get(url, {'w': '320'}).status_code, 404)
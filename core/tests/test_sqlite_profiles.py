@@ -0,0 +1,93 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from core import sqlite
+from treasury.services.diagnosis_service import DiagnosisService
+from users.models import CustomUser
+
+
+def pragma(alias, name):
+    with connections[alias].cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+class SQLiteProfileTests(TestCase):
+    databases = {'default', 'audit'}
+
+    def test_profile_applied_per_alias(self):
+        self.assertEqual(pragma('default', 'cache_size'), -65536)
+        self.assertEqual(pragma('default', 'temp_store'), 2)
+        self.assertEqual(pragma('default', 'foreign_keys'), 1)
+        self.assertEqual(pragma('audit', 'cache_size'), -16384)
+        self.assertEqual(pragma('audit', 'wal_autocheckpoint'), 4000)
+
+    @override_settings(SQLITE_OPTIMIZE_INTERVAL=60)
+    def test_optimize_runs_once_per_interval(self):
+        connections['default'].ensure_connection()
+        with mock.patch.dict(sqlite._last_optimize, clear=True):
+            self.assertEqual(sqlite.optimize_if_due(now=1000), [])
+            self.assertEqual(sqlite.optimize_if_due(now=1030), [])
+            self.assertIn('default', sqlite.optimize_if_due(now=1061))
+            self.assertEqual(sqlite.optimize_if_due(now=1062), [])
+
+    def test_diagnosis_exposes_effective_settings(self):
+        database = DiagnosisService().build_report()['database']
+
+        self.assertEqual([db['alias'] for db in database], ['default'])
+        self.assertEqual(database[0]['profile'], 'read_heavy')
+        self.assertEqual(database[0]['pragmas']['cache_size'], -65536)
+        self.assertIn('sqlite_version', database[0])
+
+        audit = sqlite.effective_settings(['audit'])[0]
+        self.assertEqual(audit['profile'], 'write_heavy')
+        self.assertEqual(audit['pragmas']['wal_autocheckpoint'], 4000)
+
+
+class SQLiteProfileSwitchTests(TransactionTestCase):
+    """Os PRAGMAs valem para conexões novas; aqui a conexão é reaberta."""
+    databases = {'default', 'audit'}
+
+    def reconnect(self):
+        connections['default'].close()
+        connections['default'].ensure_connection()
+
+    def tearDown(self):
+        self.reconnect()
+
+    def test_override_applies_on_new_connection(self):
+        with mock.patch.dict(sqlite.profile_overrides, {'default': 'write_heavy'}):
+            self.reconnect()
+            self.assertEqual(pragma('default', 'busy_timeout'), 10000)
+        self.reconnect()
+        self.assertEqual(pragma('default', 'busy_timeout'), 5000)
+
+    @override_settings(SQLITE_PROFILES={'read_heavy': {'cache_size': -1000}})
+    def test_profiles_can_be_overridden_in_settings(self):
+        self.reconnect()
+        self.assertEqual(pragma('default', 'cache_size'), -1000)
+        default = [db for db in sqlite.effective_settings() if db['alias'] == 'default'][0]
+        self.assertEqual(list(default['pragmas']), ['cache_size'])
+
+
+class BenchmarkCommandTests(TransactionTestCase):
+
+    def test_benchmark_reports_each_profile(self):
+        CustomUser.objects.create_superuser(username='admin', email='a@a.com', password='x')
+        out = StringIO()
+
+        call_command('benchmark_sqlite_profiles', '--iterations', '2', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 1 + 2 * len(sqlite.DEFAULT_PROFILES))
+        self.assertTrue(any(line.startswith('write_heavy') and 'transaction-summary' in line for line in lines))
+        self.assertEqual(sqlite.profile_overrides, {})
+
+    def test_unknown_profile(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_sqlite_profiles', '--profile', 'nope', stdout=StringIO())
@@ -0,0 +1,171 @@
+import io
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from django.template import Context, Template
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from core import thumbnails
+
+
+def image_bytes(size=(2000, 1000), fmt='JPEG'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+class ThumbnailTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.storage = FileSystemStorage(location=self.tmp, base_url='/media/')
+        self.field = models.FileField(storage=self.storage)
+
+    def upload(self, name, content):
+        name = self.storage.save(name, ContentFile(content))
+        return FieldFile(None, self.field, name)
+
+    def test_generates_webp_for_each_width(self):
+        original = self.upload('receipts/boleto.jpg', image_bytes())
+
+        self.assertEqual(thumbnails.generate_derivatives(original.name, self.storage), (320, 1024))
+
+        for width in (320, 1024):
+            with self.storage.open(thumbnails.derivative_name(original.name, width)) as f:
+                image = Image.open(f)
+                self.assertEqual(image.format, 'WEBP')
+                self.assertEqual(image.size, (width, width // 2))
+        small = self.storage.size(thumbnails.derivative_name(original.name, 320))
+        self.assertLess(small, self.storage.size(original.name))
+
+    def test_small_images_are_not_upscaled(self):
+        original = self.upload('song_files/partitura.png', image_bytes((200, 300), 'PNG'))
+        thumbnails.generate_derivatives(original.name, self.storage)
+
+        with self.storage.open(thumbnails.derivative_name(original.name, 1024)) as f:
+            self.assertEqual(Image.open(f).size, (200, 300))
+
+    def test_url_picks_smallest_adequate_rendition(self):
+        original = self.upload('receipts/boleto.jpg', image_bytes())
+        self.assertEqual(thumbnails.thumbnail_url(original, 320), original.url)
+        self.assertEqual(thumbnails.thumbnail_url(original, 320, fallback=False), '')
+
+        thumbnails.generate_derivatives(original.name, self.storage)
+
+        self.assertTrue(thumbnails.thumbnail_url(original, 300).endswith('.jpg.w320.webp'))
+        self.assertTrue(thumbnails.thumbnail_url(original, 500).endswith('.jpg.w1024.webp'))
+        self.assertTrue(thumbnails.thumbnail_url(original, 4000).endswith('.jpg.w1024.webp'))
+
+    def test_available_widths_are_cached(self):
+        original = self.upload('receipts/boleto.jpg', image_bytes())
+        thumbnails.generate_derivatives(original.name, self.storage)
+
+        with mock.patch.object(self.storage, 'exists') as exists:
+            thumbnails.thumbnail_url(original, 320)
+        exists.assert_not_called()
+
+    def test_template_tag(self):
+        original = self.upload('receipts/boleto.jpg', image_bytes())
+        thumbnails.generate_derivatives(original.name, self.storage)
+
+        rendered = Template('{% load thumbnails %}{% thumbnail_url doc 320 %}').render(Context({'doc': original}))
+        self.assertEqual(rendered, self.storage.url(thumbnails.derivative_name(original.name, 320)))
+
+    @override_settings(THUMBNAIL_GENERATION='async')
+    def test_scheduled_after_commit_for_supported_files(self):
+        with mock.patch.object(thumbnails._executor, 'submit') as submit:
+            with self.captureOnCommitCallbacks(execute=True):
+                thumbnails.schedule_derivatives('receipts/boleto.pdf', self.storage)
+                thumbnails.schedule_derivatives('song_files/hino.mp3', self.storage)
+                submit.assert_not_called()
+
+        submit.assert_called_once_with(thumbnails._run, 'receipts/boleto.pdf', self.storage)
+
+    @override_settings(THUMBNAIL_GENERATION='sync')
+    def test_sync_generation_runs_on_commit(self):
+        original = self.upload('receipts/boleto.jpg', image_bytes())
+
+        with mock.patch.object(thumbnails._executor, 'submit') as submit:
+            with self.captureOnCommitCallbacks(execute=True):
+                thumbnails.schedule_derivatives(original.name, self.storage)
+
+        submit.assert_not_called()
+        self.assertEqual(thumbnails.available_widths(original.name, self.storage), (320, 1024))
+
+    def test_generation_can_be_disabled(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            thumbnails.schedule_derivatives('receipts/boleto.jpg', self.storage)
+        self.assertEqual(callbacks, [])
+
+    def test_delete_derivatives(self):
+        original = self.upload('receipts/boleto.jpg', image_bytes())
+        thumbnails.generate_derivatives(original.name, self.storage)
+
+        thumbnails.delete_derivatives(original.name, self.storage)
+
+        self.assertFalse(self.storage.exists(thumbnails.derivative_name(original.name, 320)))
+        self.assertEqual(thumbnails.thumbnail_url(original, 320), original.url)
+
+    @unittest.skipUnless(shutil.which('pdftoppm'), 'poppler não instalado')
+    def test_pdf_first_page_preview(self):
+        original = self.upload('receipts/boleto.pdf', image_bytes(fmt='PDF'))
+
+        thumbnails.generate_derivatives(original.name, self.storage)
+
+        with self.storage.open(thumbnails.derivative_name(original.name, 320)) as f:
+            self.assertEqual(Image.open(f).size[0], 320)
+
+
+class GenerateThumbnailsCommandTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_backfills_missing_thumbnails(self):
+        from datetime import date
+        from decimal import Decimal
+
+        from treasury.models import AccountingPeriod, TransactionModel
+        from users.models import CustomUser
+
+        user = CustomUser.objects.create_user(username='treasurer', email='t@test.com', password='x')
+        period = AccountingPeriod.objects.create(
+            month=date(2024, 1, 1), opening_balance=Decimal('0.00'), status='open',
+        )
+        transaction = TransactionModel.objects.create(
+            user=user, description='Energia', amount=Decimal('10.00'), is_positive=False,
+            date=date(2024, 1, 5), accounting_period=period,
+            acquittance_doc=ContentFile(image_bytes(), name='boleto.jpg'),
+        )
+        doc = transaction.acquittance_doc
+        self.assertEqual(thumbnails.available_widths(doc.name, doc.storage), ())
+
+        out = io.StringIO()
+        call_command('generate_thumbnails', '--dry-run', stdout=out)
+        self.assertIn(doc.name, out.getvalue())
+        self.assertFalse(doc.storage.exists(thumbnails.derivative_name(doc.name, 320)))
+
+        cache.clear()
+        call_command('generate_thumbnails', stdout=io.StringIO())
+        self.assertTrue(doc.storage.exists(thumbnails.derivative_name(doc.name, 320)))
+
+        # Segunda execução: nada a fazer
+        with mock.patch.object(thumbnails, 'generate_derivatives') as generate:
+            call_command('generate_thumbnails', stdout=io.StringIO())
+        generate.assert_not_called()
@@ -0,0 +1,171 @@
+"""
+Miniaturas WebP de imagens e PDFs enviados.
+
+Depois do upload (no commit), um worker gera, para cada largura de
+``THUMBNAIL_WIDTHS``, uma miniatura WebP da imagem ou da primeira página do
+PDF, gravada ao lado do original em ``<nome original>.w<largura>.webp``. Os
+originais nunca são sobrescritos (nomes com hash ou uuid), então o nome da
+miniatura também é imutável e pode ser cacheado indefinidamente.
+
+As larguras já geradas de cada arquivo ficam no cache, para que as páginas
+escolham a menor miniatura adequada sem consultar o storage a cada render
+(tag ``{% thumbnail_url %}`` em ``core/templatetags/thumbnails.py``).
+
+``THUMBNAIL_GENERATION`` define como a geração roda: ``"async"`` (worker em
+thread no próprio processo), ``"sync"`` (no callback do commit) ou ``"off"``.
+Trabalhos perdidos num restart e arquivos anteriores às miniaturas são
+(re)processados por ``python manage.py generate_thumbnails``.
+"""
+import hashlib
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import transaction
+from pdf2image import convert_from_bytes
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tif', '.tiff'}
+PDF_EXTENSIONS = {'.pdf'}
+WEBP_QUALITY = 75
+# Sem miniaturas ainda (geração em andamento): consulta o storage de novo logo
+MISSING_TIMEOUT = 60
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='thumbnails')
+
+
+def get_generation_mode():
+    return getattr(settings, 'THUMBNAIL_GENERATION', 'async')
+
+
+def get_widths():
+    return tuple(sorted(getattr(settings, 'THUMBNAIL_WIDTHS', (320, 1024))))
+
+
+def supports(name):
+    ext = os.path.splitext(name or '')[1].lower()
+    return ext in IMAGE_EXTENSIONS or ext in PDF_EXTENSIONS
+
+
+def derivative_name(name, width):
+    return f'{name}.w{width}.webp'
+
+
+def _cache_key(name):
+    return f'thumbnails:{hashlib.sha1(name.encode()).hexdigest()}'
+
+
+def _load_image(name, storage):
+    with storage.open(name, 'rb') as f:
+        data = f.read()
+
+    if os.path.splitext(name)[1].lower() in PDF_EXTENSIONS:
+        # Só a primeira página, já na resolução da maior miniatura
+        pages = convert_from_bytes(
+            data, first_page=1, last_page=1, size=(max(get_widths()), None),
+        )
+        return pages[0] if pages else None
+
+    image = Image.open(io.BytesIO(data))
+    # JPEG: decodifica já reduzido quando o original é muito maior
+    image.draft('RGB', (max(get_widths()), max(get_widths())))
+    return image
+
+
+def generate_derivatives(name, storage):
+    """
+    Gera as miniaturas que faltam de um arquivo.
+
+    Returns:
+        Larguras disponíveis (tupla)
+    """
+    widths = get_widths()
+    missing = [width for width in widths if not storage.exists(derivative_name(name, width))]
+    if missing:
+        image = _load_image(name, storage)
+        if image is None:
+            return ()
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+        for width in missing:
+            rendition = image.copy()
+            rendition.thumbnail((width, width * 4))
+            buffer = io.BytesIO()
+            rendition.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+            storage.save(derivative_name(name, width), ContentFile(buffer.getvalue()))
+
+    cache.set(_cache_key(name), widths, None)
+    return widths
+
+
+def _run(name, storage):
+    try:
+        generate_derivatives(name, storage)
+    except Exception:
+        logger.exception('Erro ao gerar miniaturas de %s', name)
+
+
+def schedule_derivatives(name, storage):
+    """Agenda a geração das miniaturas para depois do commit."""
+    mode = get_generation_mode()
+    if mode == 'off' or not supports(name):
+        return
+    if mode == 'sync':
+        transaction.on_commit(lambda: _run(name, storage))
+    else:
+        transaction.on_commit(lambda: _executor.submit(_run, name, storage))
+
+
+def delete_derivatives(name, storage):
+    for width in get_widths():
+        storage.delete(derivative_name(name, width))
+    cache.delete(_cache_key(name))
+
+
+def available_widths(name, storage):
+    """Larguras de miniatura já geradas para o arquivo."""
+    key = _cache_key(name)
+    widths = cache.get(key)
+    if widths is None:
+        widths = tuple(
+            width for width in get_widths() if storage.exists(derivative_name(name, width))
+        )
+        cache.set(key, widths, None if widths else MISSING_TIMEOUT)
+    return widths
+
+
+def pick_width(field_file, width):
+    """
+    Largura da menor miniatura com pelo menos ``width`` px (ou da maior
+    disponível); None sem miniaturas.
+    """
+    if not field_file or not supports(field_file.name):
+        return None
+    widths = available_widths(field_file.name, field_file.storage)
+    if not widths:
+        return None
+    return next((w for w in widths if w >= width), widths[-1])
+
+
+def thumbnail_url(field_file, width, fallback=True):
+    """
+    URL pública da menor miniatura adequada (ver ``pick_width``). Sem
+    miniatura, devolve a URL do original (ou '' com ``fallback=False``).
+
+    Arquivos protegidos usam ``protected_thumbnail_url``
+    (core/views/protected_media_view.py).
+    """
+    if not field_file:
+        return ''
+    chosen = pick_width(field_file, width)
+    if chosen is not None:
+        return field_file.storage.url(derivative_name(field_file.name, chosen))
+    return field_file.url if fallback else ''
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import IndexView, ConfigView, AboutView
+from .views import IndexView, ConfigView, AboutView, ProtectedMediaView
 
 app_name = 'core'
 
@@ -7,4 +7,5 @@ urlpatterns = [
     path('', IndexView.as_view(), name="home"),
     path("config", ConfigView.as_view(), name="config"),
     path("about", AboutView.as_view(), name="about"),
+    path("files/<slug:kind>/<str:pk>/", ProtectedMediaView.as_view(), name="protected-media"),
 ]
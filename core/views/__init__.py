@@ -2,4 +2,5 @@ from .index_view import IndexView
 from .config_view import ConfigView
 from .error_handlers import custom_404
 from .error_handlers import custom_403
-from .about_view import AboutView
\ No newline at end of file
+from .about_view import AboutView
+from .protected_media_view import ProtectedMediaView
\ No newline at end of file
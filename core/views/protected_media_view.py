@@ -0,0 +1,104 @@
+from django.apps import apps
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import PermissionDenied
+from django.db.models.fields.files import FieldFile
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views import View
+
+from core import thumbnails
+from core.media import serve_file
+from users.capabilities import TREASURY_VIEWER, Capability, has_capability
+
+# Arquivos servidos pela view: modelo, campo, hash guardado, quem pode ver e
+# se as miniaturas (?w=<largura>) também são servidas por aqui
+PROTECTED_MEDIA = {
+    'frozen-report': {
+        'model': 'treasury.FrozenReport',
+        'field': 'pdf_file',
+        'hash_field': 'pdf_hash',
+        'capability': TREASURY_VIEWER,
+    },
+    'receipt': {
+        'model': 'treasury.TransactionModel',
+        'field': 'acquittance_doc',
+        'capability': TREASURY_VIEWER,
+        'thumbnails': True,
+    },
+    'minute-attachment': {
+        'model': 'secretarial.MinuteFileModel',
+        'field': 'file',
+        'permission': 'secretarial.view_meetingminutemodel',
+    },
+    'song-file': {
+        'model': 'worship.SongFile',
+        'field': 'file',
+        'capability': Capability.AUTHENTICATED,
+        'thumbnails': True,
+    },
+}
+
+
+def protected_media_url(kind, obj):
+    return reverse('core:protected-media', args=[kind, obj.pk])
+
+
+def protected_thumbnail_url(kind, obj, width, fallback=True):
+    """
+    URL protegida da menor miniatura adequada do arquivo. Sem miniatura,
+    devolve a URL protegida do original (ou '' com ``fallback=False``).
+    """
+    field_file = getattr(obj, PROTECTED_MEDIA[kind]['field'])
+    if not field_file:
+        return ''
+    chosen = thumbnails.pick_width(field_file, width)
+    if chosen is not None:
+        return f'{protected_media_url(kind, obj)}?w={chosen}'
+    return protected_media_url(kind, obj) if fallback else ''
+
+
+class ProtectedMediaView(LoginRequiredMixin, View):
+    """
+    Entrega um arquivo de modelo depois de verificar a permissão.
+
+    Suporta ETag/Last-Modified (304), Range (206) e X-Accel-Redirect/X-Sendfile
+    (ver core/media.py). Com ``?w=<largura>``, entrega a miniatura WebP já
+    gerada, com a mesma verificação de permissão do original.
+    """
+    http_method_names = ['get', 'head']
+
+    def get(self, request, kind, pk):
+        source = PROTECTED_MEDIA.get(kind)
+        width = request.GET.get('w')
+        if source is None or (width is not None and not source.get('thumbnails')):
+            raise Http404
+
+        if 'capability' in source and not has_capability(request.user, source['capability']):
+            raise PermissionDenied
+        if 'permission' in source and not request.user.has_perm(source['permission']):
+            raise PermissionDenied
+
+        obj = get_object_or_404(apps.get_model(source['model']), pk=pk)
+        field_file = getattr(obj, source['field'])
+        if not field_file:
+            raise Http404
+
+        if width is not None:
+            return self.serve_thumbnail(request, obj, field_file, width)
+
+        stored_hash = getattr(obj, source['hash_field']) if 'hash_field' in source else None
+        return serve_file(
+            request, field_file,
+            stored_hash=stored_hash,
+            as_attachment=request.GET.get('download') == '1',
+        )
+
+    def serve_thumbnail(self, request, obj, field_file, width):
+        if not width.isdigit():
+            raise Http404
+        width = int(width)
+        if width not in thumbnails.available_widths(field_file.name, field_file.storage):
+            raise Http404
+        rendition = FieldFile(obj, field_file.field, thumbnails.derivative_name(field_file.name, width))
+        return serve_file(request, rendition)
@@ -97,15 +97,40 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
         "OPTIONS": {
                     'timeout': 20,
-                    'init_command': (
-                        'PRAGMA journal_mode=WAL;'
-                        'PRAGMA synchronous=NORMAL;'
-                        'PRAGMA busy_timeout=5000;'
-                    ),
                 },
+        "CONN_MAX_AGE": config("CONN_MAX_AGE", default=60, cast=int),
+        "CONN_HEALTH_CHECKS": True,
     },
 }
 
+# PRAGMAs aplicados a cada conexão SQLite nova (ver core/sqlite.py).
+# Perfis: read_heavy, write_heavy; aliases ausentes usam read_heavy.
+SQLITE_PROFILE_BY_ALIAS = {
+    "default": config("SQLITE_PROFILE", default="read_heavy"),
+    "audit": "write_heavy",
+}
+# Intervalo mínimo (segundos) entre execuções de PRAGMA optimize por banco
+SQLITE_OPTIMIZE_INTERVAL = config("SQLITE_OPTIMIZE_INTERVAL", default=3600, cast=int)
+
+
+# Cache padrão. As versões do livro-caixa (relatórios e saldos da tesouraria)
+# e as permissões em cache são invalidadas por chave neste cache, então com
+# mais de um processo (ex.: gunicorn com vários workers) ele precisa ser
+# compartilhado, ex.:
+#   CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+#   CACHE_LOCATION=/var/tmp/diacono_cache
+CACHES = {
+    "default": {
+        "BACKEND": config("CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": config("CACHE_LOCATION", default=""),
+    }
+}
+
+
+# Backups dos bancos SQLite (python manage.py backup_databases)
+BACKUP_ROOT = config("BACKUP_ROOT", default=str(BASE_DIR / "backups"))
+BACKUP_KEEP = config("BACKUP_KEEP", default=7, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -173,6 +198,23 @@ STATIC_URL = "/static/"
 MEDIA_ROOT = BASE_DIR / "media"
 MEDIA_URL = "/media/"
 
+# PDFs importados para atas ficam em staging até a ata ser criada (segundos)
+PDF_IMPORT_STAGING_TTL = config("PDF_IMPORT_STAGING_TTL", default=60 * 60 * 24, cast=int)
+
+# Arquivos protegidos (core/media.py): com storage local, o servidor web pode
+# entregar o arquivo depois da verificação de permissão.
+# "" (Django entrega), "x-accel-redirect" (nginx) ou "x-sendfile" (Apache)
+PROTECTED_MEDIA_SENDFILE = config("PROTECTED_MEDIA_SENDFILE", default="")
+# Location "internal" do nginx que aponta para MEDIA_ROOT
+PROTECTED_MEDIA_ACCEL_PREFIX = config("PROTECTED_MEDIA_ACCEL_PREFIX", default="/protected-media/")
+PROTECTED_MEDIA_MAX_AGE = 60 * 60
+
+# Larguras (px) das miniaturas WebP geradas para comprovantes e partituras
+THUMBNAIL_WIDTHS = (320, 1024)
+# "async" (thread no processo), "sync" (no commit do upload) ou "off".
+# Backfill e novas tentativas: python manage.py generate_thumbnails
+THUMBNAIL_GENERATION = config("THUMBNAIL_GENERATION", default="async")
+
 # Storage Configuration
 # Desenvolvimento: armazenamento local
 # Produção: S3 compatível (Cloudflare R2, Backblaze B2, etc.)
@@ -215,6 +257,8 @@ else:
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "users.CustomUser"
+# ModelBackend com as permissões memorizadas por requisição (users.capabilities)
+AUTHENTICATION_BACKENDS = ["users.backends.CachedPermissionsBackend"]
 LOGOUT_REDIRECT_URL = "core:home"
 LOGIN_REDIRECT_URL = "core:home"
 
@@ -3,9 +3,18 @@ from events.models import Event
 from users.models import CustomUser
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from datetime import datetime
 
 
 class EventForm(forms.ModelForm):
+    recurrence_exceptions = forms.CharField(
+        required=False,
+        label="Exceções",
+        help_text="Datas sem ocorrência, separadas por vírgula (DD/MM/AAAA).",
+        widget=forms.TextInput(
+            attrs={"class": "app-input", "placeholder": "DD/MM/AAAA, DD/MM/AAAA"}),
+    )
+
     class Meta:
         model = Event
         fields = [
@@ -18,6 +27,10 @@ class EventForm(forms.ModelForm):
             "contact_user",
             "contact_name",
             "category",
+            "recurrence",
+            "recurrence_interval",
+            "recurrence_until",
+            "recurrence_exceptions",
         ]
         labels = {
             "start_date": "Início",
@@ -29,6 +42,9 @@ class EventForm(forms.ModelForm):
             "description": "Descrição",
             "location": "Local",
             "category": "Categoria",
+            "recurrence": "Repetição",
+            "recurrence_interval": "Intervalo",
+            "recurrence_until": "Repetir até",
         }
         widgets = {
             "user": forms.HiddenInput(),
@@ -46,6 +62,12 @@ class EventForm(forms.ModelForm):
                 attrs={"class": "app-input", "rows": 3}),
             "location": forms.Select(attrs={"class": "app-input"}),
             "category": forms.Select(attrs={"class": "app-input"}),
+            "recurrence": forms.Select(attrs={"class": "app-input"}),
+            "recurrence_interval": forms.NumberInput(
+                attrs={"class": "app-input", "min": 1}),
+            "recurrence_until": forms.DateInput(
+                attrs={"class": "datepicker app-input", 'type': 'text', 'placeholder': 'DD/MM/AAAA'},
+                format='%d/%m/%Y'),
         }
 
     def __init__(self, *args, **kwargs):
@@ -59,6 +81,13 @@ class EventForm(forms.ModelForm):
             )
             self.fields["user"].widget = forms.HiddenInput()
 
+        exceptions = self.initial.get("recurrence_exceptions")
+        if isinstance(exceptions, list):
+            self.initial["recurrence_exceptions"] = ", ".join(
+                datetime.strptime(day, "%Y-%m-%d").strftime("%d/%m/%Y")
+                for day in exceptions
+            )
+
     def clean_start_date(self):
         start_date = self.cleaned_data.get("start_date")
         if start_date and start_date < timezone.now():
@@ -69,6 +98,20 @@ class EventForm(forms.ModelForm):
         end_date = self.cleaned_data.get("end_date")
         return end_date
 
+    def clean_recurrence_interval(self):
+        return self.cleaned_data.get("recurrence_interval") or 1
+
+    def clean_recurrence_exceptions(self):
+        value = self.cleaned_data.get("recurrence_exceptions") or ""
+        exceptions = []
+        for item in filter(None, (part.strip() for part in value.split(","))):
+            try:
+                day = datetime.strptime(item, "%d/%m/%Y").date()
+            except ValueError:
+                raise ValidationError(f"Data inválida: {item}")
+            exceptions.append(day.isoformat())
+        return sorted(set(exceptions))
+
     def clean(self):
         cleaned_data = super().clean()
         contact_name = cleaned_data.get("contact_name")
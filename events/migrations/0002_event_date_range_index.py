@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['start_date', 'end_date'], name='events_even_start_d_7e0d92_idx'),
+        ),
+    ]
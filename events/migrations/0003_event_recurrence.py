@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_date_range_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='recurrence',
+            field=models.CharField(blank=True, choices=[('', 'Não se repete'), ('weekly', 'Semanal'), ('monthly_weekday', 'Mensal (mesmo dia da semana)')], default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_exceptions',
+            field=models.JSONField(blank=True, default=list, help_text='Datas (AAAA-MM-DD) em que a ocorrência não acontece.'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_interval',
+            field=models.PositiveSmallIntegerField(blank=True, default=1, help_text='Repete a cada N semanas (semanal) ou N meses (mensal).'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_until',
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
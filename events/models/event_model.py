@@ -2,30 +2,26 @@ from django.db import models
 from core.models import BaseModel
 from users.models import CustomUser
 from django.utils import timezone
-from datetime import timedelta
 from django.core.exceptions import ValidationError
 
 
 class EventManager(models.Manager):
     def events_by_month_current_year(self):
-        current_date = timezone.now()
-        events_by_month = {}
-        for month in range(1, 13):
-            month_events = self.filter(
-                start_date__year=current_date.year,
-                start_date__month=month,
-                end_date__gte=current_date
-            ) | self.filter(
-                start_date__year=current_date.year,
-                start_date__month=month,
-                end_date__isnull=True,
-                start_date__gte=current_date - timedelta(days=5)
-            ).order_by("start_date", "end_date")
-            events_by_month[month] = month_events
-        return events_by_month
+        from events.services import CalendarService
+
+        return CalendarService().events_by_month()
 
 
 class Event(BaseModel):
+    RECURRENCE_NONE = ""
+    RECURRENCE_WEEKLY = "weekly"
+    RECURRENCE_MONTHLY_WEEKDAY = "monthly_weekday"
+    RECURRENCE_CHOICES = [
+        (RECURRENCE_NONE, "Não se repete"),
+        (RECURRENCE_WEEKLY, "Semanal"),
+        (RECURRENCE_MONTHLY_WEEKDAY, "Mensal (mesmo dia da semana)"),
+    ]
+
     user = models.ForeignKey(
         CustomUser, on_delete=models.SET_DEFAULT, null=False, blank=False, default=1
     )
@@ -48,9 +44,27 @@ class Event(BaseModel):
     contact_name = models.CharField(max_length=100, null=True, blank=True)
     category = models.ForeignKey(
         "events.EventCategory", on_delete=models.PROTECT, null=True, blank=True)
+    recurrence = models.CharField(
+        max_length=20, choices=RECURRENCE_CHOICES, default=RECURRENCE_NONE, blank=True)
+    recurrence_interval = models.PositiveSmallIntegerField(
+        default=1, blank=True,
+        help_text="Repete a cada N semanas (semanal) ou N meses (mensal).")
+    recurrence_until = models.DateField(null=True, blank=True)
+    recurrence_exceptions = models.JSONField(
+        default=list, blank=True,
+        help_text="Datas (AAAA-MM-DD) em que a ocorrência não acontece.")
 
     objects = EventManager()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["start_date", "end_date"]),
+        ]
+
+    @property
+    def is_recurring(self):
+        return bool(self.recurrence)
+
     def clean(self):
         # Check if the start_date is in the past
         if self.start_date and self.start_date < timezone.now():
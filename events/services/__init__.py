@@ -0,0 +1,3 @@
+from .calendar_service import CalendarService
+
+__all__ = ['CalendarService']
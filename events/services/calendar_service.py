@@ -0,0 +1,403 @@
+import calendar
+import hashlib
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from events.models import Event
+from events.utils.recurrence import (
+    Occurrence,
+    iter_occurrence_dates,
+    iter_occurrences,
+    nth_weekday_index,
+)
+
+
+MONTH_NAMES_PT = (
+    "",
+    "janeiro",
+    "fevereiro",
+    "março",
+    "abril",
+    "maio",
+    "junho",
+    "julho",
+    "agosto",
+    "setembro",
+    "outubro",
+    "novembro",
+    "dezembro",
+)
+
+CALENDAR_CACHE_TIMEOUT = 60 * 15
+OCCURRENCE_CACHE_TIMEOUT = 60 * 60 * 24
+CALENDAR_VERSION_KEY = "events:calendar:version"
+
+# Eventos sem data de término continuam visíveis por alguns dias após o início.
+OPEN_ENDED_GRACE = timedelta(days=5)
+
+
+def get_calendar_version():
+    version = cache.get(CALENDAR_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(CALENDAR_VERSION_KEY, version, None)
+    return version
+
+
+def bump_calendar_version():
+    """Invalida todas as entradas de calendário em cache."""
+    try:
+        cache.incr(CALENDAR_VERSION_KEY)
+    except ValueError:
+        cache.set(CALENDAR_VERSION_KEY, 2, None)
+
+
+ICS_WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+
+def _month_start(year, month):
+    return timezone.make_aware(datetime(year, month, 1))
+
+
+def _next_month_start(year, month):
+    if month == 12:
+        return _month_start(year + 1, 1)
+    return _month_start(year, month + 1)
+
+
+def _start_of_day(value):
+    return timezone.make_aware(datetime.combine(timezone.localtime(value).date(), datetime.min.time()))
+
+
+def _is_upcoming(occurrence, now):
+    if occurrence.end_date:
+        return occurrence.end_date >= now
+    return occurrence.start_date >= now - OPEN_ENDED_GRACE
+
+
+def _occurrence_cache_key(event, window_start, window_end):
+    # As regras de recorrência fazem parte da chave: editar o evento a invalida.
+    rules = hashlib.md5(repr((
+        event.start_date,
+        event.end_date,
+        event.recurrence,
+        event.recurrence_interval,
+        event.recurrence_until,
+        sorted(event.recurrence_exceptions or []),
+    )).encode()).hexdigest()
+    return (
+        f"events:occurrences:{event.pk}:{rules}:"
+        f"{int(window_start.timestamp())}:{int(window_end.timestamp())}"
+    )
+
+
+def _escape_ics(value):
+    return (
+        (value or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _format_ics_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _format_ics_local(name, value):
+    """
+    Propriedade com horário local e TZID ("DTSTART;TZID=...:20300118T213000").
+
+    A RRULE é expandida no horário do DTSTART: com o horário local, BYDAY e a
+    posição no mês valem para o dia do evento aqui, e não para o dia em UTC.
+    """
+    tz = timezone.get_current_timezone()
+    return f"{name};TZID={tz.key}:{value.astimezone(tz).strftime('%Y%m%dT%H%M%S')}"
+
+
+def _ics_vtimezone():
+    """
+    VTIMEZONE do fuso do projeto, com o deslocamento atual.
+
+    Basta para fusos sem horário de verão (America/Sao_Paulo desde 2019).
+    """
+    tz = timezone.get_current_timezone()
+    minutes = int(timezone.localtime().utcoffset().total_seconds() // 60)
+    sign = "-" if minutes < 0 else "+"
+    offset = f"{sign}{abs(minutes) // 60:02d}{abs(minutes) % 60:02d}"
+    return [
+        "BEGIN:VTIMEZONE",
+        f"TZID:{tz.key}",
+        "BEGIN:STANDARD",
+        "DTSTART:19700101T000000",
+        f"TZOFFSETFROM:{offset}",
+        f"TZOFFSETTO:{offset}",
+        "END:STANDARD",
+        "END:VTIMEZONE",
+    ]
+
+
+class CalendarService:
+    """
+    Serviço para montagem do calendário de eventos.
+
+    Responsável por:
+    - Agrupar os eventos do ano por mês com uma única consulta
+    - Expandir eventos recorrentes apenas dentro da janela pedida
+    - Montar a grade mensal (semanas x dias)
+    - Gerar o feed ICS
+    """
+
+    def get_queryset(self):
+        return Event.objects.select_related("location", "category").order_by(
+            "start_date", "end_date"
+        )
+
+    def recurring_in_window(self, window_start, window_end):
+        """Filtro dos eventos recorrentes cuja série pode ocorrer na janela."""
+        return (
+            ~Q(recurrence=Event.RECURRENCE_NONE)
+            & Q(start_date__lt=window_end)
+            & (
+                Q(recurrence_until__isnull=True)
+                | Q(recurrence_until__gte=timezone.localtime(window_start).date())
+            )
+        )
+
+    def occurrences(self, events, window_start, window_end):
+        """
+        Expande os eventos em ocorrências dentro da janela, ordenadas pelo
+        início. Eventos únicos aparecem como eles mesmos.
+
+        As datas de cada evento recorrente ficam em cache por (evento, janela),
+        buscadas em lote com ``get_many``.
+        """
+        events = list(events)
+        keys = {
+            event.pk: _occurrence_cache_key(event, window_start, window_end)
+            for event in events
+            if event.recurrence
+        }
+        cached = cache.get_many(keys.values()) if keys else {}
+        missing = {}
+
+        occurrences = []
+        for event in events:
+            if not event.recurrence:
+                occurrences.extend(iter_occurrences(event, window_start, window_end))
+                continue
+            key = keys[event.pk]
+            dates = cached.get(key)
+            if dates is None:
+                dates = missing[key] = list(
+                    iter_occurrence_dates(event, window_start, window_end)
+                )
+            occurrences.extend(Occurrence(event, start, end) for start, end in dates)
+
+        if missing:
+            cache.set_many(missing, OCCURRENCE_CACHE_TIMEOUT)
+
+        occurrences.sort(key=lambda occ: (occ.start_date, occ.end_date or occ.start_date))
+        return occurrences
+
+    def upcoming_events_for_year(self, year=None, now=None):
+        """
+        Retorna, em uma única consulta, os eventos do ano que ainda não
+        terminaram (ou que começaram há poucos dias, se não têm término),
+        além das séries recorrentes ativas no ano, sem expandi-las.
+        """
+        now = now or timezone.now()
+        year = year or timezone.localtime(now).year
+        year_start, year_end = _month_start(year, 1), _month_start(year + 1, 1)
+
+        upcoming = Q(end_date__gte=now) | Q(
+            end_date__isnull=True, start_date__gte=now - OPEN_ENDED_GRACE
+        )
+        one_off = Q(
+            recurrence=Event.RECURRENCE_NONE,
+            start_date__gte=year_start,
+            start_date__lt=year_end,
+        ) & upcoming
+
+        return self.get_queryset().filter(
+            one_off | self.recurring_in_window(year_start, year_end)
+        )
+
+    def upcoming_occurrences_for_year(self, year=None, now=None):
+        """Ocorrências do ano que ainda não terminaram, em ordem cronológica."""
+        now = now or timezone.now()
+        year = year or timezone.localtime(now).year
+        year_start, year_end = _month_start(year, 1), _month_start(year + 1, 1)
+
+        # Nada antes de "agora" interessa; arredondar ao dia permite reaproveitar
+        # o cache de ocorrências ao longo do dia.
+        window_start = max(year_start, min(_start_of_day(now - OPEN_ENDED_GRACE), year_end))
+        events = self.upcoming_events_for_year(year, now)
+
+        return [
+            occurrence
+            for occurrence in self.occurrences(events, window_start, year_end)
+            if occurrence.start_date >= year_start and _is_upcoming(occurrence, now)
+        ]
+
+    def events_by_month(self, year=None, now=None):
+        """
+        Agrupa as ocorrências do ano por número do mês (1 a 12).
+
+        Returns:
+            Dicionário {mês: [eventos]} com todos os 12 meses
+        """
+        events_by_month = {month: [] for month in range(1, 13)}
+        for occurrence in self.upcoming_occurrences_for_year(year, now):
+            month = timezone.localtime(occurrence.start_date).month
+            events_by_month[month].append(occurrence)
+        return events_by_month
+
+    def events_by_month_named(self, year=None, now=None):
+        """
+        Agrupa os eventos do ano pelo nome do mês em português,
+        omitindo os meses sem eventos.
+        """
+        return {
+            MONTH_NAMES_PT[month]: events
+            for month, events in self.events_by_month(year, now).items()
+            if events
+        }
+
+    def occurrences_in_month(self, year, month):
+        """Ocorrências que acontecem, ao menos em parte, dentro do mês."""
+        month_start = _month_start(year, month)
+        next_month = _next_month_start(year, month)
+        one_off = Q(recurrence=Event.RECURRENCE_NONE, start_date__lt=next_month) & (
+            Q(end_date__gte=month_start)
+            | Q(end_date__isnull=True, start_date__gte=month_start)
+        )
+        events = self.get_queryset().filter(
+            one_off | self.recurring_in_window(month_start, next_month)
+        )
+        return self.occurrences(events, month_start, next_month)
+
+    def month_grid(self, year, month):
+        """
+        Monta a grade do mês (semanas começando no domingo) com os eventos
+        de cada dia.
+
+        Returns:
+            Dicionário serializável em JSON
+        """
+        dates = calendar.Calendar(firstweekday=6).monthdatescalendar(year, month)
+        grid_start, grid_end = dates[0][0], dates[-1][-1]
+
+        days = {}
+        for event in self.occurrences_in_month(year, month):
+            first_day = timezone.localtime(event.start_date).date()
+            last_day = timezone.localtime(event.end_date).date() if event.end_date else first_day
+            data = self.serialize_event(event)
+            day = max(first_day, grid_start)
+            while day <= min(last_day, grid_end):
+                days.setdefault(day, []).append(data)
+                day += timedelta(days=1)
+
+        weeks = [
+            [
+                {
+                    "date": day.isoformat(),
+                    "in_month": day.month == month,
+                    "events": days.get(day, []),
+                }
+                for day in week
+            ]
+            for week in dates
+        ]
+
+        return {
+            "year": year,
+            "month": month,
+            "month_name": MONTH_NAMES_PT[month],
+            "weeks": weeks,
+        }
+
+    def serialize_event(self, event):
+        return {
+            "id": event.id,
+            "title": event.title,
+            "start_date": event.start_date.isoformat(),
+            "end_date": event.end_date.isoformat() if event.end_date else None,
+            "location": event.location.name,
+            "category": event.category.name if event.category else None,
+            "recurring": bool(event.recurrence),
+        }
+
+    def ics_recurrence_lines(self, event):
+        """Regras RRULE/EXDATE equivalentes à recorrência do evento."""
+        if not event.recurrence:
+            return []
+
+        local_start = timezone.localtime(event.start_date)
+        if event.recurrence == Event.RECURRENCE_WEEKLY:
+            rule = "FREQ=WEEKLY"
+        else:
+            weekday = ICS_WEEKDAYS[local_start.weekday()]
+            rule = f"FREQ=MONTHLY;BYDAY={nth_weekday_index(local_start.date())}{weekday}"
+        rule += f";INTERVAL={max(event.recurrence_interval or 1, 1)}"
+        if event.recurrence_until:
+            until = timezone.make_aware(
+                datetime.combine(event.recurrence_until, datetime.max.time())
+            )
+            rule += f";UNTIL={_format_ics_datetime(until)}"
+
+        lines = [f"RRULE:{rule}"]
+        if event.recurrence_exceptions:
+            wall_time = local_start.strftime("%H%M%S")
+            excluded = ",".join(
+                f"{date.fromisoformat(day):%Y%m%d}T{wall_time}"
+                for day in sorted(event.recurrence_exceptions)
+            )
+            lines.append(f"EXDATE;TZID={timezone.get_current_timezone().key}:{excluded}")
+        return lines
+
+    def ics_feed(self, events):
+        """Gera o conteúdo de um arquivo iCalendar (RFC 5545)."""
+        stamp = _format_ics_datetime(timezone.now())
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//IBARECISA//Eventos//PT-BR",
+            "CALSCALE:GREGORIAN",
+            *_ics_vtimezone(),
+        ]
+        for event in events:
+            end_date = event.end_date or event.start_date
+            lines.extend([
+                "BEGIN:VEVENT",
+                f"UID:event-{event.id}@ibarecisa.org.br",
+                f"DTSTAMP:{stamp}",
+                _format_ics_local("DTSTART", event.start_date),
+                _format_ics_local("DTEND", end_date),
+                *self.ics_recurrence_lines(event),
+                f"SUMMARY:{_escape_ics(event.title)}",
+                f"DESCRIPTION:{_escape_ics(event.description)}",
+                f"LOCATION:{_escape_ics(event.location.name)}",
+                "END:VEVENT",
+            ])
+        lines.append("END:VCALENDAR")
+        return "\r\n".join(lines) + "\r\n"
+
+    def cached_month_grid(self, year, month):
+        key = f"events:calendar:grid:{get_calendar_version()}:{year}:{month}"
+        return cache.get_or_set(
+            key, lambda: self.month_grid(year, month), CALENDAR_CACHE_TIMEOUT
+        )
+
+    def cached_ics_feed(self, year):
+        key = f"events:calendar:ics:{get_calendar_version()}:{year}"
+        return cache.get_or_set(
+            key,
+            lambda: self.ics_feed(self.upcoming_events_for_year(year)),
+            CALENDAR_CACHE_TIMEOUT,
+        )
@@ -0,0 +1,20 @@
+"""
+Signals para invalidação do cache de calendário de eventos.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from events.models import Event, Venue, EventCategory
+from events.services.calendar_service import bump_calendar_version
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Venue)
+@receiver(post_delete, sender=Venue)
+@receiver(post_save, sender=EventCategory)
+@receiver(post_delete, sender=EventCategory)
+def invalidate_calendar_cache(sender, instance, **kwargs):
+    """Descarta grades mensais e feeds ICS em cache após qualquer alteração."""
+    bump_calendar_version()
@@ -2,4 +2,7 @@ from .events_form_tests import EventFormTestCase
 from .events_model_tests import EventModelTestCase
 from .events_manager_tests import EventManagerTests
 from .event_category_model_tests import EventCategoryModelTest
-from .event_create_view_tests import EventCreateViewTest
\ No newline at end of file
+from .event_create_view_tests import EventCreateViewTest
+from .calendar_service_tests import CalendarServiceTests, CalendarViewsTests
+from .events_by_period_view_tests import EventsByPeriodViewTests
+from .recurrence_tests import RecurrenceTests, EventFormRecurrenceTests
@@ -0,0 +1,126 @@
+from datetime import datetime
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from events.models import Event, Venue, EventCategory
+from events.services import CalendarService
+from users.models import CustomUser
+
+
+class CalendarServiceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create(
+            username='calendar_user', email='calendar_user@example.com')
+        self.venue = baker.make(Venue, name='Templo')
+        self.category = baker.make(EventCategory, name='Culto')
+        self.now = timezone.make_aware(datetime(2030, 3, 10, 12, 0))
+
+        self.march_event = self._make_event(
+            'Culto de Março', datetime(2030, 3, 15, 19, 0), datetime(2030, 3, 15, 21, 0))
+        self.june_event = self._make_event(
+            'Retiro', datetime(2030, 6, 29, 8, 0), datetime(2030, 7, 1, 18, 0))
+        self.finished_event = self._make_event(
+            'Evento Encerrado', datetime(2030, 3, 1, 19, 0), datetime(2030, 3, 1, 21, 0))
+        self.next_year_event = self._make_event(
+            'Ano Seguinte', datetime(2031, 1, 5, 19, 0), datetime(2031, 1, 5, 21, 0))
+
+    def _make_event(self, title, start, end):
+        return baker.make(
+            Event,
+            user=self.user,
+            title=title,
+            start_date=timezone.make_aware(start),
+            end_date=timezone.make_aware(end),
+            location=self.venue,
+            category=self.category,
+        )
+
+    def test_events_by_month_uses_a_single_query(self):
+        with self.assertNumQueries(1):
+            events_by_month = CalendarService().events_by_month(2030, now=self.now)
+            names = [event.location.name for events in events_by_month.values() for event in events]
+
+        self.assertEqual(len(events_by_month), 12)
+        self.assertEqual(events_by_month[3], [self.march_event])
+        self.assertEqual(events_by_month[6], [self.june_event])
+        self.assertEqual(names, ['Templo', 'Templo'])
+
+    def test_events_by_month_named_uses_portuguese_names(self):
+        named = CalendarService().events_by_month_named(2030, now=self.now)
+
+        self.assertEqual(list(named.keys()), ['março', 'junho'])
+
+    def test_month_grid_spreads_multi_day_events(self):
+        grid = CalendarService().month_grid(2030, 6)
+
+        days = {day['date']: day for week in grid['weeks'] for day in week}
+        self.assertEqual(grid['month_name'], 'junho')
+        self.assertEqual([e['title'] for e in days['2030-06-29']['events']], ['Retiro'])
+        self.assertEqual([e['title'] for e in days['2030-06-30']['events']], ['Retiro'])
+        self.assertTrue(all(len(week) == 7 for week in grid['weeks']))
+
+    def test_ics_feed_escapes_text(self):
+        self.march_event.title = 'Culto, Ceia; Louvor'
+        feed = CalendarService().ics_feed([self.march_event])
+
+        self.assertIn('BEGIN:VCALENDAR', feed)
+        self.assertIn('SUMMARY:Culto\\, Ceia\\; Louvor', feed)
+        self.assertIn(f'UID:event-{self.march_event.id}@ibarecisa.org.br', feed)
+
+
+class CalendarViewsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create(
+            username='calendar_view_user', email='calendar_view_user@example.com')
+        self.venue = baker.make(Venue)
+        self.event = baker.make(
+            Event,
+            user=self.user,
+            title='Ensaio',
+            start_date=timezone.make_aware(datetime(2030, 5, 4, 19, 0)),
+            end_date=timezone.make_aware(datetime(2030, 5, 4, 21, 0)),
+            location=self.venue,
+        )
+
+    def test_month_grid_is_cached_until_an_event_changes(self):
+        url = reverse('events:calendar-month-grid', kwargs={'year': 2030, 'month': 5})
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        self.event.title = 'Ensaio Geral'
+        self.event.save()
+        response = self.client.get(url)
+
+        titles = [e['title'] for week in response.json()['weeks'] for day in week for e in day['events']]
+        self.assertIn('Ensaio Geral', titles)
+
+    def test_month_grid_rejects_invalid_month(self):
+        url = reverse('events:calendar-month-grid', kwargs={'year': 2030, 'month': 13})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 400)
+
+    def test_month_grid_rejects_out_of_range_year(self):
+        for year in (0, 9999, 99999):
+            url = reverse('events:calendar-month-grid', kwargs={'year': year, 'month': 5})
+            self.assertEqual(self.client.get(url).status_code, 400, year)
+
+    def test_ics_feed_rejects_out_of_range_year(self):
+        for year in ('0', '99999'):
+            response = self.client.get(reverse('events:calendar-ics'), {'year': year})
+            self.assertEqual(response.status_code, 400, year)
+
+    def test_ics_feed(self):
+        response = self.client.get(reverse('events:calendar-ics'), {'year': 2030})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/calendar'))
+        self.assertIn(b'SUMMARY:Ensaio', response.content)
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from events.models import Event, Venue, EventCategory
+from users.models import CustomUser
+
+
+class EventsByPeriodViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create(
+            username='period_user', email='period_user@example.com')
+        self.venue = baker.make(Venue, name='Salão')
+        self.category = baker.make(EventCategory, name='Ensaio')
+        self.url = reverse('events:events-by-period-ajax')
+        self.params = {'start_date': '2030-05-01', 'end_date': '2030-06-01'}
+        for day in (3, 10, 17):
+            baker.make(
+                Event,
+                user=self.user,
+                title=f'Ensaio {day}',
+                start_date=timezone.make_aware(datetime(2030, 5, day, 19, 0)),
+                end_date=timezone.make_aware(datetime(2030, 5, day, 21, 0)),
+                location=self.venue,
+                category=self.category,
+            )
+
+    def test_returns_events_with_joined_fields(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, self.params)
+
+        events = response.json()['events']
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(events), 3)
+        self.assertEqual(events[0]['location'], 'Salão')
+        self.assertEqual(events[0]['category'], 'Ensaio')
+        self.assertEqual(
+            events[0]['url_events_edit_event'],
+            reverse('events:edit-event', kwargs={'pk': events[0]['id']}),
+        )
+
+    def test_event_without_category(self):
+        Event.objects.update(category=None)
+
+        response = self.client.get(self.url, self.params)
+
+        self.assertIsNone(response.json()['events'][0]['category'])
+
+    def test_unchanged_range_returns_304(self):
+        response = self.client.get(self.url, self.params)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/'))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_edit_changes_etag(self):
+        etag = self.client.get(self.url, self.params)['ETag']
+
+        event = Event.objects.first()
+        event.title = 'Ensaio Geral'
+        event.save()
+
+        response = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_missing_dates(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,195 @@
+from datetime import date, datetime
+
+from dateutil.rrule import rrulestr
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from events.forms import EventForm
+from events.models import Event, Venue, EventCategory
+from events.services import CalendarService
+from events.utils.recurrence import Occurrence, iter_occurrence_dates
+from users.models import CustomUser
+
+
+def aware(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class RecurrenceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create(
+            username='recurrence_user', email='recurrence_user@example.com')
+        self.venue = baker.make(Venue, name='Templo')
+        self.category = baker.make(EventCategory, name='Ensaio')
+        # Domingo, 6 de janeiro de 2030
+        self.weekly = baker.make(
+            Event,
+            user=self.user,
+            title='Culto Dominical',
+            start_date=aware(2030, 1, 6, 19, 0),
+            end_date=aware(2030, 1, 6, 21, 0),
+            location=self.venue,
+            category=self.category,
+            recurrence=Event.RECURRENCE_WEEKLY,
+        )
+
+    def test_weekly_occurrences_only_inside_window(self):
+        dates = list(iter_occurrence_dates(
+            self.weekly, aware(2030, 3, 1), aware(2030, 3, 31)))
+
+        self.assertEqual(
+            [start.date() for start, _ in dates],
+            [date(2030, 3, 3), date(2030, 3, 10), date(2030, 3, 17), date(2030, 3, 24)],
+        )
+        self.assertTrue(all(start.hour == 19 for start, _ in dates))
+        self.assertTrue(all((end - start).seconds == 7200 for start, end in dates))
+
+    def test_far_window_is_generated_lazily(self):
+        occurrences = iter_occurrence_dates(
+            self.weekly, aware(2130, 1, 2), aware(2130, 1, 9))
+
+        start, _ = next(occurrences)
+        self.assertEqual(start.date(), date(2130, 1, 8))
+        self.assertEqual(start.weekday(), 6)
+
+    def test_interval_until_and_exceptions(self):
+        self.weekly.recurrence_interval = 2
+        self.weekly.recurrence_until = date(2030, 2, 20)
+        self.weekly.recurrence_exceptions = ['2030-01-20']
+
+        dates = [start.date() for start, _ in iter_occurrence_dates(
+            self.weekly, aware(2030, 1, 1), aware(2030, 12, 31))]
+
+        self.assertEqual(dates, [date(2030, 1, 6), date(2030, 2, 3), date(2030, 2, 17)])
+
+    def test_monthly_by_weekday(self):
+        # Segundo sábado do mês
+        event = baker.make(
+            Event,
+            user=self.user,
+            start_date=aware(2030, 1, 12, 9, 0),
+            end_date=aware(2030, 1, 12, 11, 0),
+            location=self.venue,
+            recurrence=Event.RECURRENCE_MONTHLY_WEEKDAY,
+        )
+
+        dates = [start.date() for start, _ in iter_occurrence_dates(
+            event, aware(2030, 2, 1), aware(2030, 5, 1))]
+
+        self.assertEqual(dates, [date(2030, 2, 9), date(2030, 3, 9), date(2030, 4, 13)])
+
+    def test_monthly_last_weekday(self):
+        # Último domingo (quinto domingo de março de 2030)
+        event = baker.make(
+            Event,
+            user=self.user,
+            start_date=aware(2030, 3, 31, 18, 0),
+            location=self.venue,
+            recurrence=Event.RECURRENCE_MONTHLY_WEEKDAY,
+        )
+
+        dates = [start.date() for start, _ in iter_occurrence_dates(
+            event, aware(2030, 4, 1), aware(2030, 6, 1))]
+
+        self.assertEqual(dates, [date(2030, 4, 28), date(2030, 5, 26)])
+
+    def test_calendar_expands_occurrences_by_month(self):
+        events_by_month = CalendarService().events_by_month(2030, now=aware(2030, 3, 1))
+
+        self.assertEqual(events_by_month[1], [])
+        self.assertEqual(len(events_by_month[3]), 5)
+        self.assertIsInstance(events_by_month[3][0], Occurrence)
+        self.assertEqual(events_by_month[3][0].title, 'Culto Dominical')
+        self.assertEqual(events_by_month[3][0].location.name, 'Templo')
+
+    def test_occurrence_cache_is_invalidated_on_edit(self):
+        service = CalendarService()
+        window = (aware(2030, 3, 1), aware(2030, 4, 1))
+        self.assertEqual(len(service.occurrences([self.weekly], *window)), 5)
+
+        self.weekly.recurrence_exceptions = ['2030-03-10']
+        self.weekly.save()
+        event = Event.objects.get(pk=self.weekly.pk)
+
+        self.assertEqual(len(service.occurrences([event], *window)), 4)
+
+    def test_events_by_period_includes_occurrences(self):
+        response = self.client.get(
+            reverse('events:events-by-period-ajax'),
+            {'start_date': '2030-03-01', 'end_date': '2030-03-15'},
+        )
+
+        events = response.json()['events']
+        self.assertEqual(len(events), 2)
+        self.assertTrue(all(event['recurring'] for event in events))
+        self.assertEqual(events[0]['id'], self.weekly.pk)
+
+    def test_ics_feed_uses_rrule(self):
+        self.weekly.recurrence_exceptions = ['2030-01-13']
+
+        feed = CalendarService().ics_feed([self.weekly])
+
+        self.assertIn('RRULE:FREQ=WEEKLY;INTERVAL=1', feed)
+        self.assertIn('DTSTART;TZID=America/Sao_Paulo:20300106T190000', feed)
+        self.assertIn('EXDATE;TZID=America/Sao_Paulo:20300113T190000', feed)
+        self.assertIn('TZID:America/Sao_Paulo', feed)
+
+    def test_ics_monthly_rule_for_evening_event(self):
+        # Terceira sexta-feira, 21h30 local: já é sábado em UTC
+        evening = baker.make(
+            Event,
+            user=self.user,
+            title='Culto de Oração',
+            start_date=aware(2030, 1, 18, 21, 30),
+            end_date=aware(2030, 1, 18, 22, 30),
+            location=self.venue,
+            recurrence=Event.RECURRENCE_MONTHLY_WEEKDAY,
+        )
+
+        feed = CalendarService().ics_feed([evening])
+
+        lines = feed.split('\r\n')
+        start = next(line for line in lines if line.startswith('DTSTART;'))
+        rule = next(line for line in lines if line.startswith('RRULE:'))
+        self.assertEqual(start, 'DTSTART;TZID=America/Sao_Paulo:20300118T213000')
+        self.assertIn('BYDAY=3FR', rule)
+        expanded = rrulestr(f'{start}\n{rule}', tzids={'America/Sao_Paulo': timezone.get_current_timezone()})
+        self.assertEqual(
+            [timezone.localtime(start) for start in expanded[:3]],
+            [aware(2030, 1, 18, 21, 30), aware(2030, 2, 15, 21, 30), aware(2030, 3, 15, 21, 30)],
+        )
+
+
+class EventFormRecurrenceTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create(
+            username='recurrence_form_user', email='recurrence_form_user@example.com')
+        self.location = baker.make(Venue)
+        self.data = {
+            "user": self.user.id,
+            "title": "Ensaio do Coral",
+            "start_date": "2035-01-06 19:00:00",
+            "end_date": "2035-01-06 21:00:00",
+            "location": self.location.id,
+            "contact_name": "Maestro",
+            "recurrence": Event.RECURRENCE_WEEKLY,
+            "recurrence_exceptions": "13/01/2035, 20/01/2035",
+        }
+
+    def test_parses_exceptions_and_default_interval(self):
+        form = EventForm(data=self.data, user=self.user)
+
+        self.assertTrue(form.is_valid(), form.errors.as_text())
+        self.assertEqual(form.cleaned_data['recurrence_exceptions'], ['2035-01-13', '2035-01-20'])
+        self.assertEqual(form.cleaned_data['recurrence_interval'], 1)
+
+    def test_invalid_exception_date(self):
+        self.data['recurrence_exceptions'] = '31/02/2035'
+
+        form = EventForm(data=self.data, user=self.user)
+
+        self.assertIn('recurrence_exceptions', form.errors)
@@ -12,6 +12,8 @@ from events.views import (
     CategoryFormView,
     CategoryCreateView,
     EventsByPeriodView,
+    EventsMonthGridView,
+    EventsICSFeedView,
 )
 
 app_name = "events"
@@ -48,4 +50,10 @@ urlpatterns = [
         name="update-category",
     ),
     path("byperiod", EventsByPeriodView.as_view(), name="events-by-period-ajax"),
+    path(
+        "calendar/<int:year>/<int:month>",
+        EventsMonthGridView.as_view(),
+        name="calendar-month-grid",
+    ),
+    path("calendar.ics", EventsICSFeedView.as_view(), name="calendar-ics"),
 ]
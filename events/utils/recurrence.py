@@ -0,0 +1,121 @@
+import calendar
+from datetime import date, datetime, timedelta
+
+from django.utils import timezone
+
+
+class Occurrence:
+    """
+    Uma ocorrência de um evento recorrente.
+
+    Expõe as datas da ocorrência e delega os demais atributos ao evento,
+    de modo que templates e serializadores possam tratá-la como um Event.
+    """
+
+    __slots__ = ("event", "start_date", "end_date")
+
+    def __init__(self, event, start_date, end_date):
+        self.event = event
+        self.start_date = start_date
+        self.end_date = end_date
+
+    def __getattr__(self, name):
+        return getattr(self.event, name)
+
+    def __eq__(self, other):
+        if not isinstance(other, Occurrence):
+            return NotImplemented
+        return self.event.pk == other.event.pk and self.start_date == other.start_date
+
+    def __hash__(self):
+        return hash((self.event.pk, self.start_date))
+
+    def __repr__(self):
+        return f"<Occurrence: {self.event} @ {self.start_date:%Y-%m-%d %H:%M}>"
+
+
+def nth_weekday_index(day):
+    """Posição do dia da semana no mês (1 a 4, ou -1 para o último)."""
+    nth = (day.day - 1) // 7 + 1
+    return -1 if nth == 5 else nth
+
+
+def _nth_weekday_of_month(year, month, weekday, nth):
+    if nth > 0:
+        offset = (weekday - date(year, month, 1).weekday()) % 7
+        return date(year, month, 1 + offset + (nth - 1) * 7)
+    last = date(year, month, calendar.monthrange(year, month)[1])
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _add_months(year, month, months):
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def iter_occurrence_dates(event, window_start, window_end):
+    """
+    Gera, sob demanda, os pares (início, fim) das ocorrências do evento que
+    se sobrepõem à janela [window_start, window_end).
+
+    A primeira ocorrência candidata é calculada diretamente a partir do
+    início da janela, então o custo depende do tamanho da janela e não de
+    há quanto tempo o evento se repete. O horário é mantido no fuso local,
+    e ``end_date`` nulo resulta em fim nulo.
+    """
+    duration = event.end_date - event.start_date if event.end_date else None
+
+    def overlaps(start):
+        end = start + duration if duration is not None else start
+        return start < window_end and end >= window_start
+
+    if not event.recurrence:
+        if overlaps(event.start_date):
+            yield event.start_date, event.end_date
+        return
+
+    local_start = timezone.localtime(event.start_date)
+    first_day = local_start.date()
+    wall_time = local_start.time().replace(tzinfo=None)
+    interval = max(event.recurrence_interval or 1, 1)
+    exceptions = set(event.recurrence_exceptions or [])
+    earliest_day = timezone.localtime(window_start - (duration or timedelta())).date()
+
+    if event.recurrence == event.RECURRENCE_WEEKLY:
+        step = 7 * interval
+        index = max(0, (earliest_day - first_day).days // step)
+
+        def day_for(index):
+            return first_day + timedelta(days=index * step)
+    else:
+        weekday, nth = first_day.weekday(), nth_weekday_index(first_day)
+        months = (earliest_day.year - first_day.year) * 12 + earliest_day.month - first_day.month
+        index = max(0, months // interval - 1)
+
+        def day_for(index):
+            year, month = _add_months(first_day.year, first_day.month, index * interval)
+            return _nth_weekday_of_month(year, month, weekday, nth)
+
+    while True:
+        day = day_for(index)
+        index += 1
+        if event.recurrence_until and day > event.recurrence_until:
+            return
+        start = timezone.make_aware(datetime.combine(day, wall_time))
+        if start >= window_end:
+            return
+        if day.isoformat() in exceptions or not overlaps(start):
+            continue
+        yield start, start + duration if duration is not None else None
+
+
+def iter_occurrences(event, window_start, window_end):
+    """
+    Como ``iter_occurrence_dates``, mas gera objetos prontos para exibição:
+    o próprio evento, se não for recorrente, ou uma ``Occurrence``.
+    """
+    if not event.recurrence:
+        yield from (event for _ in iter_occurrence_dates(event, window_start, window_end))
+        return
+    for start, end in iter_occurrence_dates(event, window_start, window_end):
+        yield Occurrence(event, start, end)
@@ -9,4 +9,5 @@ from .venue_update_view import VenueUpdateView
 from .category_create_view import CategoryCreateView
 from .category_form_view import CategoryFormView
 from .category_update_view import CategoryUpdateView
-from .events_by_period_view import EventsByPeriodView
\ No newline at end of file
+from .events_by_period_view import EventsByPeriodView
+from .calendar_views import EventsMonthGridView, EventsICSFeedView
@@ -0,0 +1,36 @@
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from django.views import View
+
+from events.services import CalendarService
+
+# A grade e o feed consultam o ano seguinte; date() só vai até 9999
+MIN_YEAR, MAX_YEAR = 1, 9998
+
+
+class EventsMonthGridView(View):
+    def get(self, request, year, month, *args, **kwargs):
+        if not MIN_YEAR <= year <= MAX_YEAR:
+            return JsonResponse({"error": "Ano inválido."}, status=400)
+        if not 1 <= month <= 12:
+            return JsonResponse({"error": "Mês inválido."}, status=400)
+
+        return JsonResponse(CalendarService().cached_month_grid(year, month))
+
+
+class EventsICSFeedView(View):
+    def get(self, request, *args, **kwargs):
+        year = request.GET.get("year")
+        if year is None:
+            year = timezone.localtime().year
+        elif year.isdigit() and MIN_YEAR <= int(year) <= MAX_YEAR:
+            year = int(year)
+        else:
+            return HttpResponse("Ano inválido.", status=400)
+
+        response = HttpResponse(
+            CalendarService().cached_ics_feed(year),
+            content_type="text/calendar; charset=utf-8",
+        )
+        response["Content-Disposition"] = f'inline; filename="eventos-{year}.ics"'
+        return response
@@ -1,9 +1,19 @@
+from datetime import datetime
+
+from django.db.models import Count, Max, Q
 from django.http import JsonResponse
 from django.views import View
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.dateparse import parse_date
 from events.models import Event
+from events.services import CalendarService
+from events.services.calendar_service import get_calendar_version
 from django.shortcuts import reverse
 
+# pk fictício usado para montar o template da URL de edição com um único reverse()
+_URL_PK_PLACEHOLDER = 999999999
+
 
 class EventsByPeriodView(View):
     def get(self, request, *args, **kwargs):
@@ -21,23 +31,69 @@ class EventsByPeriodView(View):
         if not start_date or not end_date:
             return JsonResponse({"error": "Formato inválido."}, status=400)
 
+        window_start = timezone.make_aware(datetime.combine(start_date, datetime.min.time()))
+        window_end = timezone.make_aware(datetime.combine(end_date, datetime.min.time()))
+
+        calendar = CalendarService()
         events = Event.objects.filter(
-            start_date__gte=start_date, end_date__lte=end_date
+            Q(
+                recurrence=Event.RECURRENCE_NONE,
+                start_date__gte=window_start,
+                end_date__lte=window_end,
+            )
+            | calendar.recurring_in_window(window_start, window_end)
+        )
+
+        etag = self.get_etag(events)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            occurrences = [
+                occurrence
+                for occurrence in calendar.occurrences(
+                    events.select_related("location", "category"),
+                    window_start,
+                    window_end,
+                )
+                if occurrence.start_date >= window_start
+                and occurrence.end_date is not None
+                and occurrence.end_date <= window_end
+            ]
+            response = JsonResponse({"events": self.serialize(occurrences)})
+            response["ETag"] = etag
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    def get_etag(self, events):
+        """
+        ETag fraco a partir de contagem e max(modified) do intervalo.
+
+        Como ``modified`` guarda apenas a data, a versão do calendário
+        (incrementada a cada gravação de evento) também entra na chave.
+        """
+        stats = events.aggregate(count=Count("id"), last_modified=Max("modified"))
+        return 'W/"{}-{}-{}"'.format(
+            get_calendar_version(),
+            stats["count"],
+            stats["last_modified"].isoformat() if stats["last_modified"] else "0",
         )
 
-        events_data = [
+    def serialize(self, occurrences):
+        url_template = reverse(
+            "events:edit-event", kwargs={"pk": _URL_PK_PLACEHOLDER}
+        ).replace(str(_URL_PK_PLACEHOLDER), "{}")
+
+        return [
             {
-                "id": event.id,
-                "title": event.title,
-                "description": event.description,
-                "start_date": event.start_date,
-                "end_date": event.end_date,
-                "location": event.location.name,
-                "price": event.price,
-                "category": event.category.name,
-                "url_events_edit_event": reverse('events:edit-event', kwargs={'pk': event.id})
+                "id": occurrence.id,
+                "title": occurrence.title,
+                "description": occurrence.description,
+                "start_date": occurrence.start_date,
+                "end_date": occurrence.end_date,
+                "location": occurrence.location.name,
+                "price": occurrence.price,
+                "category": occurrence.category.name if occurrence.category else None,
+                "recurring": bool(occurrence.recurrence),
+                "url_events_edit_event": url_template.format(occurrence.id),
             }
-            for event in events
+            for occurrence in occurrences
         ]
-
-        return JsonResponse({"events": events_data})
@@ -26,6 +26,10 @@ class EventsFormView(PermissionRequiredMixin, FormView):
             initial_data['contact_user'] = event.contact_user
             initial_data['contact_name'] = event.contact_name
             initial_data['category'] = event.category
+            initial_data['recurrence'] = event.recurrence
+            initial_data['recurrence_interval'] = event.recurrence_interval
+            initial_data['recurrence_until'] = event.recurrence_until
+            initial_data['recurrence_exceptions'] = event.recurrence_exceptions
         return initial_data
 
     def get_context_data(self, **kwargs):
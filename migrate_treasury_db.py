@@ -11,7 +11,7 @@ AVISO: Sempre faça backup do banco antes de executar em produção!
 import os
 import sys
 import django
-import shutil
+import sqlite3
 from datetime import datetime
 
 # Setup Django
@@ -33,7 +33,14 @@ def backup_database():
     backup_path = f"{db_path}.backup_{timestamp}"
 
     try:
-        shutil.copy2(db_path, backup_path)
+        # API de backup online: cópia consistente mesmo com escritas em andamento
+        source = sqlite3.connect(db_path)
+        target = sqlite3.connect(backup_path)
+        try:
+            source.backup(target, pages=1024)
+        finally:
+            target.close()
+            source.close()
         print(f"✅ Backup criado: {backup_path}")
         return backup_path
     except Exception as e:
@@ -0,0 +1,22 @@
+"""
+Management Command para remover PDFs importados que nunca viraram ata.
+
+Os PDFs enviados na importação de atas ficam em staging no storage padrão
+até a ata ser criada. Este comando apaga os que passaram de
+PDF_IMPORT_STAGING_TTL. Pode rodar periodicamente (cron).
+
+Uso:
+    python manage.py purge_pdf_stagings
+"""
+
+from django.core.management.base import BaseCommand
+
+from secretarial.utils.pdf_staging import purge_expired_stagings
+
+
+class Command(BaseCommand):
+    help = 'Remove os PDFs de importação de atas em staging já expirados'
+
+    def handle(self, *args, **options):
+        purged = purge_expired_stagings()
+        self.stdout.write(self.style.SUCCESS(f'{purged} staging(s) expirado(s) removido(s).'))
@@ -5,6 +5,8 @@ Mixins de permissão para views da secretaria.
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.core.exceptions import PermissionDenied
 
+from users.capabilities import CHURCH_MEMBER, has_capability
+
 
 class IsSecretarialUserMixin(UserPassesTestMixin):
     """
@@ -20,8 +22,7 @@ class IsSecretarialUserMixin(UserPassesTestMixin):
     Esta é a mesma lógica usada na navbar para mostrar links de Secretaria/Tesouraria.
     """
     def test_func(self):
-        user = self.request.user
-        return user.is_authenticated and (user.is_staff or user.type == "REGULAR" or user.is_superuser)
+        return has_capability(self.request.user, CHURCH_MEMBER)
 
     def handle_no_permission(self):
         """Redireciona para página de permissão negada."""
@@ -7,4 +7,6 @@ from .generate_pdf_tests import GeneratePDFViewTestCase
 from .minute_text_util_tests import TestMakeMinute
 from .date_utils_tests import TestDateToWords
 from .create_minute_form_view_tests import CreateMinuteFormViewTestCase
-from .create_minute_project_view import CreateMinuteProjectFormViewTestCase
\ No newline at end of file
+from .create_minute_project_view import CreateMinuteProjectFormViewTestCase
+from .membership_directory_tests import MembershipDirectoryTests
+from .pdf_staging_tests import PDFStagingTests
@@ -0,0 +1,100 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+
+from users.models import CustomUser
+
+
+class MembershipDirectoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = CustomUser.objects.create_superuser(
+            username="admin", email="admin_directory@example.com", password="testpass123")
+        self.client.force_login(self.admin)
+
+    def member(self, first_name, last_name, **kwargs):
+        kwargs.setdefault("type", CustomUser.Types.REGULAR)
+        return baker.make(CustomUser, first_name=first_name, last_name=last_name, **kwargs)
+
+    def test_search_ignores_accents_and_case(self):
+        joao = self.member("João", "Conceição")
+        self.member("Maria", "Silva")
+        url = reverse("secretarial:members-directory")
+
+        for term in ("joao", "JOÃO CONC", "conceicao", "Conceição"):
+            results = self.client.get(url, {"q": term}).json()["results"]
+            self.assertEqual([r["id"] for r in results], [joao.pk], term)
+
+    def test_search_by_email_prefix_ignores_case(self):
+        joao = self.member("João", "Conceição", email="Joao.Conceicao@Example.com")
+        self.member("Maria", "Silva", email="maria@example.com")
+        url = reverse("secretarial:members-directory")
+
+        for term in ("joao.c", "JOAO.CONCEICAO@EX"):
+            results = self.client.get(url, {"q": term}).json()["results"]
+            self.assertEqual([r["id"] for r in results], [joao.pk], term)
+
+        joao.email = "pedro@example.com"
+        joao.save(update_fields=["email"])
+        self.assertEqual(self.client.get(url, {"q": "pedro@"}).json()["count"], 1)
+
+    def test_directory_is_paginated_and_filtered(self):
+        for i in range(25):
+            self.member(f"Membro{i:02d}", "Teste")
+        self.member("Pastor", "Teste", type=CustomUser.Types.STAFF, is_pastor=True)
+        url = reverse("secretarial:members-directory")
+
+        data = self.client.get(url, {"page": 2}).json()
+        self.assertEqual(data["count"], 26)
+        self.assertEqual(data["num_pages"], 2)
+        self.assertEqual(len(data["results"]), 6)
+
+        data = self.client.get(url, {"function": "pastor"}).json()
+        self.assertEqual([r["first_name"] for r in data["results"]], ["Pastor"])
+
+    def test_directory_cache_is_invalidated_on_user_write(self):
+        member = self.member("Ana", "Souza")
+        url = reverse("secretarial:members-directory")
+        self.assertEqual(self.client.get(url, {"q": "ana"}).json()["count"], 1)
+
+        member.first_name = "Beatriz"
+        member.save()
+
+        self.assertEqual(self.client.get(url, {"q": "ana"}).json()["count"], 0)
+        self.assertEqual(self.client.get(url, {"q": "beatriz"}).json()["count"], 1)
+
+    def test_stats_come_from_one_query(self):
+        from users.services import MembershipService
+
+        self.member("Paulo", "Pastor", type=CustomUser.Types.STAFF, is_pastor=True)
+        self.member("Rita", "Regular")
+        baker.make(CustomUser, type=CustomUser.Types.CONGREGATED, _quantity=2)
+
+        with self.assertNumQueries(1):
+            stats = MembershipService().stats()
+
+        self.assertEqual(stats["members"], 2)
+        self.assertEqual(stats["visitors"], 2)
+        self.assertEqual(stats["pastors"], 1)
+        self.assertEqual(stats["non_members"], stats["total"] - 2)
+
+    def test_home_queries_do_not_grow_with_membership(self):
+        url = reverse("secretarial:home")
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(url)
+
+        baker.make(CustomUser, type=CustomUser.Types.REGULAR, _quantity=20)
+        cache.clear()
+        with CaptureQueriesContext(connection) as large:
+            self.client.get(url)
+
+        self.assertEqual(len(small), len(large))
+
+    def test_unified_search_is_accent_insensitive(self):
+        joao = self.member("João", "Conceição")
+        response = self.client.post(
+            reverse("secretarial-search"), {"category": "members", "searched": "conceicao"})
+        self.assertEqual([user["id"] for user in response.json()], [joao.pk])
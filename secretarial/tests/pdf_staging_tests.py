@@ -0,0 +1,101 @@
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from secretarial.models import MinuteFileModel
+from secretarial.utils import pdf_staging
+
+PDF_CONTENT = b"%PDF-1.4 " + b"0" * 4096
+
+
+class PDFStagingTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = get_user_model().objects.create_user(
+            username="secretary", email="secretary@example.com", password="password123",
+            type=get_user_model().Types.STAFF, is_pastor=True, is_secretary=True,
+        )
+        self.user.user_permissions.add(Permission.objects.get(codename="add_meetingminutemodel"))
+        self.client.login(username="secretary", password="password123")
+
+    def upload(self, name="ata.pdf"):
+        return SimpleUploadedFile(name, PDF_CONTENT, content_type="application/pdf")
+
+    def staged_tokens(self):
+        if not default_storage.exists(pdf_staging.STAGING_DIR):
+            return []
+        return default_storage.listdir(pdf_staging.STAGING_DIR)[0]
+
+    def test_stage_and_open(self):
+        token = pdf_staging.stage_pdf(self.upload("ata de março.pdf"))
+
+        name, staged_file = pdf_staging.open_staged_pdf(token)
+        with staged_file:
+            self.assertEqual(staged_file.read(), PDF_CONTENT)
+        self.assertEqual(name, "ata_de_março.pdf")
+
+        pdf_staging.discard_staged_pdf(token)
+        self.assertIsNone(pdf_staging.open_staged_pdf(token))
+        self.assertEqual(self.staged_tokens(), [])
+
+    def test_invalid_token_is_ignored(self):
+        self.assertIsNone(pdf_staging.open_staged_pdf("../../etc"))
+
+    def test_purge_removes_only_expired(self):
+        token = pdf_staging.stage_pdf(self.upload())
+
+        self.assertEqual(pdf_staging.purge_expired_stagings(), 0)
+        self.assertEqual(self.staged_tokens(), [token])
+
+        later = time.time() + pdf_staging.get_ttl() + 1
+        self.assertEqual(pdf_staging.purge_expired_stagings(now=later), 1)
+        self.assertEqual(self.staged_tokens(), [])
+
+    @override_settings(PDF_IMPORT_STAGING_TTL=0)
+    def test_purge_command(self):
+        pdf_staging.stage_pdf(self.upload())
+        with mock.patch("time.time", return_value=time.time() + 1):
+            call_command("purge_pdf_stagings", stdout=mock.MagicMock())
+        self.assertEqual(self.staged_tokens(), [])
+
+    @mock.patch("secretarial.views.pdf_import_view.extract_text_from_pdf", return_value="Texto da ata")
+    def test_import_keeps_only_token_in_session(self, _extract):
+        response = self.client.post(reverse("secretarial:pdf-import"), {"pdf_file": self.upload()})
+        self.assertEqual(response.status_code, 302)
+
+        session = self.client.session
+        self.assertNotIn("pdf_attachment", session)
+        token = session[pdf_staging.SESSION_KEY]
+        self.assertLess(len(token), 64)
+
+        response = self.client.post(
+            reverse("secretarial:create-minute-view"),
+            {
+                "president": self.user.pk,
+                "secretary": self.user.pk,
+                "meeting_date": "2024-03-10",
+                "body": "Texto da ata",
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+
+        attachment = MinuteFileModel.objects.get()
+        with attachment.file.open("rb") as f:
+            self.assertEqual(f.read(), PDF_CONTENT)
+        self.assertEqual(attachment.description, "PDF importado - ata.pdf")
+        self.assertNotIn(pdf_staging.SESSION_KEY, self.client.session)
+        self.assertEqual(self.staged_tokens(), [])
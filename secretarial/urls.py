@@ -3,6 +3,7 @@ from secretarial.views import (
     SecretarialHomeView,
     MinutesEditorView,
     UsersQualifyingListView,
+    MembersDirectoryView,
     UserDetailQualifyingView,
     UserDeleteView,
     MinuteHomeView,
@@ -44,6 +45,7 @@ urlpatterns = [
     path("", SecretarialHomeView.as_view(), name="home"),
     path("minute", MinutesEditorView.as_view(), name="minutes-editor"),
     path("users", UsersQualifyingListView.as_view(), name="users-qualifying"),
+    path("users/directory", MembersDirectoryView.as_view(), name="members-directory"),
     path("user/<int:pk>/", UserDetailQualifyingView.as_view(), name="user-qualify"),
     path("user/<int:pk>/delete/", UserDeleteView.as_view(), name="delete-user"),
     path("user/<int:pk>/send-password", SendPasswordEmailView.as_view(), name="send-password-email"),
@@ -0,0 +1,119 @@
+"""
+Staging dos PDFs importados para atas.
+
+O PDF enviado em PDFImportView é gravado em partes no storage padrão, em
+``staging/minute_pdfs/<token>/<nome>``, e a sessão guarda apenas o token.
+A ata criada depois reabre o arquivo pelo token. O token começa com o
+instante do envio, então a limpeza dos envios expirados
+(``purge_pdf_stagings``) não precisa consultar datas no storage.
+"""
+import os
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils.text import get_valid_filename
+
+STAGING_DIR = 'staging/minute_pdfs'
+SESSION_KEY = 'pdf_staging_token'
+
+_TOKEN_RE = re.compile(r'^(?P<created>\d+)_[0-9a-f]{32}$')
+
+
+def get_ttl():
+    return getattr(settings, 'PDF_IMPORT_STAGING_TTL', 60 * 60 * 24)
+
+
+def _token_age(token, now=None):
+    """Idade do token em segundos, ou None se o token for inválido."""
+    match = _TOKEN_RE.match(token or '')
+    if not match:
+        return None
+    return (now or time.time()) - int(match.group('created'))
+
+
+def _token_dir(token):
+    return f'{STAGING_DIR}/{token}'
+
+
+def stage_pdf(uploaded_file):
+    """
+    Grava o arquivo enviado no staging.
+
+    O storage lê o arquivo em partes (``chunks()``), sem carregá-lo inteiro
+    em memória.
+
+    Returns:
+        Token do staging
+    """
+    token = f'{int(time.time())}_{uuid.uuid4().hex}'
+    name = get_valid_filename(os.path.basename(uploaded_file.name)) or 'documento.pdf'
+    uploaded_file.seek(0)
+    default_storage.save(f'{_token_dir(token)}/{name}', uploaded_file)
+    return token
+
+
+def open_staged_pdf(token):
+    """
+    Abre o PDF de um staging ainda válido.
+
+    Returns:
+        Tupla (nome original, arquivo aberto) ou None se expirado/inexistente
+    """
+    age = _token_age(token)
+    if age is None:
+        return None
+    if age > get_ttl():
+        discard_staged_pdf(token)
+        return None
+
+    try:
+        _, files = default_storage.listdir(_token_dir(token))
+    except FileNotFoundError:
+        return None
+    if not files:
+        return None
+    name = files[0]
+    return name, default_storage.open(f'{_token_dir(token)}/{name}', 'rb')
+
+
+def _remove(directory):
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for name in files:
+        default_storage.delete(f'{directory}/{name}')
+    # FileSystemStorage remove o diretório vazio; em S3 não há o que remover
+    default_storage.delete(directory)
+
+
+def discard_staged_pdf(token):
+    """Remove os arquivos de um staging."""
+    if _token_age(token) is not None:
+        _remove(_token_dir(token))
+
+
+def purge_expired_stagings(now=None):
+    """
+    Remove os stagings mais antigos que o TTL (e pastas com nome inválido).
+
+    Returns:
+        Quantidade de stagings removidos
+    """
+    try:
+        tokens, _ = default_storage.listdir(STAGING_DIR)
+    except FileNotFoundError:
+        return 0
+
+    ttl = get_ttl()
+    purged = 0
+    for token in tokens:
+        age = _token_age(token, now)
+        if age is not None and age <= ttl:
+            continue
+        _remove(_token_dir(token))
+        purged += 1
+    return purged
@@ -1,6 +1,6 @@
 from .secretarial_home_view import SecretarialHomeView
 from .minutes_editor_view import MinutesEditorView
-from .users_qualifying_list_view import UsersQualifyingListView
+from .users_qualifying_list_view import UsersQualifyingListView, MembersDirectoryView
 from .user_detail_qualifying_view import UserDetailQualifyingView
 from .minute_home_view import MinuteHomeView
 from .create_minute_project_view import CreateMinuteProjectView
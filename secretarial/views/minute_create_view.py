@@ -1,9 +1,10 @@
 from django.views.generic import CreateView
-from django.core.files.base import ContentFile
+from django.core.files import File
 from secretarial.forms import MinuteModelForm
 from secretarial.models import (
     MinuteProjectModel, MeetingMinuteModel, MinuteExcerptsModel, MinuteFileModel)
 from django.contrib.auth.mixins import PermissionRequiredMixin
+from secretarial.utils import pdf_staging
 import reversion
 
 
@@ -39,27 +40,22 @@ class MinuteCreateView(PermissionRequiredMixin, CreateView):
             reversion.set_user(self.request.user)
             response = super().form_valid(form)
 
-        # Verificar se há um PDF na sessão para anexar
-        pdf_attachment = self.request.session.get('pdf_attachment')
-        if pdf_attachment:
+        # Verificar se há um PDF em staging para anexar
+        token = self.request.session.pop(pdf_staging.SESSION_KEY, None)
+        if token:
+            self.request.session.pop('pdf_project_id', None)
             try:
-                # Decodificar o conteúdo base64 de volta para bytes
-                import base64
-                pdf_content = base64.b64decode(pdf_attachment['content'])
-                # Criar o arquivo a partir do conteúdo armazenado
-                pdf_file = ContentFile(pdf_content, name=pdf_attachment['name'])
-
-                # Criar o anexo
-                MinuteFileModel.objects.create(
-                    minute=self.object,
-                    file=pdf_file,
-                    description=f"PDF importado - {pdf_attachment['name']}"
-                )
-
-                # Limpar a sessão
-                del self.request.session['pdf_attachment']
-                if 'pdf_project_id' in self.request.session:
-                    del self.request.session['pdf_project_id']
+                staged = pdf_staging.open_staged_pdf(token)
+                if staged:
+                    name, staged_file = staged
+                    with staged_file:
+                        # O storage copia o arquivo em partes
+                        MinuteFileModel.objects.create(
+                            minute=self.object,
+                            file=File(staged_file, name=name),
+                            description=f"PDF importado - {name}"
+                        )
+                pdf_staging.discard_staged_pdf(token)
 
             except Exception as e:
                 # Log do erro, mas não falhar a criação da ata
@@ -6,6 +6,7 @@ from django.urls import reverse
 from django.core.files.base import ContentFile
 from secretarial.forms import PDFImportForm
 from secretarial.utils.ai_utils import extract_text_from_pdf
+from secretarial.utils import pdf_staging
 from secretarial.models import MinuteProjectModel
 from datetime import date
 import os
@@ -43,16 +44,12 @@ class PDFImportView(PermissionRequiredMixin, FormView):
         )
         minute_project.save()
 
-        # Salvar o arquivo PDF temporariamente na sessão
+        # Gravar o PDF em staging; a sessão guarda apenas o token.
         # Será anexado à ata quando ela for criada
-        import base64
-        pdf_content = pdf_file.read()
-        self.request.session['pdf_attachment'] = {
-            'name': pdf_file.name,
-            'content': base64.b64encode(pdf_content).decode('utf-8'),  # Converter para base64
-            'content_type': pdf_file.content_type,
-            'size': len(pdf_content)
-        }
+        previous_token = self.request.session.get(pdf_staging.SESSION_KEY)
+        if previous_token:
+            pdf_staging.discard_staged_pdf(previous_token)
+        self.request.session[pdf_staging.SESSION_KEY] = pdf_staging.stage_pdf(pdf_file)
         self.request.session['pdf_project_id'] = minute_project.pk
 
         messages.success(self.request, 'Texto extraído do PDF com sucesso! Você pode editar a ata gerada.')
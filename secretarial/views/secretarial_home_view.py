@@ -1,7 +1,6 @@
 from django.views.generic import TemplateView
-from users.models import CustomUser
-from django.db.models import Q
 from secretarial.mixins import IsSecretarialUserMixin
+from users.services import MembershipService
 
 
 class SecretarialHomeView(IsSecretarialUserMixin, TemplateView):
@@ -10,14 +9,10 @@ class SecretarialHomeView(IsSecretarialUserMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        number_of_members = CustomUser.objects.filter(
-            Q(type=CustomUser.Types.REGULAR) | Q(type=CustomUser.Types.STAFF)
-        ).count()
-        number_of_visitors = CustomUser.objects.filter(
-            type=CustomUser.Types.CONGREGATED
-        ).count()
+        stats = MembershipService().stats()
 
-        context["number_of_members"] = number_of_members
-        context["number_of_visitors"] = number_of_visitors
-        context["total_members"] = number_of_members + number_of_visitors
+        context["membership_stats"] = stats
+        context["number_of_members"] = stats["members"]
+        context["number_of_visitors"] = stats["visitors"]
+        context["total_members"] = stats["total_members"]
         return context
@@ -1,7 +1,20 @@
+from django.core.paginator import Paginator
+from django.http import JsonResponse
+from django.views import View
 from django.views.generic import TemplateView
-from users.models import CustomUser
-from django.db.models import Q
 from django.contrib.auth.mixins import PermissionRequiredMixin
+from users.services import MembershipService
+
+NON_MEMBERS_PAGE_SIZE = 50
+
+
+def directory_params(params):
+    return {
+        "search": params.get("q", "").strip(),
+        "approval": params.get("approval", ""),
+        "function": params.get("function", ""),
+        "page": params.get("page", 1),
+    }
 
 
 class UsersQualifyingListView(PermissionRequiredMixin, TemplateView):
@@ -10,12 +23,21 @@ class UsersQualifyingListView(PermissionRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        membership = MembershipService()
 
-        context["members"] = CustomUser.objects.filter(
-            Q(type=CustomUser.Types.REGULAR) | Q(type=CustomUser.Types.STAFF)
-        )
-        context["users"] = CustomUser.objects.exclude(
-            Q(type=CustomUser.Types.REGULAR) | Q(type=CustomUser.Types.STAFF)
-        )
+        # Primeira página do diretório; as demais vêm de MembersDirectoryView
+        context["stats"] = membership.stats()
+        context["members"] = membership.directory(**directory_params(self.request.GET))
+        context["users"] = Paginator(
+            membership.non_members().order_by("search_name", "id"), NON_MEMBERS_PAGE_SIZE
+        ).get_page(self.request.GET.get("users_page"))
 
         return context
+
+
+class MembersDirectoryView(PermissionRequiredMixin, View):
+    """Diretório paginado de membros em JSON (busca por prefixo sem acentos)."""
+    permission_required = "users.add_customuser"
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(MembershipService().directory(**directory_params(request.GET)))
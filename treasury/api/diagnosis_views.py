@@ -7,8 +7,6 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, BasePermission
 
-from django.db import models as db_models
-
 from treasury.models import (
     AccountingPeriod,
     TransactionModel,
@@ -19,6 +17,7 @@ from treasury.models import (
     FrozenReport,
     CategoryModel,
 )
+from treasury.services.diagnosis_service import DiagnosisService
 
 
 class IsSuperUser(BasePermission):
@@ -30,172 +29,7 @@ class DiagnosisView(APIView):
     permission_classes = [IsAuthenticated, IsSuperUser]
 
     def get(self, request):
-        report = {
-            'generated_at': request.META.get('HTTP_DATE', ''),
-            'summary': self._get_summary(),
-            'periods': [],
-            'issues': [],
-            'snapshots': self._get_snapshots(),
-            'audit_recent': self._get_recent_audit(),
-        }
-        report['periods'] = self._get_periods()
-        report['issues'] = self._collect_issues(report['periods'])
-        return Response(report)
-
-    def _get_summary(self):
-        periods = AccountingPeriod.objects.all()
-        transactions = TransactionModel.objects.filter(transaction_type='original')
-        orphans = TransactionModel.objects.filter(accounting_period__isnull=True)
-        return {
-            'total_periods': periods.count(),
-            'open_periods': periods.filter(status='open').count(),
-            'closed_periods': periods.filter(status='closed').count(),
-            'archived_periods': periods.filter(status='archived').count(),
-            'total_transactions': transactions.count(),
-            'orphan_transactions': orphans.count(),
-            'total_snapshots': PeriodSnapshot.objects.count(),
-            'first_period': str(periods.order_by('month').first()) if periods.exists() else None,
-            'last_period': str(periods.order_by('-month').first()) if periods.exists() else None,
-        }
-
-    def _get_periods(self):
-        periods = AccountingPeriod.objects.all().order_by('month')
-        result = []
-        prev_period = None
-        for period in periods:
-            transactions = TransactionModel.objects.filter(
-                accounting_period=period, transaction_type='original',
-            )
-            reversal_tx = TransactionModel.objects.filter(
-                accounting_period=period, transaction_type='reversal',
-            )
-            reversals = ReversalTransaction.objects.filter(
-                db_models.Q(original_transaction__accounting_period=period)
-                | db_models.Q(reversal_transaction__accounting_period=period)
-            )
-
-            positive = transactions.filter(is_positive=True, amount__gt=0).aggregate(
-                t=db_models.Sum('amount')
-            )['t'] or Decimal('0.00')
-            neg_new = transactions.filter(is_positive=False, amount__gt=0).aggregate(
-                t=db_models.Sum('amount')
-            )['t'] or Decimal('0.00')
-            neg_old = transactions.filter(is_positive=False, amount__lt=0).aggregate(
-                t=db_models.Sum('amount')
-            )['t'] or Decimal('0.00')
-            net = positive + neg_old - neg_new
-
-            pd = {
-                'id': period.id,
-                'month': str(period.month),
-                'month_label': f'{period.month_name}/{period.year}',
-                'status': period.status,
-                'is_first_month': period.is_first_month,
-                'opening_balance': float(period.opening_balance),
-                'closing_balance': float(period.closing_balance) if period.closing_balance else None,
-                'closed_at': period.closed_at.isoformat() if period.closed_at else None,
-                'closed_by': str(period.closed_by) if period.closed_by else None,
-                'transactions_count': transactions.count(),
-                'reversal_count': reversal_tx.count(),
-                'total_positive': float(positive),
-                'total_negative_new': float(neg_new),
-                'total_negative_old': float(neg_old),
-                'net': float(net),
-                'calculated_balance': float(period.opening_balance + net),
-                'has_monthly_report': MonthlyReportModel.objects.filter(month=period.month).exists(),
-                'has_frozen_report': FrozenReport.objects.filter(period=period).exists(),
-                'issues': [],
-                'chain_ok': True,
-            }
-
-            if prev_period and prev_period.closing_balance is not None:
-                if period.opening_balance != prev_period.closing_balance:
-                    pd['chain_ok'] = False
-                    pd['issues'].append({
-                        'severity': 'error', 'type': 'chain_broken',
-                        'message': f'opening ({period.opening_balance}) != closing anterior ({prev_period.closing_balance})',
-                    })
-
-            if period.status == 'closed' and period.closing_balance is not None:
-                calculated = period.opening_balance + net
-                if abs(period.closing_balance - calculated) > Decimal('0.01'):
-                    pd['issues'].append({
-                        'severity': 'error', 'type': 'closing_mismatch',
-                        'message': f'closing ({period.closing_balance}) != calculado ({calculated})',
-                    })
-
-            has_old = transactions.filter(is_positive=False, amount__lt=0).exists()
-            has_new = transactions.filter(is_positive=False, amount__gt=0).exists()
-            if has_old and has_new:
-                pd['issues'].append({
-                    'severity': 'warning', 'type': 'mixed_sign',
-                    'message': 'Mistura de padrões de sinal',
-                })
-
-            linked_wrong = TransactionModel.objects.filter(
-                date__year=period.month.year,
-                date__month=period.month.month,
-            ).exclude(accounting_period=period).exclude(accounting_period__isnull=True)
-            if linked_wrong.exists():
-                pd['issues'].append({
-                    'severity': 'warning', 'type': 'wrong_link',
-                    'message': f'{linked_wrong.count()} transações com data aqui vinculadas a outro período',
-                })
-
-            result.append(pd)
-            prev_period = period
-
-        return result
-
-    def _collect_issues(self, periods_data):
-        issues = []
-        orphans = TransactionModel.objects.filter(accounting_period__isnull=True)
-        if orphans.exists():
-            issues.append({
-                'severity': 'error', 'type': 'orphan_transactions',
-                'message': f'{orphans.count()} transações sem período',
-            })
-        for pd in periods_data:
-            for issue in pd.get('issues', []):
-                issue['period'] = pd['month_label']
-                issues.append(issue)
-        issues.sort(key=lambda x: 0 if x['severity'] == 'error' else 1)
-        return issues
-
-    def _get_snapshots(self):
-        snapshots = PeriodSnapshot.objects.all().order_by('-created_at')[:20]
-        return [
-            {
-                'id': str(s.id),
-                'period_label': f'{s.period_month:02d}/{s.period_year}',
-                'created_at': s.created_at.isoformat(),
-                'created_by': s.created_by_name or '-',
-                'reason': s.reason,
-                'transactions_count': s.transactions_count,
-                'closing_balance': float(s.closing_balance) if s.closing_balance else None,
-                'was_closed': s.was_closed,
-            }
-            for s in snapshots
-        ]
-
-    def _get_recent_audit(self):
-        try:
-            logs = AuditLog.objects.filter(
-                entity_type__in=['AccountingPeriod', 'TransactionModel']
-            ).order_by('-timestamp')[:30]
-            return [
-                {
-                    'timestamp': log.timestamp.isoformat(),
-                    'action': log.action,
-                    'user_name': log.user_name or '-',
-                    'entity_type': log.entity_type,
-                    'entity_id': log.entity_id,
-                    'description': log.description,
-                }
-                for log in logs
-            ]
-        except Exception:
-            return []
+        return Response(DiagnosisService().build_report())
 
 
 class DiagnosisSnapshotView(APIView):
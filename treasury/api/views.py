@@ -3,16 +3,17 @@ from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, BasePermission
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Sum, F, DecimalField, Count, Case, When, Value
-from django.db.models.functions import Coalesce, TruncMonth
+from django.db.models import Q, Sum, DecimalField, Count
+from django.db.models.functions import Coalesce
 from django.db import transaction
 from django.utils import timezone
 from decimal import Decimal
 from datetime import datetime, timedelta
 from calendar import month_name, monthrange
 import locale
+import logging
 
 # Try to import DjangoFilterBackend, fall back to search filter if not available
 try:
@@ -22,6 +23,7 @@ except ImportError:
     from rest_framework.filters import SearchFilter as DjangoFilterBackend
     HAS_DJANGO_FILTERS = False
 
+from core.views.protected_media_view import protected_media_url
 from treasury.models import (
     AccountingPeriod,
     TransactionModel,
@@ -35,7 +37,7 @@ from treasury.serializers import (
     AccountingPeriodSerializer,
     AccountingPeriodCloseSerializer,
     TransactionSerializer,
-    TransactionListSerializer,
+    TransactionRowSerializer,
     TransactionCreateSerializer,
     TransactionUpdateSerializer,
     ReversalTransactionSerializer,
@@ -43,8 +45,13 @@ from treasury.serializers import (
     CategorySerializer,
     CategoryDetailSerializer,
 )
+from treasury.services.chart_series_service import ChartSeriesService
 from treasury.services.period_service import PeriodService
+from treasury.services.receipt_storage_service import ReceiptStorageService
 from treasury.services.transaction_service import TransactionService
+from users.capabilities import TREASURY_ADMIN, TREASURY_VIEWER, has_capability
+
+logger = logging.getLogger(__name__)
 
 
 class IsTreasuryUser(BasePermission):
@@ -62,21 +69,7 @@ class IsTreasuryUser(BasePermission):
     Congregados e usuários simples NÃO têm acesso.
     """
     def has_permission(self, request, view):
-        user = request.user
-        if not user.is_authenticated:
-            return False
-
-        # Membros regulares podem visualizar
-        if user.type == "REGULAR":
-            return True
-
-        # Staff e funções especiais
-        return (
-            user.is_treasurer or
-            user.is_secretary or
-            user.is_pastor or
-            user.is_staff
-        )
+        return has_capability(request.user, TREASURY_VIEWER)
 
 
 class IsTreasurerOnly(BasePermission):
@@ -91,21 +84,7 @@ class IsTreasurerOnly(BasePermission):
     - Superuser (is_superuser)
     """
     def has_permission(self, request, view):
-        user = request.user
-        if not user.is_authenticated:
-            return False
-
-        # Superuser pode tudo
-        if user.is_superuser:
-            return True
-
-        # Admins da tesouraria
-        return (
-            user.is_treasurer or
-            user.is_secretary or
-            user.is_pastor or
-            user.is_staff
-        )
+        return has_capability(request.user, TREASURY_ADMIN)
 
 
 class IsAdminUser(BasePermission):
@@ -113,14 +92,7 @@ class IsAdminUser(BasePermission):
     Permissão para administradores da tesouraria.
     """
     def has_permission(self, request, view):
-        user = request.user
-        return user.is_authenticated and (
-            user.is_staff or
-            user.is_superuser or
-            user.is_treasurer or
-            user.is_secretary or
-            user.is_pastor
-        )
+        return has_capability(request.user, TREASURY_ADMIN)
 
 
 class CategoryViewSet(viewsets.ModelViewSet):
@@ -157,17 +129,17 @@ class CategoryViewSet(viewsets.ModelViewSet):
     def transactions(self, request, pk=None):
         """Lista todas as transações de uma categoria."""
         category = self.get_object()
-        transactions = category.transactions.select_related(
-            'user', 'category', 'accounting_period'
-        ).order_by('-date', '-created_at')
+        transactions = category.transactions.order_by(
+            '-date', '-created_at'
+        ).values(*TransactionRowSerializer.VALUES)
 
         # Paginação
         page = self.paginate_queryset(transactions)
         if page is not None:
-            serializer = TransactionListSerializer(page, many=True)
+            serializer = TransactionRowSerializer(page, many=True)
             return self.get_paginated_response(serializer.data)
 
-        serializer = TransactionListSerializer(transactions, many=True)
+        serializer = TransactionRowSerializer(transactions, many=True)
         return Response(serializer.data)
 
 
@@ -206,11 +178,11 @@ class AccountingPeriodViewSet(viewsets.ReadOnlyModelViewSet):
     def transactions(self, request, pk=None):
         """Lista todas as transações de um período."""
         period = self.get_object()
-        transactions = period.transactions.select_related(
-            'user', 'category', 'created_by'
-        ).filter(transaction_type='original').order_by('-date', '-created_at')
+        transactions = period.transactions.filter(
+            transaction_type='original'
+        ).order_by('-date', '-created_at').values(*TransactionRowSerializer.VALUES)
 
-        serializer = TransactionListSerializer(transactions, many=True)
+        serializer = TransactionRowSerializer(transactions, many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'])
@@ -403,11 +375,26 @@ class AccountingPeriodViewSet(viewsets.ReadOnlyModelViewSet):
             )
 
 
+class TransactionCursorPagination(CursorPagination):
+    """
+    Paginação por cursor da listagem de transações.
+
+    A ordem (date, created_at, id) é servida pelo índice composto da
+    TransactionModel, então cada página custa o mesmo em qualquer ponto
+    do histórico.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-date', '-created_at', '-id')
+
+
 class TransactionViewSet(viewsets.ModelViewSet):
     """
     ViewSet para gerenciar transações.
 
-    * list: Lista transações com filtros
+    * list: Lista transações com filtros (paginação por cursor; com ``page``
+      usa a paginação por número de página)
     * retrieve: Detalhes de uma transação
     * create: Criar nova transação
     * update: Atualizar transação (apenas período aberto)
@@ -418,7 +405,7 @@ class TransactionViewSet(viewsets.ModelViewSet):
     filterset_fields = ['category', 'is_positive', 'accounting_period', 'transaction_type']
     search_fields = ['description']
     ordering_fields = ['date', 'amount', 'created_at']
-    ordering = ['-date', '-created_at']
+    ordering = ['-date', '-created_at', '-id']
 
     def get_filter_backends(self):
         backends = [filters.SearchFilter, filters.OrderingFilter]
@@ -426,11 +413,27 @@ class TransactionViewSet(viewsets.ModelViewSet):
             backends.insert(0, DjangoFilterBackend)
         return backends
 
+    @property
+    def paginator(self):
+        """Cursor na listagem; número de página quando o cliente envia ``page``."""
+        if not hasattr(self, '_paginator'):
+            if self.action == 'list' and 'page' not in self.request.query_params:
+                self._paginator = TransactionCursorPagination()
+            else:
+                self._paginator = PageNumberPagination()
+        return self._paginator
+
     def get_queryset(self):
         """Retorna queryset de transações com filtros adicionais."""
-        queryset = TransactionModel.objects.select_related(
-            'user', 'category', 'accounting_period', 'created_by'
-        ).prefetch_related('reversals')
+        if self.action == 'list':
+            # Linhas enxutas: só as colunas do TransactionRowSerializer
+            queryset = TransactionModel.objects.values(*TransactionRowSerializer.VALUES)
+        else:
+            queryset = TransactionModel.objects.select_related(
+                'user', 'category', 'accounting_period', 'created_by'
+            )
+            if self.action == 'retrieve':
+                queryset = queryset.prefetch_related('reversals')
 
         # Filtro por período (aceita ambos: period_id e accounting_period)
         period_id = self.request.query_params.get('period_id') or self.request.query_params.get('accounting_period')
@@ -440,21 +443,23 @@ class TransactionViewSet(viewsets.ModelViewSet):
         # Filtro por data (início e fim) - garantir que seja apenas data, não datetime
         date_from = self.request.query_params.get('date_from')
         date_to = self.request.query_params.get('date_to')
-        print(f'[DATE FILTER] date_from={date_from} date_to={date_to}', flush=True)
         if date_from:
             try:
                 date_from_obj = datetime.strptime(date_from, '%Y-%m-%d').date()
                 queryset = queryset.filter(date__gte=date_from_obj)
-                print(f'[DATE FILTER] filtering date__gte={date_from_obj}', flush=True)
-            except ValueError as e:
-                print(f'[DATE FILTER] invalid date_from: {e}', flush=True)
+            except ValueError:
+                logger.debug('Filtro date_from inválido ignorado', extra={'date_from': date_from})
         if date_to:
             try:
                 date_to_obj = datetime.strptime(date_to, '%Y-%m-%d').date()
                 queryset = queryset.filter(date__lte=date_to_obj)
-                print(f'[DATE FILTER] filtering date__lte={date_to_obj}', flush=True)
-            except ValueError as e:
-                print(f'[DATE FILTER] invalid date_to: {e}', flush=True)
+            except ValueError:
+                logger.debug('Filtro date_to inválido ignorado', extra={'date_to': date_to})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Filtros da listagem de transações',
+                extra={'action': self.action, 'period_id': period_id, 'date_from': date_from, 'date_to': date_to},
+            )
 
         # Filtro por tipo (excluir reversals por padrão, exceto para action summary)
         show_reversals = self.request.query_params.get('show_reversals', 'false') == 'true'
@@ -466,7 +471,7 @@ class TransactionViewSet(viewsets.ModelViewSet):
 
     def get_serializer_class(self):
         if self.action == 'list':
-            return TransactionListSerializer
+            return TransactionRowSerializer
         elif self.action == 'create':
             return TransactionCreateSerializer
         elif self.action in ['update', 'partial_update']:
@@ -921,7 +926,7 @@ class FrozenReportViewSet(viewsets.ReadOnlyModelViewSet):
                 },
                 'report_type': report.report_type,
                 'report_type_label': report.get_report_type_display(),
-                'pdf_file': report.pdf_file.url if report.pdf_file else None,
+                'pdf_file': protected_media_url('frozen-report', report) if report.pdf_file else None,
                 'pdf_hash': report.pdf_hash,
                 'closing_balance': float(report.closing_balance),
                 'total_positive': float(report.total_positive),
@@ -951,7 +956,7 @@ class FrozenReportViewSet(viewsets.ReadOnlyModelViewSet):
             },
             'report_type': report.report_type,
             'report_type_label': report.get_report_type_display(),
-            'pdf_file': report.pdf_file.url if report.pdf_file else None,
+            'pdf_file': protected_media_url('frozen-report', report) if report.pdf_file else None,
             'pdf_hash': report.pdf_hash,
             'verification': verification,
             'closing_balance': float(report.closing_balance),
@@ -1289,9 +1294,8 @@ class BatchTransactionCreateView(APIView):
         # Salvar comprovante uma vez (se fornecido)
         receipt_path = None
         if receipt_file:
-            from django.core.files.storage import default_storage
-            # Salvar e obter o caminho
-            receipt_path = default_storage.save(f'treasury/receipts/batch_{receipt_file.name}', receipt_file)
+            # Mesmo arquivo já enviado antes reaproveita o objeto no storage
+            receipt_path = ReceiptStorageService.store(receipt_file)
 
         created_transactions = []
         errors = []
@@ -1358,67 +1362,14 @@ class CashflowChartView(APIView):
             else:
                 end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
 
-            # Get transactions grouped by month
-            transactions = TransactionModel.objects.filter(
-                date__gte=start_date,
-                date__lte=end_date,
-                transaction_type='original'
-            ).annotate(
-                month=TruncMonth('date')
-            ).values('month').annotate(
-                revenues=Sum(Case(When(is_positive=True, then=F('amount')), default=Decimal('0.00'), output_field=DecimalField())),
-                expenses_signed=Sum(Case(When(is_positive=False, amount__lt=0, then=F('amount')), default=Decimal('0.00'), output_field=DecimalField())),
-                expenses_unsigned=Sum(Case(When(is_positive=False, amount__gt=0, then=F('amount')), default=Decimal('0.00'), output_field=DecimalField()))
-            ).order_by('month')
-
-            months = []
-            revenues = []
-            expenses = []
-            balance = []
-            running_balance = Decimal('0.00')
-
-            initial_balance = TransactionModel.objects.filter(
-                date__lt=start_date,
-                transaction_type='original'
-            ).aggregate(
-                initial_revenue=Sum(Case(When(is_positive=True, then=F('amount')), default=Decimal('0.00'), output_field=DecimalField())),
-                initial_exp_signed=Sum(Case(When(is_positive=False, amount__lt=0, then=F('amount')), default=Decimal('0.00'), output_field=DecimalField())),
-                initial_exp_unsigned=Sum(Case(When(is_positive=False, amount__gt=0, then=F('amount')), default=Decimal('0.00'), output_field=DecimalField()))
-            )
-            running_balance = (initial_balance['initial_revenue'] or Decimal('0.00')) + (initial_balance['initial_exp_signed'] or Decimal('0.00')) - (initial_balance['initial_exp_unsigned'] or Decimal('0.00'))
-
-            for tx in transactions:
-                month_label = self._get_month_name(tx['month'].month, tx['month'].year)
-                months.append(month_label)
-
-                rev = float(tx['revenues'] or Decimal('0.00'))
-                exp_val = float((tx['expenses_signed'] or Decimal('0.00')) - (tx['expenses_unsigned'] or Decimal('0.00')))
-                revenues.append(rev)
-                expenses.append(abs(exp_val))
-
-                running_balance += Decimal(str(rev)) + Decimal(str(exp_val))
-                balance.append(float(running_balance))
-
-            return Response({
-                'categories': months,
-                'series': [
-                    {'name': 'Receitas', 'data': revenues},
-                    {'name': 'Despesas', 'data': expenses},
-                    {'name': 'Saldo Acumulado', 'data': balance}
-                ]
-            })
+            # Colunar, em centavos: labels, revenues, expenses e balance
+            return Response(ChartSeriesService(start_date, end_date).cashflow())
 
         except ValueError as e:
             return Response({'error': f'Formato de data inválido: {e}'}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    def _get_month_name(self, month, year):
-        """Retorna o nome do mês em português."""
-        months_pt = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-        return f"{months_pt[month - 1]}/{str(year)[2:]}"
-
-
 class RevenuesByCategoryChartView(APIView):
     """
     API para dados do gráfico de receitas por categoria.
@@ -1444,30 +1395,8 @@ class RevenuesByCategoryChartView(APIView):
             else:
                 end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
 
-            # Get revenues by category
-            categories = TransactionModel.objects.filter(
-                date__gte=start_date,
-                date__lte=end_date,
-                is_positive=True,
-                transaction_type='original'
-            ).values(
-                category_name=Coalesce('category__name', Value('Sem categoria'))
-            ).annotate(
-                total=Sum('amount')
-            ).order_by('-total')
-
-            labels = []
-            values = []
-
-            for cat in categories:
-                labels.append(cat['category_name'])
-                values.append(float(cat['total']))
-
-            return Response({
-                'labels': labels,
-                'values': values,
-                'total': sum(values)
-            })
+            # Colunar, em centavos: labels, values e total
+            return Response(ChartSeriesService(start_date, end_date).by_category(is_positive=True))
 
         except ValueError as e:
             return Response({'error': f'Formato de data inválido: {e}'}, status=status.HTTP_400_BAD_REQUEST)
@@ -1500,50 +1429,8 @@ class ExpensesByCategoryChartView(APIView):
             else:
                 end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
 
-            neg_signed = TransactionModel.objects.filter(
-                date__gte=start_date,
-                date__lte=end_date,
-                is_positive=False,
-                amount__lt=0,
-                transaction_type='original'
-            ).values(
-                category_name=Coalesce('category__name', Value('Sem categoria'))
-            ).annotate(
-                total=Sum('amount')
-            )
-
-            neg_unsigned = TransactionModel.objects.filter(
-                date__gte=start_date,
-                date__lte=end_date,
-                is_positive=False,
-                amount__gt=0,
-                transaction_type='original'
-            ).values(
-                category_name=Coalesce('category__name', Value('Sem categoria'))
-            ).annotate(
-                total=Sum('amount')
-            )
-
-            cat_totals = {}
-            for cat in neg_signed:
-                name = cat['category_name']
-                cat_totals[name] = cat_totals.get(name, Decimal('0.00')) + (cat['total'] or Decimal('0.00'))
-            for cat in neg_unsigned:
-                name = cat['category_name']
-                cat_totals[name] = cat_totals.get(name, Decimal('0.00')) - (cat['total'] or Decimal('0.00'))
-
-            sorted_cats = sorted(cat_totals.items(), key=lambda x: x[1])
-            labels = [c[0] for c in sorted_cats]
-            values = [abs(float(c[1])) for c in sorted_cats]
-
-            labels.reverse()
-            values.reverse()
-
-            return Response({
-                'labels': labels,
-                'values': values,
-                'total': sum(values)
-            })
+            # Colunar, em centavos (valores positivos): labels, values e total
+            return Response(ChartSeriesService(start_date, end_date).by_category(is_positive=False))
 
         except ValueError as e:
             return Response({'error': f'Formato de data inválido: {e}'}, status=status.HTTP_400_BAD_REQUEST)
@@ -1576,38 +1463,8 @@ class MonthlyComparisonChartView(APIView):
             else:
                 end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
 
-            # Get transactions grouped by month
-            transactions = TransactionModel.objects.filter(
-                date__gte=start_date,
-                date__lte=end_date,
-                transaction_type='original'
-            ).annotate(
-                month=TruncMonth('date')
-            ).values('month').annotate(
-                revenues=Sum(Case(When(is_positive=True, then=F('amount')), default=Decimal('0.00'), output_field=DecimalField())),
-                expenses_signed=Sum(Case(When(is_positive=False, amount__lt=0, then=F('amount')), default=Decimal('0.00'), output_field=DecimalField())),
-                expenses_unsigned=Sum(Case(When(is_positive=False, amount__gt=0, then=F('amount')), default=Decimal('0.00'), output_field=DecimalField()))
-            ).order_by('month')
-
-            months = []
-            revenues = []
-            expenses = []
-            months_pt = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-
-            for tx in transactions:
-                month_label = f"{months_pt[tx['month'].month - 1]}/{str(tx['month'].year)[2:]}"
-                months.append(month_label)
-                revenues.append(float(tx['revenues'] or Decimal('0.00')))
-                exp_val = float((tx['expenses_signed'] or Decimal('0.00')) - (tx['expenses_unsigned'] or Decimal('0.00')))
-                expenses.append(abs(exp_val))
-
-            return Response({
-                'categories': months,
-                'series': [
-                    {'name': 'Receitas', 'data': revenues},
-                    {'name': 'Despesas', 'data': expenses}
-                ]
-            })
+            # Colunar, em centavos: labels, revenues e expenses
+            return Response(ChartSeriesService(start_date, end_date).monthly_flows())
 
         except ValueError as e:
             return Response({'error': f'Formato de data inválido: {e}'}, status=status.HTTP_400_BAD_REQUEST)
@@ -1655,48 +1512,8 @@ class BalanceHistoryChartView(APIView):
                 else:
                     period_end = period_end.replace(month=period_end.month - 1, day=monthrange(period_end.year, period_end.month - 1)[1])
 
-            # Get periods within range
-            periods = AccountingPeriod.objects.filter(
-                month__gte=period_start.replace(day=1),
-                month__lte=period_end.replace(day=1)
-            ).order_by('month')
-
-            labels = []
-            values = []
-
-            # Get accumulated balance from before the first period
-            accumulated = Decimal('0.00')
-            periods_list = list(periods)
-            if periods_list:
-                first_period = periods_list[0]
-                # Look for previous closed periods
-                prev_period = AccountingPeriod.objects.filter(
-                    month__lt=first_period.month,
-                    closing_balance__isnull=False
-                ).order_by('-month').first()
-                if prev_period and prev_period.closing_balance is not None:
-                    accumulated = prev_period.closing_balance
-
-            for period in periods_list:
-                labels.append(period.month_name)
-                # Use closing_balance if available, otherwise calculate current
-                if period.closing_balance is not None:
-                    accumulated = period.closing_balance
-                    values.append(float(accumulated))
-                else:
-                    # For open periods, calculate balance from transactions
-                    summary = period.get_transactions_summary()
-                    if summary['count'] > 0:
-                        accumulated += float(summary['net'])
-                    else:
-                        # No transactions, keep accumulated balance
-                        pass
-                    values.append(float(accumulated))
-
-            return Response({
-                'categories': labels,
-                'values': values
-            })
+            # Colunar, em centavos: labels e balance
+            return Response(ChartSeriesService(period_start, period_end).balance_history())
 
         except ValueError as e:
             return Response({'error': f'Formato de data inválido: {e}'}, status=status.HTTP_400_BAD_REQUEST)
@@ -1808,339 +1625,90 @@ class AIInsightsView(APIView):
 
     - Desenvolvimento (DEBUG=True): Usa Ollama com ministral-3:8b
     - Produção (DEBUG=False): Usa Mistral API com mistral-small-latest
-    - Cache: Insights são salvos e reutilizados se o count de transações não mudou
+    - Cache: Insights são reutilizados enquanto a impressão digital do livro
+      no período (quantidade, soma e última alteração) não mudar
     - Force: Use force=true para regenerar ignorando o cache
+    - A geração roda fora da requisição: o POST responde 202 e o cliente
+      consulta o GET até o status deixar de ser "pending"
 
     POST /api/treasury/charts/ai-insights/
     Body: { start_date: "2025-01-01", end_date: "2025-01-31", force: false }
+
+    GET /api/treasury/charts/ai-insights/?start_date=2025-01-01&end_date=2025-01-31
     """
     permission_classes = [IsAuthenticated, IsTreasurerOnly]
 
     def post(self, request):
-        """Gera insights financeiros usando cache inteligente."""
+        """Retorna o insight em cache ou enfileira a geração."""
         import logging
-        import os
-        from django.conf import settings
+        from treasury.services import AIInsightService
 
         logger = logging.getLogger(__name__)
 
-        # Desenvolvimento: Ollama, Produção: Mistral API
-        use_mistral_api = not getattr(settings, 'DEBUG', True)
-        debug_mode = getattr(settings, 'DEBUG', True)
-        api_name = "Mistral API" if use_mistral_api else "Ollama"
-        logger.info(f'AI Insights request - usando {api_name} (DEBUG={debug_mode})')
-
-        # Coletar parâmetros
-        start_date = request.data.get('start_date')
-        end_date = request.data.get('end_date')
+        dates = self._parse_dates(request.data)
+        if isinstance(dates, Response):
+            return dates
+        start_date, end_date = dates
         force_regenerate = request.data.get('force', False)
+        logger.info(f'Período solicitado: {start_date} até {end_date}, force={force_regenerate}')
 
-        if not start_date or not end_date:
-            logger.warning('Request sem datas start_date/end_date')
-            return Response({'error': 'Datas start_date e end_date são obrigatórias'}, status=status.HTTP_400_BAD_REQUEST)
-
-        try:
-            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-            logger.info(f'Período solicitado: {start_date} até {end_date}, force={force_regenerate}')
-        except ValueError as e:
-            logger.error(f'Formato de data inválido: {e}')
-            return Response({'error': 'Formato de data inválido. Use YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
-
-        try:
-            # Buscar transações do período
-            transactions = TransactionModel.objects.filter(
-                date__gte=start_date,
-                date__lte=end_date,
-                transaction_type='original'
-            ).order_by('-date')[:100]  # Limitar a 100 transações mais recentes
-
-            if not transactions:
-                logger.warning(f'Nenhuma transação encontrada no período {start_date} até {end_date}')
-                return Response({'error': 'Nenhuma transação encontrada no período'}, status=status.HTTP_400_BAD_REQUEST)
-
-            transactions_count = len(transactions)
-            logger.info(f'Processando {transactions_count} transações')
-
-            # Verificar cache existente
-            from treasury.models import AIInsight
-
-            existing_insight = AIInsight.objects.filter(
-                start_date=start_date,
-                end_date=end_date
-            ).first()
-
-            # Retornar cache se válido e não forçado
-            if existing_insight and not force_regenerate:
-                if existing_insight.is_still_valid(transactions_count):
-                    logger.info(f'Retornando insight em cache de {existing_insight.generated_at}')
-                    return Response({
-                        'insights': existing_insight.content,
-                        'generated_at': existing_insight.generated_at.isoformat(),
-                        'cached': True,
-                        'is_stale': existing_insight.is_stale
-                    })
-                else:
-                    logger.info(f'Cache invalidado: count mudou de {existing_insight.transactions_count} para {transactions_count}')
-
-            # Preparar resumo dos dados para a IA
-            summary = self._prepare_summary_for_ai(transactions, start_date, end_date)
-            logger.info(f'Summary preparado: {len(summary)} caracteres')
-
-            # Gerar insights com Ollama (dev) ou Mistral API (prod)
-            if use_mistral_api:
-                insights = self._generate_insights_with_mistral(summary)
-            else:
-                insights = self._generate_insights_with_ollama(summary)
-
-            logger.info(f'Insights gerados com sucesso: {len(insights)} caracteres')
-
-            # Salvar no banco (atualiza se existe)
-            model_used = getattr(settings, 'OLLAMA_TEXT_MODEL', 'gemma3n:e4b') if not use_mistral_api else getattr(settings, 'MISTRAL_MODEL', 'mistral-small-latest')
-
-            if existing_insight:
-                # Atualiza existente
-                existing_insight.content = insights
-                existing_insight.transactions_count = transactions_count
-                existing_insight.model_used = model_used
-                existing_insight.debug_mode = debug_mode
-                existing_insight.save()
-                logger.info(f'Insight atualizado no banco (id={existing_insight.id})')
-            else:
-                # Cria novo
-                new_insight = AIInsight.objects.create(
-                    start_date=start_date,
-                    end_date=end_date,
-                    content=insights,
-                    transactions_count=transactions_count,
-                    model_used=model_used,
-                    debug_mode=debug_mode
-                )
-                logger.info(f'Insight salvo no banco (id={new_insight.id})')
-
-            return Response({
-                'insights': insights,
-                'generated_at': timezone.now().isoformat(),
-                'cached': False
-            })
-
-        except Exception as e:
-            import traceback
-            error_trace = traceback.format_exc()
-            logger.error(f'Erro ao gerar insights: {e}\n{error_trace}')
-            return Response({
-                'error': str(e),
-                'insights': f'Erro ao gerar insights: {str(e)}'
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-    def _generate_insights_with_ollama(self, summary: str) -> str:
-        """Gera insights usando Ollama (modelo local)."""
-        import logging
-        import os
-        import requests
-        from django.conf import settings
-
-        logger = logging.getLogger(__name__)
-
-        ollama_base_url = getattr(settings, 'OLLAMA_HOST', 'http://localhost:11434')
-        ollama_model = getattr(settings, 'OLLAMA_TEXT_MODEL', 'gemma3n:e4b')
-
-        logger.info(f'Gerando insights com Ollama: model={ollama_model}, url={ollama_base_url}')
-
-        payload = {
-            'model': ollama_model,
-            'messages': [
-                {
-                    'role': 'system',
-                    'content': 'Você é um assistente financeiro especializado em análise de dados financeiros de igrejas. '
-                    'Forneça insights práticos e acionáveis em formato markdown, usando linguagem clara e objetiva. '
-                    'Use emojis para tornar o texto mais visual. '
-                    'Estruture sua resposta com: 📊 Visão Geral, 💡 Insights Principais, ⚠️ Pontos de Atenção, 🎯 Recomendações, 📖 Palavra de Sabedoria. '
-                    'Na seção "📖 Palavra de Sabedoria", inclua 1-2 versículos bíblicos relevantes sobre fidelidade, mordomia e sabedoria financeira, '
-                    'com uma breve exposição/princípio prático que se aplica à situação financeira analisada.'
-                },
-                {
-                    'role': 'user',
-                    'content': f'Analise os seguintes dados financeiros:\n\n{summary}'
-                }
-            ],
-            'stream': False,
-            'options': {
-                'num_predict': 1200,
-                'temperature': 0.7
-            }
-        }
-
-        try:
-            response = requests.post(
-                f'{ollama_base_url}/api/chat',
-                json=payload,
-                timeout=120
-            )
-            logger.info(f'Ollama response status: {response.status_code}')
-        except requests.exceptions.ConnectionError as e:
-            error_msg = f'Ollama não está respondendo em {ollama_base_url}. Verifique se o serviço está rodando.'
-            logger.error(f'ConnectionError: {error_msg} - {e}')
-            raise Exception(error_msg)
-        except requests.exceptions.Timeout as e:
-            error_msg = f'Ollama demorou muito para responder (timeout 120s). Tente reduzir o período ou usar um modelo mais rápido.'
-            logger.error(f'Timeout: {error_msg} - {e}')
-            raise Exception(error_msg)
-        except requests.exceptions.RequestException as e:
-            error_msg = f'Erro ao comunicar com Ollama: {type(e).__name__}: {e}'
-            logger.error(f'RequestException: {error_msg}')
-            raise Exception(error_msg)
-
-        if response.status_code != 200:
-            error_detail = response.text[:500] if response.text else 'sem detalhes'
-            error_msg = f'Ollama retornou erro {response.status_code}: {error_detail}'
-            logger.error(f'Ollama HTTP error: {error_msg}')
-            raise Exception(error_msg)
-
-        try:
-            result = response.json()
-        except ValueError as e:
-            error_msg = f'Resposta inválida do Ollama (não é JSON): {response.text[:200]}'
-            logger.error(f'JSON decode error: {error_msg}')
-            raise Exception(error_msg)
+        insight, fingerprint = AIInsightService().request_insight(
+            start_date, end_date, force=force_regenerate)
 
-        insights = result.get('message', {}).get('content', '')
+        if insight is None:
+            logger.warning(f'Nenhuma transação encontrada no período {start_date} até {end_date}')
+            return Response({'error': 'Nenhuma transação encontrada no período'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if not insights:
-            error_msg = f'Ollama retornou resposta vazia. Resposta completa: {result}'
-            logger.error(f'Empty insights: {error_msg}')
-            raise Exception('Resposta vazia da IA - tente novamente')
+        if insight.status == insight.STATUS_READY:
+            logger.info(f'Retornando insight em cache de {insight.generated_at}')
+            return self._insight_response(insight, cached=True)
 
-        logger.info(f'Insights gerados com sucesso: {len(insights)} caracteres')
-        return insights
-
-    def _generate_insights_with_mistral(self, summary: str) -> str:
-        """Gera insights usando Mistral API com mistral-small-latest."""
-        import logging
-        from django.conf import settings
+        logger.info(f'Geração de insight enfileirada (id={insight.id}, {fingerprint[0]} transações)')
+        return self._insight_response(insight)
 
-        logger = logging.getLogger(__name__)
+    def get(self, request):
+        """Consulta o status da geração do insight do período."""
+        from treasury.services import AIInsightService
 
-        logger.info('Gerando insights com Mistral API')
+        dates = self._parse_dates(request.query_params)
+        if isinstance(dates, Response):
+            return dates
 
-        try:
-            from mistralai import Mistral
-        except ImportError:
-            error_msg = 'SDK Mistral não instalado. Execute: pip install mistralai'
-            logger.error(f'ImportError: {error_msg}')
-            raise Exception(error_msg)
+        insight = AIInsightService().get_insight(*dates)
+        if insight is None:
+            return Response({'error': 'Nenhum insight solicitado para o período'}, status=status.HTTP_404_NOT_FOUND)
+        return self._insight_response(insight)
 
-        api_key = getattr(settings, 'MISTRAL_API_KEY', None)
-        if not api_key:
-            error_msg = 'MISTRAL_API_KEY não configurado nas variáveis de ambiente'
-            logger.error(f'Missing API key: {error_msg}')
-            raise Exception(error_msg)
+    def _parse_dates(self, params):
+        start_date = params.get('start_date')
+        end_date = params.get('end_date')
 
-        model = getattr(settings, 'MISTRAL_MODEL', 'mistral-small-latest')
-        logger.info(f'Usando modelo Mistral: {model}')
+        if not start_date or not end_date:
+            return Response({'error': 'Datas start_date e end_date são obrigatórias'}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            client = Mistral(api_key=api_key)
-
-            chat_response = client.chat.complete(
-                model=model,
-                messages=[
-                    {
-                        'role': 'system',
-                        'content': 'Você é um assistente financeiro especializado em análise de dados financeiros de igrejas. '
-                        'Forneça insights práticos e acionáveis em formato markdown, usando linguagem clara e objetiva. '
-                        'Use emojis para tornar o texto mais visual. '
-                        'Estruture sua resposta com: 📊 Visão Geral, 💡 Insights Principais, ⚠️ Pontos de Atenção, 🎯 Recomendações, 📖 Palavra de Sabedoria. '
-                        'Na seção "📖 Palavra de Sabedoria", inclua 1-2 versículos bíblicos relevantes sobre fidelidade, mordomia e sabedoria financeira, '
-                        'com uma breve exposição/princípio prático que se aplica à situação financeira analisada.'
-                    },
-                    {
-                        'role': 'user',
-                        'content': f'Analise os seguintes dados financeiros:\n\n{summary}'
-                    }
-                ],
-                max_tokens=1200,
-                temperature=0.7
+            return (
+                datetime.strptime(start_date, '%Y-%m-%d').date(),
+                datetime.strptime(end_date, '%Y-%m-%d').date(),
             )
+        except ValueError:
+            return Response({'error': 'Formato de data inválido. Use YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
 
-            insights = chat_response.choices[0].message.content
-
-            if not insights:
-                error_msg = 'Mistral retornou resposta vazia - tente novamente'
-                logger.error(f'Empty response from Mistral: {error_msg}')
-                raise Exception(error_msg)
-
-            logger.info(f'Insights gerados com sucesso: {len(insights)} caracteres')
-            return insights
-
-        except Exception as e:
-            if '401' in str(e) or 'authentication' in str(e).lower():
-                error_msg = f'Erro de autenticação na API Mistral. Verifique MISTRAL_API_KEY: {e}'
-            elif 'rate limit' in str(e).lower():
-                error_msg = f'Limite de taxa da API Mistral atingido. Tente novamente em alguns minutos: {e}'
-            elif 'timeout' in str(e).lower():
-                error_msg = f'Timeout na API Mistral. Tente novamente: {e}'
-            else:
-                error_msg = f'Erro ao comunicar com Mistral API: {type(e).__name__}: {e}'
-            logger.error(f'Mistral API error: {error_msg}')
-            raise Exception(error_msg)
-
-    def _prepare_summary_for_ai(self, transactions, start_date, end_date):
-        """Prepara um resumo dos dados para enviar à IA."""
-        from collections import defaultdict
-
-        # Agrupar por categoria
-        category_totals = defaultdict(lambda: {'revenue': Decimal('0'), 'expense': Decimal('0'), 'count': 0})
-
-        for tx in transactions:
-            cat = tx.category.name if tx.category else 'Sem Categoria'
-            if tx.is_positive:
-                category_totals[cat]['revenue'] += tx.amount
-            else:
-                category_totals[cat]['expense'] += abs(tx.amount)
-            category_totals[cat]['count'] += 1
-
-        # Calcular totais gerais
-        total_revenue = sum(d['revenue'] for d in category_totals.values())
-        total_expense = sum(d['expense'] for d in category_totals.values())
-        net_balance = total_revenue - total_expense
-
-        # Formatar resumo
-        summary = f"""Período Analisado: {start_date.strftime('%d/%m/%Y')} a {end_date.strftime('%d/%m/%Y')}
-
-RESUMO FINANCEIRO:
-• Total de Receitas: R$ {float(total_revenue):,.2f}
-• Total de Despesas: R$ {float(total_expense):,.2f}
-• Saldo Líquido: R$ {float(net_balance):,.2f}
-• Número de Transações: {len(transactions)}
-
-TOP RECEITAS POR CATEGORIA:
-"""
-
-        # Adicionar top categorias de receita
-        revenue_by_cat = sorted(
-            [(cat, float(data['revenue'])) for cat, data in category_totals.items()],
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
-
-        for cat, total in revenue_by_cat:
-            if total > 0:
-                summary += f"• {cat}: R$ {total:,.2f}\n"
-
-        summary += "\nTOP DESPESAS POR CATEGORIA:\n"
-
-        # Adicionar top categorias de despesa
-        expense_by_cat = sorted(
-            [(cat, float(data['expense'])) for cat, data in category_totals.items()],
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
-
-        for cat, total in expense_by_cat:
-            if total > 0:
-                summary += f"• {cat}: R$ {total:,.2f}\n"
+    def _insight_response(self, insight, cached=False):
+        if insight.status == insight.STATUS_PENDING:
+            return Response({'status': insight.status}, status=status.HTTP_202_ACCEPTED)
 
-        summary += "\nForneça insights sobre estes dados, destacando tendências, padrões e recomendações."
+        if insight.status == insight.STATUS_FAILED:
+            return Response({
+                'status': insight.status,
+                'error': insight.error,
+                'insights': f'Erro ao gerar insights: {insight.error}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        return summary
+        return Response({
+            'status': insight.status,
+            'insights': insight.content,
+            'generated_at': insight.generated_at.isoformat(),
+            'cached': cached,
+            'is_stale': insight.is_stale
+        })
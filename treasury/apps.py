@@ -6,4 +6,5 @@ class TreasuryConfig(AppConfig):
     name = "treasury"
 
     def ready(self):
+        import treasury.checks  # noqa: F401
         import treasury.signals
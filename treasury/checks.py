@@ -0,0 +1,29 @@
+"""
+Verificações de configuração da tesouraria.
+
+Os relatórios e saldos em cache são invalidados pela versão do livro-caixa
+guardada no cache padrão. Um cache por processo (LocMemCache) não propaga
+essa invalidação entre workers.
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+LOCMEM_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if backend != LOCMEM_BACKEND:
+        return []
+    return [
+        Warning(
+            "O cache padrão é local a cada processo.",
+            hint=(
+                "Com mais de um worker, a invalidação dos saldos e relatórios da "
+                "tesouraria só alcança o processo que gravou. Configure "
+                "CACHE_BACKEND/CACHE_LOCATION com um cache compartilhado."
+            ),
+            id="treasury.W001",
+        )
+    ]
@@ -3,16 +3,15 @@ from datetime import date
 from decimal import Decimal
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from django.db.models import Sum, Q, Count, Case, When, F
-from django.db.models.functions import Coalesce
-from django.db import models as db_models
+from django.db.models import Q, Count
 
 from treasury.models import (
     AccountingPeriod,
     TransactionModel,
-    MonthlyReportModel,
     FrozenReport,
+    PeriodCheckState,
 )
+from treasury.services.diagnosis_service import DiagnosisService
 
 
 CHECKS = {
@@ -41,6 +40,19 @@ CHECK_LABELS = {
     '10': 'Consistencia de sinal do amount',
 }
 
+# Checks com resultado por periodo, guardados em PeriodCheckState
+PERIOD_CHECKS = (
+    'opening_balance',
+    'closing_balance',
+    'monthly_report',
+    'frozen_report_hash',
+    'running_balance',
+)
+
+# Checks que dependem do periodo anterior e do inicio da cadeia: refeitos
+# quando o chain_fingerprint do periodo muda
+CHAIN_CHECKS = ('opening_balance', 'monthly_report', 'running_balance')
+
 
 class Command(BaseCommand):
     help = 'Verifica inconsistencias na tesouraria'
@@ -67,7 +79,16 @@ class Command(BaseCommand):
             '--json-file',
             type=str,
             default=None,
-            help='Caminho do arquivo JSON de saida (padrao: treasury_check_TIMESTAMP.json)',
+            help='Caminho do arquivo JSON de saida (sem isso, --output json escreve na saida padrao)',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help=(
+                'Verifica todos os periodos, ignorando os resultados guardados. Sem isso, so os '
+                'periodos alterados desde a ultima verificacao (e a cadeia a partir deles) sao '
+                'verificados de novo; o hash dos PDFs congelados so e recalculado nesses periodos.'
+            ),
         )
 
     def handle(self, *args, **options):
@@ -75,21 +96,40 @@ class Command(BaseCommand):
         month_arg = options.get('month')
         output = options.get('output', 'terminal')
         json_file = options.get('json_file')
+        full = options.get('full', False)
 
         selected = self._resolve_checks(checks_arg)
         period_qs = self._resolve_periods(month_arg)
 
+        # --output json sem --json-file: apenas o JSON na saida padrao
+        json_stdout = output == 'json' and not json_file
+
+        # Totais de todos os periodos carregados uma unica vez
+        self.engine = DiagnosisService()
+        self._load_check_state(period_qs, full)
+
+        if not json_stdout and any(CHECKS[k] in PERIOD_CHECKS for k in selected):
+            self.stdout.write(
+                f'\nPeriodos alterados desde a ultima verificacao: '
+                f'{len(self.changed_ids)} de {len(self.selected_periods)}'
+                + (' (--full)' if full else '')
+            )
+
         results = {}
         errors_count = 0
         warnings_count = 0
 
         for check_key in selected:
             check_name = CHECKS[check_key]
-            self.stdout.write(f'\n{"=" * 60}')
-            self.stdout.write(self.style.NOTICE(f'  [{check_key}] {CHECK_LABELS[check_key]}'))
-            self.stdout.write(f'{"=" * 60}')
+            if not json_stdout:
+                self.stdout.write(f'\n{"=" * 60}')
+                self.stdout.write(self.style.NOTICE(f'  [{check_key}] {CHECK_LABELS[check_key]}'))
+                self.stdout.write(f'{"=" * 60}')
 
-            result = self._run_check(check_name, period_qs)
+            if check_name in PERIOD_CHECKS:
+                result = self._run_period_check(check_name)
+            else:
+                result = self._run_check(check_name, period_qs)
             results[check_name] = result
 
             if output == 'terminal':
@@ -98,6 +138,12 @@ class Command(BaseCommand):
             errors_count += result.get('errors', 0)
             warnings_count += result.get('warnings', 0)
 
+        self._save_check_state()
+
+        if json_stdout:
+            self.stdout.write(json.dumps(results, indent=2, default=str, ensure_ascii=False))
+            return
+
         self.stdout.write(f'\n{"=" * 60}')
         self.stdout.write(self.style.NOTICE('  RESUMO'))
         self.stdout.write(f'{"=" * 60}')
@@ -110,11 +156,10 @@ class Command(BaseCommand):
             if warnings_count > 0:
                 self.stdout.write(self.style.WARNING(f'  Avisos: {warnings_count}'))
 
-        if output == 'json' or json_file:
-            filename = json_file or f'treasury_check_{timezone.now().strftime("%Y%m%d_%H%M%S")}.json'
-            with open(filename, 'w', encoding='utf-8') as f:
+        if json_file:
+            with open(json_file, 'w', encoding='utf-8') as f:
                 json.dump(results, f, indent=2, default=str, ensure_ascii=False)
-            self.stdout.write(self.style.SUCCESS(f'\n  JSON salvo em: {filename}'))
+            self.stdout.write(self.style.SUCCESS(f'\n  JSON salvo em: {json_file}'))
 
     def _resolve_checks(self, checks_arg):
         if checks_arg:
@@ -156,6 +201,99 @@ class Command(BaseCommand):
                 raise SystemExit(1)
         return qs
 
+    # ------------------------------------------------------------------
+    # Verificacao incremental
+    # ------------------------------------------------------------------
+
+    def _load_check_state(self, period_qs, full):
+        """
+        Compara o fingerprint de cada periodo com o da ultima verificacao.
+
+        Se so o chain_fingerprint mudou (periodo anterior alterado, removido
+        ou criado), so os resultados dos checks em cadeia sao descartados.
+        """
+        selected_ids = set(period_qs.values_list('id', flat=True))
+        self.selected_periods = [p for p in self.engine.periods if p.id in selected_ids]
+        self.fingerprints = {p.id: self.engine.fingerprint(p) for p in self.selected_periods}
+        self.chain_fingerprints = {p.id: self.engine.chain_fingerprint(p) for p in self.selected_periods}
+
+        self.states = {
+            state.period_id: state
+            for state in PeriodCheckState.objects.filter(period_id__in=selected_ids)
+        }
+        self.changed_ids = {
+            period_id for period_id, fingerprint in self.fingerprints.items()
+            if full or period_id not in self.states or self.states[period_id].fingerprint != fingerprint
+        }
+        self.chain_changed_ids = {
+            period_id for period_id, fingerprint in self.chain_fingerprints.items()
+            if period_id not in self.changed_ids and self.states[period_id].chain_fingerprint != fingerprint
+        }
+        # Resultados de um periodo alterado nao valem mais, nem os dos checks
+        # que nao forem rodados agora
+        self.period_results = {
+            p.id: {} if p.id in self.changed_ids else dict(self.states[p.id].results)
+            for p in self.selected_periods
+        }
+        for period_id in self.chain_changed_ids:
+            for check_name in CHAIN_CHECKS:
+                self.period_results[period_id].pop(check_name, None)
+        self.checked_ids = set()
+
+    def _periods_to_check(self, check_name):
+        return [p for p in self.selected_periods if check_name not in self.period_results[p.id]]
+
+    def _run_period_check(self, check_name):
+        """
+        Roda um check por periodo apenas nos periodos sem resultado valido
+        e junta os detalhes novos com os guardados dos demais.
+        """
+        periods = self._periods_to_check(check_name)
+        fresh = self._run_check(check_name, periods)
+
+        by_month = {}
+        general = []
+        for detail in fresh['details']:
+            if 'month' in detail:
+                by_month.setdefault(detail['month'], []).append(detail)
+            else:
+                general.append(detail)
+
+        for period in periods:
+            self.period_results[period.id][check_name] = by_month.get(period.month.strftime('%m/%Y'), [])
+            self.checked_ids.add(period.id)
+
+        details = [
+            detail
+            for period in self.selected_periods
+            for detail in self.period_results[period.id][check_name]
+        ] + general
+        return {
+            'errors': sum(1 for d in details if d.get('status') == 'error'),
+            'warnings': sum(1 for d in details if d.get('status') == 'warning'),
+            'details': details,
+        }
+
+    def _save_check_state(self):
+        now = timezone.now()
+        to_create, to_update = [], []
+        for period_id in self.checked_ids | self.changed_ids | self.chain_changed_ids:
+            state = self.states.get(period_id)
+            if state is None:
+                state = PeriodCheckState(period_id=period_id)
+                to_create.append(state)
+            else:
+                to_update.append(state)
+            state.fingerprint = self.fingerprints[period_id]
+            state.chain_fingerprint = self.chain_fingerprints[period_id]
+            state.results = self.period_results[period_id]
+            state.checked_at = now
+
+        PeriodCheckState.objects.bulk_create(to_create)
+        PeriodCheckState.objects.bulk_update(
+            to_update, ['fingerprint', 'chain_fingerprint', 'results', 'checked_at'],
+        )
+
     def _run_check(self, check_name, period_qs):
         dispatch = {
             'opening_balance': self._check_opening_balance,
@@ -171,27 +309,12 @@ class Command(BaseCommand):
         }
         return dispatch[check_name](period_qs)
 
-    def _calculate_net(self, period):
-        txs = TransactionModel.objects.filter(
-            accounting_period=period,
-            transaction_type='original',
-        )
-        positive_sum = txs.filter(is_positive=True).aggregate(
-            total=Coalesce(Sum('amount'), Decimal('0.00'))
-        )['total']
-        neg_signed = txs.filter(is_positive=False, amount__lt=0).aggregate(
-            total=Coalesce(Sum('amount'), Decimal('0.00'))
-        )['total']
-        neg_unsigned = txs.filter(is_positive=False, amount__gt=0).aggregate(
-            total=Coalesce(Sum('amount'), Decimal('0.00'))
-        )['total']
-        return positive_sum + neg_signed - neg_unsigned
-
-    def _check_opening_balance(self, period_qs):
+    def _check_opening_balance(self, periods):
         result = {'errors': 0, 'warnings': 0, 'details': []}
-        periods = list(period_qs)
+        position = {p.id: i for i, p in enumerate(self.engine.periods)}
 
-        for i, period in enumerate(periods):
+        for period in periods:
+            i = position[period.id]
             if period.is_first_month:
                 result['details'].append({
                     'period': str(period),
@@ -210,11 +333,11 @@ class Command(BaseCommand):
                 })
                 continue
 
-            prev = periods[i - 1]
+            prev = self.engine.periods[i - 1]
             if prev.status in ('closed', 'archived'):
                 expected = prev.closing_balance
             else:
-                expected = prev.opening_balance + self._calculate_net(prev)
+                expected = prev.opening_balance + self.engine.net(prev)
 
             if period.opening_balance != expected:
                 result['errors'] += 1
@@ -241,12 +364,12 @@ class Command(BaseCommand):
 
         return result
 
-    def _check_closing_balance(self, period_qs):
+    def _check_closing_balance(self, periods):
         result = {'errors': 0, 'warnings': 0, 'details': []}
-        closed = period_qs.filter(status__in=['closed', 'archived'], closing_balance__isnull=False)
+        closed = [p for p in periods if p.status in ('closed', 'archived') and p.closing_balance is not None]
 
         for period in closed:
-            net = self._calculate_net(period)
+            net = self.engine.net(period)
             expected = period.opening_balance + net
             diff = period.closing_balance - expected
 
@@ -292,7 +415,8 @@ class Command(BaseCommand):
                     'message': f'OK: {period.closing_balance}',
                 })
 
-        if closed.count() == 0:
+        if not any(p.status in ('closed', 'archived') and p.closing_balance is not None
+                   for p in self.selected_periods):
             result['warnings'] += 1
             result['details'].append({
                 'status': 'warning',
@@ -301,33 +425,21 @@ class Command(BaseCommand):
 
         return result
 
-    def _check_monthly_report(self, period_qs):
+    def _check_monthly_report(self, periods):
         result = {'errors': 0, 'warnings': 0, 'details': []}
-        periods = list(period_qs)
 
         for period in periods:
-            report = MonthlyReportModel.objects.filter(month=period.month).first()
-            txs = TransactionModel.objects.filter(
-                accounting_period=period,
-                transaction_type='original',
-            )
+            report = self.engine.monthly_reports.get(period.month)
+            totals = self.engine.totals(period)
 
-            positive = txs.filter(is_positive=True).aggregate(
-                total=Coalesce(Sum('amount'), Decimal('0.00'))
-            )['total']
-            neg_signed = txs.filter(is_positive=False, amount__lt=0).aggregate(
-                total=Coalesce(Sum('amount'), Decimal('0.00'))
-            )['total']
-            neg_unsigned = txs.filter(is_positive=False, amount__gt=0).aggregate(
-                total=Coalesce(Sum('amount'), Decimal('0.00'))
-            )['total']
-            negative = neg_signed - neg_unsigned
+            positive = totals['positive']
+            negative = self.engine.total_negative(period)
             net = positive + negative
             monthly_result = positive + negative
             total_balance = period.opening_balance + net
 
             if not report:
-                if txs.exists():
+                if totals['count']:
                     result['warnings'] += 1
                     result['details'].append({
                         'period': str(period),
@@ -337,13 +449,10 @@ class Command(BaseCommand):
                     })
                 continue
 
-            prev_period = period.get_previous_period()
+            prev_period = self.engine.previous_period(period)
             expected_prev_balance = Decimal('0.00')
             if prev_period:
-                if prev_period.status in ('closed', 'archived') and prev_period.closing_balance is not None:
-                    expected_prev_balance = prev_period.closing_balance
-                else:
-                    expected_prev_balance = prev_period.opening_balance + self._calculate_net(prev_period)
+                expected_prev_balance = self.engine.expected_closing(prev_period)
 
             issues = []
             if report.previous_month_balance != expected_prev_balance:
@@ -378,7 +487,7 @@ class Command(BaseCommand):
 
     def _check_period_gaps(self, period_qs):
         result = {'errors': 0, 'warnings': 0, 'details': []}
-        all_periods = list(AccountingPeriod.objects.all().order_by('month'))
+        all_periods = self.engine.periods
 
         if len(all_periods) < 2:
             result['details'].append({
@@ -491,11 +600,11 @@ class Command(BaseCommand):
 
         return result
 
-    def _check_frozen_report_hash(self, period_qs):
+    def _check_frozen_report_hash(self, periods):
         result = {'errors': 0, 'warnings': 0, 'details': []}
-        reports = FrozenReport.objects.all()
+        reports = FrozenReport.objects.filter(period__in=periods).select_related('period')
 
-        if not reports.exists():
+        if not any(p.id in self.engine.frozen_period_ids for p in self.selected_periods):
             result['details'].append({
                 'status': 'info',
                 'message': 'Nenhum FrozenReport encontrado.',
@@ -510,6 +619,7 @@ class Command(BaseCommand):
                         'report_id': str(report.id),
                         'type': report.report_type,
                         'period': str(report.period),
+                        'month': report.period.month.strftime('%m/%Y'),
                         'status': 'ok',
                         'message': f'OK: {report.report_type} - {report.period}',
                     })
@@ -519,6 +629,7 @@ class Command(BaseCommand):
                         'report_id': str(report.id),
                         'type': report.report_type,
                         'period': str(report.period),
+                        'month': report.period.month.strftime('%m/%Y'),
                         'stored_hash': verification['stored_hash'],
                         'current_hash': verification['current_hash'],
                         'status': 'error',
@@ -530,6 +641,7 @@ class Command(BaseCommand):
                     'report_id': str(report.id),
                     'type': report.report_type,
                     'period': str(report.period),
+                    'month': report.period.month.strftime('%m/%Y'),
                     'status': 'warning',
                     'message': f'ERRO AO VERIFICAR: {e}',
                 })
@@ -578,9 +690,13 @@ class Command(BaseCommand):
 
         return result
 
-    def _check_running_balance(self, period_qs):
+    def _check_running_balance(self, periods):
+        """
+        Percorre a cadeia inteira em memoria, mas so registra detalhes dos
+        periodos em ``periods``.
+        """
         result = {'errors': 0, 'warnings': 0, 'details': []}
-        all_periods = list(AccountingPeriod.objects.all().order_by('month'))
+        all_periods = self.engine.periods
 
         if not all_periods:
             result['details'].append({'status': 'info', 'message': 'Nenhum periodo encontrado.'})
@@ -614,7 +730,7 @@ class Command(BaseCommand):
             check_periods = all_periods
 
         for period in check_periods:
-            net = self._calculate_net(period)
+            net = self.engine.net(period)
             expected_running = running + net
             actual_opening = period.opening_balance
 
@@ -668,6 +784,10 @@ class Command(BaseCommand):
                     })
                     running = period.closing_balance
 
+        report_months = {p.month.strftime('%m/%Y') for p in periods}
+        result['details'] = [d for d in result['details'] if d['month'] in report_months]
+        result['errors'] = sum(1 for d in result['details'] if d['status'] == 'error')
+        result['warnings'] = sum(1 for d in result['details'] if d['status'] == 'warning')
         return result
 
     def _print_result(self, check_name, result):
@@ -1,9 +1,8 @@
+import json
 from datetime import date
 from decimal import Decimal
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from django.db.models import Sum, Count, Q
-from django.db.models.functions import Coalesce
 
 from treasury.models import (
     AccountingPeriod,
@@ -12,6 +11,7 @@ from treasury.models import (
 )
 from treasury.models.period_snapshot import PeriodSnapshot
 from treasury.models.audit_log import AuditLog
+from treasury.services.diagnosis_service import DiagnosisService
 
 
 FIXES = {
@@ -65,16 +65,24 @@ class Command(BaseCommand):
             default=False,
             help='Nao pedir confirmacao antes de cada correcao',
         )
+        parser.add_argument(
+            '--output',
+            type=str,
+            choices=['terminal', 'json'],
+            default='terminal',
+            help='Formato de saida (padrao: terminal)',
+        )
 
     def handle(self, *args, **options):
         fixes_arg = options.get('fixes')
         month_arg = options.get('month')
         dry_run = options.get('dry_run', True)
         no_confirm = options.get('no_confirm', False)
+        as_json = options.get('output') == 'json'
 
         selected = self._resolve_fixes(fixes_arg)
 
-        if dry_run:
+        if dry_run and not as_json:
             self.stdout.write(self.style.WARNING(
                 '\n  MODO DRY-RUN: Nenhuma alteracao sera feita.'
                 '\n  Use --no-dry-run para executar de verdade.\n'
@@ -91,12 +99,13 @@ class Command(BaseCommand):
 
         for fix_key in selected:
             fix_name = FIXES[fix_key]
-            self.stdout.write(f'\n{"=" * 60}')
-            self.stdout.write(self.style.NOTICE(
-                f'  [{fix_key}] {FIX_LABELS[fix_key]}'
-                f'{" (DRY-RUN)" if dry_run else ""}'
-            ))
-            self.stdout.write(f'{"=" * 60}')
+            if not as_json:
+                self.stdout.write(f'\n{"=" * 60}')
+                self.stdout.write(self.style.NOTICE(
+                    f'  [{fix_key}] {FIX_LABELS[fix_key]}'
+                    f'{" (DRY-RUN)" if dry_run else ""}'
+                ))
+                self.stdout.write(f'{"=" * 60}')
 
             if not no_confirm and not dry_run:
                 answer = input(f'  Executar {FIX_LABELS[fix_key]}? (s/N): ').strip().lower()
@@ -111,7 +120,12 @@ class Command(BaseCommand):
                 'result': result,
             })
 
-            self._print_fix_result(result)
+            if not as_json:
+                self._print_fix_result(result)
+
+        if as_json:
+            self.stdout.write(json.dumps(summary, indent=2, default=str, ensure_ascii=False))
+            return
 
         self._print_summary(summary)
 
@@ -162,24 +176,10 @@ class Command(BaseCommand):
             'orphan_transactions': self._fix_orphan_transactions,
             'period_gaps': self._fix_period_gaps,
         }
+        # Recarregado a cada correcao, pois a anterior pode ter alterado os dados
+        self.engine = DiagnosisService()
         return dispatch[fix_name](period_qs, dry_run)
 
-    def _calculate_net(self, period):
-        txs = TransactionModel.objects.filter(
-            accounting_period=period,
-            transaction_type='original',
-        )
-        positive_sum = txs.filter(is_positive=True).aggregate(
-            total=Coalesce(Sum('amount'), Decimal('0.00'))
-        )['total']
-        neg_signed = txs.filter(is_positive=False, amount__lt=0).aggregate(
-            total=Coalesce(Sum('amount'), Decimal('0.00'))
-        )['total']
-        neg_unsigned = txs.filter(is_positive=False, amount__gt=0).aggregate(
-            total=Coalesce(Sum('amount'), Decimal('0.00'))
-        )['total']
-        return positive_sum + neg_signed - neg_unsigned
-
     def _create_snapshot_and_log(self, period, reason, dry_run):
         if dry_run:
             return None
@@ -203,7 +203,7 @@ class Command(BaseCommand):
 
     def _fix_opening_balance(self, period_qs, dry_run):
         result = {'fixed': 0, 'already_ok': 0, 'details': []}
-        all_periods = list(AccountingPeriod.objects.all().order_by('month'))
+        all_periods = self.engine.periods
 
         month_filter = None
         filtered = list(period_qs)
@@ -213,7 +213,7 @@ class Command(BaseCommand):
         prev_closing = None
 
         for i, period in enumerate(all_periods):
-            net = self._calculate_net(period)
+            net = self.engine.net(period)
 
             if month_filter and period.month not in month_filter:
                 actual_opening = period.opening_balance
@@ -249,7 +249,7 @@ class Command(BaseCommand):
 
             if prev_closing is None:
                 prev_p = all_periods[i - 1]
-                prev_net = self._calculate_net(prev_p)
+                prev_net = self.engine.net(prev_p)
                 if prev_p.status in ('closed', 'archived') and prev_p.closing_balance is not None:
                     prev_closing = prev_p.closing_balance
                 else:
@@ -299,7 +299,7 @@ class Command(BaseCommand):
         )
 
         for period in closed:
-            net = self._calculate_net(period)
+            net = self.engine.net(period)
             expected = period.opening_balance + net
             diff = period.closing_balance - expected
 
@@ -342,37 +342,21 @@ class Command(BaseCommand):
 
     def _fix_monthly_report(self, period_qs, dry_run):
         result = {'fixed': 0, 'already_ok': 0, 'details': []}
-        periods = list(AccountingPeriod.objects.all().order_by('month'))
+        periods = self.engine.periods
 
         for period in periods:
-            txs = TransactionModel.objects.filter(
-                accounting_period=period,
-                transaction_type='original',
-            )
-
-            positive = txs.filter(is_positive=True).aggregate(
-                total=Coalesce(Sum('amount'), Decimal('0.00'))
-            )['total']
-            neg_signed = txs.filter(is_positive=False, amount__lt=0).aggregate(
-                total=Coalesce(Sum('amount'), Decimal('0.00'))
-            )['total']
-            neg_unsigned = txs.filter(is_positive=False, amount__gt=0).aggregate(
-                total=Coalesce(Sum('amount'), Decimal('0.00'))
-            )['total']
-            negative = neg_signed - neg_unsigned
+            positive = self.engine.totals(period)['positive']
+            negative = self.engine.total_negative(period)
             net = positive + negative
             monthly_result = positive + negative
             total_balance = period.opening_balance + net
 
-            prev_period = period.get_previous_period()
+            prev_period = self.engine.previous_period(period)
             previous_balance = Decimal('0.00')
             if prev_period:
-                if prev_period.status in ('closed', 'archived') and prev_period.closing_balance is not None:
-                    previous_balance = prev_period.closing_balance
-                else:
-                    previous_balance = prev_period.opening_balance + self._calculate_net(prev_period)
+                previous_balance = self.engine.expected_closing(prev_period)
 
-            report = MonthlyReportModel.objects.filter(month=period.month).first()
+            report = self.engine.monthly_reports.get(period.month)
 
             needs_fix = False
             if not report:
@@ -505,6 +489,9 @@ class Command(BaseCommand):
             })
             return result
 
+        # Periodos criados neste loop nao estao no engine; sem transacoes, o
+        # saldo final de cada um e o proprio opening
+        created_openings = {}
         for gap_month in sorted(gaps):
             prev_month = gap_month
             if prev_month.month == 1:
@@ -513,9 +500,12 @@ class Command(BaseCommand):
                 prev_month_date = gap_month.replace(month=gap_month.month - 1)
 
             opening = Decimal('0.00')
-            prev_period = AccountingPeriod.objects.filter(month=prev_month_date).first()
+            prev_period = self.engine.periods_by_month.get(prev_month_date)
             if prev_period:
-                opening = prev_period.opening_balance + self._calculate_net(prev_period)
+                opening = prev_period.opening_balance + self.engine.net(prev_period)
+            elif prev_month_date in created_openings:
+                opening = created_openings[prev_month_date]
+            created_openings[gap_month] = opening
 
             if not dry_run:
                 AccountingPeriod.objects.create(
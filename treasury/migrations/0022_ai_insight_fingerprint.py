@@ -0,0 +1,48 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('treasury', '0021_normalize_amount_signs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aiinsight',
+            name='error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='aiinsight',
+            name='requested_at',
+            field=models.DateTimeField(blank=True, help_text='Quando a geração atual foi enfileirada', null=True),
+        ),
+        migrations.AddField(
+            model_name='aiinsight',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Gerando'), ('ready', 'Pronto'), ('failed', 'Falhou')], default='ready', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='aiinsight',
+            name='transactions_sum',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Soma com sinal das transações usadas para gerar o insight.', max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='aiinsight',
+            name='transactions_updated_at',
+            field=models.DateTimeField(blank=True, help_text='Última alteração entre as transações usadas para gerar o insight.', null=True),
+        ),
+        migrations.AlterField(
+            model_name='aiinsight',
+            name='content',
+            field=models.TextField(blank=True, default='', help_text='Conteúdo markdown dos insights gerados'),
+        ),
+        migrations.AlterField(
+            model_name='aiinsight',
+            name='transactions_count',
+            field=models.PositiveIntegerField(default=0, help_text='Número de transações usadas para gerar o insight. Se mudar, o cache é invalidado.'),
+        ),
+    ]
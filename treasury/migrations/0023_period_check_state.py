@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('treasury', '0022_ai_insight_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodCheckState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(help_text='SHA256 das entradas verificadas (hex)', max_length=64)),
+                ('results', models.JSONField(default=dict, help_text='Detalhes de cada verificação do período, por nome do check')),
+                ('checked_at', models.DateTimeField()),
+                ('period', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='check_state', to='treasury.accountingperiod')),
+            ],
+            options={
+                'verbose_name': 'Estado de Verificação do Período',
+                'verbose_name_plural': 'Estados de Verificação dos Períodos',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('treasury', '0023_period_check_state'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='transactionmodel',
+            name='acquittance_doc',
+            field=models.FileField(blank=True, db_index=True, null=True, upload_to='treasury/receipts/'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('treasury', '0024_transaction_receipt_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transactionmodel',
+            index=models.Index(fields=['-date', '-created_at', '-id'], name='treasury_tr_date_e93080_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('treasury', '0025_transaction_list_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='periodcheckstate',
+            name='chain_fingerprint',
+            field=models.CharField(blank=True, default='', help_text='SHA256 do período anterior e do início da cadeia (hex)', max_length=64),
+        ),
+    ]
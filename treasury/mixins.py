@@ -5,6 +5,14 @@ Mixins de permissão para views da tesouraria.
 from django.contrib.auth.mixins import AccessMixin, UserPassesTestMixin
 from django.core.exceptions import PermissionDenied
 
+from users.capabilities import (
+    TREASURER_ONLY,
+    TREASURY_ADMIN,
+    TREASURY_VIEWER,
+    Capability,
+    has_capability,
+)
+
 
 class IsTreasurerOnlyMixin(UserPassesTestMixin):
     """
@@ -17,16 +25,7 @@ class IsTreasurerOnlyMixin(UserPassesTestMixin):
     Secretários, pastores e staff em geral NÃO têm acesso.
     """
     def test_func(self):
-        user = self.request.user
-        if not user.is_authenticated:
-            return False
-
-        # Superuser pode tudo
-        if user.is_superuser:
-            return True
-
-        # Apenas tesoureiros (não secretários/pastores)
-        return user.is_treasurer
+        return has_capability(self.request.user, TREASURER_ONLY)
 
     def handle_no_permission(self):
         """Redireciona para página de permissão negada."""
@@ -50,22 +49,7 @@ class IsTreasuryUserMixin(UserPassesTestMixin):
     Congregados e usuários simples NÃO têm acesso.
     """
     def test_func(self):
-        user = self.request.user
-        if not user.is_authenticated:
-            return False
-
-        # Membros regulares podem visualizar
-        if user.type == "REGULAR":
-            return True
-
-        # Staff e funções especiais
-        return (
-            user.is_treasurer or
-            user.is_secretary or
-            user.is_pastor or
-            user.is_staff or
-            user.is_superuser
-        )
+        return has_capability(self.request.user, TREASURY_VIEWER)
 
     def handle_no_permission(self):
         """Redireciona para página de permissão negada."""
@@ -86,16 +70,7 @@ class IsAdminOrTreasuryUserMixin(UserPassesTestMixin):
     - Superuser (is_superuser)
     """
     def test_func(self):
-        user = self.request.user
-        return (
-            user.is_authenticated and (
-                user.is_staff or
-                user.is_superuser or
-                user.is_treasurer or
-                user.is_secretary or
-                user.is_pastor
-            )
-        )
+        return has_capability(self.request.user, TREASURY_ADMIN)
 
     def handle_no_permission(self):
         """Redireciona para página de permissão negada."""
@@ -114,8 +89,7 @@ class IsSuperUserOnlyMixin(UserPassesTestMixin):
     Tesoureiros, secretários, pastores e staff em geral NÃO têm acesso.
     """
     def test_func(self):
-        user = self.request.user
-        return user.is_authenticated and user.is_superuser
+        return has_capability(self.request.user, Capability.SUPERUSER)
 
     def handle_no_permission(self):
         """Redireciona para página de permissão negada."""
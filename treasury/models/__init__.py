@@ -7,6 +7,7 @@ from .monthly_transactions_by_category_model import MonthlyTransactionByCategory
 from .accounting_period import AccountingPeriod
 from .reversal_transaction import ReversalTransaction
 from .ai_insight import AIInsight
+from .period_check_state import PeriodCheckState
 
 # Models no banco de auditoria (audit.sqlite3)
 from .period_snapshot import PeriodSnapshot
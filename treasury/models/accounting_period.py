@@ -4,6 +4,11 @@ from django.utils import timezone
 from decimal import Decimal
 import calendar
 
+MONTH_NAMES = (
+    'Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+    'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro',
+)
+
 
 class AccountingPeriod(models.Model):
     """
@@ -102,11 +107,7 @@ class AccountingPeriod(models.Model):
     @property
     def month_name(self):
         """Retorna o nome do mês em português."""
-        meses = [
-            'Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
-            'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro'
-        ]
-        return meses[self.month.month - 1]
+        return MONTH_NAMES[self.month.month - 1]
 
     @property
     def first_day(self):
@@ -271,7 +272,8 @@ class AccountingPeriod(models.Model):
         Cria o MonthlyReportModel automaticamente ao fechar o período.
         """
         from .monthly_report_model import MonthlyReportModel
-        from .transaction import TransactionModel
+        from .monthly_transactions_by_category_model import MonthlyTransactionByCategoryModel
+        from treasury.utils import get_category_breakdown
         from decimal import Decimal
 
         year = self.month.year
@@ -286,67 +288,35 @@ class AccountingPeriod(models.Model):
             else:
                 previous_balance = prev_period.get_current_balance()
 
-        # Calcular totais das transações
-        transactions = TransactionModel.objects.filter(
-            accounting_period=self,
-            transaction_type='original'
-        )
-
-        positive = transactions.filter(is_positive=True).aggregate(
-            total=models.Sum('amount')
-        )['total'] or Decimal('0.00')
-
-        neg_signed = transactions.filter(is_positive=False, amount__lt=0).aggregate(
-            total=models.Sum('amount')
-        )['total'] or Decimal('0.00')
-        neg_unsigned = transactions.filter(is_positive=False, amount__gt=0).aggregate(
-            total=models.Sum('amount')
-        )['total'] or Decimal('0.00')
-        negative = neg_signed - neg_unsigned
-
-        positive_by_category = {}
-        for tx in transactions.filter(is_positive=True):
-            cat_name = tx.category.name if tx.category else 'outros'
-            positive_by_category[cat_name] = positive_by_category.get(cat_name, Decimal('0.00')) + tx.amount
-
-        negative_by_category = {}
-        for tx in transactions.filter(is_positive=False):
-            cat_name = tx.category.name if tx.category else 'outros'
-            negative_by_category[cat_name] = negative_by_category.get(cat_name, Decimal('0.00')) + abs(tx.amount)
-
-        in_cash = Decimal('0.00')
-        in_current_account = Decimal('0.00')
-        in_savings_account = Decimal('0.00')
+        # Uma consulta alimenta as linhas por categoria e os totais do
+        # relatório, que são a soma delas
+        breakdown = get_category_breakdown(year, month)
+        positive = sum(map(Decimal, breakdown[True].values()), Decimal('0.00'))
+        negative = sum(map(Decimal, breakdown[False].values()), Decimal('0.00'))
 
         monthly_result = positive + negative
         total_balance = previous_balance + monthly_result
 
         # Criar ou atualizar o MonthlyReportModel
-        report, created = MonthlyReportModel.objects.get_or_create(
-            month=self.month,
-            defaults={
-                'previous_month_balance': previous_balance,
-                'total_positive_transactions': positive,
-                'total_negative_transactions': negative,
-                'in_cash': in_cash,
-                'in_current_account': in_current_account,
-                'in_savings_account': in_savings_account,
-                'monthly_result': monthly_result,
-                'total_balance': total_balance,
-            }
-        )
+        report = MonthlyReportModel.objects.filter(month=self.month).first()
+        created = report is None
+        if created:
+            report = MonthlyReportModel(month=self.month)
+        report.previous_month_balance = previous_balance
+        report.total_positive_transactions = positive
+        report.total_negative_transactions = negative
+        report.in_cash = Decimal('0.00')
+        report.in_current_account = Decimal('0.00')
+        report.in_savings_account = Decimal('0.00')
+        report.monthly_result = monthly_result
+        report.total_balance = total_balance
+        # Na criação, o signal post_save_monthly_report grava as categorias
+        report._category_breakdown = breakdown
+        report.save()
 
-        # Se já existe, atualizar
         if not created:
-            report.previous_month_balance = previous_balance
-            report.total_positive_transactions = positive
-            report.total_negative_transactions = negative
-            report.in_cash = in_cash
-            report.in_current_account = in_current_account
-            report.in_savings_account = in_savings_account
-            report.monthly_result = monthly_result
-            report.total_balance = total_balance
-            report.save()
+            # Novo fechamento (após reabertura): as categorias também mudaram
+            MonthlyTransactionByCategoryModel.replace_for_report(report, breakdown)
 
     def _create_frozen_reports(self, user=None):
         """
@@ -364,7 +334,9 @@ class AccountingPeriod(models.Model):
         month = self.month.month
 
         # Preparar contexto para os PDFs
-        from treasury.utils import get_aggregate_transactions_by_category, get_last_day_of_month
+        from treasury.utils import (
+            format_brl, format_brl_values, get_category_breakdown, get_last_day_of_month,
+        )
         from core.core_context_processor import context_user_data
         from decimal import Decimal
 
@@ -375,8 +347,9 @@ class AccountingPeriod(models.Model):
 
         last_day = get_last_day_of_month(year, month)
 
-        positive_transactions_dict = get_aggregate_transactions_by_category(year, month, True)
-        negative_transactions_dict = get_aggregate_transactions_by_category(year, month, False)
+        breakdown = get_category_breakdown(year, month)
+        positive_transactions_dict = format_brl_values(breakdown[True])
+        negative_transactions_dict = format_brl_values(breakdown[False])
 
         m_result = an_report.total_positive_transactions + an_report.total_negative_transactions
 
@@ -416,10 +389,15 @@ class AccountingPeriod(models.Model):
             from treasury.models import TransactionModel
 
             # Buscar todas as transações do período
-            transactions = TransactionModel.objects.filter(
-                accounting_period=self,
-                transaction_type='original'
-            ).order_by('date', 'created_at')
+            transactions = list(
+                TransactionModel.objects.filter(
+                    accounting_period=self,
+                    transaction_type='original'
+                ).select_related('category').order_by('date', 'created_at')
+            )
+            # Valores formatados de uma vez, fora do laço do template
+            for transaction in transactions:
+                transaction.amount_brl = format_brl(transaction.amount)
 
             # Contexto para o extrato
             extract_context = {
@@ -432,7 +410,7 @@ class AccountingPeriod(models.Model):
                 "m_result": m_result,
                 "balance": Decimal(an_report.total_balance),
                 "transactions": transactions,
-                "transaction_count": transactions.count(),
+                "transaction_count": len(transactions),
             }
 
             html_extract = render_to_string("treasury/export_extract_report.html", extract_context)
@@ -9,19 +9,47 @@ class AIInsight(models.Model):
     """
     Armazena insights de IA gerados para um período específico.
 
-    O cache é invalidado automaticamente se o número de transações
-    mudar, garantindo que insights sempre reflitam os dados atuais.
+    O cache é invalidado automaticamente se a impressão digital do livro
+    no período (quantidade, soma e última alteração das transações) mudar,
+    garantindo que insights sempre reflitam os dados atuais.
+
+    A geração roda fora da requisição: o registro fica ``pending`` até o
+    worker gravar o conteúdo (``ready``) ou o erro (``failed``).
     """
+    STATUS_PENDING = 'pending'
+    STATUS_READY = 'ready'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Gerando'),
+        (STATUS_READY, 'Pronto'),
+        (STATUS_FAILED, 'Falhou'),
+    ]
+
     start_date = models.DateField(db_index=True)
     end_date = models.DateField(db_index=True)
-    content = models.TextField(help_text='Conteúdo markdown dos insights gerados')
+    content = models.TextField(blank=True, default='', help_text='Conteúdo markdown dos insights gerados')
     generated_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_READY)
+    error = models.TextField(blank=True, default='')
+    requested_at = models.DateTimeField(
+        null=True, blank=True,
+        help_text='Quando a geração atual foi enfileirada'
+    )
 
-    # Controle de invalidação de cache
+    # Controle de invalidação de cache (impressão digital do livro no período)
     transactions_count = models.PositiveIntegerField(
+        default=0,
         help_text='Número de transações usadas para gerar o insight. '
                   'Se mudar, o cache é invalidado.'
     )
+    transactions_sum = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0,
+        help_text='Soma com sinal das transações usadas para gerar o insight.'
+    )
+    transactions_updated_at = models.DateTimeField(
+        null=True, blank=True,
+        help_text='Última alteração entre as transações usadas para gerar o insight.'
+    )
 
     # Metadata para rastreamento
     model_used = models.CharField(
@@ -54,17 +82,26 @@ class AIInsight(models.Model):
         if self.start_date and self.end_date and self.start_date > self.end_date:
             raise ValidationError({'start_date': 'Data inicial deve ser anterior ou igual à data final.'})
 
-    def is_still_valid(self, current_count: int) -> bool:
+    @property
+    def fingerprint(self) -> tuple:
+        """Impressão digital do livro usada na geração: (count, soma, última alteração)."""
+        return (self.transactions_count, self.transactions_sum, self.transactions_updated_at)
+
+    @fingerprint.setter
+    def fingerprint(self, value: tuple):
+        self.transactions_count, self.transactions_sum, self.transactions_updated_at = value
+
+    def is_still_valid(self, current_fingerprint: tuple) -> bool:
         """
-        Verifica se o insight ainda é válido baseado no count de transações.
+        Verifica se o insight ainda é válido comparando a impressão digital do livro.
 
         Args:
-            current_count: Número atual de transações no período
+            current_fingerprint: Tupla (count, soma, última alteração) atual do período
 
         Returns:
             True se o cache ainda é válido, False caso contrário
         """
-        return self.transactions_count == current_count
+        return self.status == self.STATUS_READY and self.fingerprint == tuple(current_fingerprint)
 
     @property
     def is_stale(self) -> bool:
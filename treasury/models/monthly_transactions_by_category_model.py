@@ -16,3 +16,19 @@ class MonthlyTransactionByCategoryModel(BaseModel):
 
     def __str__(self):
         return f'{self.category}'
+
+    @classmethod
+    def replace_for_report(cls, report, breakdown):
+        """
+        Regrava as linhas por categoria de um relatório em um único INSERT.
+
+        Args:
+            report: MonthlyReportModel
+            breakdown: Resultado de get_category_breakdown
+        """
+        cls.objects.filter(report=report).delete()
+        cls.objects.bulk_create([
+            cls(report=report, category=category, total_amount=total, is_positive=sign)
+            for sign in (True, False)
+            for category, total in breakdown[sign].items()
+        ])
@@ -0,0 +1,40 @@
+from django.db import models
+
+
+class PeriodCheckState(models.Model):
+    """
+    Último resultado do check_treasury para um período contábil.
+
+    ``fingerprint`` resume as entradas das verificações do período (contagem,
+    soma e última alteração das transações, campos do período, MonthlyReport
+    e hashes dos FrozenReports). Enquanto ele não mudar, os resultados
+    gravados em ``results`` são reaproveitados em vez de verificar de novo.
+
+    ``chain_fingerprint`` resume o que as verificações em cadeia (abertura,
+    MonthlyReport e saldo corrente) leem dos vizinhos; se ele mudar, só os
+    resultados dessas verificações são refeitos.
+    """
+    period = models.OneToOneField(
+        'AccountingPeriod',
+        on_delete=models.CASCADE,
+        related_name='check_state',
+    )
+    fingerprint = models.CharField(max_length=64, help_text="SHA256 das entradas verificadas (hex)")
+    chain_fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        help_text="SHA256 do período anterior e do início da cadeia (hex)",
+    )
+    results = models.JSONField(
+        default=dict,
+        help_text="Detalhes de cada verificação do período, por nome do check",
+    )
+    checked_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Estado de Verificação do Período"
+        verbose_name_plural = "Estados de Verificação dos Períodos"
+
+    def __str__(self):
+        return f"Verificação de {self.period} em {self.checked_at:%d/%m/%Y %H:%M}"
@@ -3,18 +3,9 @@ from core.models import BaseModel
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from treasury.utils import custom_upload_to
-from django.core.files.storage import default_storage
 from decimal import Decimal
 import os
 
-# Import para S3 (se disponível)
-try:
-    import boto3
-    from django.conf import settings
-    BOTO3_AVAILABLE = True
-except ImportError:
-    BOTO3_AVAILABLE = False
-
 
 class TransactionModel(BaseModel):
     user = models.ForeignKey("users.CustomUser", on_delete=models.CASCADE)
@@ -28,9 +19,11 @@ class TransactionModel(BaseModel):
 
     # FileField simples para aceitar PDF e imagens
     # Nota: usa string literal para evitar problemas com migrations no SQLite
+    # Arquivos novos são gravados pelo hash do conteúdo (ReceiptStorageService);
+    # o índice serve à contagem de referências
     acquittance_doc = models.FileField(
         upload_to='treasury/receipts/',
-        blank=True, null=True
+        blank=True, null=True, db_index=True
     )
 
     edit_history = models.ManyToManyField(
@@ -87,6 +80,10 @@ class TransactionModel(BaseModel):
     class Meta:
         verbose_name = "Transação"
         verbose_name_plural = "Transações"
+        indexes = [
+            # Ordem da listagem da API (paginação por cursor)
+            models.Index(fields=['-date', '-created_at', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.date} - {self.description} - R$ {self.amount}"
@@ -136,7 +133,10 @@ class TransactionModel(BaseModel):
                 # AccountingPeriod might not exist during migrations
                 pass
 
+        from treasury.services.receipt_storage_service import ReceiptStorageService
+
         # Verificar se a transação pode ser editada
+        old_doc = None
         if self.pk:
             # Verificar se o período está fechado
             old_transaction = TransactionModel.objects.filter(pk=self.pk).first()
@@ -146,60 +146,28 @@ class TransactionModel(BaseModel):
                     # (isso será tratado pela API, não aqui)
                     pass
 
-            # Limpar documento antigo se foi alterado
-            old_doc = TransactionModel.objects.filter(
-                pk=self.pk).values_list('acquittance_doc', flat=True).first()
-            if old_doc and old_doc != self.acquittance_doc.name:
-                try:
-                    default_storage.delete(old_doc)
-                except Exception as e:
-                    print(f"Erro ao deletar documento: {e}")
-
-        super().save(*args, **kwargs)
+            # Documento atual, liberado depois se for trocado
+            if old_transaction:
+                old_doc = old_transaction.acquittance_doc.name
 
-    def delete(self, *args, **kwargs):
-        # Deleta o arquivo do comprovante (local ou S3)
-        if self.acquittance_doc and self.acquittance_doc.name:
-            deleted = False
+        # Comprovante recém-enviado: grava pelo hash do conteúdo
+        if self.acquittance_doc and not self.acquittance_doc._committed:
+            self.acquittance_doc = ReceiptStorageService.store(self.acquittance_doc.file)
 
-            # Método 1: Tenta usar o método padrão do Django
-            try:
-                self.acquittance_doc.delete(save=False)
-                deleted = True
-            except Exception as e1:
-                print(f"[TransactionModel] Erro ao deletar com .delete(): {e1}")
+        super().save(*args, **kwargs)
 
-            # Método 2: Se falhou e S3 está configurado, tenta boto3 diretamente
-            if not deleted and BOTO3_AVAILABLE:
-                try:
-                    s3 = boto3.client(
-                        's3',
-                        endpoint_url=getattr(settings, 'AWS_S3_ENDPOINT_URL', None),
-                        aws_access_key_id=getattr(settings, 'AWS_ACCESS_KEY_ID', None),
-                        aws_secret_access_key=getattr(settings, 'AWS_SECRET_ACCESS_KEY', None),
-                        region_name=getattr(settings, 'AWS_S3_REGION_NAME', 'us-east-1')
-                    )
-                    bucket_name = getattr(settings, 'AWS_STORAGE_BUCKET_NAME', None)
-                    if bucket_name:
-                        s3.delete_object(Bucket=bucket_name, Key=self.acquittance_doc.name)
-                        deleted = True
-                        print(f"[TransactionModel] Arquivo deletado do S3 via boto3: {self.acquittance_doc.name}")
-                except Exception as e2:
-                    print(f"[TransactionModel] Erro ao deletar com boto3: {e2}")
-
-            # Método 3: Storage local (fallback)
-            if not deleted:
-                try:
-                    if self.acquittance_doc.storage.exists(self.acquittance_doc.name):
-                        self.acquittance_doc.storage.delete(self.acquittance_doc.name)
-                        deleted = True
-                except Exception as e3:
-                    print(f"[TransactionModel] Erro ao deletar com storage: {e3}")
+        # Libera o documento antigo se foi trocado (removido se ninguém mais o usa)
+        if old_doc and old_doc != self.acquittance_doc.name:
+            ReceiptStorageService.release(old_doc)
 
-            if not deleted:
-                print(f"[TransactionModel] AVISO: Arquivo não foi deletado: {self.acquittance_doc.name}")
+    def delete(self, *args, **kwargs):
+        from treasury.services.receipt_storage_service import ReceiptStorageService
 
-        super(TransactionModel, self).delete(*args, **kwargs)
+        doc = self.acquittance_doc.name
+        result = super(TransactionModel, self).delete(*args, **kwargs)
+        # O comprovante só sai do storage quando a última transação que o usa é excluída
+        ReceiptStorageService.release(doc)
+        return result
 
     @property
     def signed_amount(self):
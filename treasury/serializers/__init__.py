@@ -4,6 +4,7 @@ from django.contrib.auth import get_user_model
 from django.db import models
 from decimal import Decimal
 
+from core.views.protected_media_view import protected_thumbnail_url
 from treasury.models import (
     AccountingPeriod,
     TransactionModel,
@@ -11,6 +12,7 @@ from treasury.models import (
     CategoryModel,
     AuditLog,
 )
+from treasury.models.accounting_period import MONTH_NAMES
 
 User = get_user_model()
 
@@ -225,6 +227,7 @@ class TransactionSerializer(serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True, allow_null=True)
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True, allow_null=True)
     reversal_count = serializers.SerializerMethodField()
+    acquittance_thumbnail = serializers.SerializerMethodField()
 
     class Meta:
         model = TransactionModel
@@ -240,6 +243,7 @@ class TransactionSerializer(serializers.ModelSerializer):
             'signed_amount',
             'date',
             'acquittance_doc',
+            'acquittance_thumbnail',
             'accounting_period',
             'period_name',
             'period_status',
@@ -275,6 +279,14 @@ class TransactionSerializer(serializers.ModelSerializer):
     def get_reversal_count(self, obj):
         return obj.reversals.count()
 
+    def get_acquittance_thumbnail(self, obj):
+        """Miniatura WebP do comprovante (None enquanto não for gerada)."""
+        url = protected_thumbnail_url('receipt', obj, 320, fallback=False)
+        request = self.context.get('request')
+        if url and request is not None:
+            return request.build_absolute_uri(url)
+        return url or None
+
 
 class TransactionListSerializer(serializers.ModelSerializer):
     """Serializer simplificado para listagem de transações."""
@@ -315,6 +327,72 @@ class TransactionListSerializer(serializers.ModelSerializer):
         return None
 
 
+class TransactionRowSerializer(serializers.Serializer):
+    """
+    Linha da listagem de transações a partir de ``.values(*VALUES)``.
+
+    Mesmo formato do TransactionListSerializer, sem instanciar modelos e com o
+    período resumido (sem transactions_summary, que custava consultas por linha).
+    """
+
+    VALUES = (
+        'id',
+        'description',
+        'amount',
+        'is_positive',
+        'date',
+        'transaction_type',
+        'category_id',
+        'category__name',
+        'accounting_period_id',
+        'accounting_period__month',
+        'accounting_period__status',
+    )
+
+    def to_representation(self, row):
+        amount = row['amount']
+        signed_amount = amount if row['is_positive'] else -amount
+        category_id = row['category_id']
+        period_id = row['accounting_period_id']
+        status = row['accounting_period__status']
+
+        period = None
+        period_name = None
+        if period_id is not None:
+            month = row['accounting_period__month']
+            period_name = MONTH_NAMES[month.month - 1]
+            period = {
+                'id': period_id,
+                'month': month.isoformat(),
+                'year': month.year,
+                'month_name': period_name,
+                'status': status,
+                'is_open': status == 'open',
+            }
+
+        is_open = period_id is None or status == 'open'
+        return {
+            'id': row['id'],
+            'description': row['description'],
+            'amount': f'{amount:.2f}',
+            'is_positive': row['is_positive'],
+            'signed_amount': f'{signed_amount:.2f}',
+            'date': row['date'].isoformat(),
+            'category': (
+                {'id': category_id, 'name': row['category__name']}
+                if category_id is not None else None
+            ),
+            'category_name': row['category__name'],
+            'accounting_period': period,
+            'period_name': period_name,
+            'period_status': status,
+            'transaction_type': row['transaction_type'],
+            'can_be_edited': is_open,
+            'can_be_reversed': not is_open and row['transaction_type'] == 'original',
+            'can_be_deleted': is_open,
+        }
+
+
 class TransactionCreateSerializer(serializers.ModelSerializer):
     """Serializer para criar transações."""
 
@@ -648,6 +726,7 @@ __all__ = [
     'AccountingPeriodCloseSerializer',
     'TransactionSerializer',
     'TransactionListSerializer',
+    'TransactionRowSerializer',
     'TransactionCreateSerializer',
     'TransactionUpdateSerializer',
     'ReversalTransactionSerializer',
@@ -1,4 +1,8 @@
+from .ai_insight_service import AIInsightService
+from .balance_sheet_service import BalanceSheetService
+from .chart_series_service import ChartSeriesService
 from .period_service import PeriodService
+from .receipt_storage_service import ReceiptStorageService
 from .transaction_service import TransactionService
 
-__all__ = ['PeriodService', 'TransactionService']
+__all__ = ['AIInsightService', 'BalanceSheetService', 'ChartSeriesService', 'PeriodService', 'ReceiptStorageService', 'TransactionService']
@@ -0,0 +1,399 @@
+"""
+Serviço de insights financeiros gerados por IA.
+
+O cache de cada período é chaveado por uma impressão digital barata do livro
+(quantidade, soma com sinal e última alteração das transações), calculada em
+uma única agregação. A geração, que depende de uma chamada lenta ao LLM,
+roda em um worker fora da requisição; o cliente consulta o status até ficar
+pronto.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Case, Count, DecimalField, F, Max, Sum, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from treasury.models import AIInsight, TransactionModel
+
+logger = logging.getLogger(__name__)
+
+# Uma geração por vez: o gargalo é o LLM, não o banco
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ai-insights')
+
+# Gerações pendentes há mais tempo que isso são consideradas perdidas (ex.: restart)
+PENDING_TIMEOUT = timedelta(minutes=5)
+
+
+class AIInsightService:
+    """
+    Serviço para geração e cache de insights de IA por período.
+
+    Responsável por:
+    - Calcular a impressão digital do livro no período
+    - Montar o resumo a partir de agregações SQL
+    - Enfileirar e executar a geração fora da requisição
+    """
+
+    def ledger_fingerprint(self, start_date, end_date):
+        """
+        Calcula a impressão digital das transações do período em uma consulta.
+
+        Args:
+            start_date: Data inicial (inclusive)
+            end_date: Data final (inclusive)
+
+        Returns:
+            Tupla (count, soma com sinal, max(updated_at))
+        """
+        signed_amount = Case(
+            When(is_positive=True, then=F('amount')),
+            default=-F('amount'),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        )
+        result = TransactionModel.objects.filter(
+            date__gte=start_date,
+            date__lte=end_date,
+        ).aggregate(
+            count=Count('id'),
+            total=Coalesce(Sum(signed_amount), Decimal('0'),
+                           output_field=DecimalField(max_digits=14, decimal_places=2)),
+            last_change=Max('updated_at'),
+        )
+        return (result['count'], result['total'], result['last_change'])
+
+    def category_totals(self, start_date, end_date):
+        """
+        Totais por categoria e sinal das transações originais do período.
+
+        Args:
+            start_date: Data inicial (inclusive)
+            end_date: Data final (inclusive)
+
+        Returns:
+            Lista de dicts com category__name, is_positive, total e count
+        """
+        return list(
+            TransactionModel.objects.filter(
+                date__gte=start_date,
+                date__lte=end_date,
+                transaction_type='original',
+            ).values('category__name', 'is_positive').annotate(
+                total=Sum('amount'),
+                count=Count('id'),
+            ).order_by()
+        )
+
+    def request_insight(self, start_date, end_date, force=False):
+        """
+        Retorna o insight do período, enfileirando uma nova geração se preciso.
+
+        Args:
+            start_date: Data inicial (inclusive)
+            end_date: Data final (inclusive)
+            force: Regenera mesmo que o cache seja válido
+
+        Returns:
+            Tupla (insight, fingerprint). O insight volta ``ready`` quando o
+            cache é válido, ou ``pending`` quando uma geração foi enfileirada.
+            Retorna (None, fingerprint) se não houver transações no período.
+        """
+        fingerprint = self.ledger_fingerprint(start_date, end_date)
+        if not fingerprint[0]:
+            return None, fingerprint
+
+        try:
+            insight, _ = AIInsight.objects.get_or_create(
+                start_date=start_date,
+                end_date=end_date,
+                defaults={'status': AIInsight.STATUS_PENDING},
+            )
+        except IntegrityError:
+            insight = AIInsight.objects.get(start_date=start_date, end_date=end_date)
+
+        if not force and insight.is_still_valid(fingerprint):
+            return insight, fingerprint
+
+        if not force and self._is_generating(insight):
+            return insight, fingerprint
+
+        insight.status = AIInsight.STATUS_PENDING
+        insight.error = ''
+        insight.requested_at = timezone.now()
+        insight.save(update_fields=['status', 'error', 'requested_at'])
+        self.dispatch(insight.pk)
+        return insight, fingerprint
+
+    def get_insight(self, start_date, end_date):
+        """Retorna o insight salvo do período (para polling), ou None."""
+        return AIInsight.objects.filter(start_date=start_date, end_date=end_date).first()
+
+    def dispatch(self, insight_id):
+        """Enfileira a geração no worker depois do commit da requisição."""
+        transaction.on_commit(lambda: _executor.submit(self._run_in_worker, insight_id))
+
+    def _is_generating(self, insight):
+        return (
+            insight.status == AIInsight.STATUS_PENDING
+            and insight.requested_at is not None
+            and timezone.now() - insight.requested_at < PENDING_TIMEOUT
+        )
+
+    def _run_in_worker(self, insight_id):
+        close_old_connections()
+        try:
+            self.generate(insight_id)
+        finally:
+            close_old_connections()
+
+    def generate(self, insight_id):
+        """
+        Gera e salva o conteúdo de um insight pendente (executado no worker).
+
+        A impressão digital é recalculada aqui, junto com o resumo, para que
+        o insight salvo corresponda exatamente aos dados analisados.
+
+        Args:
+            insight_id: ID do AIInsight a ser gerado
+        """
+        insight = AIInsight.objects.get(pk=insight_id)
+        use_mistral_api = not getattr(settings, 'DEBUG', True)
+
+        try:
+            fingerprint = self.ledger_fingerprint(insight.start_date, insight.end_date)
+            summary = self._prepare_summary_for_ai(insight.start_date, insight.end_date)
+            logger.info(f'Summary preparado: {len(summary)} caracteres')
+
+            # Gerar insights com Ollama (dev) ou Mistral API (prod)
+            if use_mistral_api:
+                content = self._generate_insights_with_mistral(summary)
+            else:
+                content = self._generate_insights_with_ollama(summary)
+        except Exception as e:
+            logger.exception(f'Erro ao gerar insights (id={insight_id}): {e}')
+            insight.status = AIInsight.STATUS_FAILED
+            insight.error = str(e)
+            insight.save(update_fields=['status', 'error'])
+            return insight
+
+        insight.content = content
+        insight.fingerprint = fingerprint
+        insight.status = AIInsight.STATUS_READY
+        insight.error = ''
+        insight.generated_at = timezone.now()
+        insight.model_used = (
+            getattr(settings, 'MISTRAL_MODEL', 'mistral-small-latest') if use_mistral_api
+            else getattr(settings, 'OLLAMA_TEXT_MODEL', 'gemma3n:e4b')
+        )
+        insight.debug_mode = getattr(settings, 'DEBUG', True)
+        insight.save()
+        logger.info(f'Insight salvo no banco (id={insight.id})')
+        return insight
+
+    def _generate_insights_with_ollama(self, summary: str) -> str:
+        """Gera insights usando Ollama (modelo local)."""
+        import requests
+
+        ollama_base_url = getattr(settings, 'OLLAMA_HOST', 'http://localhost:11434')
+        ollama_model = getattr(settings, 'OLLAMA_TEXT_MODEL', 'gemma3n:e4b')
+
+        logger.info(f'Gerando insights com Ollama: model={ollama_model}, url={ollama_base_url}')
+
+        payload = {
+            'model': ollama_model,
+            'messages': [
+                {
+                    'role': 'system',
+                    'content': 'Você é um assistente financeiro especializado em análise de dados financeiros de igrejas. '
+                    'Forneça insights práticos e acionáveis em formato markdown, usando linguagem clara e objetiva. '
+                    'Use emojis para tornar o texto mais visual. '
+                    'Estruture sua resposta com: 📊 Visão Geral, 💡 Insights Principais, ⚠️ Pontos de Atenção, 🎯 Recomendações, 📖 Palavra de Sabedoria. '
+                    'Na seção "📖 Palavra de Sabedoria", inclua 1-2 versículos bíblicos relevantes sobre fidelidade, mordomia e sabedoria financeira, '
+                    'com uma breve exposição/princípio prático que se aplica à situação financeira analisada.'
+                },
+                {
+                    'role': 'user',
+                    'content': f'Analise os seguintes dados financeiros:\n\n{summary}'
+                }
+            ],
+            'stream': False,
+            'options': {
+                'num_predict': 1200,
+                'temperature': 0.7
+            }
+        }
+
+        try:
+            response = requests.post(
+                f'{ollama_base_url}/api/chat',
+                json=payload,
+                timeout=120
+            )
+            logger.info(f'Ollama response status: {response.status_code}')
+        except requests.exceptions.ConnectionError as e:
+            error_msg = f'Ollama não está respondendo em {ollama_base_url}. Verifique se o serviço está rodando.'
+            logger.error(f'ConnectionError: {error_msg} - {e}')
+            raise Exception(error_msg)
+        except requests.exceptions.Timeout as e:
+            error_msg = f'Ollama demorou muito para responder (timeout 120s). Tente reduzir o período ou usar um modelo mais rápido.'
+            logger.error(f'Timeout: {error_msg} - {e}')
+            raise Exception(error_msg)
+        except requests.exceptions.RequestException as e:
+            error_msg = f'Erro ao comunicar com Ollama: {type(e).__name__}: {e}'
+            logger.error(f'RequestException: {error_msg}')
+            raise Exception(error_msg)
+
+        if response.status_code != 200:
+            error_detail = response.text[:500] if response.text else 'sem detalhes'
+            error_msg = f'Ollama retornou erro {response.status_code}: {error_detail}'
+            logger.error(f'Ollama HTTP error: {error_msg}')
+            raise Exception(error_msg)
+
+        try:
+            result = response.json()
+        except ValueError as e:
+            error_msg = f'Resposta inválida do Ollama (não é JSON): {response.text[:200]}'
+            logger.error(f'JSON decode error: {error_msg}')
+            raise Exception(error_msg)
+
+        insights = result.get('message', {}).get('content', '')
+
+        if not insights:
+            error_msg = f'Ollama retornou resposta vazia. Resposta completa: {result}'
+            logger.error(f'Empty insights: {error_msg}')
+            raise Exception('Resposta vazia da IA - tente novamente')
+
+        logger.info(f'Insights gerados com sucesso: {len(insights)} caracteres')
+        return insights
+
+    def _generate_insights_with_mistral(self, summary: str) -> str:
+        """Gera insights usando Mistral API com mistral-small-latest."""
+        logger.info('Gerando insights com Mistral API')
+
+        try:
+            from mistralai import Mistral
+        except ImportError:
+            error_msg = 'SDK Mistral não instalado. Execute: pip install mistralai'
+            logger.error(f'ImportError: {error_msg}')
+            raise Exception(error_msg)
+
+        api_key = getattr(settings, 'MISTRAL_API_KEY', None)
+        if not api_key:
+            error_msg = 'MISTRAL_API_KEY não configurado nas variáveis de ambiente'
+            logger.error(f'Missing API key: {error_msg}')
+            raise Exception(error_msg)
+
+        model = getattr(settings, 'MISTRAL_MODEL', 'mistral-small-latest')
+        logger.info(f'Usando modelo Mistral: {model}')
+
+        try:
+            client = Mistral(api_key=api_key)
+
+            chat_response = client.chat.complete(
+                model=model,
+                messages=[
+                    {
+                        'role': 'system',
+                        'content': 'Você é um assistente financeiro especializado em análise de dados financeiros de igrejas. '
+                        'Forneça insights práticos e acionáveis em formato markdown, usando linguagem clara e objetiva. '
+                        'Use emojis para tornar o texto mais visual. '
+                        'Estruture sua resposta com: 📊 Visão Geral, 💡 Insights Principais, ⚠️ Pontos de Atenção, 🎯 Recomendações, 📖 Palavra de Sabedoria. '
+                        'Na seção "📖 Palavra de Sabedoria", inclua 1-2 versículos bíblicos relevantes sobre fidelidade, mordomia e sabedoria financeira, '
+                        'com uma breve exposição/princípio prático que se aplica à situação financeira analisada.'
+                    },
+                    {
+                        'role': 'user',
+                        'content': f'Analise os seguintes dados financeiros:\n\n{summary}'
+                    }
+                ],
+                max_tokens=1200,
+                temperature=0.7
+            )
+
+            insights = chat_response.choices[0].message.content
+
+            if not insights:
+                error_msg = 'Mistral retornou resposta vazia - tente novamente'
+                logger.error(f'Empty response from Mistral: {error_msg}')
+                raise Exception(error_msg)
+
+            logger.info(f'Insights gerados com sucesso: {len(insights)} caracteres')
+            return insights
+
+        except Exception as e:
+            if '401' in str(e) or 'authentication' in str(e).lower():
+                error_msg = f'Erro de autenticação na API Mistral. Verifique MISTRAL_API_KEY: {e}'
+            elif 'rate limit' in str(e).lower():
+                error_msg = f'Limite de taxa da API Mistral atingido. Tente novamente em alguns minutos: {e}'
+            elif 'timeout' in str(e).lower():
+                error_msg = f'Timeout na API Mistral. Tente novamente: {e}'
+            else:
+                error_msg = f'Erro ao comunicar com Mistral API: {type(e).__name__}: {e}'
+            logger.error(f'Mistral API error: {error_msg}')
+            raise Exception(error_msg)
+
+    def _prepare_summary_for_ai(self, start_date, end_date):
+        """Prepara um resumo dos dados para enviar à IA a partir dos totais por categoria."""
+        from collections import defaultdict
+
+        # Agrupar por categoria
+        category_totals = defaultdict(lambda: {'revenue': Decimal('0'), 'expense': Decimal('0'), 'count': 0})
+        transactions_count = 0
+
+        for row in self.category_totals(start_date, end_date):
+            cat = row['category__name'] or 'Sem Categoria'
+            if row['is_positive']:
+                category_totals[cat]['revenue'] += row['total']
+            else:
+                category_totals[cat]['expense'] += abs(row['total'])
+            category_totals[cat]['count'] += row['count']
+            transactions_count += row['count']
+
+        # Calcular totais gerais
+        total_revenue = sum(d['revenue'] for d in category_totals.values())
+        total_expense = sum(d['expense'] for d in category_totals.values())
+        net_balance = total_revenue - total_expense
+
+        # Formatar resumo
+        summary = f"""Período Analisado: {start_date.strftime('%d/%m/%Y')} a {end_date.strftime('%d/%m/%Y')}
+
+RESUMO FINANCEIRO:
+• Total de Receitas: R$ {float(total_revenue):,.2f}
+• Total de Despesas: R$ {float(total_expense):,.2f}
+• Saldo Líquido: R$ {float(net_balance):,.2f}
+• Número de Transações: {transactions_count}
+
+TOP RECEITAS POR CATEGORIA:
+"""
+
+        # Adicionar top categorias de receita
+        revenue_by_cat = sorted(
+            [(cat, float(data['revenue'])) for cat, data in category_totals.items()],
+            key=lambda x: x[1],
+            reverse=True
+        )[:5]
+
+        for cat, total in revenue_by_cat:
+            if total > 0:
+                summary += f"• {cat}: R$ {total:,.2f}\n"
+
+        summary += "\nTOP DESPESAS POR CATEGORIA:\n"
+
+        # Adicionar top categorias de despesa
+        expense_by_cat = sorted(
+            [(cat, float(data['expense'])) for cat, data in category_totals.items()],
+            key=lambda x: x[1],
+            reverse=True
+        )[:5]
+
+        for cat, total in expense_by_cat:
+            if total > 0:
+                summary += f"• {cat}: R$ {total:,.2f}\n"
+
+        summary += "\nForneça insights sobre estes dados, destacando tendências, padrões e recomendações."
+
+        return summary
@@ -0,0 +1,207 @@
+"""
+Balanço financeiro de vários anos em uma consulta.
+
+Os totais de cada período saem de subconsultas agrupadas por período e o
+resultado acumulado de uma soma com janela (``SUM(...) OVER (ORDER BY month)``),
+tudo no mesmo SELECT. Os dados calculados ficam em cache pela combinação de
+filtros e pela versão do livro-caixa, incrementada após o commit de cada
+gravação de transação ou período (ver ``treasury.signals.ledger_version``).
+O PDF é renderizado a cada pedido, pois traz a data de geração e os dados
+da igreja.
+
+A versão do livro-caixa fica no cache padrão; com vários processos, ele
+precisa ser compartilhado (Redis, Memcached ou banco) para que a
+invalidação alcance todos.
+"""
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value, Window
+from django.db.models.functions import Abs, Coalesce
+
+from treasury.models import AccountingPeriod, TransactionModel
+from treasury.utils import format_brl
+
+LEDGER_VERSION_KEY = "treasury:ledger:version"
+BALANCE_SHEET_DATA_TIMEOUT = 60 * 60 * 24
+
+_ROW_MONEY_FIELDS = ('opening_balance', 'total_positive', 'total_negative', 'net', 'closing_balance')
+
+STATUS_LABELS = {
+    'all': 'Todos',
+    'open': 'Abertos',
+    'closed': 'Fechados',
+    'archived': 'Arquivados',
+}
+
+_MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+def get_ledger_version():
+    return cache.get_or_set(LEDGER_VERSION_KEY, 1, None)
+
+
+def bump_ledger_version():
+    try:
+        cache.incr(LEDGER_VERSION_KEY)
+    except ValueError:
+        cache.set(LEDGER_VERSION_KEY, 2, None)
+
+
+def _period_total(amount, **filters):
+    """Subconsulta com o total das transações originais do período externo."""
+    total = (
+        TransactionModel.objects.filter(
+            accounting_period=OuterRef('pk'),
+            transaction_type='original',
+            **filters,
+        )
+        .values('accounting_period')
+        .annotate(total=Sum(amount))
+        .values('total')
+    )
+    return Coalesce(Subquery(total, output_field=_MONEY), Value(Decimal('0.00')), output_field=_MONEY)
+
+
+class BalanceSheetService:
+    """
+    Serviço para o balanço financeiro (saldos por período).
+
+    Responsável por:
+    - Calcular entradas, saídas e saldos de todos os períodos em uma consulta
+    - Renderizar e manter em cache o PDF do balanço
+    """
+
+    def periods_with_totals(self, end_year=None):
+        """
+        Períodos até ``end_year`` com totais e resultado acumulado.
+
+        Cada período vem anotado com ``total_positive``, ``total_negative``
+        (negativo, independente de as saídas estarem gravadas com ou sem
+        sinal) e ``cumulative_net`` (soma dos resultados até o período).
+        A janela precisa enxergar todos os períodos anteriores, então só o
+        limite superior é filtrado no banco.
+        """
+        periods = AccountingPeriod.objects.annotate(
+            total_positive=_period_total('amount', is_positive=True),
+            total_negative=-_period_total(Abs('amount'), is_positive=False),
+        ).annotate(
+            cumulative_net=Window(
+                Sum(F('total_positive') + F('total_negative')),
+                order_by=F('month').asc(),
+            ),
+        ).order_by('month')
+
+        if end_year:
+            periods = periods.filter(month__year__lte=int(end_year))
+        return periods
+
+    def build(self, start_year=None, end_year=None, status_filter='all'):
+        """
+        Monta os dados do balanço para os filtros informados.
+
+        O saldo de um período é o closing_balance quando ele existe; caso
+        contrário, o último saldo fechado mais os resultados acumulados desde
+        então (diferença de ``cumulative_net``). Não há consultas além da
+        de ``periods_with_totals``.
+
+        Returns:
+            Dict com periods_with_balance, total_positive, total_negative,
+            total_net e final_balance
+        """
+        anchor_balance = Decimal('0.00')
+        anchor_cumulative = Decimal('0.00')
+        running_balance = Decimal('0.00')
+
+        periods_with_balance = []
+        total_positive = Decimal('0.00')
+        total_negative = Decimal('0.00')
+
+        for period in self.periods_with_totals(end_year):
+            opening_balance = running_balance
+            cumulative = period.cumulative_net
+
+            if period.closing_balance is not None:
+                closing_balance = period.closing_balance
+                anchor_balance = closing_balance
+                anchor_cumulative = cumulative
+            else:
+                closing_balance = anchor_balance + (cumulative - anchor_cumulative)
+            running_balance = closing_balance
+
+            if start_year and period.year < int(start_year):
+                continue
+            if status_filter and status_filter != 'all' and period.status != status_filter:
+                continue
+
+            net = period.total_positive + period.total_negative
+            periods_with_balance.append({
+                'period': period,
+                'opening_balance': opening_balance,
+                'total_positive': period.total_positive,
+                'total_negative': period.total_negative,
+                'net': net,
+                'closing_balance': closing_balance,
+            })
+            total_positive += period.total_positive
+            total_negative += period.total_negative
+
+        final_balance = (
+            periods_with_balance[-1]['closing_balance'] if periods_with_balance else Decimal('0.00')
+        )
+        return {
+            'periods_with_balance': periods_with_balance,
+            'total_positive': total_positive,
+            'total_negative': total_negative,
+            'total_net': total_positive + total_negative,
+            'final_balance': final_balance,
+        }
+
+    def data_cache_key(self, start_year, end_year, status_filter):
+        return (
+            f"treasury:balance_sheet:{get_ledger_version()}:"
+            f"{start_year or ''}:{end_year or ''}:{status_filter or 'all'}"
+        )
+
+    def cached_build(self, start_year=None, end_year=None, status_filter='all'):
+        """``build`` reaproveitando o cache enquanto o livro-caixa não mudar."""
+        key = self.data_cache_key(start_year, end_year, status_filter)
+        data = cache.get(key)
+        if data is None:
+            data = self.build(start_year, end_year, status_filter)
+            cache.set(key, data, BALANCE_SHEET_DATA_TIMEOUT)
+        return data
+
+    def render_pdf(self, start_year, end_year, status_filter, extra_context, base_url):
+        """
+        Renderiza o PDF do balanço a partir dos dados em cache.
+
+        Args:
+            start_year: Ano inicial (ou None)
+            end_year: Ano final (ou None)
+            status_filter: Filtro de status (all, open, closed, archived)
+            extra_context: Contexto adicional do template (ex.: church_info)
+            base_url: URL base para recursos estáticos do WeasyPrint
+
+        Returns:
+            Bytes do PDF
+        """
+        import weasyprint
+        from django.template.loader import render_to_string
+
+        data = self.cached_build(start_year, end_year, status_filter)
+        # Valores das linhas já formatados: o template só exibe o texto
+        for item in data['periods_with_balance']:
+            for field in _ROW_MONEY_FIELDS:
+                item[f'{field}_brl'] = format_brl(item[field])
+
+        context = {
+            **extra_context,
+            'start_year': start_year,
+            'end_year': end_year,
+            'status_filter': status_filter,
+            'status_label': STATUS_LABELS.get(status_filter, 'Todos'),
+            **data,
+        }
+        html = render_to_string("treasury/export_balance_sheet_report.html", context)
+        return weasyprint.HTML(string=html, base_url=base_url).write_pdf()
@@ -0,0 +1,167 @@
+"""
+Séries dos gráficos da tesouraria em centavos inteiros.
+
+Cada valor já sai do banco em centavos (``CAST(ROUND(amount * 100))`` somado
+como inteiro) e os saldos acumulados são somas de inteiros, sem passar por
+float. As respostas são colunares: um array de rótulos e um array de
+centavos por série; o front divide por 100 apenas para exibir.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+from itertools import accumulate
+from operator import sub
+
+from django.db.models import F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Abs, Cast, Coalesce, Round, TruncMonth
+
+from treasury.models import AccountingPeriod, TransactionModel
+
+MONTH_ABBR = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+_CENTS = Cast(Round(F('amount') * 100), IntegerField())
+
+# Entradas e saídas em centavos positivos; saídas com ou sem sinal
+REVENUE_CENTS = Coalesce(Sum(_CENTS, filter=Q(is_positive=True)), Value(0))
+EXPENSE_CENTS = Coalesce(Sum(Abs(_CENTS), filter=Q(is_positive=False)), Value(0))
+NET_CENTS = REVENUE_CENTS - EXPENSE_CENTS
+
+
+def to_cents(value):
+    """Converte um Decimal em centavos inteiros (None vira 0)."""
+    if value is None:
+        return 0
+    return int(Decimal(value).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP).scaleb(2))
+
+
+def month_label(month):
+    """Rótulo curto do mês (ex.: ``Jan/25``)."""
+    return f"{MONTH_ABBR[month.month - 1]}/{str(month.year)[2:]}"
+
+
+def _columns(rows, width):
+    """Transpõe as linhas da consulta em ``width`` listas (colunas)."""
+    return [list(column) for column in zip(*rows)] if rows else [[] for _ in range(width)]
+
+
+class ChartSeriesService:
+    """
+    Serviço para as séries dos gráficos da tesouraria.
+
+    Responsável por:
+    - Entradas, saídas e saldo acumulado por mês
+    - Totais por categoria
+    - Histórico de saldo por período
+    """
+
+    def __init__(self, start_date, end_date):
+        self.start_date = start_date
+        self.end_date = end_date
+
+    def _transactions(self):
+        return TransactionModel.objects.filter(
+            date__gte=self.start_date,
+            date__lte=self.end_date,
+            transaction_type='original',
+        )
+
+    def monthly_flows(self):
+        """
+        Entradas e saídas de cada mês do intervalo.
+
+        Returns:
+            Dict com labels, revenues e expenses (centavos, saídas positivas)
+        """
+        rows = list(
+            self._transactions()
+            .annotate(month=TruncMonth('date'))
+            .values('month')
+            .annotate(revenues=REVENUE_CENTS, expenses=EXPENSE_CENTS)
+            .order_by('month')
+            .values_list('month', 'revenues', 'expenses')
+        )
+        months, revenues, expenses = _columns(rows, 3)
+        return {
+            'labels': [month_label(month) for month in months],
+            'revenues': revenues,
+            'expenses': expenses,
+        }
+
+    def opening_cents(self):
+        """Resultado acumulado de todas as transações anteriores ao intervalo."""
+        return TransactionModel.objects.filter(
+            date__lt=self.start_date,
+            transaction_type='original',
+        ).aggregate(net=NET_CENTS)['net']
+
+    def cashflow(self):
+        """Fluxo mensal com o saldo acumulado (``balance``) ao fim de cada mês."""
+        flows = self.monthly_flows()
+        flows['balance'] = list(accumulate(
+            map(sub, flows['revenues'], flows['expenses']),
+            initial=self.opening_cents(),
+        ))[1:]
+        return flows
+
+    def by_category(self, is_positive):
+        """
+        Totais por categoria, do maior para o menor.
+
+        Args:
+            is_positive: True para entradas, False para saídas (em módulo)
+
+        Returns:
+            Dict com labels, values (centavos) e total
+        """
+        total = REVENUE_CENTS if is_positive else EXPENSE_CENTS
+        rows = list(
+            self._transactions()
+            .filter(is_positive=is_positive)
+            .values(category_name=Coalesce('category__name', Value('Sem categoria')))
+            .annotate(total=total)
+            .order_by('-total')
+            .values_list('category_name', 'total')
+        )
+        labels, values = _columns(rows, 2)
+        return {'labels': labels, 'values': values, 'total': sum(values)}
+
+    def balance_history(self):
+        """
+        Saldo ao fim de cada período do intervalo.
+
+        Períodos com closing_balance usam esse valor; os demais somam o
+        resultado do período ao saldo anterior.
+
+        Returns:
+            Dict com labels e balance (centavos)
+        """
+        net = (
+            TransactionModel.objects.filter(accounting_period=OuterRef('pk'), transaction_type='original')
+            .values('accounting_period')
+            .annotate(net=NET_CENTS)
+            .values('net')
+        )
+        periods = list(
+            AccountingPeriod.objects.filter(
+                month__gte=self.start_date.replace(day=1),
+                month__lte=self.end_date.replace(day=1),
+            )
+            .annotate(net_cents=Coalesce(Subquery(net, output_field=IntegerField()), Value(0)))
+            .order_by('month')
+        )
+
+        accumulated = 0
+        if periods:
+            previous = AccountingPeriod.objects.filter(
+                month__lt=periods[0].month,
+                closing_balance__isnull=False,
+            ).order_by('-month').values_list('closing_balance', flat=True).first()
+            accumulated = to_cents(previous)
+
+        balance = []
+        for period in periods:
+            if period.closing_balance is not None:
+                accumulated = to_cents(period.closing_balance)
+            else:
+                accumulated += period.net_cents
+            balance.append(accumulated)
+
+        return {'labels': [period.month_name for period in periods], 'balance': balance}
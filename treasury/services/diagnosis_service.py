@@ -0,0 +1,459 @@
+"""
+Motor de diagnóstico da tesouraria.
+
+Carrega de uma vez os dados necessários para diagnosticar todos os períodos:
+totais agrupados por período, presença de MonthlyReport/FrozenReport,
+estornos e transações vinculadas ao período errado. O número de consultas é
+fixo, independente de quantos períodos existem.
+
+``fingerprint`` resume as entradas das verificações de um período e
+``chain_fingerprint`` o que as verificações em cadeia leem dos vizinhos; o
+check_treasury os usa para só verificar de novo os períodos alterados.
+
+``get_database_settings`` expõe os PRAGMAs efetivos dos bancos SQLite
+(perfil de core/sqlite.py).
+
+Usado pela API de diagnóstico e pelos comandos treasury_diagnosis,
+check_treasury e fix_treasury.
+"""
+from datetime import date
+import hashlib
+from decimal import Decimal
+from functools import cached_property
+
+from django.db import router
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from core import sqlite
+from treasury.models import (
+    AccountingPeriod,
+    AuditLog,
+    FrozenReport,
+    MonthlyReportModel,
+    PeriodSnapshot,
+    ReversalTransaction,
+    TransactionModel,
+)
+
+ZERO = Decimal('0.00')
+
+EMPTY_TOTALS = {
+    'count': 0,
+    'all_count': 0,
+    'reversal_count': 0,
+    'positive': ZERO,
+    'negative_new': ZERO,
+    'negative_old': ZERO,
+    'negative_new_count': 0,
+    'negative_old_count': 0,
+    'amount_sum': ZERO,
+    'last_change': None,
+}
+
+
+def previous_month(month):
+    if month.month == 1:
+        return date(month.year - 1, 12, 1)
+    return date(month.year, month.month - 1, 1)
+
+
+def next_month(month):
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+class DiagnosisService:
+    """
+    Serviço de diagnóstico dos períodos contábeis.
+
+    Os dados são carregados sob demanda e memorizados na instância; crie uma
+    nova instância depois de alterar períodos ou transações.
+
+    Responsável por:
+    - Totais por período (entradas, saídas nos dois padrões de sinal, contagens)
+    - Saldo esperado de cada período
+    - Relatório completo de diagnóstico (resumo, períodos, problemas)
+    """
+
+    @cached_property
+    def periods(self):
+        """Todos os períodos, em ordem cronológica."""
+        return list(AccountingPeriod.objects.select_related('closed_by').order_by('month'))
+
+    @cached_property
+    def periods_by_month(self):
+        return {period.month: period for period in self.periods}
+
+    @cached_property
+    def period_totals(self):
+        """
+        Totais de transações agrupados por período (chave None = órfãs).
+
+        Uma única consulta com agregações condicionais.
+        """
+        original = Q(transaction_type='original')
+        negative = original & Q(is_positive=False)
+        rows = (
+            TransactionModel.objects.order_by()
+            .values('accounting_period_id')
+            .annotate(
+                count=Count('id', filter=original),
+                all_count=Count('id'),
+                reversal_count=Count('id', filter=Q(transaction_type='reversal')),
+                positive=Sum('amount', filter=original & Q(is_positive=True)),
+                negative_new=Sum('amount', filter=negative & Q(amount__gt=0)),
+                negative_old=Sum('amount', filter=negative & Q(amount__lt=0)),
+                negative_new_count=Count('id', filter=negative & Q(amount__gt=0)),
+                negative_old_count=Count('id', filter=negative & Q(amount__lt=0)),
+                amount_sum=Sum('amount'),
+                last_change=Max('updated_at'),
+            )
+        )
+        totals = {}
+        for row in rows:
+            period_id = row.pop('accounting_period_id')
+            last_change = row.pop('last_change')
+            totals[period_id] = {key: value if value is not None else ZERO for key, value in row.items()}
+            totals[period_id]['last_change'] = last_change
+        return totals
+
+    @cached_property
+    def reversal_counts(self):
+        """Quantidade de ReversalTransaction envolvendo cada período."""
+        pairs = (
+            ReversalTransaction.objects.order_by()
+            .values(
+                original_period=F('original_transaction__accounting_period_id'),
+                reversal_period=F('reversal_transaction__accounting_period_id'),
+            )
+            .annotate(n=Count('id'))
+        )
+        counts = {}
+        for pair in pairs:
+            for period_id in {pair['original_period'], pair['reversal_period']}:
+                if period_id is not None:
+                    counts[period_id] = counts.get(period_id, 0) + pair['n']
+        return counts
+
+    @cached_property
+    def monthly_reports(self):
+        return {report.month: report for report in MonthlyReportModel.objects.all()}
+
+    @cached_property
+    def frozen_reports(self):
+        """(id, pdf_hash, pdf_file) dos FrozenReports de cada período."""
+        reports = {}
+        rows = FrozenReport.objects.order_by('id').values_list('period_id', 'id', 'pdf_hash', 'pdf_file')
+        for period_id, *report in rows:
+            reports.setdefault(period_id, []).append(tuple(report))
+        return reports
+
+    @cached_property
+    def frozen_period_ids(self):
+        return set(self.frozen_reports)
+
+    @cached_property
+    def mislinked_by_month(self):
+        """Transações cuja data cai em um mês mas estão vinculadas a outro período."""
+        rows = (
+            TransactionModel.objects.order_by()
+            .filter(accounting_period__isnull=False)
+            .annotate(tx_month=TruncMonth('date'))
+            .exclude(tx_month=F('accounting_period__month'))
+            .values('tx_month')
+            .annotate(n=Count('id'))
+        )
+        return {row['tx_month']: row['n'] for row in rows}
+
+    def totals(self, period):
+        return self.period_totals.get(period.id, EMPTY_TOTALS)
+
+    def net(self, period):
+        """Resultado do período (saídas com ou sem sinal)."""
+        totals = self.totals(period)
+        return totals['positive'] + totals['negative_old'] - totals['negative_new']
+
+    def total_negative(self, period):
+        totals = self.totals(period)
+        return totals['negative_old'] - totals['negative_new']
+
+    def previous_period(self, period):
+        """Período do mês anterior (equivalente a get_previous_period, sem consulta)."""
+        return self.periods_by_month.get(previous_month(period.month))
+
+    def expected_closing(self, period):
+        """closing_balance de períodos fechados; opening + resultado nos demais."""
+        if period.status in ('closed', 'archived') and period.closing_balance is not None:
+            return period.closing_balance
+        return period.opening_balance + self.net(period)
+
+    def fingerprint(self, period):
+        """
+        SHA256 das entradas verificadas no período.
+
+        Cobre contagem, soma e última alteração das transações, os campos do
+        período, os valores do MonthlyReport e os hashes gravados dos
+        FrozenReports. Não depende dos períodos vizinhos (ver
+        ``chain_fingerprint``).
+        """
+        totals = self.totals(period)
+        report = self.monthly_reports.get(period.month)
+        parts = [
+            totals['all_count'],
+            totals['amount_sum'],
+            totals['last_change'],
+            period.opening_balance,
+            period.closing_balance,
+            period.status,
+            period.is_first_month,
+            period.balance_adjustment_reason,
+            period.updated_at,
+            report and (
+                report.previous_month_balance,
+                report.total_positive_transactions,
+                report.total_negative_transactions,
+                report.monthly_result,
+                report.total_balance,
+            ),
+            self.frozen_reports.get(period.id, []),
+        ]
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+    @cached_property
+    def period_positions(self):
+        return {period.id: index for index, period in enumerate(self.periods)}
+
+    @cached_property
+    def chain_start(self):
+        """Período em que começa o saldo corrente (is_first_month ou o mais antigo)."""
+        return next((p for p in self.periods if p.is_first_month), self.periods[0] if self.periods else None)
+
+    def chain_fingerprint(self, period):
+        """
+        SHA256 do que as verificações em cadeia de um período leem fora dele.
+
+        Cobre o período anterior na ordem cronológica (id, mês e saldo final
+        esperado) e o início da cadeia: muda quando o vizinho é alterado,
+        removido ou criado, mesmo que o próprio período não mude.
+        """
+        index = self.period_positions[period.id]
+        previous = self.periods[index - 1] if index else None
+        parts = [
+            previous and (previous.id, previous.month, self.expected_closing(previous)),
+            self.chain_start.id,
+        ]
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Relatório completo
+    # ------------------------------------------------------------------
+
+    def build_report(self):
+        """
+        Monta o relatório de diagnóstico completo.
+
+        Returns:
+            Dict com generated_at, summary, periods, issues, snapshots,
+            audit_recent e database
+        """
+        periods = self.get_periods()
+        return {
+            'generated_at': timezone.now().isoformat(),
+            'summary': self.get_summary(),
+            'periods': periods,
+            'issues': self.collect_issues(periods),
+            'snapshots': self.get_snapshots(),
+            'audit_recent': self.get_recent_audit(),
+            'database': self.get_database_settings(),
+        }
+
+    def get_summary(self):
+        statuses = [period.status for period in self.periods]
+        return {
+            'total_periods': len(self.periods),
+            'open_periods': statuses.count('open'),
+            'closed_periods': statuses.count('closed'),
+            'archived_periods': statuses.count('archived'),
+            'total_transactions': sum(totals['count'] for totals in self.period_totals.values()),
+            'orphan_transactions': self.period_totals.get(None, EMPTY_TOTALS)['all_count'],
+            'total_snapshots': PeriodSnapshot.objects.count(),
+            'first_period': str(self.periods[0]) if self.periods else None,
+            'last_period': str(self.periods[-1]) if self.periods else None,
+        }
+
+    def get_periods(self):
+        result = []
+        prev_period = None
+        for period in self.periods:
+            totals = self.totals(period)
+            net = self.net(period)
+
+            period_data = {
+                'id': period.id,
+                'month': str(period.month),
+                'month_label': f'{period.month_name}/{period.year}',
+                'status': period.status,
+                'is_first_month': period.is_first_month,
+                'opening_balance': float(period.opening_balance),
+                'closing_balance': float(period.closing_balance) if period.closing_balance else None,
+                'closed_at': period.closed_at.isoformat() if period.closed_at else None,
+                'closed_by': str(period.closed_by) if period.closed_by else None,
+                'transactions_count': totals['count'],
+                'reversal_transactions_count': totals['reversal_count'],
+                'reversals_count': self.reversal_counts.get(period.id, 0),
+                'total_positive': float(totals['positive']),
+                'total_negative_new': float(totals['negative_new']),
+                'total_negative_old': float(totals['negative_old']),
+                'net': float(net),
+                'calculated_balance': float(period.opening_balance + net),
+                'has_monthly_report': period.month in self.monthly_reports,
+                'has_frozen_report': period.id in self.frozen_period_ids,
+                'issues': [],
+            }
+
+            chain_ok = True
+            if prev_period:
+                if prev_period.closing_balance is not None:
+                    expected_opening = prev_period.closing_balance
+                    if period.opening_balance != expected_opening:
+                        chain_ok = False
+                        period_data['issues'].append({
+                            'severity': 'error',
+                            'type': 'chain_broken',
+                            'message': (
+                                f'opening_balance ({period.opening_balance}) != '
+                                f'closing_balance anterior ({expected_opening})'
+                            ),
+                        })
+                elif prev_period.status == 'closed':
+                    period_data['issues'].append({
+                        'severity': 'warning',
+                        'type': 'missing_closing_balance',
+                        'message': 'Período anterior está fechado mas sem closing_balance',
+                    })
+            period_data['chain_ok'] = chain_ok
+
+            if period.status == 'closed' and period.closing_balance is not None:
+                calculated = period.opening_balance + net
+                if abs(period.closing_balance - calculated) > Decimal('0.01'):
+                    period_data['issues'].append({
+                        'severity': 'error',
+                        'type': 'closing_balance_mismatch',
+                        'message': (
+                            f'closing_balance ({period.closing_balance}) != '
+                            f'opening + net ({calculated})'
+                        ),
+                    })
+
+            if totals['negative_old_count'] and totals['negative_new_count']:
+                period_data['issues'].append({
+                    'severity': 'warning',
+                    'type': 'mixed_sign_pattern',
+                    'message': 'Mistura de padrões de sinal em transações negativas',
+                })
+
+            linked_wrong = self.mislinked_by_month.get(period.month, 0)
+            if linked_wrong:
+                period_data['issues'].append({
+                    'severity': 'warning',
+                    'type': 'transactions_linked_elsewhere',
+                    'message': (
+                        f'{linked_wrong} transações com data neste mês '
+                        f'estão vinculadas a outro período'
+                    ),
+                })
+
+            result.append(period_data)
+            prev_period = period
+
+        if result and not any(p['is_first_month'] for p in result):
+            result[0]['issues'].append({
+                'severity': 'warning',
+                'type': 'no_first_month',
+                'message': 'Nenhum período marcado como is_first_month',
+            })
+
+        self._check_gaps(result)
+        return result
+
+    def _check_gaps(self, periods_data):
+        for previous, current in zip(periods_data, periods_data[1:]):
+            expected_next = next_month(date.fromisoformat(previous['month']))
+            curr_date = date.fromisoformat(current['month'])
+            if curr_date != expected_next:
+                current['issues'].append({
+                    'severity': 'warning',
+                    'type': 'period_gap',
+                    'message': (
+                        f'Gap entre {expected_next.strftime("%m/%Y")} e '
+                        f'{curr_date.strftime("%m/%Y")}'
+                    ),
+                })
+
+    def collect_issues(self, periods_data):
+        issues = []
+        orphan_count = self.period_totals.get(None, EMPTY_TOTALS)['all_count']
+        if orphan_count:
+            issues.append({
+                'severity': 'error',
+                'type': 'orphan_transactions',
+                'message': f'{orphan_count} transações sem accounting_period',
+                'transaction_ids': list(
+                    TransactionModel.objects.filter(accounting_period__isnull=True)
+                    .values_list('id', flat=True)[:50]
+                ),
+            })
+
+        for pd in periods_data:
+            for issue in pd['issues']:
+                issue['period'] = pd['month_label']
+                issues.append(issue)
+
+        issues.sort(key=lambda x: 0 if x['severity'] == 'error' else 1)
+        return issues
+
+    def get_snapshots(self, limit=20):
+        snapshots = PeriodSnapshot.objects.all().order_by('-created_at')[:limit]
+        return [
+            {
+                'id': str(s.id),
+                'period_month': s.period_month,
+                'period_year': s.period_year,
+                'period_label': f'{s.period_month:02d}/{s.period_year}',
+                'created_at': s.created_at.isoformat(),
+                'created_by': s.created_by_name or '-',
+                'reason': s.reason,
+                'transactions_count': s.transactions_count,
+                'closing_balance': float(s.closing_balance) if s.closing_balance else None,
+                'was_closed': s.was_closed,
+            }
+            for s in snapshots
+        ]
+
+    def get_recent_audit(self, limit=30):
+        try:
+            logs = AuditLog.objects.filter(
+                entity_type__in=['AccountingPeriod', 'TransactionModel']
+            ).order_by('-timestamp')[:limit]
+            return [
+                {
+                    'id': str(log.id),
+                    'timestamp': log.timestamp.isoformat(),
+                    'action': log.action,
+                    'user_name': log.user_name or '-',
+                    'entity_type': log.entity_type,
+                    'entity_id': log.entity_id,
+                    'description': log.description,
+                }
+                for log in logs
+            ]
+        except Exception:
+            return []
+
+    def get_database_settings(self):
+        # Só os bancos onde ficam os dados da tesouraria
+        aliases = sorted({router.db_for_read(model) for model in (TransactionModel, AuditLog)})
+        return sqlite.effective_settings(aliases)
@@ -1,15 +1,23 @@
-from django.db.models import Sum, Q, Count, DecimalField
+from django.core.cache import cache
+from django.db.models import Sum, Q, Count
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 from decimal import Decimal
 from datetime import datetime, date
+from dateutil.relativedelta import relativedelta
 
 from treasury.models import AccountingPeriod, TransactionModel, PeriodSnapshot, MonthlyReportModel
 from treasury.serializers import AccountingPeriodSerializer
+from treasury.services.balance_sheet_service import get_ledger_version
+from treasury.utils import get_transactions_totals
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# Saldos consultados com frequência (dashboards); a chave inclui a versão do
+# livro-caixa, então qualquer gravação de transação ou período os invalida
+BALANCE_CACHE_TIMEOUT = 30
+
 
 class PeriodService:
     """
@@ -154,9 +162,19 @@ class PeriodService:
         1. Soma dos closing_balance de todos os períodos fechados
         2. + Transações do período aberto mais recente
 
+        O resultado fica em cache por BALANCE_CACHE_TIMEOUT segundos.
+
         Returns:
             O saldo atual
         """
+        key = f"treasury:current_balance:{get_ledger_version()}"
+        balance = cache.get(key)
+        if balance is None:
+            balance = self._compute_current_balance()
+            cache.set(key, balance, BALANCE_CACHE_TIMEOUT)
+        return balance
+
+    def _compute_current_balance(self):
         # Soma dos saldos de períodos fechados
         closed_periods = AccountingPeriod.objects.filter(
             status__in=['closed', 'archived'],
@@ -180,6 +198,46 @@ class PeriodService:
 
         return balance
 
+    def get_month_balance(self, month):
+        """
+        Saldo de um mês: abertura do período e totais das transações originais.
+
+        As transações são filtradas por intervalo de datas
+        (date >= primeiro dia AND date < primeiro dia do mês seguinte), que
+        usa o índice de date, e somadas em uma agregação condicional. O
+        resultado fica em cache por BALANCE_CACHE_TIMEOUT segundos.
+
+        Args:
+            month: Qualquer data do mês
+
+        Returns:
+            Dicionário com opening_balance, positive, negative (<= 0), net e
+            balance (abertura + net)
+        """
+        first_day = month.replace(day=1)
+        key = f"treasury:month_balance:{get_ledger_version()}:{first_day.isoformat()}"
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+        opening_balance = (
+            AccountingPeriod.objects.filter(month=first_day)
+            .values_list('opening_balance', flat=True)
+            .first()
+        ) or Decimal('0.00')
+        result = get_transactions_totals(
+            TransactionModel.objects.filter(
+                date__gte=first_day,
+                date__lt=first_day + relativedelta(months=1),
+                transaction_type='original',
+            )
+        )
+        result['opening_balance'] = opening_balance
+        result['balance'] = opening_balance + result['net']
+
+        cache.set(key, result, BALANCE_CACHE_TIMEOUT)
+        return result
+
     def get_balance_at_date(self, target_date):
         """
         Retorna o saldo em uma data específica.
@@ -247,7 +305,8 @@ class PeriodService:
         """
         Calcula o valor líquido das transações de um período.
 
-        Nota: amount é sempre positivo, o sinal é determinado por is_positive.
+        Nota: o sinal é determinado por is_positive; saídas gravadas com ou
+        sem sinal são subtraídas pelo valor absoluto.
 
         Args:
             period: Instância de AccountingPeriod
@@ -259,19 +318,7 @@ class PeriodService:
             accounting_period=period,
             transaction_type='original'
         )
-
-        # Somar positivas
-        positive = transactions.filter(is_positive=True).aggregate(
-            total=Coalesce(Sum('amount'), Decimal('0.00'), output_field=DecimalField())
-        )['total'] or Decimal('0.00')
-
-        # Somar negativas (amount sempre positivo)
-        negative = transactions.filter(is_positive=False).aggregate(
-            total=Coalesce(Sum('amount'), Decimal('0.00'), output_field=DecimalField())
-        )['total'] or Decimal('0.00')
-
-        # Net = positivas - negativas (subtrair despesas)
-        return positive - negative
+        return get_transactions_totals(transactions)['net']
 
     def can_edit_transaction(self, transaction):
         """
@@ -0,0 +1,108 @@
+"""
+Armazenamento dos comprovantes endereçado por conteúdo.
+
+O comprovante é gravado em ``treasury/receipts/sha256/<aa>/<sha256><ext>``,
+onde o hash é do conteúdo do arquivo. O mesmo arquivo enviado de novo (o
+mesmo boleto em outra transação, um lote) aponta para o mesmo objeto e não é
+enviado outra vez ao storage.
+
+A contagem de referências é o número de transações cujo ``acquittance_doc``
+aponta para a chave (coluna indexada). O objeto só é removido do storage
+quando a última transação deixa de referenciá-lo, depois do commit. Como o
+reaproveitamento de um objeto existente não trava nada, um envio concorrente
+pode reaproveitar a chave enquanto outra transação a libera. A remoção
+começa com um UPDATE nas linhas que usam a chave: no SQLite ele toma o lock
+de escrita do banco até o commit, e a transação que reaproveita a chave (que
+grava a própria linha) espera por ele. Assim, ou a remoção vê a nova
+referência e mantém o objeto, ou termina antes e quem reaproveitou a chave
+grava o objeto de novo, depois do próprio commit.
+Cada comprovante novo ganha miniaturas WebP (``core.thumbnails``), removidas
+junto com ele.
+"""
+import hashlib
+import logging
+import os
+
+from django.db import transaction
+
+from core import thumbnails
+from treasury.models import TransactionModel
+
+logger = logging.getLogger(__name__)
+
+RECEIPTS_DIR = 'treasury/receipts/sha256'
+
+
+class ReceiptStorageService:
+    """Grava e libera comprovantes de transações no storage do campo."""
+
+    @staticmethod
+    def storage():
+        # Mesmo storage (e cliente S3) do campo, criado uma vez por processo
+        return TransactionModel._meta.get_field('acquittance_doc').storage
+
+    @staticmethod
+    def key_for(file):
+        """Chave do comprovante a partir do conteúdo (lido em partes)."""
+        digest = hashlib.sha256()
+        for chunk in file.chunks():
+            digest.update(chunk)
+        file.seek(0)
+        ext = os.path.splitext(file.name or '')[1].lower()
+        hexdigest = digest.hexdigest()
+        return f'{RECEIPTS_DIR}/{hexdigest[:2]}/{hexdigest}{ext}'
+
+    @classmethod
+    def store(cls, file):
+        """
+        Grava o comprovante, se ainda não existir no storage.
+
+        Returns:
+            Nome do arquivo no storage
+        """
+        key = cls.key_for(file)
+        storage = cls.storage()
+        if storage.exists(key):
+            transaction.on_commit(lambda: cls._restore(key, file))
+            return key
+        name = storage.save(key, file)
+        thumbnails.schedule_derivatives(name, storage)
+        return name
+
+    @classmethod
+    def _restore(cls, key, file):
+        """Grava de novo o objeto reaproveitado, se uma liberação concorrente o removeu."""
+        storage = cls.storage()
+        if storage.exists(key):
+            return
+        logger.warning('Comprovante %s removido durante o reaproveitamento; gravando de novo', key)
+        file.seek(0)
+        name = storage.save(key, file)
+        thumbnails.schedule_derivatives(name, storage)
+
+    @staticmethod
+    def reference_count(name):
+        return TransactionModel.objects.filter(acquittance_doc=name).count()
+
+    @classmethod
+    def release(cls, name):
+        """
+        Remove o comprovante do storage, depois do commit, se nenhuma
+        transação o referenciar mais.
+        """
+        if not name:
+            return
+
+        def remove():
+            try:
+                with transaction.atomic():
+                    # Escrita antes de contar: segura o lock de escrita até o
+                    # objeto ser removido (select_for_update não trava no SQLite)
+                    if TransactionModel.objects.filter(acquittance_doc=name).update(acquittance_doc=name):
+                        return
+                    cls.storage().delete(name)
+                    thumbnails.delete_derivatives(name, cls.storage())
+            except Exception:
+                logger.exception('Erro ao remover comprovante %s', name)
+
+        transaction.on_commit(remove)
@@ -1,5 +1,6 @@
 from .post_save_monthly_report import post_save_monthly_report
 from .post_save_accounting_period import set_opening_balance_on_create
+from .ledger_version import bump_ledger_version_on_change
 
 # REMOVED: Old MonthlyBalance-related signals (replaced by AccountingPeriod)
 # - update_monthly_balance_on_create (substituído por AccountingPeriod)
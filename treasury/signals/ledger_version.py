@@ -0,0 +1,23 @@
+"""
+Signal para invalidar os relatórios em cache quando o livro-caixa muda.
+
+Qualquer gravação ou exclusão de transação ou período incrementa a versão do
+livro-caixa usada nas chaves de cache do balanço (BalanceSheetService) e dos
+saldos (PeriodService). O incremento acontece só depois do commit: antes
+dele, uma leitura concorrente ainda veria os dados antigos e os guardaria
+sob a versão nova.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from treasury.models import AccountingPeriod, TransactionModel
+from treasury.services.balance_sheet_service import bump_ledger_version
+
+
+@receiver(post_save, sender=TransactionModel)
+@receiver(post_delete, sender=TransactionModel)
+@receiver(post_save, sender=AccountingPeriod)
+@receiver(post_delete, sender=AccountingPeriod)
+def bump_ledger_version_on_change(sender, **kwargs):
+    transaction.on_commit(bump_ledger_version)
@@ -1,6 +1,11 @@
+from decimal import Decimal
+
 from django import template
 import calendar
 
+from treasury.utils import format_brl as _format_brl
+from treasury.utils.format_brl import to_decimal
+
 register = template.Library()
 
 
@@ -15,22 +20,17 @@ def format_brl(value):
     Formata valor para formato brasileiro.
     Ex: 1234.56 -> 1.234,56
          10000 -> 10.000,00
+
+    Em listas longas, prefira formatar os valores na view (format_brl_values)
+    e exibir o texto pronto.
     """
-    try:
-        value = float(value)
-        # Primeiro formata com vírgula como separador de milhar e ponto como decimal
-        # Depois inverte: ponto para milhar, vírgula para decimal
-        formatted = f"{value:,.2f}"
-        formatted = formatted.replace(",", "X").replace(".", ",").replace("X", ".")
-        return formatted
-    except (ValueError, TypeError):
-        return "0,00"
+    return _format_brl(value)
 
 
 @register.filter
 def abs_value(value):
-    """Retorna o valor absoluto (sem sinal)."""
+    """Retorna o valor absoluto (sem sinal), como Decimal."""
     try:
-        return abs(float(value))
+        return abs(to_decimal(value))
     except (ValueError, TypeError):
-        return 0
+        return Decimal('0')
@@ -19,7 +19,8 @@ class InMemoryStorage(Storage):
         return name
 
     def delete(self, name):
-        del self.files[name]
+        # Como os storages reais, excluir um arquivo inexistente não é erro
+        self.files.pop(name, None)
 
     def exists(self, name):
         return name in self.files
@@ -0,0 +1,125 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users.models import CustomUser
+from treasury.models import AIInsight, AccountingPeriod, CategoryModel, TransactionModel
+from treasury.services import AIInsightService
+
+
+URL = '/treasury/api/charts/ai-insights/'
+PERIOD = {'start_date': '2025-01-01', 'end_date': '2025-01-31'}
+
+
+@override_settings(DEBUG=True)
+@mock.patch.object(AIInsightService, '_generate_insights_with_ollama', return_value='## Insights')
+class AIInsightsTest(APITestCase):
+
+    def setUp(self):
+        self.treasurer = CustomUser.objects.create_user(
+            username='treasurer',
+            email='treasurer@test.com',
+            password='testpass123',
+            is_treasurer=True,
+            type=CustomUser.Types.STAFF,
+        )
+        self.tithes = CategoryModel.objects.create(name='Dizimos')
+        self.energy = CategoryModel.objects.create(name='Energia')
+        self.period = AccountingPeriod.objects.create(
+            month=date(2025, 1, 1),
+            opening_balance=Decimal('0.00'),
+            status='open',
+        )
+        self.client.force_authenticate(user=self.treasurer)
+
+    def add_transaction(self, amount, is_positive=True, category=None):
+        return TransactionModel.objects.create(
+            user=self.treasurer,
+            category=category or self.tithes,
+            description='Transacao',
+            amount=Decimal(amount),
+            is_positive=is_positive,
+            date=date(2025, 1, 10),
+            accounting_period=self.period,
+        )
+
+    def request_and_run(self, data=PERIOD):
+        """POST que enfileira a geração e executa o worker na própria thread."""
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.post(URL, data)
+        if response.status_code == status.HTTP_202_ACCEPTED:
+            self.assertEqual(len(callbacks), 1)
+            AIInsightService().generate(AIInsight.objects.get().pk)
+        return response
+
+    def test_generation_runs_off_request_and_is_polled(self, generate):
+        self.add_transaction('100.00')
+
+        response = self.request_and_run()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'pending')
+
+        response = self.client.get(URL, PERIOD)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['insights'], '## Insights')
+
+        response = self.client.post(URL, PERIOD)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['cached'])
+        self.assertEqual(generate.call_count, 1)
+
+    def test_edit_keeping_count_invalidates_cache(self, generate):
+        tx = self.add_transaction('100.00')
+        self.request_and_run()
+
+        tx.amount = Decimal('150.00')
+        tx.save()
+
+        response = self.request_and_run()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(generate.call_count, 2)
+        self.assertEqual(AIInsight.objects.get().transactions_sum, Decimal('150.00'))
+
+    def test_pending_generation_is_not_enqueued_twice(self, generate):
+        self.add_transaction('100.00')
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.client.post(URL, PERIOD)
+            response = self.client.post(URL, PERIOD)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_summary_covers_whole_range(self, generate):
+        for _ in range(120):
+            self.add_transaction('10.00')
+        self.add_transaction('50.00', is_positive=False, category=self.energy)
+
+        summary = AIInsightService()._prepare_summary_for_ai(date(2025, 1, 1), date(2025, 1, 31))
+
+        self.assertIn('Total de Receitas: R$ 1,200.00', summary)
+        self.assertIn('Número de Transações: 121', summary)
+        self.assertIn('• Energia: R$ 50.00', summary)
+
+    def test_fingerprint_is_single_query(self, generate):
+        self.add_transaction('100.00')
+        self.add_transaction('30.00', is_positive=False)
+
+        with self.assertNumQueries(1):
+            count, total, last_change = AIInsightService().ledger_fingerprint(
+                date(2025, 1, 1), date(2025, 1, 31))
+
+        self.assertEqual((count, total), (2, Decimal('70.00')))
+        self.assertIsNotNone(last_change)
+
+    def test_failed_generation_reports_error(self, generate):
+        generate.side_effect = Exception('Ollama fora do ar')
+        self.add_transaction('100.00')
+        self.request_and_run()
+
+        response = self.client.get(URL, PERIOD)
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.data['error'], 'Ollama fora do ar')
@@ -0,0 +1,120 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from users.models import CustomUser
+from treasury.models import AccountingPeriod, CategoryModel, TransactionModel
+from treasury.services.balance_sheet_service import BalanceSheetService
+
+
+class BalanceSheetServiceTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            username='member',
+            email='member@test.com',
+            password='testpass123',
+            type=CustomUser.Types.REGULAR,
+        )
+        self.category = CategoryModel.objects.create(name='Dizimos')
+
+        # 2023-11 aberto, 2023-12 fechado com saldo informado, 2024-01/02 abertos
+        self.november = self.create_period(date(2023, 11, 1))
+        self.december = self.create_period(date(2023, 12, 1), closing_balance=Decimal('500.00'))
+        self.january = self.create_period(date(2024, 1, 1))
+        self.february = self.create_period(date(2024, 2, 1))
+
+        self.create_tx(self.november, '300.00', True, date(2023, 11, 5))
+        self.create_tx(self.december, '100.00', True, date(2023, 12, 5))
+        self.create_tx(self.january, '200.00', True, date(2024, 1, 5))
+        # Saídas gravadas com e sem sinal
+        self.create_tx(self.january, '50.00', False, date(2024, 1, 6))
+        self.create_tx(self.february, '-25.00', False, date(2024, 2, 6))
+
+    def create_period(self, month, closing_balance=None):
+        return AccountingPeriod.objects.create(
+            month=month,
+            opening_balance=Decimal('0.00'),
+            status='closed' if closing_balance is not None else 'open',
+            closing_balance=closing_balance,
+        )
+
+    def create_tx(self, period, amount, is_positive, tx_date):
+        return TransactionModel.objects.create(
+            user=self.user,
+            category=self.category,
+            description='Lancamento',
+            amount=Decimal(amount),
+            is_positive=is_positive,
+            date=tx_date,
+            accounting_period=period,
+            created_by=self.user,
+        )
+
+    def test_balances_anchor_on_closing_balance(self):
+        data = BalanceSheetService().build()
+
+        rows = [
+            (item['period'].month, item['opening_balance'], item['net'], item['closing_balance'])
+            for item in data['periods_with_balance']
+        ]
+        self.assertEqual(rows, [
+            (date(2023, 11, 1), Decimal('0.00'), Decimal('300.00'), Decimal('300.00')),
+            (date(2023, 12, 1), Decimal('300.00'), Decimal('100.00'), Decimal('500.00')),
+            (date(2024, 1, 1), Decimal('500.00'), Decimal('150.00'), Decimal('650.00')),
+            (date(2024, 2, 1), Decimal('650.00'), Decimal('-25.00'), Decimal('625.00')),
+        ])
+        self.assertEqual(data['total_positive'], Decimal('600.00'))
+        self.assertEqual(data['total_negative'], Decimal('-75.00'))
+        self.assertEqual(data['final_balance'], Decimal('625.00'))
+
+    def test_year_filter_keeps_previous_balance(self):
+        data = BalanceSheetService().build(start_year='2024', end_year='2024')
+
+        self.assertEqual(len(data['periods_with_balance']), 2)
+        self.assertEqual(data['periods_with_balance'][0]['opening_balance'], Decimal('500.00'))
+        self.assertEqual(data['total_net'], Decimal('125.00'))
+        self.assertEqual(data['final_balance'], Decimal('625.00'))
+
+    def test_single_query_regardless_of_periods(self):
+        with CaptureQueriesContext(connection) as queries:
+            BalanceSheetService().build(start_year='2024')
+        self.assertEqual(len(queries), 1)
+
+    def test_data_is_cached_until_ledger_changes(self):
+        self.client.force_login(self.user)
+        url = reverse('treasury:balance-sheet-pdf')
+        params = {'start_year': '2024', 'end_year': '2024', 'status': 'all'}
+
+        with mock.patch('weasyprint.HTML') as html, \
+                mock.patch.object(BalanceSheetService, 'build', wraps=BalanceSheetService().build) as build:
+            html.return_value.write_pdf.return_value = b'%PDF-1'
+            self.assertEqual(self.client.get(url, params).content, b'%PDF-1')
+            self.client.get(url, params)
+            self.assertEqual(build.call_count, 1)
+            # O PDF traz a data de geração: é renderizado a cada pedido
+            self.assertEqual(html.call_count, 2)
+
+            self.client.get(url, {**params, 'status': 'open'})
+            self.assertEqual(build.call_count, 2)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.create_tx(self.february, '10.00', True, date(2024, 2, 7))
+            self.client.get(url, params)
+            self.assertEqual(build.call_count, 3)
+
+    def test_ledger_version_bumps_only_after_commit(self):
+        from treasury.services.balance_sheet_service import get_ledger_version
+
+        version = get_ledger_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_tx(self.february, '10.00', True, date(2024, 2, 8))
+            self.assertEqual(get_ledger_version(), version)
+        self.assertGreater(get_ledger_version(), version)
@@ -0,0 +1,44 @@
+from decimal import Decimal
+
+from django.template import Context, Template
+from django.test import SimpleTestCase
+
+from treasury.utils import format_brl, format_brl_values
+
+
+class FormatBrlTest(SimpleTestCase):
+
+    def test_grouping_and_cents(self):
+        self.assertEqual(format_brl(Decimal('0')), '0,00')
+        self.assertEqual(format_brl(Decimal('5.5')), '5,50')
+        self.assertEqual(format_brl(Decimal('999.99')), '999,99')
+        self.assertEqual(format_brl(Decimal('1000')), '1.000,00')
+        self.assertEqual(format_brl(Decimal('1234.56')), '1.234,56')
+        self.assertEqual(format_brl(10000), '10.000,00')
+        self.assertEqual(format_brl(Decimal('1000005.07')), '1.000.005,07')
+        self.assertEqual(format_brl(Decimal('-1234567.89')), '-1.234.567,89')
+
+    def test_exact_rounding(self):
+        # Em float, 2.675 vira 2.67499999...; em Decimal arredonda para cima
+        self.assertEqual(format_brl(Decimal('2.675')), '2,68')
+        self.assertEqual(format_brl(Decimal('-2.675')), '-2,68')
+        self.assertEqual(format_brl(Decimal('0.004')), '0,00')
+        self.assertEqual(format_brl(Decimal('-0.004')), '0,00')
+        self.assertEqual(format_brl(Decimal('12345678901234.99')), '12.345.678.901.234,99')
+
+    def test_other_inputs(self):
+        self.assertEqual(format_brl('150.00'), '150,00')
+        self.assertEqual(format_brl(0.1 + 0.2), '0,30')
+        for invalid in (None, '', 'abc', 'NaN', [1]):
+            self.assertEqual(format_brl(invalid), '0,00')
+
+    def test_format_values(self):
+        self.assertEqual(
+            format_brl_values({'Dizimos': '1500.00', 'outros': Decimal('5.5')}),
+            {'Dizimos': '1.500,00', 'outros': '5,50'},
+        )
+
+    def test_template_filters(self):
+        template = Template('{% load extras %}{{ value|format_brl }}|{{ value|abs_value|format_brl }}')
+        self.assertEqual(template.render(Context({'value': Decimal('-1234.50')})), '-1.234,50|1.234,50')
+        self.assertEqual(template.render(Context({'value': None})), '0,00|0,00')
@@ -0,0 +1,97 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+
+from users.models import CustomUser
+from treasury.models import AccountingPeriod, CategoryModel, TransactionModel
+from treasury.services import ChartSeriesService, PeriodService
+from treasury.services.chart_series_service import to_cents
+
+
+class ChartSeriesTest(TestCase):
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username='member',
+            email='member@test.com',
+            password='testpass123',
+            type=CustomUser.Types.REGULAR,
+        )
+        self.tithes = CategoryModel.objects.create(name='Dizimos')
+        self.energy = CategoryModel.objects.create(name='Energia')
+
+        self.january = AccountingPeriod.objects.create(
+            month=date(2024, 1, 1), opening_balance=Decimal('0.00'), status='closed',
+            closing_balance=Decimal('99.80'), is_first_month=True,
+        )
+        self.february = AccountingPeriod.objects.create(
+            month=date(2024, 2, 1), opening_balance=Decimal('99.80'), status='open',
+        )
+        self.create_tx(self.january, self.tithes, '100.10', True, date(2024, 1, 5))
+        self.create_tx(self.january, self.energy, '0.30', False, date(2024, 1, 10))
+        # Valores que não somam exatamente em float (0.1 + 0.2)
+        self.create_tx(self.february, self.tithes, '0.10', True, date(2024, 2, 3))
+        self.create_tx(self.february, self.tithes, '0.20', True, date(2024, 2, 4))
+        self.create_tx(self.february, self.energy, '0.05', False, date(2024, 2, 5))
+
+        self.client.force_login(self.user)
+
+    def create_tx(self, period, category, amount, is_positive, tx_date):
+        return TransactionModel.objects.create(
+            user=self.user,
+            category=category,
+            description=f'{category.name} {tx_date}',
+            amount=Decimal(amount),
+            is_positive=is_positive,
+            date=tx_date,
+            accounting_period=period,
+            created_by=self.user,
+        )
+
+    def test_to_cents(self):
+        self.assertEqual(to_cents(Decimal('100.10')), 10010)
+        self.assertEqual(to_cents(Decimal('-0.05')), -5)
+        self.assertEqual(to_cents(None), 0)
+
+    def test_cashflow_balance_matches_current_balance(self):
+        data = ChartSeriesService(date(2024, 1, 1), date(2024, 2, 29)).cashflow()
+
+        self.assertEqual(data['labels'], ['Jan/24', 'Fev/24'])
+        self.assertEqual(data['revenues'], [10010, 30])
+        self.assertEqual(data['expenses'], [30, 5])
+        self.assertEqual(data['balance'], [9980, 10005])
+        self.assertEqual(data['balance'][-1], to_cents(PeriodService().get_current_balance()))
+
+    def test_cashflow_starts_from_previous_transactions(self):
+        data = ChartSeriesService(date(2024, 2, 1), date(2024, 2, 29)).cashflow()
+        self.assertEqual(data['balance'], [10005])
+
+    def test_balance_history_matches_current_balance(self):
+        data = ChartSeriesService(date(2024, 1, 1), date(2024, 2, 29)).balance_history()
+
+        self.assertEqual(data['labels'], ['Janeiro', 'Fevereiro'])
+        self.assertEqual(data['balance'], [9980, to_cents(PeriodService().get_current_balance())])
+
+    def test_expenses_by_category_accept_both_sign_patterns(self):
+        self.create_tx(self.february, self.energy, '-25.00', False, date(2024, 2, 6))
+
+        data = ChartSeriesService(date(2024, 1, 1), date(2024, 2, 29)).by_category(is_positive=False)
+        self.assertEqual(data, {'labels': ['Energia'], 'values': [2535], 'total': 2535})
+
+    def test_api_returns_columnar_cents(self):
+        response = self.client.get(
+            '/treasury/api/charts/cashflow/', {'start_date': '2024-01-01', 'end_date': '2024-02-29'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'labels': ['Jan/24', 'Fev/24'],
+            'revenues': [10010, 30],
+            'expenses': [30, 5],
+            'balance': [9980, 10005],
+        })
+
+        response = self.client.get(
+            '/treasury/api/charts/revenues-by-category/', {'start_date': '2024-01-01', 'end_date': '2024-02-29'},
+        )
+        self.assertEqual(response.json(), {'labels': ['Dizimos'], 'values': [10040], 'total': 10040})
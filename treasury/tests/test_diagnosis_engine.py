@@ -0,0 +1,96 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+import json
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from treasury.models import AccountingPeriod, TransactionModel
+from treasury.services.diagnosis_service import DiagnosisService
+from treasury.tests.test_diagnosis import DiagnosisTestBase
+
+
+class DiagnosisServiceTests(DiagnosisTestBase):
+
+    def create_tx(self, period, amount, is_positive, tx_date):
+        return TransactionModel.objects.create(
+            user=self.treasurer,
+            category=self.category,
+            description='Lancamento',
+            amount=Decimal(amount),
+            is_positive=is_positive,
+            date=tx_date,
+            accounting_period=period,
+            created_by=self.treasurer,
+        )
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            DiagnosisService().build_report()
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_periods(self):
+        before = self.count_queries()
+
+        for month in range(3, 13):
+            period = AccountingPeriod.objects.create(
+                month=date(2025, month, 1), opening_balance=Decimal('0.00'), status='open',
+            )
+            self.create_tx(period, '10.00', True, date(2025, month, 2))
+
+        self.assertEqual(self.count_queries(), before)
+
+    def test_net_matches_period_summary(self):
+        self.create_tx(self.period_open, '40.00', False, date(2025, 1, 16))
+        self.create_tx(self.period_open, '-15.00', False, date(2025, 1, 17))
+
+        engine = DiagnosisService()
+        summary = self.period_open.get_transactions_summary()
+        self.assertEqual(engine.net(self.period_open), summary['net'])
+        self.assertEqual(engine.total_negative(self.period_open), summary['total_negative'])
+
+        report = engine.build_report()
+        january = next(p for p in report['periods'] if p['id'] == self.period_open.id)
+        self.assertEqual(january['net'], 45.0)
+        self.assertIn('mixed_sign_pattern', [i['type'] for i in january['issues']])
+
+    def test_detects_transactions_linked_to_another_period(self):
+        self.create_tx(self.period_open, '10.00', True, date(2025, 2, 3))
+
+        report = DiagnosisService().build_report()
+        february = next(p for p in report['periods'] if p['id'] == self.period_closed.id)
+        issues = [i for i in february['issues'] if i['type'] == 'transactions_linked_elsewhere']
+        self.assertEqual(len(issues), 1)
+        self.assertIn('1 transações', issues[0]['message'])
+
+    def test_check_treasury_json_output(self):
+        out = StringIO()
+        call_command('check_treasury', '--checks', '1,2,3,9', '--output', 'json', stdout=out)
+        data = json.loads(out.getvalue())
+        self.assertEqual(
+            set(data), {'opening_balance', 'closing_balance', 'monthly_report', 'running_balance'},
+        )
+
+    def test_fix_treasury_json_output(self):
+        out = StringIO()
+        call_command('fix_treasury', '--fixes', '2,3', '--output', 'json', stdout=out)
+        data = json.loads(out.getvalue())
+        self.assertTrue(data['dry_run'])
+        self.assertEqual([entry['fix'] for entry in data['fixes_applied']], ['closing_balance', 'monthly_report'])
+
+    def test_fix_period_gaps_chains_consecutive_gaps(self):
+        out = StringIO()
+        call_command(
+            'fix_treasury', '--fixes', '5', '--no-dry-run', '--no-confirm', '--output', 'json', stdout=out,
+        )
+        details = json.loads(out.getvalue())['fixes_applied'][0]['result']['details']
+
+        # Fevereiro (1000 + 200) abre marco; os meses seguintes seguem o saldo
+        self.assertEqual(details[0]['month'], '03/2025')
+        self.assertTrue(len(details) > 1)
+        self.assertEqual({d['opening_balance'] for d in details}, {'1200.00'})
+        self.assertEqual(
+            AccountingPeriod.objects.get(month=date(2025, 4, 1)).opening_balance, Decimal('1200.00'),
+        )
@@ -0,0 +1,125 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+import json
+
+from django.core.management import call_command
+
+from treasury.models import AccountingPeriod, FrozenReport, PeriodCheckState, TransactionModel
+from treasury.tests.test_diagnosis import DiagnosisTestBase
+
+
+CHECKS = '1,2,3,7,9'
+
+
+class IncrementalCheckTreasuryTests(DiagnosisTestBase):
+
+    def setUp(self):
+        super().setUp()
+        for period in (self.period_archived, self.period_closed):
+            FrozenReport.objects.create(
+                period=period,
+                pdf_file=f'frozen_reports/{period.month:%Y/%m}/relatorio.pdf',
+                pdf_hash='a' * 64,
+                closing_balance=period.closing_balance,
+                total_positive=Decimal('0.00'),
+                total_negative=Decimal('0.00'),
+                transaction_count=0,
+            )
+        patcher = mock.patch.object(FrozenReport, 'verify', return_value={'valid': True})
+        self.verify = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_check(self, *args):
+        out = StringIO()
+        call_command('check_treasury', '--checks', CHECKS, '--output', 'json', *args, stdout=out)
+        return json.loads(out.getvalue())
+
+    def checked_at(self):
+        return dict(PeriodCheckState.objects.values_list('period_id', 'checked_at'))
+
+    def test_unchanged_periods_reuse_stored_results(self):
+        first = self.run_check()
+        self.assertEqual(self.verify.call_count, 2)
+        self.assertEqual(PeriodCheckState.objects.count(), 3)
+        stamps = self.checked_at()
+
+        second = self.run_check()
+        self.assertEqual(self.verify.call_count, 2)
+        self.assertEqual(second, first)
+        self.assertEqual(self.checked_at(), stamps)
+
+    def test_change_rechecks_chain_from_changed_month(self):
+        self.run_check()
+        stamps = self.checked_at()
+
+        TransactionModel.objects.create(
+            user=self.treasurer,
+            category=self.category,
+            description='Nova entrada',
+            amount=Decimal('50.00'),
+            is_positive=True,
+            date=date(2025, 1, 20),
+            accounting_period=self.period_open,
+            created_by=self.treasurer,
+        )
+        incremental = self.run_check()
+
+        # Dezembro fica como estava; janeiro mudou e fevereiro depende dele
+        after = self.checked_at()
+        self.assertEqual(after[self.period_archived.id], stamps[self.period_archived.id])
+        self.assertNotEqual(after[self.period_open.id], stamps[self.period_open.id])
+        self.assertNotEqual(after[self.period_closed.id], stamps[self.period_closed.id])
+        # O PDF congelado de fevereiro não é verificado de novo
+        self.assertEqual(self.verify.call_count, 2)
+
+        self.assertEqual(incremental, self.run_check('--full'))
+
+    def opening_details(self, result):
+        return {d['month']: d for d in result['opening_balance']['details']}
+
+    def test_previous_period_change_rechecks_selected_month(self):
+        self.run_check('--month', '02/2025')
+
+        TransactionModel.objects.create(
+            user=self.treasurer,
+            category=self.category,
+            description='Nova entrada',
+            amount=Decimal('50.00'),
+            is_positive=True,
+            date=date(2025, 1, 20),
+            accounting_period=self.period_open,
+            created_by=self.treasurer,
+        )
+        incremental = self.run_check('--month', '02/2025')
+
+        self.assertEqual(self.opening_details(incremental)['02/2025']['expected'], '1150.00')
+        # Só os checks em cadeia foram refeitos
+        self.assertEqual(self.verify.call_count, 1)
+        self.assertEqual(incremental, self.run_check('--month', '02/2025', '--full'))
+
+    def test_deleted_previous_period_rechecks_next_one(self):
+        first = self.run_check()
+        self.assertEqual(self.opening_details(first)['02/2025']['status'], 'error')
+
+        # Sem janeiro, fevereiro abre com o saldo final de dezembro
+        TransactionModel.objects.filter(accounting_period=self.period_open).delete()
+        AccountingPeriod.objects.filter(pk=self.period_open.pk).delete()
+        incremental = self.run_check()
+
+        self.assertEqual(self.opening_details(incremental)['02/2025']['status'], 'ok')
+        self.assertEqual(incremental, self.run_check('--full'))
+
+    def test_full_flag_rechecks_everything(self):
+        self.run_check()
+        self.run_check('--full')
+        self.assertEqual(self.verify.call_count, 4)
+
+    def test_check_without_stored_result_runs_on_every_period(self):
+        out = StringIO()
+        call_command('check_treasury', '--checks', '2', '--output', 'json', stdout=out)
+        self.assertEqual(self.verify.call_count, 0)
+
+        self.assertEqual(self.run_check(), self.run_check('--full'))
+        self.assertEqual(self.verify.call_count, 4)
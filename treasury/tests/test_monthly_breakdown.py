@@ -0,0 +1,121 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from users.models import CustomUser
+from treasury.models import (
+    AccountingPeriod,
+    CategoryModel,
+    MonthlyReportModel,
+    MonthlyTransactionByCategoryModel,
+    TransactionModel,
+)
+from treasury.utils import get_category_breakdown
+
+
+class MonthlyBreakdownTest(TestCase):
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username='treasurer',
+            email='treasurer@test.com',
+            password='testpass123',
+            type=CustomUser.Types.REGULAR,
+        )
+        self.tithes = CategoryModel.objects.create(name='Dizimos')
+        self.energy = CategoryModel.objects.create(name='Energia')
+        self.period = AccountingPeriod.objects.create(
+            month=date(2024, 3, 1), opening_balance=Decimal('0.00'), status='open',
+        )
+
+    def create_tx(self, category, amount, is_positive, day=5, **kwargs):
+        return TransactionModel.objects.create(
+            user=self.user,
+            category=category,
+            description='Lançamento',
+            amount=Decimal(amount),
+            is_positive=is_positive,
+            date=date(2024, 3, day),
+            accounting_period=self.period,
+            **kwargs,
+        )
+
+    def create_sample(self, repeat=1):
+        for _ in range(repeat):
+            self.create_tx(self.tithes, '100.00', True)
+            self.create_tx(None, '5.50', True)
+            # Padrão de sinal duplo: negativas com e sem sinal
+            self.create_tx(self.energy, '-30.00', False)
+            self.create_tx(self.energy, '20.00', False)
+
+    def report_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.period._create_monthly_report()
+        MonthlyReportModel.objects.filter(month=self.period.month).delete()
+        # Totais e categorias saem do mesmo GROUP BY
+        self.assertEqual(sum('GROUP BY' in q['sql'] for q in ctx.captured_queries), 1)
+        return len(ctx.captured_queries)
+
+    def test_breakdown_groups_by_category_and_sign(self):
+        self.create_sample()
+        self.create_tx(self.tithes, '50.00', True)
+
+        breakdown = get_category_breakdown(2024, 3)
+
+        self.assertEqual(breakdown[True], {'Dizimos': '150.00', 'outros': '5.50'})
+        self.assertEqual(breakdown[False], {'Energia': '-50.00'})
+        self.assertEqual(get_category_breakdown(2024, 4), {True: {}, False: {}})
+
+    def test_monthly_report_totals_and_category_rows(self):
+        self.create_sample()
+
+        self.period._create_monthly_report()
+
+        report = MonthlyReportModel.objects.get(month=self.period.month)
+        self.assertEqual(report.total_positive_transactions, Decimal('105.50'))
+        self.assertEqual(report.total_negative_transactions, Decimal('-50.00'))
+        self.assertEqual(report.monthly_result, Decimal('55.50'))
+        rows = {
+            (row.category, row.is_positive): row.total_amount
+            for row in MonthlyTransactionByCategoryModel.objects.filter(report=report)
+        }
+        self.assertEqual(rows, {
+            ('Dizimos', True): Decimal('100.00'),
+            ('outros', True): Decimal('5.50'),
+            ('Energia', False): Decimal('-50.00'),
+        })
+
+    def test_category_rows_add_up_to_report_totals(self):
+        self.create_sample()
+        self.create_tx(self.tithes, '40.00', False, transaction_type='reversal')
+        self.create_tx(self.energy, '20.00', True, transaction_type='reversal')
+
+        self.period._create_monthly_report()
+
+        report = MonthlyReportModel.objects.get(month=self.period.month)
+        rows = MonthlyTransactionByCategoryModel.objects.filter(report=report)
+        positive = sum(row.total_amount for row in rows if row.is_positive)
+        negative = sum(row.total_amount for row in rows if not row.is_positive)
+        self.assertEqual(positive, report.total_positive_transactions)
+        self.assertEqual(negative, report.total_negative_transactions)
+        self.assertEqual(report.monthly_result, Decimal('55.50'))
+
+    def test_reclosing_replaces_category_rows(self):
+        self.create_sample()
+        self.period._create_monthly_report()
+        self.create_tx(self.energy, '-5.00', False)
+
+        self.period._create_monthly_report()
+
+        rows = MonthlyTransactionByCategoryModel.objects.filter(is_positive=False)
+        self.assertEqual([(r.category, r.total_amount) for r in rows], [('Energia', Decimal('-55.00'))])
+
+    def test_query_count_does_not_grow_with_transactions(self):
+        self.create_sample()
+        few = self.report_queries()
+
+        self.create_sample(repeat=20)
+        self.assertEqual(self.report_queries(), few)
@@ -0,0 +1,114 @@
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from users.models import CustomUser
+from treasury.models import AccountingPeriod, CategoryModel, TransactionModel
+
+
+class RangeExcelExportTest(TestCase):
+
+    def setUp(self):
+        self.member = CustomUser.objects.create_user(
+            username='member',
+            email='member@test.com',
+            password='testpass123',
+            type=CustomUser.Types.REGULAR,
+        )
+        self.tithes = CategoryModel.objects.create(name='Dizimos')
+        self.energy = CategoryModel.objects.create(name='Energia')
+
+        january = AccountingPeriod.objects.create(
+            month=date(2024, 1, 1), opening_balance=Decimal('1000.00'), status='closed',
+            closing_balance=Decimal('1050.00'),
+        )
+        february = AccountingPeriod.objects.create(
+            month=date(2024, 2, 1), opening_balance=Decimal('1050.00'), status='open',
+        )
+        march = AccountingPeriod.objects.create(
+            month=date(2024, 3, 1), opening_balance=Decimal('0.00'), status='open',
+        )
+        self.create_tx(january, self.tithes, '100.00', True, date(2024, 1, 10))
+        # Saídas gravadas com e sem sinal
+        self.create_tx(january, self.energy, '50.00', False, date(2024, 1, 20))
+        self.create_tx(february, self.energy, '-30.00', False, date(2024, 2, 5))
+        self.create_tx(march, self.tithes, '999.00', True, date(2024, 3, 1))
+
+        self.url = reverse('treasury:range-report-excel')
+        self.client.force_login(self.member)
+
+    def create_tx(self, period, category, amount, is_positive, tx_date):
+        return TransactionModel.objects.create(
+            user=self.member,
+            category=category,
+            description=f'{category.name} {tx_date}',
+            amount=Decimal(amount),
+            is_positive=is_positive,
+            date=tx_date,
+            accounting_period=period,
+            created_by=self.member,
+        )
+
+    def load(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return load_workbook(BytesIO(b''.join(response.streaming_content)))
+
+    def test_exports_range_with_running_balance(self):
+        response = self.client.get(self.url, {'start': '2024-01', 'end': '2024-02'})
+        self.assertIn('relatorio_2024_01_a_2024_02.xlsx', response['Content-Disposition'])
+
+        wb = self.load(response)
+        rows = list(wb['Transacoes'].iter_rows(min_row=2, max_row=4, values_only=True))
+        self.assertEqual([row[4] for row in rows], [100.0, -50.0, -30.0])
+        self.assertEqual([row[5] for row in rows], [1100.0, 1050.0, 1020.0])
+
+        summary = {row[0]: row[1] for row in wb['Resumo'].iter_rows(min_row=3, values_only=True) if row}
+        self.assertEqual(summary['Total de Entradas'], 100.0)
+        self.assertEqual(summary['Total de Saida'], -80.0)
+        self.assertEqual(summary['Saldo Final'], 1020.0)
+        self.assertEqual(summary['Quantidade de Transacoes'], 3)
+
+    def test_category_filter_accumulates_from_zero(self):
+        response = self.client.get(self.url, {'start': '2024-01', 'end': '2024-03', 'category': self.energy.pk})
+
+        wb = self.load(response)
+        rows = [row for row in wb['Transacoes'].iter_rows(min_row=2, values_only=True) if row[3]]
+        self.assertEqual([row[5] for row in rows], [-50.0, -80.0])
+
+    def test_query_count_does_not_grow_with_rows(self):
+        params = {'start': '2024-01', 'end': '2024-03'}
+        self.load(self.client.get(self.url, params))
+        with CaptureQueriesContext(connection) as before:
+            self.load(self.client.get(self.url, params))
+
+        period = AccountingPeriod.objects.get(month=date(2024, 2, 1))
+        for day in range(1, 26):
+            self.create_tx(period, self.tithes, '10.00', True, date(2024, 2, day))
+
+        with CaptureQueriesContext(connection) as after:
+            wb = self.load(self.client.get(self.url, params))
+        self.assertEqual(len(after), len(before))
+        self.assertEqual(wb['Resumo']['B10'].value, 29)
+
+    def test_invalid_range(self):
+        response = self.client.get(self.url, {'start': '2024-03', 'end': '2024-01'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_congregated_user_is_forbidden(self):
+        congregated = CustomUser.objects.create_user(
+            username='congregated',
+            email='congregated@test.com',
+            password='testpass123',
+            type=CustomUser.Types.CONGREGATED,
+        )
+        self.client.force_login(congregated)
+        response = self.client.get(self.url, {'start': '2024-01', 'end': '2024-02'})
+        self.assertEqual(response.status_code, 403)
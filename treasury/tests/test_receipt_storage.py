@@ -0,0 +1,164 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from users.models import CustomUser
+from treasury.models import AccountingPeriod, TransactionModel
+from treasury.services import ReceiptStorageService
+from treasury.tests.fake_storage import InMemoryStorage
+
+
+class ReceiptStorageTest(TestCase):
+
+    def setUp(self):
+        self.storage = InMemoryStorage()
+        patcher = mock.patch.object(ReceiptStorageService, 'storage', return_value=self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = CustomUser.objects.create_user(
+            username='treasurer',
+            email='treasurer@test.com',
+            password='testpass123',
+            type=CustomUser.Types.REGULAR,
+        )
+        self.period = AccountingPeriod.objects.create(
+            month=date(2024, 1, 1), opening_balance=Decimal('0.00'), status='open',
+        )
+
+    def create_tx(self, content=None, name='boleto.PDF'):
+        transaction = TransactionModel(
+            user=self.user,
+            description='Energia',
+            amount=Decimal('10.00'),
+            is_positive=False,
+            date=date(2024, 1, 5),
+            accounting_period=self.period,
+        )
+        if content is not None:
+            transaction.acquittance_doc = ContentFile(content, name=name)
+        transaction.save()
+        return transaction
+
+    def test_key_is_content_hash(self):
+        transaction = self.create_tx(b'boleto')
+
+        name = transaction.acquittance_doc.name
+        self.assertRegex(name, r'^treasury/receipts/sha256/[0-9a-f]{2}/[0-9a-f]{64}\.pdf$')
+        self.assertEqual(self.storage.files[name], b'boleto')
+
+    def test_identical_uploads_share_one_object(self):
+        first = self.create_tx(b'boleto', name='a.pdf')
+        with mock.patch.object(self.storage, '_save', wraps=self.storage._save) as save:
+            second = self.create_tx(b'boleto', name='b.pdf')
+
+        save.assert_not_called()
+        self.assertEqual(first.acquittance_doc.name, second.acquittance_doc.name)
+        self.assertEqual(len(self.storage.files), 1)
+        self.assertEqual(ReceiptStorageService.reference_count(first.acquittance_doc.name), 2)
+
+    def test_blob_removed_with_last_reference(self):
+        first = self.create_tx(b'boleto')
+        second = self.create_tx(b'boleto')
+        name = first.acquittance_doc.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertIn(name, self.storage.files)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertNotIn(name, self.storage.files)
+
+    def test_replacing_receipt_releases_old_one(self):
+        transaction = self.create_tx(b'antigo')
+        old_name = transaction.acquittance_doc.name
+
+        transaction.acquittance_doc = ContentFile(b'novo', name='novo.pdf')
+        with self.captureOnCommitCallbacks(execute=True):
+            transaction.save()
+
+        self.assertNotIn(old_name, self.storage.files)
+        self.assertEqual(self.storage.files[transaction.acquittance_doc.name], b'novo')
+
+    def test_release_is_deferred_until_commit(self):
+        transaction = self.create_tx(b'boleto')
+        name = transaction.acquittance_doc.name
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            transaction.delete()
+        self.assertIn(name, self.storage.files)
+
+        for callback in callbacks:
+            callback()
+        self.assertNotIn(name, self.storage.files)
+
+    def test_reused_key_is_restored_if_released_concurrently(self):
+        first = self.create_tx(b'boleto')
+        name = first.acquittance_doc.name
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            second = self.create_tx(b'boleto')
+        self.assertEqual(second.acquittance_doc.name, name)
+
+        # Liberação concorrente removeu o objeto antes do commit do reaproveitamento
+        del self.storage.files[name]
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.storage.files[name], b'boleto')
+
+    def test_release_keeps_object_reused_before_removal(self):
+        transaction = self.create_tx(b'boleto')
+        name = transaction.acquittance_doc.name
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            transaction.delete()
+        self.create_tx(b'boleto')
+
+        for callback in callbacks:
+            callback()
+        self.assertIn(name, self.storage.files)
+
+    def test_release_takes_write_lock_before_counting(self):
+        first = self.create_tx(b'boleto')
+        self.create_tx(b'boleto')
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            first.delete()
+        with CaptureQueriesContext(connection) as ctx:
+            for callback in callbacks:
+                callback()
+
+        statements = [q['sql'] for q in ctx.captured_queries if 'acquittance_doc' in q['sql']]
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith('UPDATE'))
+        self.assertIn(first.acquittance_doc.name, self.storage.files)
+
+    def test_update_reads_the_current_row_once(self):
+        transaction = self.create_tx(b'boleto')
+        transaction.description = 'Água'
+
+        with CaptureQueriesContext(connection) as ctx:
+            transaction.save()
+
+        by_pk = [q['sql'] for q in ctx.captured_queries
+                 if q['sql'].startswith('SELECT') and '"treasury_transactionmodel"."id" =' in q['sql']]
+        self.assertEqual(len(by_pk), 1)
+
+    def test_thumbnails_follow_the_stored_object(self):
+        with mock.patch('core.thumbnails.schedule_derivatives') as schedule:
+            first = self.create_tx(b'boleto')
+            self.create_tx(b'boleto')
+        schedule.assert_called_once_with(first.acquittance_doc.name, self.storage)
+
+        name = first.acquittance_doc.name
+        self.storage.files[f'{name}.w320.webp'] = b'webp'
+        for transaction in TransactionModel.objects.all():
+            with self.captureOnCommitCallbacks(execute=True):
+                transaction.delete()
+        self.assertEqual(self.storage.files, {})
@@ -0,0 +1,132 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from users.models import CustomUser
+from treasury.models import AccountingPeriod, CategoryModel, TransactionModel
+from treasury.serializers import TransactionListSerializer, TransactionRowSerializer
+
+LIST_URL = '/treasury/api/transactions/'
+
+
+class TransactionListAPITest(APITestCase):
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username='treasurer',
+            email='treasurer@test.com',
+            password='testpass123',
+            type=CustomUser.Types.REGULAR,
+        )
+        self.category = CategoryModel.objects.create(name='Dizimos')
+        self.open_period = AccountingPeriod.objects.create(
+            month=date(2024, 2, 1), opening_balance=Decimal('0.00'), status='open',
+        )
+        self.closed_period = AccountingPeriod.objects.create(
+            month=date(2024, 1, 1), opening_balance=Decimal('0.00'), status='closed',
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def create_tx(self, day, period=None, category=None, amount='10.00', is_positive=True):
+        period = period or self.open_period
+        return TransactionModel.objects.create(
+            user=self.user,
+            category=category,
+            description=f'Lançamento {day}',
+            amount=Decimal(amount),
+            is_positive=is_positive,
+            date=period.month.replace(day=day),
+            accounting_period=period,
+        )
+
+    def walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [row['id'] for row in response.data['results']]
+            url = response.data['next']
+        return ids
+
+    def test_cursor_walks_every_row_once_in_order(self):
+        # Vários lançamentos no mesmo dia exercitam o desempate por created_at/id
+        for day in (3, 3, 3, 7, 7, 12):
+            self.create_tx(day)
+            self.create_tx(day, period=self.closed_period)
+
+        ids = self.walk(f'{LIST_URL}?page_size=4')
+
+        expected = list(
+            TransactionModel.objects.order_by('-date', '-created_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_row_matches_model_serializer(self):
+        self.create_tx(5, category=self.category, amount='1234.50')
+        self.create_tx(6, period=self.closed_period, amount='20.00', is_positive=False)
+
+        rows = self.client.get(LIST_URL).data['results']
+
+        for row in rows:
+            instance = TransactionModel.objects.get(pk=row['id'])
+            full = TransactionListSerializer(instance).data
+            for key in TransactionListSerializer.Meta.fields:
+                if key == 'accounting_period':
+                    for field in row[key]:
+                        if field != 'is_open':
+                            self.assertEqual(row[key][field], full[key][field], field)
+                else:
+                    self.assertEqual(row[key], full[key], key)
+
+    def test_list_queries_do_not_grow_with_rows(self):
+        self.create_tx(1, category=self.category)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(LIST_URL)
+
+        for day in range(2, 28):
+            self.create_tx(day, category=self.category)
+            self.create_tx(day, period=self.closed_period)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(LIST_URL)
+
+        self.assertEqual(len(many.captured_queries), len(few.captured_queries))
+
+    def test_page_param_keeps_page_number_pagination(self):
+        for day in (1, 2, 3):
+            self.create_tx(day)
+
+        response = self.client.get(LIST_URL, {'page': 1})
+
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_filters_apply_to_row_queryset(self):
+        self.create_tx(2)
+        self.create_tx(20)
+        self.create_tx(5, period=self.closed_period)
+
+        response = self.client.get(LIST_URL, {'date_from': '2024-02-10', 'date_to': 'x'})
+        self.assertEqual([row['date'] for row in response.data['results']], ['2024-02-20'])
+
+        response = self.client.get(LIST_URL, {'accounting_period': self.closed_period.pk})
+        self.assertEqual([row['date'] for row in response.data['results']], ['2024-01-05'])
+
+    def test_row_serializer_without_period_or_category(self):
+        row = {
+            'id': 1, 'description': 'Oferta', 'amount': Decimal('5.00'), 'is_positive': False,
+            'date': date(2024, 2, 1), 'transaction_type': 'original',
+            'category_id': None, 'category__name': None,
+            'accounting_period_id': None, 'accounting_period__month': None,
+            'accounting_period__status': None,
+        }
+
+        data = TransactionRowSerializer(row).data
+
+        self.assertEqual(data['signed_amount'], '-5.00')
+        self.assertIsNone(data['category'])
+        self.assertIsNone(data['accounting_period'])
+        self.assertTrue(data['can_be_edited'])
+        self.assertFalse(data['can_be_reversed'])
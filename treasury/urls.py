@@ -22,6 +22,7 @@ from treasury.views.template_views import (
 from treasury.views.generate_balance_sheet_pdf_view import GenerateBalanceSheetPDFView
 from treasury.views.generate_analytical_report_pdf_view import generate_analytical_report_pdf
 from treasury.views.generate_monthly_excel_view import generate_monthly_excel
+from treasury.views.generate_range_excel_view import generate_range_excel
 
 from treasury.api.diagnosis_views import (
     DiagnosisView as DiagnosisAPIView,
@@ -55,6 +56,7 @@ urlpatterns = [
     path('relatorios/mensal/<int:year>/<int:month>/excel/', generate_monthly_excel, name='monthly-report-excel'),
     path('relatorios/balanco/', BalanceSheetView.as_view(), name='balance-sheet'),
     path('relatorios/balanco/pdf/', GenerateBalanceSheetPDFView, name='balance-sheet-pdf'),
+    path('relatorios/excel/', generate_range_excel, name='range-report-excel'),
 
     # ===== CATEGORIES =====
     path('categorias/', CategoryListView.as_view(), name='category-list'),
@@ -2,12 +2,15 @@
 from .get_last_day_of_month import get_last_day_of_month
 from .months_between_dates import months_between_dates
 from .get_aggregate_transactions_by_category import get_aggregate_transactions_by_category
+from .get_category_breakdown import get_category_breakdown
 from .get_total_transactions_amount import get_total_transactions_amount
 from .add_months import add_months
 from .custom_upload_to import custom_upload_to
 from .get_previous_month import get_previous_month
 from .get_aggregate_transactions import get_aggregate_transactions
 from .get_total_amount_transactions_by_month import get_total_amount_transactions_by_month
+from .get_transactions_totals import get_transactions_totals
+from .format_brl import format_brl, format_brl_values
 
 # REMOVED: Old MonthlyBalance-related utils (replaced by AccountingPeriod):
 # - monthly_balance_exists
@@ -0,0 +1,58 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+# Grupos de milhar e centavos pré-formatados ("000".."999", "00".."99")
+_THOUSANDS = tuple(f'{i:03d}' for i in range(1000))
+_CENTS = tuple(f'{i:02d}' for i in range(100))
+
+
+def to_decimal(value):
+    """
+    Converte para Decimal sem passar por float.
+
+    Floats são convertidos pela representação em texto (0.1 -> Decimal('0.1')).
+    Levanta ValueError/TypeError para valores inválidos.
+    """
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, float):
+        value = repr(value)
+    elif not isinstance(value, (int, str)):
+        raise TypeError(f'Valor não numérico: {value!r}')
+    try:
+        result = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f'Valor não numérico: {value!r}')
+    if not result.is_finite():
+        raise ValueError(f'Valor não numérico: {value!r}')
+    return result
+
+
+def format_brl(value):
+    """
+    Formata valor no padrão brasileiro, sem o prefixo "R$".
+
+    O valor é arredondado para centavos (meio para cima) e formatado a partir
+    do inteiro de centavos. Valores inválidos viram "0,00".
+    Ex: 1234.56 -> 1.234,56
+         10000 -> 10.000,00
+    """
+    try:
+        cents = int(to_decimal(value).scaleb(2).to_integral_value(ROUND_HALF_UP))
+    except (ValueError, TypeError):
+        return '0,00'
+
+    sign = '-' if cents < 0 else ''
+    units, cents = divmod(abs(cents), 100)
+
+    groups = []
+    while units >= 1000:
+        units, group = divmod(units, 1000)
+        groups.append(_THOUSANDS[group])
+    groups.append(str(units))
+    groups.reverse()
+    return f"{sign}{'.'.join(groups)},{_CENTS[cents]}"
+
+
+def format_brl_values(values):
+    """Formata em lote os valores de um dicionário ({chave: "1.234,56"})."""
+    return {key: format_brl(value) for key, value in values.items()}
@@ -0,0 +1,45 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.db.models.functions import Abs
+
+
+def get_category_breakdown(year, month, is_positive=None):
+    """
+    Totais do período por categoria e sinal, em uma única consulta (GROUP BY).
+
+    Considera as transações originais do período contábil do mês (sem
+    estornos), como o MonthlyReportModel: somados, os totais por categoria
+    dão os totais do relatório. Transações sem categoria entram em "outros".
+    Saídas podem estar gravadas com ou sem sinal; o total é -sum(|amount|).
+
+    Returns:
+        {True: {categoria: "0.00"}, False: {...}}, com as categorias em ordem
+        alfabética
+    """
+    from treasury.models import TransactionModel
+
+    transactions = TransactionModel.objects.filter(
+        accounting_period__month=date(year, month, 1),
+        transaction_type='original',
+    )
+    if is_positive is not None:
+        transactions = transactions.filter(is_positive=is_positive)
+
+    rows = (
+        transactions
+        .values_list('is_positive', 'category__name')
+        .annotate(total=Sum('amount'), magnitude=Sum(Abs('amount')))
+        .order_by('category__name')
+    )
+
+    totals = {True: defaultdict(Decimal), False: defaultdict(Decimal)}
+    for positive, category_name, total, magnitude in rows:
+        totals[positive][category_name or 'outros'] += total if positive else -magnitude
+
+    return {
+        sign: {name: "{:.2f}".format(value) for name, value in sorted(by_category.items())}
+        for sign, by_category in totals.items()
+    }
@@ -0,0 +1,24 @@
+from decimal import Decimal
+
+from django.db.models import Q, Sum
+from django.db.models.functions import Abs
+
+
+def get_transactions_totals(transactions):
+    """
+    Entradas, saídas e resultado de um queryset em uma única agregação
+    condicional.
+
+    As saídas são somadas em valor absoluto, então o total vale tanto para
+    negativas gravadas com sinal quanto sem sinal (is_positive=False).
+
+    Returns:
+        {"positive": Decimal, "negative": Decimal (<= 0), "net": Decimal}
+    """
+    totals = transactions.aggregate(
+        positive=Sum('amount', filter=Q(is_positive=True)),
+        negative=Sum(Abs('amount'), filter=Q(is_positive=False)),
+    )
+    positive = totals['positive'] or Decimal('0.00')
+    negative = -(totals['negative'] or Decimal('0.00'))
+    return {'positive': positive, 'negative': negative, 'net': positive + negative}
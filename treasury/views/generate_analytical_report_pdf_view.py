@@ -5,6 +5,8 @@ from django.http import HttpResponse, HttpResponseForbidden
 from django.contrib.auth.decorators import login_required
 from core.core_context_processor import context_user_data
 from treasury.models import AccountingPeriod
+from treasury.utils import format_brl_values
+from users.capabilities import TREASURY_VIEWER, has_capability
 from decimal import Decimal
 from collections import defaultdict
 
@@ -21,21 +23,7 @@ def _is_treasury_user(user):
     - Staff (is_staff)
     - Superuser (is_superuser)
     """
-    if not user.is_authenticated:
-        return False
-
-    # Membros regulares podem visualizar
-    if user.type == "REGULAR":
-        return True
-
-    # Staff e funções especiais
-    return (
-        user.is_treasurer or
-        user.is_secretary or
-        user.is_pastor or
-        user.is_staff or
-        user.is_superuser
-    )
+    return has_capability(user, TREASURY_VIEWER)
 
 
 @login_required
@@ -93,8 +81,9 @@ def generate_analytical_report_pdf(request, period_id):
         "total_n": total_n,
         "m_result": m_result,
         "balance": balance,
-        "p_transactions": dict(positive_by_category) if positive_by_category else None,
-        "n_transactions": dict(negative_by_category) if negative_by_category else None,
+        # Linhas por categoria já formatadas em BRL
+        "p_transactions": format_brl_values(positive_by_category) if positive_by_category else None,
+        "n_transactions": format_brl_values(negative_by_category) if negative_by_category else None,
     }
 
     html = render_to_string("treasury/export_analytical_report.html", context)
@@ -11,6 +11,7 @@ from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import get_object_or_404
 
 from treasury.models import AccountingPeriod, TransactionModel
+from users.capabilities import TREASURY_VIEWER, has_capability
 
 
 BRL_FORMAT = '#,##0.00_);[Red](#,##0.00)'
@@ -35,17 +36,7 @@ THIN_BORDER = Border(
 
 
 def _is_treasury_user(user):
-    if not user.is_authenticated:
-        return False
-    if user.type == "REGULAR":
-        return True
-    return (
-        user.is_treasurer
-        or user.is_secretary
-        or user.is_pastor
-        or user.is_staff
-        or user.is_superuser
-    )
+    return has_capability(user, TREASURY_VIEWER)
 
 
 def _apply_cell_style(cell, font=None, fill=None, alignment=None, number_format=None, border=None):
@@ -0,0 +1,240 @@
+import tempfile
+from datetime import datetime
+from decimal import Decimal
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle
+from openpyxl.utils import get_column_letter
+
+from django.contrib.auth.decorators import login_required
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Abs
+from django.http import FileResponse, HttpResponseBadRequest, HttpResponseForbidden
+from django.shortcuts import get_object_or_404
+
+from treasury.models import AccountingPeriod, CategoryModel, TransactionModel
+from treasury.views.generate_monthly_excel_view import (
+    BOLD_FONT,
+    BRL_FORMAT,
+    DATE_FORMAT,
+    ENTRY_FILL,
+    EXIT_FILL,
+    HEADER_FILL,
+    HEADER_FONT,
+    NORMAL_FONT,
+    THIN_BORDER,
+    TITLE_FONT,
+    TOTAL_FILL,
+    _is_treasury_user,
+)
+
+# Linhas buscadas por vez no banco; a planilha em modo write-only grava cada
+# linha direto no arquivo temporário, então a memória não cresce com o período.
+CHUNK_SIZE = 2000
+
+COLUMNS = [
+    ('Data', 14),
+    ('Descricao', 40),
+    ('Categoria', 20),
+    ('Tipo', 12),
+    ('Valor', 18),
+    ('Saldo Acumulado', 18),
+]
+
+
+def _parse_month(value):
+    """Converte 'AAAA-MM' no primeiro dia do mês (ou None se inválido)."""
+    try:
+        return datetime.strptime(value or '', '%Y-%m').date()
+    except ValueError:
+        return None
+
+
+def _named_styles():
+    """Estilos registrados uma vez no workbook e referenciados por nome em cada célula."""
+    center = Alignment(horizontal='center', vertical='center')
+    right = Alignment(horizontal='right', vertical='center')
+    return [
+        NamedStyle(name='title', font=TITLE_FONT),
+        NamedStyle(name='header', font=HEADER_FONT, fill=HEADER_FILL, border=THIN_BORDER, alignment=center),
+        NamedStyle(name='label', font=BOLD_FONT, border=THIN_BORDER, alignment=right),
+        NamedStyle(name='value', font=NORMAL_FONT, border=THIN_BORDER, alignment=right),
+        NamedStyle(name='money', font=NORMAL_FONT, border=THIN_BORDER, alignment=right, number_format=BRL_FORMAT),
+        NamedStyle(name='entry_text', font=NORMAL_FONT, border=THIN_BORDER, fill=ENTRY_FILL),
+        NamedStyle(name='entry_date', font=NORMAL_FONT, border=THIN_BORDER, fill=ENTRY_FILL,
+                   alignment=center, number_format=DATE_FORMAT),
+        NamedStyle(name='entry_type', font=NORMAL_FONT, border=THIN_BORDER, fill=ENTRY_FILL, alignment=center),
+        NamedStyle(name='entry_money', font=NORMAL_FONT, border=THIN_BORDER, fill=ENTRY_FILL,
+                   alignment=right, number_format=BRL_FORMAT),
+        NamedStyle(name='exit_text', font=NORMAL_FONT, border=THIN_BORDER, fill=EXIT_FILL),
+        NamedStyle(name='exit_date', font=NORMAL_FONT, border=THIN_BORDER, fill=EXIT_FILL,
+                   alignment=center, number_format=DATE_FORMAT),
+        NamedStyle(name='exit_type', font=NORMAL_FONT, border=THIN_BORDER, fill=EXIT_FILL, alignment=center),
+        NamedStyle(name='exit_money', font=NORMAL_FONT, border=THIN_BORDER, fill=EXIT_FILL,
+                   alignment=right, number_format=BRL_FORMAT),
+        NamedStyle(name='total_label', font=BOLD_FONT, fill=TOTAL_FILL, border=THIN_BORDER),
+        NamedStyle(name='total_money', font=BOLD_FONT, fill=TOTAL_FILL, border=THIN_BORDER,
+                   alignment=right, number_format=BRL_FORMAT),
+        NamedStyle(name='note', font=Font(name='Calibri', size=9, italic=True, color='666666')),
+    ]
+
+
+def _cell(ws, value, style):
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
+
+
+@login_required
+def generate_range_excel(request):
+    """
+    Exporta as transações de um intervalo de meses em uma planilha Excel.
+
+    Parâmetros (GET):
+        start: mês inicial no formato AAAA-MM
+        end: mês final no formato AAAA-MM
+        category: id da categoria (opcional)
+    """
+    if not _is_treasury_user(request.user):
+        return HttpResponseForbidden("Sem permissao.")
+
+    start = _parse_month(request.GET.get('start'))
+    end = _parse_month(request.GET.get('end'))
+    if not start or not end or end < start:
+        return HttpResponseBadRequest("Informe start e end no formato AAAA-MM (start <= end).")
+
+    category = None
+    category_id = request.GET.get('category')
+    if category_id:
+        if not category_id.isdigit():
+            return HttpResponseBadRequest("Categoria inválida.")
+        category = get_object_or_404(CategoryModel, pk=category_id)
+
+    transactions = TransactionModel.objects.filter(
+        transaction_type='original',
+        accounting_period__month__gte=start,
+        accounting_period__month__lte=end,
+    )
+    if category:
+        transactions = transactions.filter(category=category)
+
+    # Saídas podem estar gravadas com ou sem sinal; Abs normaliza as duas formas
+    totals = transactions.aggregate(
+        total_positive=Sum('amount', filter=Q(is_positive=True)),
+        total_negative=Sum(Abs('amount'), filter=Q(is_positive=False)),
+        count=Count('id'),
+    )
+    total_positive = totals['total_positive'] or Decimal('0.00')
+    total_negative = -(totals['total_negative'] or Decimal('0.00'))
+    net = total_positive + total_negative
+
+    # Com filtro de categoria o saldo da conta não se aplica: acumula a partir de zero
+    opening_balance = Decimal('0.00')
+    if category is None:
+        first_period = AccountingPeriod.objects.filter(
+            month__gte=start, month__lte=end,
+        ).order_by('month').only('opening_balance').first()
+        if first_period and first_period.opening_balance:
+            opening_balance = first_period.opening_balance
+
+    wb = Workbook(write_only=True)
+    for style in _named_styles():
+        wb.add_named_style(style)
+
+    _write_summary_sheet(
+        wb.create_sheet('Resumo'), start, end, category,
+        opening_balance, total_positive, total_negative, net, totals['count'],
+    )
+    _write_transactions_sheet(
+        wb.create_sheet('Transacoes'),
+        transactions.order_by('date', 'created_at', 'id').values_list(
+            'date', 'description', 'category__name', 'is_positive', 'amount',
+        ),
+        opening_balance,
+        total_positive,
+        total_negative,
+        totals['count'],
+    )
+
+    # O workbook write-only só é montado no save; o arquivo temporário é
+    # enviado em blocos pelo FileResponse (StreamingHttpResponse) e removido ao fechar.
+    output = tempfile.TemporaryFile()
+    wb.save(output)
+    output.seek(0)
+
+    filename = f"relatorio_{start:%Y_%m}_a_{end:%Y_%m}.xlsx"
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=filename,
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+
+
+def _write_summary_sheet(ws, start, end, category, opening_balance, total_positive, total_negative, net, count):
+    ws.column_dimensions['A'].width = 30
+    ws.column_dimensions['B'].width = 25
+
+    ws.append([_cell(ws, f'Relatorio de {start:%m/%Y} a {end:%m/%Y}', 'title')])
+    ws.append([])
+
+    balance_label = 'Saldo Final' if category is None else 'Acumulado'
+    rows = [
+        ('Periodo', f'{start:%m/%Y} a {end:%m/%Y}', 'value'),
+        ('Categoria', category.name if category else 'Todas', 'value'),
+        ('Saldo Anterior (Abertura)', float(opening_balance), 'money'),
+        ('Total de Entradas', float(total_positive), 'money'),
+        ('Total de Saida', float(total_negative), 'money'),
+        ('Resultado do Periodo', float(net), 'total_money'),
+        (balance_label, float(opening_balance + net), 'total_money'),
+        ('Quantidade de Transacoes', count, 'value'),
+    ]
+    for label, value, style in rows:
+        label_style = 'total_label' if style == 'total_money' else 'label'
+        ws.append([_cell(ws, label, label_style), _cell(ws, value, style)])
+
+    ws.append([])
+    ws.append([
+        _cell(ws, 'Gerado em:', 'note'),
+        _cell(ws, datetime.now().strftime('%d/%m/%Y %H:%M'), 'note'),
+    ])
+
+
+def _write_transactions_sheet(ws, rows, opening_balance, total_positive, total_negative, count):
+    for col_idx, (_, width) in enumerate(COLUMNS, 1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+    ws.freeze_panes = 'A2'
+    ws.auto_filter.ref = f'A1:{get_column_letter(len(COLUMNS))}1'
+
+    ws.append([_cell(ws, header, 'header') for header, _ in COLUMNS])
+
+    running_balance = opening_balance
+    for tx_date, description, category_name, is_positive, amount in rows.iterator(chunk_size=CHUNK_SIZE):
+        value = abs(amount) if is_positive else -abs(amount)
+        running_balance += value
+        prefix = 'entry' if is_positive else 'exit'
+        ws.append([
+            _cell(ws, tx_date, f'{prefix}_date'),
+            _cell(ws, description, f'{prefix}_text'),
+            _cell(ws, category_name or 'Sem categoria', f'{prefix}_text'),
+            _cell(ws, 'Entrada' if is_positive else 'Saida', f'{prefix}_type'),
+            _cell(ws, float(value), f'{prefix}_money'),
+            _cell(ws, float(running_balance), f'{prefix}_money'),
+        ])
+
+    ws.append([])
+    ws.append([
+        _cell(ws, 'TOTAIS', 'total_label'),
+        _cell(ws, None, 'total_label'),
+        _cell(ws, None, 'total_label'),
+        _cell(ws, None, 'total_label'),
+        _cell(ws, float(total_positive + total_negative), 'total_money'),
+        _cell(ws, float(running_balance), 'total_money'),
+    ])
+    ws.append([
+        _cell(ws, f'{count} transacao(oes)', 'note'),
+        None, None, None,
+        _cell(ws, f'Entradas: {total_positive:,.2f}', 'note'),
+    ])
+    ws.append([None, None, None, None, _cell(ws, f'Saidas: {total_negative:,.2f}', 'note')])
@@ -0,0 +1,15 @@
+from django.contrib.auth.backends import ModelBackend
+
+from users.capabilities import get_cached_permissions
+
+
+class CachedPermissionsBackend(ModelBackend):
+    """
+    ModelBackend que lê as permissões memorizadas em users.capabilities,
+    resolvendo as de usuário e as de grupos uma vez por requisição.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        return set(get_cached_permissions(user_obj))
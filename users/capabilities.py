@@ -0,0 +1,104 @@
+"""
+Resolução única das capacidades (funções) de um usuário.
+
+As permissões da tesouraria, secretaria e louvor são todas derivadas das
+mesmas flags de CustomUser. Aqui elas viram uma máscara de bits, sempre
+calculada a partir das flags já carregadas no usuário (sem consultas).
+
+As permissões do Django exigem consultas e ficam memorizadas apenas no
+próprio objeto do usuário, durante a requisição (como no ModelBackend).
+Não há cache compartilhado: um cache por processo não seria invalidado nos
+demais workers, e uma permissão revogada continuaria valendo neles. Assim,
+uma função ou permissão revogada deixa de valer na próxima requisição, em
+qualquer processo.
+"""
+from enum import IntFlag
+
+
+class Capability(IntFlag):
+    AUTHENTICATED = 1
+    MEMBER = 2  # type == REGULAR
+    STAFF = 4
+    SUPERUSER = 8
+    TREASURER = 16
+    SECRETARY = 32
+    PASTOR = 64
+
+
+# Conjuntos usados pelas verificações de acesso (basta ter uma das capacidades)
+TREASURY_ADMIN = (
+    Capability.STAFF | Capability.SUPERUSER
+    | Capability.TREASURER | Capability.SECRETARY | Capability.PASTOR
+)
+TREASURY_VIEWER = TREASURY_ADMIN | Capability.MEMBER
+TREASURER_ONLY = Capability.TREASURER | Capability.SUPERUSER
+CHURCH_MEMBER = Capability.MEMBER | Capability.STAFF | Capability.SUPERUSER
+
+
+def compute_mask(user):
+    """Máscara de capacidades a partir das flags do usuário (sem consultas)."""
+    if not user.is_authenticated:
+        return Capability(0)
+
+    mask = Capability.AUTHENTICATED
+    if user.type == "REGULAR":
+        mask |= Capability.MEMBER
+    if user.is_staff:
+        mask |= Capability.STAFF
+    if user.is_superuser:
+        mask |= Capability.SUPERUSER
+    if user.is_treasurer:
+        mask |= Capability.TREASURER
+    if user.is_secretary:
+        mask |= Capability.SECRETARY
+    if user.is_pastor:
+        mask |= Capability.PASTOR
+    return mask
+
+
+def _resolve_permissions(user):
+    perms = getattr(user, "_capabilities", None)
+    if perms is None:
+        from django.contrib.auth.backends import ModelBackend
+
+        backend = ModelBackend()
+        perms = frozenset({
+            *backend.get_user_permissions(user),
+            *backend.get_group_permissions(user),
+        })
+        user._capabilities = perms
+    return perms
+
+
+def get_capabilities(user):
+    """
+    Retorna a máscara de capacidades do usuário.
+
+    Args:
+        user: Usuário da requisição (pode ser anônimo)
+
+    Returns:
+        Capability com as flags do usuário (vazia para anônimos)
+    """
+    if user is None or not user.is_authenticated:
+        return Capability(0)
+    # Sempre das flags carregadas: uma máscara em cache sobreviveria à
+    # revogação de uma função nos demais processos
+    return compute_mask(user)
+
+
+def has_capability(user, required):
+    """True se o usuário tiver pelo menos uma das capacidades em ``required``."""
+    return bool(get_capabilities(user) & required)
+
+
+def get_cached_permissions(user):
+    """Permissões do Django ("app.codename") do usuário, memorizadas na requisição."""
+    if user is None or not user.is_authenticated:
+        return frozenset()
+    return _resolve_permissions(user)
+
+
+def invalidate_capabilities(user):
+    """Descarta as permissões memorizadas no objeto do usuário."""
+    user.__dict__.pop("_capabilities", None)
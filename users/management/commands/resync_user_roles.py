@@ -0,0 +1,50 @@
+"""
+Management Command para reconciliar tipo, flags e grupos de todos os usuários.
+
+Aplica as mesmas regras do save() de CustomUser em lote: um SELECT dos
+usuários, um SELECT da tabela de grupos e UPDATE/DELETE/INSERT em lotes
+apenas para o que estiver divergente.
+
+Uso:
+    python manage.py resync_user_roles
+    python manage.py resync_user_roles --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from users.models import CustomUser
+from users.services import RoleSyncService
+
+
+class Command(BaseCommand):
+    help = 'Reconcilia tipo, funções e grupos de todos os usuários'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Apenas mostra quantas alterações seriam feitas',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Tamanho dos lotes de gravação (padrão: 500)',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        with transaction.atomic():
+            result = RoleSyncService().resync_all(
+                CustomUser.objects.all(),
+                dry_run=dry_run,
+                batch_size=options['batch_size'],
+            )
+
+        prefix = '[DRY RUN] ' if dry_run else ''
+        self.stdout.write(f"{prefix}Usuários atualizados: {result['users_updated']}")
+        self.stdout.write(f"{prefix}Grupos removidos: {result['groups_removed']}")
+        self.stdout.write(f"{prefix}Grupos adicionados: {result['groups_added']}")
+        self.stdout.write(self.style.SUCCESS('Reconciliação concluída.'))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:45
+
+from django.db import migrations, models
+
+from users.utils.search_key import normalize_search_text
+
+
+def backfill_search_names(apps, schema_editor):
+    CustomUser = apps.get_model("users", "CustomUser")
+    users = list(CustomUser.objects.only("id", "first_name", "last_name"))
+    for user in users:
+        user.search_name = normalize_search_text(f"{user.first_name} {user.last_name}")
+        user.search_last_name = normalize_search_text(user.last_name)
+    CustomUser.objects.bulk_update(users, ["search_name", "search_last_name"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_customuser_is_approved'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='search_last_name',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=150),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='search_name',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=301),
+        ),
+        migrations.RunPython(backfill_search_names, migrations.RunPython.noop),
+    ]
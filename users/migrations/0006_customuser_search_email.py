@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:45
+
+from django.db import migrations, models
+
+from users.utils.search_key import normalize_search_text
+
+
+def backfill_search_emails(apps, schema_editor):
+    CustomUser = apps.get_model("users", "CustomUser")
+    users = list(CustomUser.objects.only("id", "email"))
+    for user in users:
+        user.search_email = normalize_search_text(user.email)
+    CustomUser.objects.bulk_update(users, ["search_email"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_customuser_search_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='search_email',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=254),
+        ),
+        migrations.RunPython(backfill_search_emails, migrations.RunPython.noop),
+    ]
@@ -3,10 +3,8 @@ from django.db import models
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
-from django.db.models.signals import post_save
-from django.dispatch import receiver
-from django.contrib.auth.models import Group
-from django.db import transaction
+from users.services.role_sync_service import ROLE_FIELDS, RoleSyncService
+from users.utils.search_key import normalize_search_text
 from users.utils.user_profile_path import user_profile_image_path
 from django_resized import ResizedImageField
 
@@ -46,15 +44,10 @@ class CustomUser(AbstractUser):
     is_secretary = models.BooleanField(blank=True, default=False)
     is_treasurer = models.BooleanField(blank=True, default=False)
     is_approved = models.BooleanField(blank=True, default=False)
-
-    def save(self, *args, **kwargs):
-        try:
-            this = CustomUser.objects.get(id=self.id)
-            if this.profile_image != self.profile_image:
-                this.profile_image.delete(save=False)
-        except CustomUser.DoesNotExist:
-            pass
-        super(CustomUser, self).save(*args, **kwargs)
+    # Nome, sobrenome e e-mail normalizados (minúsculas, sem acentos) para a busca por prefixo
+    search_name = models.CharField(max_length=301, blank=True, default="", editable=False, db_index=True)
+    search_last_name = models.CharField(max_length=150, blank=True, default="", editable=False, db_index=True)
+    search_email = models.CharField(max_length=254, blank=True, default="", editable=False, db_index=True)
 
     class Types(models.TextChoices):
         # Um membro
@@ -80,90 +73,44 @@ class CustomUser(AbstractUser):
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
-    def save(self, *args, **kwargs):
-        try:
-            this = CustomUser.objects.get(id=self.id)
-            if this.profile_image != self.profile_image:
-                this.profile_image.delete(save=False)
-        except CustomUser.DoesNotExist:
-            pass
-        super(CustomUser, self).save(*args, **kwargs)
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Guarda a imagem carregada para saber, no save, se ela foi trocada
+        if "profile_image" in field_names:
+            instance._loaded_profile_image = values[field_names.index("profile_image")]
+        return instance
 
+    def save(self, *args, **kwargs):
+        created = self._state.adding
+        update_fields = kwargs.get("update_fields")
+        sync_roles = update_fields is None or not ROLE_FIELDS.isdisjoint(update_fields)
+
+        if sync_roles:
+            # Tipo e flags vão no mesmo INSERT/UPDATE da edição
+            role_sync = RoleSyncService()
+            role_sync.apply_roles(self)
+            if update_fields is not None:
+                kwargs["update_fields"] = update_fields = {*update_fields, *ROLE_FIELDS}
+
+        if update_fields is None or not {"first_name", "last_name"}.isdisjoint(update_fields):
+            self.search_name = normalize_search_text(f"{self.first_name} {self.last_name}")
+            self.search_last_name = normalize_search_text(self.last_name)
+            if update_fields is not None:
+                kwargs["update_fields"] = update_fields = {*update_fields, "search_name", "search_last_name"}
+
+        if update_fields is None or "email" in update_fields:
+            self.search_email = normalize_search_text(self.email)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "search_email"}
+
+        loaded_image = getattr(self, "_loaded_profile_image", None)
+        if loaded_image and loaded_image != self.profile_image.name:
+            self.profile_image.storage.delete(loaded_image)
 
-@receiver(post_save, sender=CustomUser)
-def set_initial_user_type(sender, instance, created, **kwargs):
-    regular_group, _ = Group.objects.get_or_create(name="members")
-    secretarial_group, _ = Group.objects.get_or_create(name="secretary")
-    treasury_group, _ = Group.objects.get_or_create(name="treasurer")
-    pastor_group, _ = Group.objects.get_or_create(name="pastor")
-    users_group, _ = Group.objects.get_or_create(name="users")
+        super(CustomUser, self).save(*args, **kwargs)
+        if "profile_image" in self.__dict__:
+            self._loaded_profile_image = self.profile_image.name
 
-    instance.groups.clear()
-    has_any_function = (
-        instance.is_pastor or instance.is_secretary or instance.is_treasurer
-    )
-    if not has_any_function and not (
-        instance.type
-        in [
-            CustomUser.Types.CONGREGATED,
-            CustomUser.Types.SIMPLE_USER,
-        ]
-    ):
-        instance.type = CustomUser.Types.REGULAR
-    elif has_any_function and not (
-        instance.type
-        in [
-            CustomUser.Types.CONGREGATED,
-            CustomUser.Types.SIMPLE_USER,
-        ]
-    ):
-        instance.type = CustomUser.Types.STAFF
-
-    if instance.is_superuser:
-        instance.is_approved = True
-        return
-    else:
-        if instance.type in [
-            CustomUser.Types.CONGREGATED,
-            CustomUser.Types.SIMPLE_USER,
-        ]:
-            instance.error_message = "Congregado não pode ter funções..."
-            instance.is_pastor = False
-            instance.is_secretary = False
-            instance.is_treasurer = False
-            instance.groups.clear()
-            instance.groups.add(users_group)
-        else:
-            if instance.type == CustomUser.Types.REGULAR:
-                instance.groups.add(regular_group)
-            elif instance.is_pastor:
-                if instance.is_secretary and instance.is_treasurer:
-                    instance.groups.add(pastor_group, secretarial_group, treasury_group)
-                elif instance.is_secretary:
-                    instance.groups.add(pastor_group, secretarial_group)
-                elif instance.is_treasurer:
-                    instance.groups.add(pastor_group, treasury_group)
-                else:
-                    instance.groups.add(pastor_group)
-                instance.type = CustomUser.Types.STAFF
-            elif instance.is_secretary:
-                if instance.is_treasurer:
-                    instance.groups.add(secretarial_group, treasury_group)
-                else:
-                    instance.groups.add(secretarial_group)
-                instance.type = CustomUser.Types.STAFF
-            elif instance.is_treasurer:
-                instance.groups.add(treasury_group)
-                instance.type = CustomUser.Types.STAFF
-
-        if instance.type == CustomUser.Types.STAFF:
-            instance.is_staff = True
-        else:
-            instance.is_staff = False
-
-    user_groups = instance.groups.all()
-
-    with transaction.atomic():
-        post_save.disconnect(set_initial_user_type, sender=CustomUser)
-        instance.save()
-        post_save.connect(set_initial_user_type, sender=CustomUser)
+        if sync_roles:
+            role_sync.sync_groups(self, created=created)
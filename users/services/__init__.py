@@ -0,0 +1,4 @@
+from .membership_service import MembershipService
+from .role_sync_service import RoleSyncService
+
+__all__ = ['MembershipService', 'RoleSyncService']
@@ -0,0 +1,172 @@
+"""
+Estatísticas de membresia e diretório paginado de membros.
+
+As contagens saem de um único GROUP BY e o diretório usa os campos de nome
+normalizados com busca por prefixo indexada. Os resultados ficam em cache até
+a próxima gravação de CustomUser (ver ``users.signals``).
+"""
+import hashlib
+
+from django.contrib.auth.hashers import is_password_usable
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Count, Q
+
+from users.utils.search_key import normalize_search_text
+
+MEMBERSHIP_VERSION_KEY = "membership:version"
+MEMBERSHIP_CACHE_TIMEOUT = 60 * 60
+DIRECTORY_PAGE_SIZE = 20
+
+# Maior ponto de código do BMP: fecha o intervalo da busca por prefixo
+_PREFIX_UPPER_BOUND = "\uffff"
+
+DIRECTORY_FIELDS = (
+    "id", "first_name", "last_name", "email", "phone_number", "type", "password",
+    "is_approved", "is_pastor", "is_secretary", "is_treasurer",
+)
+
+
+def get_membership_version():
+    return cache.get_or_set(MEMBERSHIP_VERSION_KEY, 1, None)
+
+
+def bump_membership_version():
+    try:
+        cache.incr(MEMBERSHIP_VERSION_KEY)
+    except ValueError:
+        cache.set(MEMBERSHIP_VERSION_KEY, 2, None)
+
+
+def prefix_filter(field, prefix):
+    """Filtro por prefixo em forma de intervalo, que usa o índice da coluna."""
+    return Q(**{f"{field}__gte": prefix, f"{field}__lt": prefix + _PREFIX_UPPER_BOUND})
+
+
+class MembershipService:
+    """
+    Serviço para estatísticas de membresia, diretório e busca de usuários.
+    """
+
+    def __init__(self, model=None):
+        if model is None:
+            from users.models import CustomUser as model
+        self.model = model
+
+    @property
+    def member_types(self):
+        return (self.model.Types.REGULAR, self.model.Types.STAFF)
+
+    def stats(self):
+        """
+        Contagens por tipo, função e aprovação a partir de um único GROUP BY.
+
+        Returns:
+            Dict com total, by_type, members, visitors, non_members,
+            total_members, pastors, secretaries, treasurers, approved e pending
+        """
+        cache_key = f"membership:stats:{get_membership_version()}"
+        stats = cache.get(cache_key)
+        if stats is not None:
+            return stats
+
+        rows = self.model.objects.values(
+            "type", "is_approved", "is_pastor", "is_secretary", "is_treasurer"
+        ).annotate(total=Count("id")).order_by()
+
+        stats = {
+            "total": 0, "by_type": {choice: 0 for choice in self.model.Types.values},
+            "pastors": 0, "secretaries": 0, "treasurers": 0, "approved": 0, "pending": 0,
+        }
+        for row in rows:
+            total = row["total"]
+            stats["total"] += total
+            stats["by_type"][row["type"]] = stats["by_type"].get(row["type"], 0) + total
+            stats["pastors"] += total if row["is_pastor"] else 0
+            stats["secretaries"] += total if row["is_secretary"] else 0
+            stats["treasurers"] += total if row["is_treasurer"] else 0
+            stats["approved" if row["is_approved"] else "pending"] += total
+
+        stats["members"] = sum(stats["by_type"][t] for t in self.member_types)
+        stats["visitors"] = stats["by_type"][self.model.Types.CONGREGATED]
+        stats["non_members"] = stats["total"] - stats["members"]
+        stats["total_members"] = stats["members"] + stats["visitors"]
+
+        cache.set(cache_key, stats, MEMBERSHIP_CACHE_TIMEOUT)
+        return stats
+
+    def search(self, queryset, term):
+        """
+        Filtra por prefixo do nome completo, do sobrenome ou do e-mail, sem
+        diferenciar acentos nem maiúsculas.
+        """
+        term = normalize_search_text(term)
+        if not term:
+            return queryset
+        return queryset.filter(
+            prefix_filter("search_name", term)
+            | prefix_filter("search_last_name", term)
+            | prefix_filter("search_email", term)
+        )
+
+    def members(self):
+        return self.model.objects.filter(type__in=self.member_types)
+
+    def non_members(self):
+        return self.model.objects.exclude(type__in=self.member_types)
+
+    def directory(self, search="", approval="", function="", page=1, page_size=DIRECTORY_PAGE_SIZE):
+        """
+        Página do diretório de membros (REGULAR e EQUIPE), já serializada.
+
+        Args:
+            search: Prefixo do nome, sobrenome ou e-mail
+            approval: "approved", "pending" ou vazio
+            function: "pastor", "secretary", "treasurer", "none" ou vazio
+            page: Número da página (1-based; valores inválidos vão para a última/primeira)
+            page_size: Itens por página
+
+        Returns:
+            Dict com results, count, page e num_pages
+        """
+        params = f"{search}|{approval}|{function}|{page}|{page_size}"
+        digest = hashlib.md5(params.encode()).hexdigest()
+        cache_key = f"membership:directory:{get_membership_version()}:{digest}"
+        result = cache.get(cache_key)
+        if result is not None:
+            return result
+
+        queryset = self.search(self.members(), search)
+
+        if approval == "approved":
+            queryset = queryset.filter(is_approved=True)
+        elif approval == "pending":
+            queryset = queryset.filter(is_approved=False)
+
+        if function in ("pastor", "secretary", "treasurer"):
+            queryset = queryset.filter(**{f"is_{function}": True})
+        elif function == "none":
+            queryset = queryset.filter(is_pastor=False, is_secretary=False, is_treasurer=False)
+
+        paginator = Paginator(
+            queryset.order_by("search_name", "id").values(*DIRECTORY_FIELDS), page_size
+        )
+        page_obj = paginator.get_page(page)
+        type_labels = dict(self.model.Types.choices)
+
+        result = {
+            "results": [self._directory_entry(row, type_labels) for row in page_obj],
+            "count": paginator.count,
+            "page": page_obj.number,
+            "num_pages": paginator.num_pages,
+        }
+        cache.set(cache_key, result, MEMBERSHIP_CACHE_TIMEOUT)
+        return result
+
+    def _directory_entry(self, row, type_labels):
+        entry = dict(row)
+        entry["pk"] = entry["id"]
+        entry["phone_number"] = str(entry["phone_number"] or "")
+        entry["type_display"] = type_labels.get(entry["type"], entry["type"])
+        entry["has_usable_password"] = is_password_usable(entry.pop("password"))
+        return entry
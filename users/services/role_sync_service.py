@@ -0,0 +1,192 @@
+"""
+Sincronização de tipo, flags e grupos dos usuários a partir das funções
+(pastor, secretário, tesoureiro).
+
+As regras ficam em um só lugar e são aplicadas de duas formas:
+- ``apply_roles`` ajusta os campos no próprio objeto antes do ``save()``,
+  para que tipo/is_staff sejam gravados no mesmo UPDATE da edição;
+- ``sync_groups`` aplica apenas a diferença de grupos na tabela intermediária.
+"""
+from django.contrib.auth.models import Group
+from django.db import connection, transaction
+
+from users.capabilities import invalidate_capabilities
+
+MEMBERS_GROUP = "members"
+SECRETARY_GROUP = "secretary"
+TREASURER_GROUP = "treasurer"
+PASTOR_GROUP = "pastor"
+USERS_GROUP = "users"
+ROLE_GROUPS = (MEMBERS_GROUP, SECRETARY_GROUP, TREASURER_GROUP, PASTOR_GROUP, USERS_GROUP)
+
+# Campos que as regras de função podem alterar
+ROLE_FIELDS = frozenset({"type", "is_staff", "is_approved", "is_pastor", "is_secretary", "is_treasurer"})
+
+# nome do grupo -> id, carregado uma vez por processo
+_group_ids = {}
+
+
+def clear_group_cache():
+    _group_ids.clear()
+
+
+class RoleSyncService:
+    """
+    Serviço para manter tipo, flags e grupos dos usuários coerentes com suas funções.
+    """
+
+    def get_group_ids(self):
+        """
+        Retorna o mapa nome -> id dos grupos de função, criando os que faltarem.
+
+        O mapa só é guardado em cache quando lido fora de uma transação, pois
+        grupos criados dentro de uma transação podem desaparecer em um rollback.
+        """
+        if _group_ids:
+            return _group_ids
+
+        group_ids = dict(Group.objects.filter(name__in=ROLE_GROUPS).values_list("name", "id"))
+        for name in ROLE_GROUPS:
+            if name not in group_ids:
+                group_ids[name] = Group.objects.get_or_create(name=name)[0].id
+
+        if not connection.in_atomic_block:
+            _group_ids.update(group_ids)
+        return group_ids
+
+    def apply_roles(self, user):
+        """
+        Normaliza tipo, flags de função, is_staff e is_approved no objeto (sem salvar).
+
+        - Congregados e usuários simples não podem ter funções
+        - Membros com alguma função são equipe; sem função, membros regulares
+        - Superusuários são sempre aprovados e mantêm is_staff
+
+        Args:
+            user: Instância de CustomUser
+        """
+        Types = user.Types
+        congregation_types = (Types.CONGREGATED, Types.SIMPLE_USER)
+        has_any_function = user.is_pastor or user.is_secretary or user.is_treasurer
+
+        if user.type not in congregation_types:
+            user.type = Types.STAFF if has_any_function else Types.REGULAR
+
+        if user.is_superuser:
+            user.is_approved = True
+            return
+
+        if user.type in congregation_types:
+            user.is_pastor = False
+            user.is_secretary = False
+            user.is_treasurer = False
+
+        user.is_staff = user.type == Types.STAFF
+
+    def desired_groups(self, user):
+        """
+        Retorna os nomes dos grupos que o usuário deve ter, já normalizado por ``apply_roles``.
+        """
+        if user.is_superuser:
+            return set()
+        if user.type in (user.Types.CONGREGATED, user.Types.SIMPLE_USER):
+            return {USERS_GROUP}
+        if user.type == user.Types.REGULAR:
+            return {MEMBERS_GROUP}
+
+        groups = set()
+        if user.is_pastor:
+            groups.add(PASTOR_GROUP)
+        if user.is_secretary:
+            groups.add(SECRETARY_GROUP)
+        if user.is_treasurer:
+            groups.add(TREASURER_GROUP)
+        return groups
+
+    def sync_groups(self, user, created=False):
+        """
+        Aplica na tabela intermediária apenas a diferença entre os grupos atuais e os desejados.
+
+        Args:
+            user: Instância de CustomUser já salva e normalizada
+            created: Se o usuário acabou de ser criado (não há grupos a ler)
+        """
+        group_ids = self.get_group_ids()
+        desired = {group_ids[name] for name in self.desired_groups(user)}
+        through = type(user).groups.through
+
+        if created:
+            current = set()
+        else:
+            current = set(through.objects.filter(customuser_id=user.pk).values_list("group_id", flat=True))
+
+        stale = current - desired
+        if stale:
+            through.objects.filter(customuser_id=user.pk, group_id__in=stale).delete()
+
+        missing = desired - current
+        if missing:
+            through.objects.bulk_create(
+                [through(customuser_id=user.pk, group_id=group_id) for group_id in missing]
+            )
+
+        if stale or missing:
+            # Permissões em cache dependem dos grupos
+            for attr in ("_perm_cache", "_group_perm_cache"):
+                user.__dict__.pop(attr, None)
+            invalidate_capabilities(user)
+
+    def resync_all(self, queryset, dry_run=False, batch_size=500):
+        """
+        Reconcilia tipo, flags e grupos de todos os usuários do queryset em poucas consultas.
+
+        Args:
+            queryset: Usuários a reconciliar
+            dry_run: Apenas calcula as diferenças, sem gravar
+            batch_size: Tamanho dos lotes de UPDATE/INSERT
+
+        Returns:
+            Dict com users_updated, groups_removed e groups_added
+        """
+        group_ids = self.get_group_ids()
+        users = list(queryset.only("id", "type", "is_superuser", *ROLE_FIELDS))
+        through = queryset.model.groups.through
+
+        changed_users = []
+        desired_pairs = set()
+        for user in users:
+            before = tuple(getattr(user, field) for field in sorted(ROLE_FIELDS))
+            self.apply_roles(user)
+            if before != tuple(getattr(user, field) for field in sorted(ROLE_FIELDS)):
+                changed_users.append(user)
+            desired_pairs.update((user.pk, group_ids[name]) for name in self.desired_groups(user))
+
+        current = {
+            (user_id, group_id): row_id
+            for row_id, user_id, group_id in through.objects.filter(
+                customuser_id__in=[user.pk for user in users]
+            ).values_list("id", "customuser_id", "group_id")
+        }
+        stale_ids = [row_id for pair, row_id in current.items() if pair not in desired_pairs]
+        missing = [pair for pair in desired_pairs if pair not in current]
+
+        if not dry_run:
+            if changed_users or stale_ids or missing:
+                from users.services.membership_service import bump_membership_version
+                # Só depois do commit: invalidar antes permitiria que uma
+                # requisição concorrente guardasse de novo os dados antigos
+                transaction.on_commit(bump_membership_version)
+            if changed_users:
+                queryset.model.objects.bulk_update(changed_users, sorted(ROLE_FIELDS), batch_size=batch_size)
+            for start in range(0, len(stale_ids), batch_size):
+                through.objects.filter(id__in=stale_ids[start:start + batch_size]).delete()
+            through.objects.bulk_create(
+                [through(customuser_id=user_id, group_id=group_id) for user_id, group_id in missing],
+                batch_size=batch_size,
+            )
+
+        return {
+            "users_updated": len(changed_users),
+            "groups_removed": len(stale_ids),
+            "groups_added": len(missing),
+        }
@@ -0,0 +1,43 @@
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from users.capabilities import invalidate_capabilities
+from users.models import CustomUser
+from users.services.membership_service import bump_membership_version
+from users.services.role_sync_service import ROLE_FIELDS, clear_group_cache
+
+# Campos que alteram capacidades ou permissões do usuário
+CAPABILITY_FIELDS = ROLE_FIELDS | {"is_superuser", "is_active"}
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_role_group_cache(sender, **kwargs):
+    # Os ids dos grupos de função ficam em cache por processo
+    clear_group_cache()
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_membership_cache(sender, update_fields=None, **kwargs):
+    # Login só grava last_login, que não aparece nas estatísticas nem no diretório
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    bump_membership_version()
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_user_capabilities(sender, instance, update_fields=None, **kwargs):
+    if update_fields and CAPABILITY_FIELDS.isdisjoint(update_fields):
+        return
+    invalidate_capabilities(instance)
+
+
+@receiver(m2m_changed, sender=CustomUser.groups.through)
+@receiver(m2m_changed, sender=CustomUser.user_permissions.through)
+def invalidate_capabilities_on_m2m(sender, instance, action, reverse, **kwargs):
+    # Outros objetos do usuário são carregados de novo a cada requisição
+    if action.startswith("post_") and not reverse:
+        invalidate_capabilities(instance)
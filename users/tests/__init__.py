@@ -2,4 +2,6 @@ from .custom_user_test_case import CustomUserTestCase
 from .update_profile_view_tests import UserProfileUpdateViewTestAsSecretary
 from .user_profile_view_test import UserProfileViewTest
 from .registration_form_tests import RegisterUserFormTest
-from .update_user_form_tests import UpdateUserProfileFormTest
\ No newline at end of file
+from .update_user_form_tests import UpdateUserProfileFormTest
+from .role_sync_tests import RoleSyncTest
+from .capabilities_tests import CapabilitiesTest
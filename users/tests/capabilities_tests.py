@@ -0,0 +1,123 @@
+from django.contrib.auth.models import AnonymousUser, Group, Permission
+from django.core.cache import cache
+from django.test import TestCase
+
+from users.capabilities import (
+    CHURCH_MEMBER,
+    TREASURER_ONLY,
+    TREASURY_ADMIN,
+    TREASURY_VIEWER,
+    Capability,
+    get_capabilities,
+    has_capability,
+)
+from users.models import CustomUser
+
+
+class CapabilitiesTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def fresh(self, user):
+        return CustomUser.objects.get(pk=user.pk)
+
+    def test_role_masks(self):
+        member = CustomUser.objects.create(username="member", email="member@example.com",
+                                           type=CustomUser.Types.REGULAR)
+        congregated = CustomUser.objects.create(username="congregated", email="congregated@example.com",
+                                                type=CustomUser.Types.CONGREGATED)
+        treasurer = CustomUser.objects.create(username="treasurer", email="treasurer@example.com",
+                                              type=CustomUser.Types.STAFF, is_treasurer=True)
+        secretary = CustomUser.objects.create(username="secretary", email="secretary@example.com",
+                                              type=CustomUser.Types.STAFF, is_secretary=True)
+
+        self.assertEqual(get_capabilities(AnonymousUser()), Capability(0))
+        self.assertFalse(has_capability(AnonymousUser(), TREASURY_VIEWER))
+
+        self.assertTrue(has_capability(member, TREASURY_VIEWER))
+        self.assertTrue(has_capability(member, CHURCH_MEMBER))
+        self.assertFalse(has_capability(member, TREASURY_ADMIN))
+
+        self.assertTrue(get_capabilities(congregated) & Capability.AUTHENTICATED)
+        self.assertFalse(has_capability(congregated, TREASURY_VIEWER))
+        self.assertFalse(has_capability(congregated, CHURCH_MEMBER))
+
+        self.assertTrue(has_capability(treasurer, TREASURER_ONLY))
+        self.assertTrue(has_capability(secretary, TREASURY_ADMIN))
+        self.assertFalse(has_capability(secretary, TREASURER_ONLY))
+
+    def test_permissions_are_resolved_once_per_request(self):
+        user = self.fresh(CustomUser.objects.create(username="member", email="member@example.com",
+                                                    type=CustomUser.Types.REGULAR))
+        user.has_perm("treasury.view_transactionmodel")
+
+        # Mesmo objeto (mesma requisição): máscara e permissões já resolvidas
+        with self.assertNumQueries(0):
+            self.assertTrue(has_capability(user, TREASURY_VIEWER))
+            self.assertFalse(user.has_perm("treasury.view_transactionmodel"))
+            self.assertFalse(user.has_perm("treasury.add_transactionmodel"))
+
+    def test_revoked_permission_without_signal_is_not_cached(self):
+        user = CustomUser.objects.create(username="member", email="member@example.com",
+                                         type=CustomUser.Types.REGULAR)
+        permission = Permission.objects.get(codename="view_transactionmodel")
+        user.user_permissions.add(permission)
+        self.assertTrue(self.fresh(user).has_perm("treasury.view_transactionmodel"))
+
+        # Remoção direta na tabela, sem signals (como em outro processo)
+        CustomUser.user_permissions.through.objects.filter(customuser_id=user.pk).delete()
+
+        self.assertFalse(self.fresh(user).has_perm("treasury.view_transactionmodel"))
+
+    def test_role_change_invalidates(self):
+        user = CustomUser.objects.create(username="member", email="member@example.com",
+                                         type=CustomUser.Types.REGULAR)
+        self.assertFalse(has_capability(self.fresh(user), TREASURER_ONLY))
+
+        user.is_treasurer = True
+        user.save()
+
+        self.assertTrue(has_capability(self.fresh(user), TREASURER_ONLY))
+
+    def test_revoked_role_without_signal_is_not_cached(self):
+        user = CustomUser.objects.create(username="treasurer", email="treasurer@example.com",
+                                         type=CustomUser.Types.STAFF, is_treasurer=True)
+        self.assertTrue(has_capability(self.fresh(user), TREASURER_ONLY))
+
+        # update() não dispara signals (como uma alteração feita em outro processo)
+        CustomUser.objects.filter(pk=user.pk).update(is_treasurer=False)
+
+        self.assertFalse(has_capability(self.fresh(user), TREASURER_ONLY))
+
+    def test_group_and_permission_changes_invalidate(self):
+        user = CustomUser.objects.create(username="member", email="member@example.com",
+                                         type=CustomUser.Types.REGULAR)
+        permission = Permission.objects.get(codename="view_transactionmodel")
+        self.assertFalse(self.fresh(user).has_perm("treasury.view_transactionmodel"))
+
+        group = Group.objects.create(name="auditors")
+        user.groups.add(group)
+        self.assertFalse(self.fresh(user).has_perm("treasury.view_transactionmodel"))
+
+        group.permissions.add(permission)
+        self.assertTrue(self.fresh(user).has_perm("treasury.view_transactionmodel"))
+
+        group.user_set.remove(user)
+        self.assertFalse(self.fresh(user).has_perm("treasury.view_transactionmodel"))
+
+        user.user_permissions.add(permission)
+        self.assertTrue(self.fresh(user).has_perm("treasury.view_transactionmodel"))
+
+    def test_access_checks_use_capabilities(self):
+        member = CustomUser.objects.create(username="member", email="member@example.com",
+                                           type=CustomUser.Types.REGULAR)
+        congregated = CustomUser.objects.create(username="congregated", email="congregated@example.com",
+                                                type=CustomUser.Types.CONGREGATED)
+
+        self.client.force_login(member)
+        response = self.client.post("/treasury/api/categories/", {"name": "Dízimos"})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.get("/treasury/").status_code, 200)
+
+        self.client.force_login(congregated)
+        self.assertEqual(self.client.get("/treasury/").status_code, 403)
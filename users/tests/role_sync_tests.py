@@ -0,0 +1,80 @@
+from io import StringIO
+
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.test import TestCase
+
+from users.models import CustomUser
+
+
+class RoleSyncTest(TestCase):
+    def group_names(self, user):
+        return set(user.groups.values_list("name", flat=True))
+
+    def test_role_change_applies_group_diff_and_flags(self):
+        user = CustomUser.objects.create(username="member", email="member@example.com",
+                                         type=CustomUser.Types.REGULAR)
+        self.assertEqual(self.group_names(user), {"members"})
+        self.assertFalse(user.is_staff)
+
+        user.is_treasurer = True
+        user.save()
+        user.refresh_from_db()
+
+        self.assertEqual(user.type, CustomUser.Types.STAFF)
+        self.assertTrue(user.is_staff)
+        self.assertEqual(self.group_names(user), {"treasurer"})
+
+        user.is_pastor = True
+        user.save()
+        self.assertEqual(self.group_names(user), {"treasurer", "pastor"})
+
+    def test_profile_edit_is_a_single_update(self):
+        user = CustomUser.objects.create(username="pastor", email="pastor@example.com",
+                                         type=CustomUser.Types.STAFF, is_pastor=True)
+        user = CustomUser.objects.get(pk=user.pk)
+        user.about = "Pastor da igreja"
+
+        # UPDATE + ids dos grupos + grupos atuais; nenhuma escrita de grupo sem mudança
+        with self.assertNumQueries(3):
+            user.save()
+
+    def test_update_fields_without_roles_skips_sync(self):
+        user = CustomUser.objects.create(username="login", email="login@example.com")
+        with self.assertNumQueries(1):
+            user.save(update_fields=["last_login"])
+
+    def test_superuser_has_no_role_groups(self):
+        admin = CustomUser.objects.create_superuser(username="admin", email="admin@example.com",
+                                                    password="testpass123")
+        admin.refresh_from_db()
+        self.assertTrue(admin.is_approved)
+        self.assertTrue(admin.is_staff)
+        self.assertEqual(self.group_names(admin), set())
+
+    def test_resync_user_roles_command(self):
+        secretary = CustomUser.objects.create(username="secretary", email="secretary@example.com",
+                                              type=CustomUser.Types.STAFF, is_secretary=True)
+        congregated = CustomUser.objects.create(username="congregated", email="congregated@example.com",
+                                                type=CustomUser.Types.CONGREGATED)
+
+        # Estado divergente gravado por fora do save()
+        CustomUser.objects.filter(pk=secretary.pk).update(is_staff=False)
+        CustomUser.objects.filter(pk=congregated.pk).update(is_treasurer=True)
+        secretary.groups.clear()
+        congregated.groups.add(Group.objects.get(name="members"))
+
+        out = StringIO()
+        call_command("resync_user_roles", stdout=out)
+
+        secretary.refresh_from_db()
+        congregated.refresh_from_db()
+        self.assertTrue(secretary.is_staff)
+        self.assertFalse(congregated.is_treasurer)
+        self.assertEqual(self.group_names(secretary), {"secretary"})
+        self.assertEqual(self.group_names(congregated), {"users"})
+        self.assertIn("Usuários atualizados: 2", out.getvalue())
+
+        out = StringIO()
+        call_command("resync_user_roles", stdout=out)
+        self.assertIn("Grupos adicionados: 0", out.getvalue())
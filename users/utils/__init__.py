@@ -1,2 +1,3 @@
 from .user_profile_path import user_profile_image_path
-from .send_message import send_message
\ No newline at end of file
+from .send_message import send_message
+from .search_key import normalize_search_text
@@ -0,0 +1,13 @@
+import unicodedata
+
+
+def normalize_search_text(value):
+    """
+    Texto em minúsculas, sem acentos e com espaços simples, para buscas por
+    prefixo indexadas ("João  Conceição" -> "joao conceicao").
+    """
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(value))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
@@ -1,6 +1,7 @@
 import os
 import uuid
 from django.db import models
+from core import thumbnails
 from core.models import BaseModel
 
 class SongFile(BaseModel):
@@ -17,6 +18,7 @@ class SongFile(BaseModel):
     description = models.CharField(max_length=255, blank=True, null=True)
 
     def save(self, *args, **kwargs):
+        new_upload = bool(self.file) and not self.file._committed
         original_extension = os.path.splitext(self.file.name)[1]
         new_filename = f"{self.song.title}_{uuid.uuid4()}{original_extension}"
         
@@ -24,5 +26,9 @@ class SongFile(BaseModel):
 
         super().save(*args, **kwargs)
 
+        # Miniatura da partitura (imagem ou 1ª página do PDF) para as listagens
+        if new_upload:
+            thumbnails.schedule_derivatives(self.file.name, self.file.storage)
+
     def __str__(self):
         return f"{self.song.title} - {self.get_file_type_display()}"
@@ -1,6 +1,7 @@
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.views.decorators.http import require_POST
+from core.views.protected_media_view import protected_media_url
 from worship.models import Song, SongFile
 import reversion
 
@@ -37,6 +38,8 @@ def add_song_file(request):
             'id': song_file.id,
             'file_type': song_file.file_type,
             'description': song_file.description,
-            'url': song_file.file.url,
+            'url': protected_media_url('song-file', song_file),
+            # Gerada depois do commit; aparece na próxima listagem
+            'thumbnail_url': '',
         }
     })
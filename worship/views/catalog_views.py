@@ -4,13 +4,12 @@ from django.shortcuts import redirect
 from django.views.generic import TemplateView
 
 from worship.forms import ComposerQuickForm, HymnalQuickForm, SongThemeQuickForm
+from users.capabilities import CHURCH_MEMBER, has_capability
 from worship.models import Composer, Hymnal, SongTheme
 
 
 def _is_worship_member(user):
-    if not user.is_authenticated:
-        return False
-    return user.is_superuser or user.is_staff or user.type == "REGULAR"
+    return has_capability(user, CHURCH_MEMBER)
 
 
 class WorshipAccessMixin(LoginRequiredMixin, UserPassesTestMixin):
@@ -15,15 +15,14 @@ from django.views import View
 from django.views.generic import CreateView, DetailView, ListView, UpdateView
 
 from core.core_context_processor import context_user_data
+from users.capabilities import CHURCH_MEMBER, has_capability
 from worship.forms import WorshipServiceForm, WorshipServiceImportForm, WorshipServiceSongForm
 from worship.models import Song, WorshipService, WorshipServiceSong
 from worship.utils import generate_service_with_llm, resolve_song_reference
 
 
 def _is_worship_member(user):
-    if not user.is_authenticated:
-        return False
-    return user.is_superuser or user.is_staff or user.type == "REGULAR"
+    return has_capability(user, CHURCH_MEMBER)
 
 
 def _normalize_single_line(text):
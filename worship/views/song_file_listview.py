@@ -1,5 +1,6 @@
 from django.views import View
 from django.http import JsonResponse
+from core.views.protected_media_view import protected_media_url, protected_thumbnail_url
 from worship.models import SongFile
 
 class SongFileListView(View):
@@ -16,7 +17,8 @@ class SongFileListView(View):
                 'file_type': file.file_type,
                 'description': file.description,
                 'file_title': file.file_title,
-                'url': file.file.url,
+                'url': protected_media_url('song-file', file),
+                'thumbnail_url': protected_thumbnail_url('song-file', file, 320, fallback=False),
             })
         
         return JsonResponse({'success': True, 'results': results})
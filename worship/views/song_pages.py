@@ -5,13 +5,12 @@ from django.urls import reverse
 from django.views.generic import CreateView, ListView
 
 from worship.forms import SongForm
+from users.capabilities import CHURCH_MEMBER, has_capability
 from worship.models import Composer, Hymnal, Song, SongTheme
 
 
 def _is_worship_member(user):
-    if not user.is_authenticated:
-        return False
-    return user.is_superuser or user.is_staff or user.type == "REGULAR"
+    return has_capability(user, CHURCH_MEMBER)
 
 
 class WorshipAccessMixin(LoginRequiredMixin, UserPassesTestMixin):